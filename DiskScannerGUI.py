@@ -9511,9 +9511,17 @@ class App:
             except Exception as exc:
                 migration_error = str(exc)
                 use_name = False
+            # The trigram index is built by scans and upgrade_db, never here.
+            try:
+                tables = {
+                    str(row[0])
+                    for row in connection.execute("SELECT name FROM sqlite_master WHERE type='table'")
+                }
+            except sqlite3.Error:
+                tables = set()
             if cancel_event.is_set():
                 return
-            sql, params = build_search_query(query_parts["like"], use_name=use_name)
+            sql, params = build_search_query(query_parts["like"], use_name=use_name, tables=tables)
             cursor = connection.cursor()
             start = time.perf_counter()
             rows = cursor.execute(sql, params).fetchall()
@@ -4,7 +4,7 @@ from __future__ import annotations
 import io
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import List, Optional, Sequence
 
 import numpy as np
 from PIL import Image, ImageOps
@@ -89,7 +89,40 @@ class ImageEmbedder:
     def embed_image(self, image: Image.Image) -> Optional[np.ndarray]:
         try:
             prepared = self._prepare(image)
-            outputs = self._session.run(None, {self._input_name: prepared})
+        except Exception:
+            return None
+        vectors = self._run(prepared)
+        return vectors[0] if vectors else None
+
+    def embed_paths(self, paths: Sequence[Path]) -> List[Optional[np.ndarray]]:
+        """Embed several images, using one session run when the model accepts batches."""
+
+        results: List[Optional[np.ndarray]] = [None] * len(paths)
+        prepared: List[np.ndarray] = []
+        slots: List[int] = []
+        for slot, path in enumerate(paths):
+            try:
+                with Image.open(path) as img:
+                    prepared.append(self._prepare(img))
+            except Exception:
+                continue
+            slots.append(slot)
+        if not prepared:
+            return results
+        if self._batchable and len(prepared) > 1:
+            vectors = self._run(np.concatenate(prepared, axis=0))
+            if vectors is not None and len(vectors) == len(prepared):
+                for slot, vector in zip(slots, vectors):
+                    results[slot] = vector
+                return results
+        for slot, arr in zip(slots, prepared):
+            vectors = self._run(arr)
+            results[slot] = vectors[0] if vectors else None
+        return results
+
+    def _run(self, batch: np.ndarray) -> Optional[List[np.ndarray]]:
+        try:
+            outputs = self._session.run(None, {self._input_name: batch})
         except Exception as exc:
             if (
                 self._primary_provider != "CPUExecutionProvider"
@@ -104,22 +137,17 @@ class ImageEmbedder:
                     self._switch_to_cpu()
                 except LightAnalysisModelError:
                     return None
-                return self.embed_image(image)
+                return self._run(batch)
             return None
         if not outputs:
             return None
-        vector = outputs[0]
-        if isinstance(vector, list):  # pragma: no cover - defensive
-            vector = np.asarray(vector, dtype=np.float32)
-        if not isinstance(vector, np.ndarray):
-            vector = np.asarray(vector, dtype=np.float32)
-        if vector.ndim == 2 and vector.shape[0] == 1:
-            vector = vector[0]
-        vector = vector.astype(np.float32, copy=False)
-        norm = np.linalg.norm(vector)
-        if norm > 0:
-            vector = vector / norm
-        return vector
+        matrix = outputs[0]
+        if not isinstance(matrix, np.ndarray):
+            matrix = np.asarray(matrix, dtype=np.float32)
+        matrix = matrix.astype(np.float32, copy=False).reshape(batch.shape[0], -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+        return list(matrix)
 
     def _initialize_session(self, providers: Sequence[str], primary: Optional[str] = None) -> None:
         try:
@@ -141,6 +169,9 @@ class ImageEmbedder:
             )
         inputs = self._session.get_inputs()
         self._input_name = inputs[0].name
+        # Only a symbolic leading dimension accepts batches of any size.
+        batch_dim = inputs[0].shape[0] if inputs[0].shape else 1
+        self._batchable = not isinstance(batch_dim, int)
         height = self._infer_size(inputs[0].shape)
         self._size = int(height or self._config_input_size)
 
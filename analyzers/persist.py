@@ -26,6 +26,7 @@ def ensure_features_table(connection: sqlite3.Connection) -> None:
         """
     )
     cur.execute("CREATE INDEX IF NOT EXISTS idx_features_kind ON features(kind)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_features_path_nocase ON features(path COLLATE NOCASE, path)")
     connection.commit()
 
 
@@ -13,6 +13,7 @@ from typing import List, Optional, Sequence, Tuple
 import numpy as np
 from PIL import Image
 
+from core.probe_cache import ProbeCache
 from gpu.capabilities import probe_gpu
 
 LOGGER = logging.getLogger("videocatalog.semantic")
@@ -54,7 +55,7 @@ class SemanticAnalyzerConfig:
 class SemanticAnalyzer:
     """Wrapper around OpenCLIP models with optional PySceneDetect sampling."""
 
-    def __init__(self, config: SemanticAnalyzerConfig) -> None:
+    def __init__(self, config: SemanticAnalyzerConfig, *, probe_cache: Optional[ProbeCache] = None) -> None:
         if open_clip is None or torch is None:
             raise SemanticModelError(
                 "open_clip or torch is not available. Install open-clip-torch and torch."
@@ -76,6 +77,7 @@ class SemanticAnalyzer:
         self._tokenizer = tokenizer
         self._max_frames = max(1, int(config.max_video_frames))
         self._ffmpeg_path = config.ffmpeg_path
+        self._probe_cache = probe_cache
         self._scene_threshold = float(config.scene_threshold)
         self._min_scene_len = max(1.0, float(config.min_scene_len))
 
@@ -120,23 +122,51 @@ class SemanticAnalyzer:
             embeddings = self._model.encode_image(tensor)
         return self._finalize_vector(embeddings)
 
+    def encode_image_paths(self, paths: Sequence[Path]) -> List[Optional[np.ndarray]]:
+        """Encode several images in a single forward pass."""
+
+        results: List[Optional[np.ndarray]] = [None] * len(paths)
+        processed = []
+        slots: List[int] = []
+        for slot, path in enumerate(paths):
+            try:
+                with Image.open(path) as image:
+                    processed.append(self._preprocess(image))
+            except Exception:
+                continue
+            slots.append(slot)
+        for slot, vector in zip(slots, self._encode_batch(processed)):
+            results[slot] = vector
+        return results
+
+    def _encode_batch(self, processed: Sequence[object]) -> List[Optional[np.ndarray]]:
+        if not processed or torch is None:
+            return [None] * len(processed)
+        try:
+            tensor = torch.stack(list(processed), dim=0).to(self._device)
+            with torch.no_grad():
+                embeddings = self._model.encode_image(tensor)
+            normalized = torch.nn.functional.normalize(embeddings, p=2, dim=-1)
+            matrix = normalized.detach().cpu().numpy().astype(np.float32)
+        except Exception:
+            return [None] * len(processed)
+        return list(matrix)
+
     def encode_video(self, video_path: Path) -> Tuple[Optional[np.ndarray], int]:
         timestamps = self._collect_timestamps(video_path)
-        vectors: List[np.ndarray] = []
+        frames = []
         for timestamp in timestamps:
             frame_bytes = self._extract_frame(video_path, timestamp)
             if not frame_bytes:
                 continue
             try:
                 with Image.open(io.BytesIO(frame_bytes)) as image:
-                    vector = self.encode_image(image)
-            except OSError:
-                vector = None
-            if vector is None:
+                    frames.append(self._preprocess(image))
+            except Exception:
                 continue
-            vectors.append(vector)
-            if len(vectors) >= self._max_frames:
+            if len(frames) >= self._max_frames:
                 break
+        vectors = [vector for vector in self._encode_batch(frames) if vector is not None]
         if not vectors:
             return None, 0
         matrix = np.stack(vectors, axis=0)
@@ -214,6 +244,8 @@ class SemanticAnalyzer:
         suffix = ffmpeg.suffix
         probe_name = "ffprobe" + suffix
         probe_path = ffmpeg.with_name(probe_name)
+        if self._probe_cache is not None:
+            return self._probe_cache.duration(video_path, ffprobe=probe_path if probe_path.exists() else None)
         if not probe_path.exists():
             return None
         try:
@@ -16,6 +16,8 @@ try:  # pragma: no cover - optional dependency guard
 except Exception:  # pragma: no cover - optional dependency guard
     cv2 = None  # type: ignore
 
+from core.probe_cache import ProbeCache
+
 from .image_embed import ImageEmbedder
 
 
@@ -37,8 +39,10 @@ class VideoThumbnailAnalyzer:
         max_frames: int = 2,
         rate_limit_profile: Optional[str] = None,
         hwaccel_args: Optional[Sequence[str]] = None,
+        probe_cache: Optional[ProbeCache] = None,
     ) -> None:
         self._embedder = embedder
+        self._probe_cache = probe_cache
         self._ffmpeg_path = Path(ffmpeg_path) if ffmpeg_path else None
         self._prefer_ffmpeg = bool(prefer_ffmpeg and self._ffmpeg_path)
         self._max_frames = max(1, int(max_frames))
@@ -115,6 +119,8 @@ class VideoThumbnailAnalyzer:
         suffix = ffmpeg.suffix
         probe_name = "ffprobe" + suffix
         probe_path = ffmpeg.with_name(probe_name)
+        if self._probe_cache is not None:
+            return self._probe_cache.duration(video_path, ffprobe=probe_path if probe_path.exists() else None)
         if not probe_path.exists():
             return None
         try:
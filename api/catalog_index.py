@@ -0,0 +1,887 @@
+"""Materialized cross-shard index of movies and TV series in ``catalog.db``.
+
+The catalog list endpoints used to load every movie of every shard into
+Python, decode its JSON columns, then filter, sort and slice in memory on
+each request. :class:`CatalogIndex` keeps one typed row per movie and per
+series in ``catalog.db`` instead, with indexes on the supported sort keys,
+so a page is a single ``SELECT ... LIMIT`` plus a ``COUNT`` that is cached
+until the index next changes.
+
+The index follows the shards rather than the writers. Unchanged shards
+cost two ``stat`` calls per refresh: the signature of their database and
+WAL file (inode, size, mtime). A scan writes ``files`` and ``inventory``
+constantly, so a changed signature only means that the shard's
+:data:`SOURCE_TABLES`, the ones the structure, quality and visual review
+writers fill, are compared with their state at the last sync. That state
+is each table's row count, newest ``updated_utc`` and number of rows
+carrying it. Tables that did not change cost nothing more. Otherwise only
+the movies and series whose source rows were stamped since the last sync
+are re-read and upserted, and rows whose folder left the shard are
+deleted. A shard is read whole on its first sync, and again when rows
+disappear from a table other than the two profile tables.
+
+Checks run on a background thread, at most once per ``min_interval_s`` per
+shard, while pages are answered from the rows already indexed. Shards that
+disappeared lose their rows. Signatures and source states live in
+``catalog_index_state``, so an API restart does not rebuild anything.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .keyset import after_clause, order_by
+
+LOGGER = logging.getLogger("videocatalog.api.catalog_index")
+
+# Bump when the row layout changes; every shard is then re-synced once.
+INDEX_VERSION = 1
+
+_COUNT_CACHE_SIZE = 256
+
+LOW_CONFIDENCE_THRESHOLD = 0.55
+
+MOVIE_SORTS = {
+    "title": "title_key",
+    "year": "year_key",
+    "confidence": "confidence",
+    "quality": "quality_key",
+}
+SERIES_SORTS = {
+    "title": "title_key",
+    "confidence": "confidence",
+    "seasons": "seasons_found",
+}
+
+ShardRows = Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]
+
+# Shard tables the index is built from, with the timestamp column their
+# writers set on every insert and update.
+SOURCE_TABLES: Dict[str, str] = {
+    "folder_profile": "updated_utc",
+    "tv_series_profile": "updated_utc",
+    "video_quality": "updated_utc",
+    "video_thumbs": "updated_utc",
+    "contact_sheets": "updated_utc",
+}
+
+# Table -> [row count, newest stamp, rows with the newest stamp]. Lists, not
+# tuples, so a state survives a JSON round trip unchanged.
+SourceState = Dict[str, List[Any]]
+
+
+class ShardDelta(NamedTuple):
+    """Rows to re-read, and every live key, for an incremental sync.
+
+    ``live_movies`` / ``live_series`` are ``None`` when their profile table
+    did not change, so no row can have left it.
+    """
+
+    movie_folders: List[str]
+    series_roots: List[str]
+    live_movies: Optional[List[str]]
+    live_series: Optional[List[str]]
+
+
+class ShardSync(NamedTuple):
+    """What :func:`load_shard` found in one shard.
+
+    ``rows`` is ``None`` when the source tables did not change. ``delta`` is
+    ``None`` when ``rows`` hold the whole shard rather than changed rows.
+    """
+
+    state: SourceState
+    rows: Optional[ShardRows]
+    delta: Optional[ShardDelta]
+
+
+def ensure_catalog_index(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS catalog_movies(
+            id TEXT PRIMARY KEY,
+            drive_label TEXT NOT NULL,
+            folder_path TEXT NOT NULL,
+            title TEXT,
+            title_key TEXT NOT NULL,
+            search_text TEXT NOT NULL,
+            year INTEGER,
+            year_key INTEGER NOT NULL,
+            confidence REAL NOT NULL,
+            quality INTEGER,
+            quality_key INTEGER NOT NULL,
+            audio_langs_json TEXT,
+            subs_langs_json TEXT,
+            audio_key TEXT NOT NULL,
+            subs_key TEXT NOT NULL,
+            has_thumb INTEGER NOT NULL,
+            has_sheet INTEGER NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS catalog_series(
+            id TEXT PRIMARY KEY,
+            drive_label TEXT NOT NULL,
+            series_root TEXT NOT NULL,
+            title TEXT,
+            title_key TEXT NOT NULL,
+            search_text TEXT NOT NULL,
+            year INTEGER,
+            confidence REAL NOT NULL,
+            seasons_found INTEGER NOT NULL,
+            has_thumb INTEGER NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS catalog_index_state(
+            drive_label TEXT PRIMARY KEY,
+            signature TEXT NOT NULL,
+            movies INTEGER NOT NULL,
+            series INTEGER NOT NULL,
+            source_json TEXT,
+            synced_utc TEXT NOT NULL
+        )
+        """
+    )
+    for table, columns in (
+        ("catalog_movies", ("title_key", "year_key", "confidence", "quality_key", "drive_label")),
+        ("catalog_series", ("title_key", "confidence", "seasons_found", "drive_label")),
+    ):
+        for column in columns:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{column}_id ON {table}({column}, id)")
+
+
+def shard_signature(path: Path) -> Optional[str]:
+    """Return a string that changes whenever ``path`` or its WAL is written."""
+
+    parts: List[str] = [f"v{INDEX_VERSION}"]
+    for candidate in (path, Path(f"{path}-wal")):
+        try:
+            st = os.stat(candidate)
+        except FileNotFoundError:
+            if candidate == path:
+                return None
+            parts.append("-")
+            continue
+        except OSError:
+            return None
+        parts.append(f"{st.st_ino}:{st.st_size}:{st.st_mtime_ns}")
+    return "|".join(parts)
+
+
+def source_state(conn: sqlite3.Connection) -> SourceState:
+    """Return the :data:`SourceState` of the source tables present in a shard."""
+
+    state: SourceState = {}
+    for table, column in SOURCE_TABLES.items():
+        columns = {str(row[1]) for row in conn.execute(f"PRAGMA table_info({table})")}
+        if not columns:
+            continue
+        if column not in columns:
+            # Nothing to follow; any change in the row count re-reads the shard.
+            count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            state[table] = [int(count), None, 0]
+            continue
+        count, newest = conn.execute(f"SELECT COUNT(*), MAX({column}) FROM {table}").fetchone()
+        at_newest = 0
+        if newest is not None:
+            # Catches rows restamped within the second of the newest stamp.
+            at_newest = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {column} = ?", (newest,)).fetchone()[0]
+        state[table] = [int(count), newest, int(at_newest)]
+    return state
+
+
+def changed_keys(conn: sqlite3.Connection, before: SourceState, after: SourceState) -> Optional[ShardDelta]:
+    """Return the rows to re-read between two states, or ``None`` for all of them."""
+
+    # Table -> comparison and stamp selecting the rows written since ``before``.
+    since: Dict[str, Tuple[str, str]] = {}
+    for table in set(before) | set(after):
+        old, new = before.get(table), after.get(table)
+        if old == new:
+            continue
+        if new is None or new[1] is None or (old is not None and old[1] is not None and new[1] < old[1]):
+            # Untracked, dropped or rolled back (a shard restored from backup).
+            return None
+        if old is not None and new[0] < old[0] and table not in ("folder_profile", "tv_series_profile"):
+            # Removed quality rows, thumbnails or sheets leave no stamp behind.
+            return None
+        if old is None or old[1] is None:
+            since[table] = (">=", "")
+            continue
+        column = SOURCE_TABLES[table]
+        at_old = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {column} = ?", (old[1],)).fetchone()[0]
+        # Rows stamped within the second of the last sync are re-read too,
+        # unless that second gained no rows since.
+        since[table] = (">" if at_old <= old[2] else ">=", old[1])
+
+    def keys(sql: str, table: str) -> Iterator[str]:
+        op, stamp = since[table]
+        return (str(row[0]) for row in conn.execute(sql.format(op=op), (stamp,)) if row[0] is not None)
+
+    folders: set[str] = set()
+    roots: set[str] = set()
+    if "folder_profile" in since:
+        folders.update(keys("SELECT folder_path FROM folder_profile WHERE updated_utc {op} ?", "folder_profile"))
+    if "video_quality" in since and "folder_profile" in after:
+        folders.update(
+            keys(
+                """
+                SELECT fp.folder_path FROM folder_profile AS fp
+                JOIN video_quality AS q ON q.path = fp.main_video_path
+                WHERE q.updated_utc {op} ?
+                """,
+                "video_quality",
+            )
+        )
+    for table in ("video_thumbs", "contact_sheets"):
+        if table in since:
+            folders.update(
+                keys(
+                    "SELECT item_key FROM " + table + " WHERE item_type IN ('folder','movie') AND updated_utc {op} ?",
+                    table,
+                )
+            )
+    if "video_thumbs" in since:
+        roots.update(
+            keys("SELECT item_key FROM video_thumbs WHERE item_type = 'series' AND updated_utc {op} ?", "video_thumbs")
+        )
+    if "tv_series_profile" in since:
+        roots.update(keys("SELECT series_root FROM tv_series_profile WHERE updated_utc {op} ?", "tv_series_profile"))
+
+    live_movies: Optional[List[str]] = None
+    if "folder_profile" in since:
+        live_movies = [
+            str(row[0])
+            for row in conn.execute(
+                "SELECT folder_path FROM folder_profile WHERE COALESCE(LOWER(kind),'') IN ('', 'movie')"
+            )
+        ]
+    live_series: Optional[List[str]] = None
+    if "tv_series_profile" in since:
+        live_series = [str(row[0]) for row in conn.execute("SELECT series_root FROM tv_series_profile")]
+    return ShardDelta(sorted(folders), sorted(roots), live_movies, live_series)
+
+
+def load_shard(
+    conn: sqlite3.Connection,
+    since: Optional[SourceState],
+    *,
+    movies: Callable[[Optional[List[str]]], List[Dict[str, Any]]],
+    series: Callable[[Optional[List[str]]], List[Dict[str, Any]]],
+) -> ShardSync:
+    """Read what changed in a shard since ``since`` (``None``: everything).
+
+    ``movies(keys)`` and ``series(keys)`` return the dicts of the given
+    folders / series roots, or of the whole shard for ``None``.
+    """
+
+    state = source_state(conn)
+    if since is not None and state == since:
+        return ShardSync(state, None, None)
+    delta = changed_keys(conn, since, state) if since is not None else None
+    if delta is None:
+        return ShardSync(state, (movies(None), series(None)), None)
+    return ShardSync(
+        state,
+        (
+            movies(delta.movie_folders) if delta.movie_folders else [],
+            series(delta.series_roots) if delta.series_roots else [],
+        ),
+        delta,
+    )
+
+
+def _lang_key(langs: Iterable[str]) -> str:
+    cleaned = sorted({str(lang).strip().lower() for lang in langs if str(lang).strip()})
+    return "," + ",".join(cleaned) + "," if cleaned else ""
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _movie_row(movie: Dict[str, Any]) -> Tuple[Any, ...]:
+    title = str(movie.get("title") or "")
+    folder_path = str(movie.get("folder_path") or "")
+    year = _int_or_none(movie.get("year"))
+    quality = _int_or_none(movie.get("quality_score"))
+    audio = list(movie.get("audio_langs") or [])
+    subs = list(movie.get("subs_langs") or [])
+    return (
+        movie["id"],
+        movie.get("drive"),
+        folder_path,
+        movie.get("title"),
+        title.casefold(),
+        f"{title} {folder_path}".lower(),
+        year,
+        year or 0,
+        float(movie.get("confidence") or 0.0),
+        quality,
+        quality or -1,
+        json.dumps(audio) if audio else None,
+        json.dumps(subs) if subs else None,
+        _lang_key(audio),
+        _lang_key(subs),
+        int(bool(movie.get("has_thumb"))),
+        int(bool(movie.get("has_sheet"))),
+    )
+
+
+def _series_row(series: Dict[str, Any]) -> Tuple[Any, ...]:
+    title = str(series.get("title") or "")
+    series_root = str(series.get("series_root") or "")
+    return (
+        series["id"],
+        series.get("drive"),
+        series_root,
+        series.get("title"),
+        title.casefold(),
+        f"{title} {series_root}".lower(),
+        _int_or_none(series.get("year")),
+        float(series.get("confidence") or 0.0),
+        _int_or_none(series.get("seasons_found")) or 0,
+        int(bool(series.get("has_thumb"))),
+    )
+
+
+def _load_langs(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        return []
+    return [str(item) for item in parsed] if isinstance(parsed, list) else []
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    # core.db.connect opens connections in autocommit mode, so ``with conn``
+    # alone would commit every row separately.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def _sort_keys(sorts: Dict[str, str], sort: str, order: str) -> List[Tuple[str, bool]]:
+    column = sorts.get(str(sort or "title").lower(), "title_key")
+    descending = str(order or "asc").lower() == "desc"
+    # ``id`` breaks ties in the same direction so one (column, id) index
+    # serves both orders.
+    return [(column, descending), ("id", descending)]
+
+
+class CatalogIndex:
+    """Keep ``catalog_movies``/``catalog_series`` in step with the shards.
+
+    ``open_writer`` returns a writable connection to ``catalog.db``; it is
+    only opened when a shard changed. ``load(label, path, since)`` returns
+    the :class:`ShardSync` of one shard relative to the source state
+    ``since`` (``None`` to read it whole), or ``None`` when it cannot be read.
+
+    A shard's WAL changes constantly while it is being scanned, so a shard
+    that is already indexed is re-synced at most once per ``min_interval_s``
+    and on a background thread; pages keep serving its previous rows in the
+    meantime. Only shards that were never indexed, and shards that went
+    away, are handled before the page is answered.
+    """
+
+    def __init__(
+        self,
+        open_writer: Callable[[], sqlite3.Connection],
+        *,
+        min_interval_s: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._open_writer = open_writer
+        self.min_interval_s = max(0.0, float(min_interval_s))
+        self._clock = clock
+        # Guards signatures, counts and stats; never held across shard reads.
+        self._lock = threading.Lock()
+        # Serializes syncs, which read shards and write catalog.db.
+        self._sync_lock = threading.Lock()
+        self._signatures: Optional[Dict[str, str]] = None
+        # Source state per shard at its last sync; absent means read it whole.
+        self._sources: Dict[str, SourceState] = {}
+        # Clock reading of the last sync attempt per shard.
+        self._synced_at: Dict[str, float] = {}
+        self._worker: Optional[threading.Thread] = None
+        # Bumped on every change to the index; cached counts from an older
+        # generation are recomputed.
+        self._generation = 0
+        self._counts: "OrderedDict[Tuple[str, str, Tuple[Any, ...]], Tuple[int, int]]" = OrderedDict()
+        self.stats: Dict[str, int] = {
+            "refreshes": 0,
+            "shards_synced": 0,
+            "shards_unchanged": 0,
+            "shards_removed": 0,
+            "rows_upserted": 0,
+            "background_syncs": 0,
+        }
+
+    def refresh(
+        self,
+        shards: Iterable[Tuple[str, Path]],
+        load: Callable[[str, Path, Optional[SourceState]], Optional[ShardSync]],
+    ) -> Dict[str, int]:
+        """Bring the index up to date with ``shards``; returns counts.
+
+        New and vanished shards are synced before returning. Changed shards
+        that are already indexed are handed to a background sync.
+        """
+
+        current: Dict[str, Tuple[Path, Optional[str]]] = {}
+        for label, path in shards:
+            current.setdefault(label, (path, shard_signature(path)))
+        with self._lock:
+            self.stats["refreshes"] += 1
+            known = dict(self._signatures) if self._signatures is not None else None
+            busy = self._worker is not None and self._worker.is_alive()
+        if known is not None and all(label in current for label in known):
+            if all(label in known or signature is None for label, (_path, signature) in current.items()):
+                if not busy and self._due(current, known):
+                    self._start_background(current, load)
+                return {"shards": len(current), "synced": 0, "removed": 0}
+        return self._sync(current, load)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a running background sync; ``False`` if it is still running."""
+
+        with self._lock:
+            worker = self._worker
+        if worker is None:
+            return True
+        worker.join(timeout)
+        return not worker.is_alive()
+
+    def invalidate(self) -> None:
+        """Forget cached signatures so the next refresh re-reads the state table."""
+
+        with self._lock:
+            self._signatures = None
+
+    def _due(self, current: Dict[str, Tuple[Path, Optional[str]]], known: Dict[str, str]) -> bool:
+        now = self._clock()
+        for label, (_path, signature) in current.items():
+            if signature is None or known.get(label) == signature:
+                continue
+            if label not in known or now - self._synced_at.get(label, float("-inf")) >= self.min_interval_s:
+                return True
+        return False
+
+    def _start_background(
+        self,
+        current: Dict[str, Tuple[Path, Optional[str]]],
+        load: Callable[[str, Path, Optional[SourceState]], Optional[ShardSync]],
+    ) -> None:
+        def run() -> None:
+            try:
+                self._sync(current, load)
+            except sqlite3.Error as exc:
+                LOGGER.warning("Background catalog index sync failed: %s", exc)
+                self.invalidate()
+
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self.stats["background_syncs"] += 1
+            self._worker = threading.Thread(target=run, name="catalog-index-sync", daemon=True)
+            self._worker.start()
+
+    def _sync(
+        self,
+        current: Dict[str, Tuple[Path, Optional[str]]],
+        load: Callable[[str, Path, Optional[SourceState]], Optional[ShardSync]],
+    ) -> Dict[str, int]:
+        with self._sync_lock:
+            writer: Optional[sqlite3.Connection] = None
+            synced = unchanged = removed = upserted = 0
+            try:
+                if self._signatures is None:
+                    writer = self._open_writer()
+                    ensure_catalog_index(writer)
+                    writer.commit()
+                    signatures: Dict[str, str] = {}
+                    self._sources = {}
+                    prefix = f"v{INDEX_VERSION}|"
+                    for label, signature, source_json in writer.execute(
+                        "SELECT drive_label, signature, source_json FROM catalog_index_state"
+                    ):
+                        signatures[str(label)] = str(signature)
+                        if source_json and str(signature).startswith(prefix):
+                            self._sources[str(label)] = json.loads(source_json)
+                    with self._lock:
+                        self._signatures = signatures
+                known = self._signatures
+                for label, (path, signature) in current.items():
+                    if signature is None or known.get(label) == signature:
+                        continue
+                    now = self._clock()
+                    if label in known and now - self._synced_at.get(label, float("-inf")) < self.min_interval_s:
+                        continue
+                    self._synced_at[label] = now
+                    result = load(label, path, self._sources.get(label))
+                    if result is None:
+                        continue
+                    if writer is None:
+                        writer = self._open_writer()
+                    if result.rows is None:
+                        self._update_state(writer, label, signature, result.state)
+                        unchanged += 1
+                    else:
+                        if result.delta is None:
+                            self._replace_shard(writer, label, signature, result.state, result.rows)
+                        else:
+                            self._apply_delta(writer, label, signature, result.state, result.rows, result.delta)
+                        upserted += len(result.rows[0]) + len(result.rows[1])
+                        synced += 1
+                    self._sources[label] = result.state
+                    with self._lock:
+                        known[label] = signature
+                        if result.rows is not None:
+                            self._generation += 1
+                for label in [label for label in known if label not in current]:
+                    if writer is None:
+                        writer = self._open_writer()
+                    self._drop_shard(writer, label)
+                    with self._lock:
+                        known.pop(label, None)
+                        self._generation += 1
+                    self._synced_at.pop(label, None)
+                    self._sources.pop(label, None)
+                    removed += 1
+            finally:
+                if writer is not None:
+                    writer.close()
+            with self._lock:
+                self.stats["shards_synced"] += synced
+                self.stats["shards_unchanged"] += unchanged
+                self.stats["shards_removed"] += removed
+                self.stats["rows_upserted"] += upserted
+            return {"shards": len(current), "synced": synced, "removed": removed}
+
+    @staticmethod
+    def _upsert_rows(writer: sqlite3.Connection, rows: ShardRows) -> None:
+        movies, series = rows
+        writer.executemany(
+            "INSERT OR REPLACE INTO catalog_movies VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+            (_movie_row(movie) for movie in movies),
+        )
+        writer.executemany(
+            "INSERT OR REPLACE INTO catalog_series VALUES(?,?,?,?,?,?,?,?,?,?)",
+            (_series_row(item) for item in series),
+        )
+
+    @staticmethod
+    def _write_state(
+        writer: sqlite3.Connection,
+        label: str,
+        signature: str,
+        state: SourceState,
+        counts: Tuple[int, int],
+    ) -> None:
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        writer.execute(
+            """
+            INSERT OR REPLACE INTO catalog_index_state(drive_label, signature, movies, series, source_json, synced_utc)
+            VALUES(?,?,?,?,?,?)
+            """,
+            (label, signature, counts[0], counts[1], json.dumps(state, sort_keys=True), now),
+        )
+
+    def _replace_shard(
+        self,
+        writer: sqlite3.Connection,
+        label: str,
+        signature: str,
+        state: SourceState,
+        rows: ShardRows,
+    ) -> None:
+        with _transaction(writer):
+            writer.execute("DELETE FROM catalog_movies WHERE drive_label = ?", (label,))
+            writer.execute("DELETE FROM catalog_series WHERE drive_label = ?", (label,))
+            self._upsert_rows(writer, rows)
+            self._write_state(writer, label, signature, state, (len(rows[0]), len(rows[1])))
+
+    def _apply_delta(
+        self,
+        writer: sqlite3.Connection,
+        label: str,
+        signature: str,
+        state: SourceState,
+        rows: ShardRows,
+        delta: ShardDelta,
+    ) -> None:
+        with _transaction(writer):
+            for table, column, live in (
+                ("catalog_movies", "folder_path", delta.live_movies),
+                ("catalog_series", "series_root", delta.live_series),
+            ):
+                if live is not None:
+                    writer.execute(
+                        f"""
+                        DELETE FROM {table}
+                        WHERE drive_label = ? AND {column} NOT IN (SELECT value FROM json_each(?))
+                        """,
+                        (label, json.dumps(live)),
+                    )
+            self._upsert_rows(writer, rows)
+            counts = tuple(
+                int(writer.execute(f"SELECT COUNT(*) FROM {table} WHERE drive_label = ?", (label,)).fetchone()[0])
+                for table in ("catalog_movies", "catalog_series")
+            )
+            self._write_state(writer, label, signature, state, (counts[0], counts[1]))
+
+    @staticmethod
+    def _update_state(writer: sqlite3.Connection, label: str, signature: str, state: SourceState) -> None:
+        with _transaction(writer):
+            writer.execute(
+                "UPDATE catalog_index_state SET signature = ?, source_json = ? WHERE drive_label = ?",
+                (signature, json.dumps(state, sort_keys=True), label),
+            )
+
+    @staticmethod
+    def _drop_shard(writer: sqlite3.Connection, label: str) -> None:
+        with _transaction(writer):
+            writer.execute("DELETE FROM catalog_movies WHERE drive_label = ?", (label,))
+            writer.execute("DELETE FROM catalog_series WHERE drive_label = ?", (label,))
+            writer.execute("DELETE FROM catalog_index_state WHERE drive_label = ?", (label,))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def movies_page(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        query: Optional[str] = None,
+        year_min: Optional[int] = None,
+        year_max: Optional[int] = None,
+        confidence_min: Optional[float] = None,
+        quality_min: Optional[int] = None,
+        audio_langs: Sequence[str] = (),
+        subs_langs: Sequence[str] = (),
+        drive: Optional[str] = None,
+        only_low_confidence: bool = False,
+        sort: str = "title",
+        order: str = "asc",
+        limit: int,
+        offset: int = 0,
+        after: Optional[Sequence[Any]] = None,
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[List[Any]]]:
+        """Return ``(rows, total, next_key)`` for one page of movies.
+
+        Rows have the shape of the shard loader's dicts. ``next_key`` is the
+        sort key of the last row when more rows follow; pass it back as
+        ``after`` to seek to the next page instead of using ``offset``.
+        """
+
+        clauses: List[str] = []
+        params: List[Any] = []
+        if drive:
+            clauses.append("drive_label = ?")
+            params.append(drive)
+        if query:
+            clauses.append("instr(search_text, ?) > 0")
+            params.append(query.lower())
+        if year_min is not None:
+            clauses.append("(year_key = 0 OR year_key >= ?)")
+            params.append(int(year_min))
+        if year_max is not None:
+            clauses.append("(year_key = 0 OR year_key <= ?)")
+            params.append(int(year_max))
+        if confidence_min is not None:
+            clauses.append("confidence >= ?")
+            params.append(float(confidence_min))
+        if only_low_confidence:
+            clauses.append("confidence < ?")
+            params.append(LOW_CONFIDENCE_THRESHOLD)
+        if quality_min is not None:
+            clauses.append("(quality IS NULL OR quality >= ?)")
+            params.append(int(quality_min))
+        for column, langs in (("audio_key", audio_langs), ("subs_key", subs_langs)):
+            for lang in langs:
+                clauses.append(f"instr({column}, ?) > 0")
+                params.append(f",{lang.lower()},")
+        fetched, total, next_key = self._page(
+            conn,
+            "catalog_movies",
+            """
+            id, drive_label, folder_path, title, year, confidence, quality,
+            audio_langs_json, subs_langs_json, has_thumb, has_sheet
+            """,
+            clauses,
+            params,
+            _sort_keys(MOVIE_SORTS, sort, order),
+            limit=limit,
+            offset=offset,
+            after=after,
+        )
+        rows = [
+            {
+                "id": row[0],
+                "drive": row[1],
+                "folder_path": row[2],
+                "title": row[3],
+                "year": row[4],
+                "confidence": row[5],
+                "quality_score": row[6],
+                "audio_langs": _load_langs(row[7]),
+                "subs_langs": _load_langs(row[8]),
+                "has_thumb": bool(row[9]),
+                "has_sheet": bool(row[10]),
+            }
+            for row in fetched
+        ]
+        return rows, total, next_key
+
+    def series_page(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        query: Optional[str] = None,
+        confidence_min: Optional[float] = None,
+        drive: Optional[str] = None,
+        only_low_confidence: bool = False,
+        sort: str = "title",
+        order: str = "asc",
+        limit: int,
+        offset: int = 0,
+        after: Optional[Sequence[Any]] = None,
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[List[Any]]]:
+        """Return ``(rows, total, next_key)`` for one page of series."""
+
+        clauses: List[str] = []
+        params: List[Any] = []
+        if drive:
+            clauses.append("drive_label = ?")
+            params.append(drive)
+        if query:
+            clauses.append("instr(search_text, ?) > 0")
+            params.append(query.lower())
+        if confidence_min is not None:
+            clauses.append("confidence >= ?")
+            params.append(float(confidence_min))
+        if only_low_confidence:
+            clauses.append("confidence < ?")
+            params.append(LOW_CONFIDENCE_THRESHOLD)
+        fetched, total, next_key = self._page(
+            conn,
+            "catalog_series",
+            "id, drive_label, series_root, title, year, confidence, seasons_found, has_thumb",
+            clauses,
+            params,
+            _sort_keys(SERIES_SORTS, sort, order),
+            limit=limit,
+            offset=offset,
+            after=after,
+        )
+        rows = [
+            {
+                "id": row[0],
+                "drive": row[1],
+                "series_root": row[2],
+                "title": row[3],
+                "year": row[4],
+                "confidence": row[5],
+                "seasons_found": row[6],
+                "has_thumb": bool(row[7]),
+            }
+            for row in fetched
+        ]
+        return rows, total, next_key
+
+    def _page(
+        self,
+        conn: sqlite3.Connection,
+        table: str,
+        columns: str,
+        clauses: List[str],
+        params: List[Any],
+        keys: List[Tuple[str, bool]],
+        *,
+        limit: int,
+        offset: int,
+        after: Optional[Sequence[Any]],
+    ) -> Tuple[List[Any], int, Optional[List[Any]]]:
+        total = self._count(conn, table, clauses, params)
+        page_clauses = list(clauses)
+        page_params = list(params)
+        if after is not None:
+            clause, extra = after_clause(keys, after)
+            page_clauses.append(clause)
+            page_params.extend(extra)
+            offset = 0
+        where = f"WHERE {' AND '.join(page_clauses)}" if page_clauses else ""
+        width = len(columns.split(","))
+        cursor = conn.execute(
+            f"""
+            SELECT {columns}, {", ".join(expr for expr, _ in keys)}
+            FROM {table} {where}
+            {order_by(keys)}
+            LIMIT ? OFFSET ?
+            """,
+            [*page_params, int(limit) + 1, int(offset)],
+        )
+        fetched = cursor.fetchall()
+        next_key: Optional[List[Any]] = None
+        if len(fetched) > limit:
+            fetched = fetched[:limit]
+            last = fetched[-1]
+            next_key = [last[width + idx] for idx in range(len(keys))]
+        return fetched, total, next_key
+
+    def _count(self, conn: sqlite3.Connection, table: str, clauses: List[str], params: List[Any]) -> int:
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        cache_key = (table, where, tuple(params))
+        with self._lock:
+            cached = self._counts.get(cache_key)
+            if cached is not None and cached[0] == self._generation:
+                self._counts.move_to_end(cache_key)
+                return cached[1]
+            generation = self._generation
+        total = int(conn.execute(f"SELECT COUNT(*) FROM {table} {where}", params).fetchone()[0])
+        with self._lock:
+            self._counts[cache_key] = (generation, total)
+            while len(self._counts) > _COUNT_CACHE_SIZE:
+                self._counts.popitem(last=False)
+        return total
+
+__all__ = [
+    "CatalogIndex",
+    "INDEX_VERSION",
+    "SOURCE_TABLES",
+    "ShardDelta",
+    "ShardSync",
+    "changed_keys",
+    "ensure_catalog_index",
+    "load_shard",
+    "shard_signature",
+    "source_state",
+]
@@ -8,14 +8,16 @@ import os
 import random
 import sqlite3
 import logging
-from collections import defaultdict
+import threading
+from collections import OrderedDict, defaultdict
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 import reports_util
+import timings
 
 from core.db import connect
 from core.paths import (
@@ -25,6 +27,7 @@ from core.paths import (
     resolve_working_dir,
     safe_label,
 )
+from core.search_index import match_clause
 from core.settings import load_settings
 from semantic import (
     SemanticConfig,
@@ -35,13 +38,42 @@ from semantic import (
 )
 from semantic.db import semantic_connection
 
+from .catalog_index import CatalogIndex, ShardSync, SourceState, load_shard, shard_signature
+from .fanout import FanoutConfig, FanoutResult, ShardFanout, merge_top_k
+from .keyset import after_clause, cursor_scope, decode_cursor, encode_cursor, order_by
+from .pool import ConnectionPool, PoolConfig
+
 LOGGER = logging.getLogger("videocatalog.api.db")
 
 _DEFAULT_LIMIT = 100
 _MAX_PAGE_SIZE = 500
 _COUNT_GUARD = 10000
+_COUNT_CACHE_SIZE = 512
+# Sort keys for path-ordered shard listings; ``path`` breaks NOCASE ties.
+_PATH_KEYS = [("path COLLATE NOCASE", False), ("path", False)]
 
 _LOW_CONFIDENCE_THRESHOLD = 0.55
+# Minimum seconds between catalog index re-syncs of one changed shard.
+_CATALOG_REFRESH_S = 10.0
+
+
+def _catalog_refresh_interval(api_settings: Dict[str, Any]) -> float:
+    try:
+        return max(0.0, float(api_settings.get("catalog_index_refresh_s", _CATALOG_REFRESH_S)))
+    except (TypeError, ValueError):
+        return _CATALOG_REFRESH_S
+
+
+def _confidence_key(item: Dict[str, Any]) -> float:
+    return item.get("confidence", 0.0)
+
+
+def _playlist_rank(row: Dict[str, Any]) -> Tuple[float, float, int]:
+    return (
+        float(row.get("quality") or 0.0),
+        float(row.get("confidence") or 0.0),
+        -(row.get("duration_min") or 0),
+    )
 
 
 def _load_json_list(value: Any) -> List[str]:
@@ -150,6 +182,10 @@ class Pagination:
 
     limit: int
     offset: int
+    cursor: Optional[str] = None
+    next_cursor: Optional[str] = None
+    # Drives left out because their shard timed out or could not be opened.
+    skipped_drives: List[str] = field(default_factory=list)
 
 
 class DataAccess:
@@ -176,6 +212,21 @@ class DataAccess:
             max_page = _MAX_PAGE_SIZE
         self.default_limit = min(default_limit, max_page)
         self.max_page_size = max_page
+        self._pool = ConnectionPool(
+            self._connect, PoolConfig.from_settings(api_settings.get("connection_pool"))
+        )
+        self._fanout = ShardFanout(FanoutConfig.from_settings(api_settings.get("shard_fanout")))
+        self._catalog_index: Optional[CatalogIndex] = (
+            CatalogIndex(
+                self._open_catalog_writer,
+                min_interval_s=_catalog_refresh_interval(api_settings),
+            )
+            if api_settings.get("catalog_index", True)
+            else None
+        )
+        # (drive, table, filter) -> (shard signature, count); see _estimate_total.
+        self._count_cache: "OrderedDict[Tuple[Any, ...], Tuple[Optional[str], Optional[int]]]" = OrderedDict()
+        self._count_lock = threading.Lock()
 
     @property
     def settings_payload(self) -> Dict[str, Any]:
@@ -197,6 +248,27 @@ class DataAccess:
             max_page = _MAX_PAGE_SIZE
         self.default_limit = min(default_limit, max_page)
         self.max_page_size = max_page
+        if bool(api_settings.get("catalog_index", True)) != (self._catalog_index is not None):
+            self._catalog_index = (
+                CatalogIndex(
+                    self._open_catalog_writer,
+                    min_interval_s=_catalog_refresh_interval(api_settings),
+                )
+                if api_settings.get("catalog_index", True)
+                else None
+            )
+        elif self._catalog_index is not None:
+            self._catalog_index.min_interval_s = _catalog_refresh_interval(api_settings)
+        pool_config = PoolConfig.from_settings(api_settings.get("connection_pool"))
+        if pool_config != self._pool.config:
+            previous = self._pool
+            self._pool = ConnectionPool(self._connect, pool_config)
+            previous.close()
+        fanout_config = FanoutConfig.from_settings(api_settings.get("shard_fanout"))
+        if fanout_config != self._fanout.config:
+            previous_fanout = self._fanout
+            self._fanout = ShardFanout(fanout_config)
+            previous_fanout.close()
 
     # ------------------------------------------------------------------
     # Catalog helpers
@@ -378,15 +450,35 @@ class DataAccess:
         except FileNotFoundError:
             return
 
-    @staticmethod
-    def _table_names(conn: sqlite3.Connection) -> set[str]:
-        try:
-            cursor = conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table'"
+    def _fan_out(
+        self,
+        task: Callable[[sqlite3.Connection, str], Any],
+        *,
+        drive: Optional[str] = None,
+    ) -> FanoutResult:
+        """Run ``task(conn, drive_label)`` on every shard (or only ``drive``) in parallel."""
+
+        shards = [
+            (label, path)
+            for label, path in self._iter_shards_with_labels()
+            if not drive or label == drive
+        ]
+        result = self._fanout.run(
+            shards,
+            lambda label, conn: task(conn, label),
+            acquire=self._pool.acquire,
+            release=self._pool.release,
+        )
+        if result.timed_out:
+            LOGGER.warning(
+                "Shard queries exceeded the %.1fs budget, returning partial results without: %s",
+                self._fanout.config.shard_budget_s,
+                ", ".join(result.timed_out),
             )
-        except sqlite3.DatabaseError:
-            return set()
-        return {str(row[0]) for row in cursor.fetchall() if row[0]}
+        return result
+
+    def _table_names(self, conn: sqlite3.Connection) -> frozenset[str]:
+        return self._pool.table_names(conn)
 
     @staticmethod
     def _encode_media_token(
@@ -453,11 +545,19 @@ class DataAccess:
     # ------------------------------------------------------------------
 
     def _movies_from_shard(
-        self, conn: sqlite3.Connection, drive_label: str
+        self,
+        conn: sqlite3.Connection,
+        drive_label: str,
+        folder_paths: Optional[Sequence[str]] = None,
     ) -> List[Dict[str, Any]]:
         tables = self._table_names(conn)
         if "folder_profile" not in tables:
             return []
+        key_filter = ""
+        key_params: Tuple[Any, ...] = ()
+        if folder_paths is not None:
+            key_filter = " AND item_key IN (SELECT value FROM json_each(?))"
+            key_params = (json.dumps(list(folder_paths)),)
         joins = []
         columns = [
             "fp.folder_path",
@@ -475,7 +575,8 @@ class DataAccess:
         if "video_thumbs" in tables:
             try:
                 cursor = conn.execute(
-                    "SELECT item_key FROM video_thumbs WHERE item_type IN ('folder','movie')"
+                    "SELECT item_key FROM video_thumbs WHERE item_type IN ('folder','movie')" + key_filter,
+                    key_params,
                 )
                 thumb_keys = {str(row[0]) for row in cursor.fetchall() if row[0]}
             except sqlite3.DatabaseError:
@@ -483,7 +584,8 @@ class DataAccess:
         if "contact_sheets" in tables:
             try:
                 cursor = conn.execute(
-                    "SELECT item_key FROM contact_sheets WHERE item_type IN ('folder','movie')"
+                    "SELECT item_key FROM contact_sheets WHERE item_type IN ('folder','movie')" + key_filter,
+                    key_params,
                 )
                 sheet_keys = {str(row[0]) for row in cursor.fetchall() if row[0]}
             except sqlite3.DatabaseError:
@@ -529,8 +631,10 @@ class DataAccess:
             + " ".join(joins)
             + " WHERE COALESCE(LOWER(fp.kind),'') IN ('', 'movie')"
         )
+        if folder_paths is not None:
+            sql += " AND fp.folder_path IN (SELECT value FROM json_each(?))"
         try:
-            cursor = conn.execute(sql)
+            cursor = conn.execute(sql, key_params)
         except sqlite3.DatabaseError:
             return []
         results: List[Dict[str, Any]] = []
@@ -595,23 +699,49 @@ class DataAccess:
         order: str = "asc",
         limit: Optional[int] = None,
         offset: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> Tuple[List[Dict[str, Any]], Pagination, Optional[int], Optional[int]]:
-        pagination = self.resolve_pagination(limit, offset)
+        pagination = self.resolve_pagination(limit, offset, cursor)
         items: List[Dict[str, Any]] = []
         requested_drive = drive.strip() if isinstance(drive, str) and drive.strip() else None
         audio_filters = [lang.lower() for lang in audio_langs or [] if lang]
         subs_filters = [lang.lower() for lang in subs_langs or [] if lang]
-        for label, shard_path in self._iter_shards_with_labels():
-            if requested_drive and label != requested_drive:
-                continue
-            try:
-                conn = self._connect(shard_path)
-            except Exception:
-                continue
+        scope = cursor_scope(
+            "movies", query, year_min, year_max, confidence_min, quality_min,
+            audio_filters, subs_filters, requested_drive, only_low_confidence, sort, order,
+        )
+        after = self._resolve_cursor(pagination, scope)
+        index = self._catalog_index
+        if index is not None and self._refresh_catalog_index():
             try:
-                shard_movies = self._movies_from_shard(conn, label)
-            finally:
-                conn.close()
+                with self._catalog() as conn:
+                    page_rows, total, next_key = index.movies_page(
+                        conn,
+                        query=query,
+                        year_min=year_min,
+                        year_max=year_max,
+                        confidence_min=confidence_min,
+                        quality_min=quality_min,
+                        audio_langs=audio_filters,
+                        subs_langs=subs_filters,
+                        drive=requested_drive,
+                        only_low_confidence=only_low_confidence,
+                        sort=sort,
+                        order=order,
+                        limit=pagination.limit,
+                        offset=pagination.offset,
+                        after=after,
+                    )
+            except sqlite3.DatabaseError as exc:
+                LOGGER.warning("Catalog index query failed, scanning shards: %s", exc)
+            else:
+                next_offset = self._finish_keyset_page(pagination, scope, after, next_key)
+                return [self._movie_summary(row) for row in page_rows], pagination, next_offset, total
+        if after is not None:
+            raise ValueError("cursor is no longer valid; restart from the first page")
+        fanout = self._fan_out(self._movies_from_shard, drive=requested_drive)
+        pagination.skipped_drives = fanout.skipped
+        for _label, shard_movies in fanout.results:
             items.extend(shard_movies)
 
         if not items:
@@ -682,36 +812,37 @@ class DataAccess:
         end = start + pagination.limit
         page_rows = filtered[start:end]
         next_offset = start + pagination.limit if end < total else None
+        if next_offset is not None:
+            pagination.next_cursor = encode_cursor(scope, offset=next_offset)
 
-        results: List[Dict[str, Any]] = []
-        for row in page_rows:
-            thumb_token = (
-                self._encode_media_token(row["drive"], "folder", row["folder_path"], variant="thumb")
-                if row.get("has_thumb")
-                else None
-            )
-            sheet_token = (
-                self._encode_media_token(row["drive"], "folder", row["folder_path"], variant="sheet")
-                if row.get("has_sheet")
-                else None
-            )
-            results.append(
-                {
-                    "id": row["id"],
-                    "path": row["folder_path"],
-                    "title": row.get("title"),
-                    "year": row.get("year"),
-                    "poster_thumb": thumb_token,
-                    "contact_sheet": sheet_token,
-                    "confidence": float(row.get("confidence") or 0.0),
-                    "quality": row.get("quality_score"),
-                    "langs_audio": row.get("audio_langs") or [],
-                    "langs_subs": row.get("subs_langs") or [],
-                    "drive": row.get("drive"),
-                }
-            )
+        results = [self._movie_summary(row) for row in page_rows]
         return results, pagination, next_offset, total
 
+    def _movie_summary(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        thumb_token = (
+            self._encode_media_token(row["drive"], "folder", row["folder_path"], variant="thumb")
+            if row.get("has_thumb")
+            else None
+        )
+        sheet_token = (
+            self._encode_media_token(row["drive"], "folder", row["folder_path"], variant="sheet")
+            if row.get("has_sheet")
+            else None
+        )
+        return {
+            "id": row["id"],
+            "path": row["folder_path"],
+            "title": row.get("title"),
+            "year": row.get("year"),
+            "poster_thumb": thumb_token,
+            "contact_sheet": sheet_token,
+            "confidence": float(row.get("confidence") or 0.0),
+            "quality": row.get("quality_score"),
+            "langs_audio": row.get("audio_langs") or [],
+            "langs_subs": row.get("subs_langs") or [],
+            "drive": row.get("drive"),
+        }
+
     def catalog_fetch_media_blob(self, token: str) -> Optional[Tuple[bytes, str]]:
         payload = self._decode_media_token(token)
         if not payload:
@@ -747,16 +878,24 @@ class DataAccess:
         return blob, mime
 
     def _tv_series_from_shard(
-        self, conn: sqlite3.Connection, drive_label: str
+        self,
+        conn: sqlite3.Connection,
+        drive_label: str,
+        series_roots: Optional[Sequence[str]] = None,
     ) -> List[Dict[str, Any]]:
         tables = self._table_names(conn)
         if "tv_series_profile" not in tables:
             return []
+        key_params: Tuple[Any, ...] = ()
+        if series_roots is not None:
+            key_params = (json.dumps(list(series_roots)),)
         thumbs: set[str] = set()
         if "video_thumbs" in tables:
             try:
                 rows = conn.execute(
                     "SELECT item_key FROM video_thumbs WHERE item_type='series'"
+                    + (" AND item_key IN (SELECT value FROM json_each(?))" if key_params else ""),
+                    key_params,
                 ).fetchall()
                 thumbs = {str(row[0]) for row in rows if row[0]}
             except sqlite3.DatabaseError:
@@ -768,6 +907,8 @@ class DataAccess:
                        assets_json, issues_json, seasons_found, updated_utc
                 FROM tv_series_profile
                 """
+                + ("WHERE series_root IN (SELECT value FROM json_each(?))" if key_params else ""),
+                key_params,
             )
         except sqlite3.DatabaseError:
             return []
@@ -946,21 +1087,40 @@ class DataAccess:
         order: str = "asc",
         limit: Optional[int] = None,
         offset: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> Tuple[List[Dict[str, Any]], Pagination, Optional[int], Optional[int]]:
-        pagination = self.resolve_pagination(limit, offset)
+        pagination = self.resolve_pagination(limit, offset, cursor)
         requested_drive = drive.strip() if isinstance(drive, str) and drive.strip() else None
         items: List[Dict[str, Any]] = []
-        for label, shard_path in self._iter_shards_with_labels():
-            if requested_drive and label != requested_drive:
-                continue
-            try:
-                conn = self._connect(shard_path)
-            except Exception:
-                continue
+        scope = cursor_scope("series", query, confidence_min, requested_drive, only_low_confidence, sort, order)
+        after = self._resolve_cursor(pagination, scope)
+        index = self._catalog_index
+        if index is not None and self._refresh_catalog_index():
             try:
-                items.extend(self._tv_series_from_shard(conn, label))
-            finally:
-                conn.close()
+                with self._catalog() as conn:
+                    page_rows, total, next_key = index.series_page(
+                        conn,
+                        query=query,
+                        confidence_min=confidence_min,
+                        drive=requested_drive,
+                        only_low_confidence=only_low_confidence,
+                        sort=sort,
+                        order=order,
+                        limit=pagination.limit,
+                        offset=pagination.offset,
+                        after=after,
+                    )
+            except sqlite3.DatabaseError as exc:
+                LOGGER.warning("Catalog index query failed, scanning shards: %s", exc)
+            else:
+                next_offset = self._finish_keyset_page(pagination, scope, after, next_key)
+                return [self._series_summary(row) for row in page_rows], pagination, next_offset, total
+        if after is not None:
+            raise ValueError("cursor is no longer valid; restart from the first page")
+        fanout = self._fan_out(self._tv_series_from_shard, drive=requested_drive)
+        pagination.skipped_drives = fanout.skipped
+        for _label, shard_series in fanout.results:
+            items.extend(shard_series)
 
         if not items:
             return [], pagination, None, 0
@@ -1000,28 +1160,29 @@ class DataAccess:
         end = start + pagination.limit
         page_rows = filtered[start:end]
         next_offset = start + pagination.limit if end < total else None
+        if next_offset is not None:
+            pagination.next_cursor = encode_cursor(scope, offset=next_offset)
 
-        results: List[Dict[str, Any]] = []
-        for row in page_rows:
-            thumb_token = (
-                self._encode_media_token(row["drive"], "series", row["series_root"], variant="thumb")
-                if row.get("has_thumb")
-                else None
-            )
-            results.append(
-                {
-                    "id": row["id"],
-                    "series_root": row["series_root"],
-                    "title": row.get("title"),
-                    "year": row.get("year"),
-                    "confidence": float(row.get("confidence") or 0.0),
-                    "seasons_found": row.get("seasons_found") or 0,
-                    "poster_thumb": thumb_token,
-                    "drive": row.get("drive"),
-                }
-            )
+        results = [self._series_summary(row) for row in page_rows]
         return results, pagination, next_offset, total
 
+    def _series_summary(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        thumb_token = (
+            self._encode_media_token(row["drive"], "series", row["series_root"], variant="thumb")
+            if row.get("has_thumb")
+            else None
+        )
+        return {
+            "id": row["id"],
+            "series_root": row["series_root"],
+            "title": row.get("title"),
+            "year": row.get("year"),
+            "confidence": float(row.get("confidence") or 0.0),
+            "seasons_found": row.get("seasons_found") or 0,
+            "poster_thumb": thumb_token,
+            "drive": row.get("drive"),
+        }
+
     def catalog_tv_seasons(
         self, series_id: str
     ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
@@ -1392,7 +1553,7 @@ class DataAccess:
         low_conf_episodes: List[Dict[str, Any]] = []
         for drive, shard_path in self._iter_shards_with_labels():
             try:
-                conn = self._connect(shard_path)
+                conn = self._pool.acquire(shard_path)
             except Exception:
                 continue
             try:
@@ -1462,7 +1623,7 @@ class DataAccess:
                     except sqlite3.DatabaseError:
                         pass
             finally:
-                conn.close()
+                self._pool.release(conn)
 
         low_conf_movies.sort(key=lambda item: item.get("confidence", 0.0))
         low_conf_episodes.sort(key=lambda item: item.get("confidence", 0.0))
@@ -1484,84 +1645,118 @@ class DataAccess:
         *,
         mode: str = "fts",
         top_k: int = 20,
+        skipped: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
+        """Return the ``top_k`` most confident movie and episode hits across shards.
+
+        Every shard returns its own best ``top_k`` hits, and the per-shard
+        lists are merged by confidence. Drives that timed out or could not
+        be opened are appended to ``skipped`` when given.
+        """
+
         token = query.strip().lower()
         if not token:
             return []
         like_pattern = f"%{token}%"
-        hits: List[Dict[str, Any]] = []
-        for drive, shard_path in self._iter_shards_with_labels():
+
+        def search_shard(conn: sqlite3.Connection, drive: str) -> List[Dict[str, Any]]:
+            return self._catalog_search_shard(conn, drive, token, like_pattern, top_k)
+
+        fanout = self._fan_out(search_shard)
+        if skipped is not None:
+            skipped.extend(fanout.skipped)
+        return merge_top_k(
+            (hits for _drive, hits in fanout.results),
+            top_k,
+            key=_confidence_key,
+            reverse=True,
+        )
+
+    def _catalog_search_shard(
+        self,
+        conn: sqlite3.Connection,
+        drive: str,
+        token: str,
+        like_pattern: str,
+        top_k: int,
+    ) -> List[Dict[str, Any]]:
+        movies: List[Dict[str, Any]] = []
+        episodes: List[Dict[str, Any]] = []
+        tables = self._table_names(conn)
+        if "folder_profile" in tables:
+            prefilter_sql, prefilter_params = match_clause(
+                "folder_profile", token, tables
+            ) or ("1", ())
             try:
-                conn = self._connect(shard_path)
-            except Exception:
-                continue
+                rows = conn.execute(
+                    f"""
+                    SELECT folder_path, parsed_title, parsed_year, confidence
+                    FROM folder_profile
+                    WHERE {prefilter_sql}
+                      AND COALESCE(LOWER(kind),'') IN ('','movie')
+                      AND (
+                        LOWER(COALESCE(parsed_title,'')) LIKE ?
+                        OR LOWER(folder_path) LIKE ?
+                      )
+                    ORDER BY confidence DESC, updated_utc DESC
+                    LIMIT ?
+                    """,
+                    (*prefilter_params, like_pattern, like_pattern, top_k),
+                ).fetchall()
+                for row in rows:
+                    movies.append(
+                        {
+                            "id": f"movie:{drive}:{row['folder_path']}",
+                            "kind": "movie",
+                            "title": row["parsed_title"] or Path(row["folder_path"]).name,
+                            "drive": drive,
+                            "confidence": float(row["confidence"] or 0.0),
+                            "context": {
+                                "year": row["parsed_year"],
+                            },
+                        }
+                    )
+            except sqlite3.DatabaseError:
+                pass
+        if "tv_episode_profile" in tables:
+            prefilter_sql, prefilter_params = match_clause(
+                "tv_episode_profile", token, tables
+            ) or ("1", ())
             try:
-                tables = self._table_names(conn)
-                if "folder_profile" in tables:
-                    try:
-                        rows = conn.execute(
-                            """
-                            SELECT folder_path, parsed_title, parsed_year, confidence
-                            FROM folder_profile
-                            WHERE COALESCE(LOWER(kind),'') IN ('','movie')
-                              AND (
-                                LOWER(COALESCE(parsed_title,'')) LIKE ?
-                                OR LOWER(folder_path) LIKE ?
-                              )
-                            ORDER BY confidence DESC, updated_utc DESC
-                            LIMIT ?
-                            """,
-                            (like_pattern, like_pattern, top_k),
-                        ).fetchall()
-                        for row in rows:
-                            hits.append(
-                                {
-                                    "id": f"movie:{drive}:{row['folder_path']}",
-                                    "kind": "movie",
-                                    "title": row["parsed_title"] or Path(row["folder_path"]).name,
-                                    "drive": drive,
-                                    "confidence": float(row["confidence"] or 0.0),
-                                    "context": {
-                                        "year": row["parsed_year"],
-                                    },
-                                }
-                            )
-                    except sqlite3.DatabaseError:
-                        pass
-                if "tv_episode_profile" in tables:
-                    try:
-                        rows = conn.execute(
-                            """
-                            SELECT episode_path, parsed_title, season_number, episode_numbers_json, confidence
-                            FROM tv_episode_profile
-                            WHERE LOWER(COALESCE(parsed_title,'')) LIKE ?
-                               OR LOWER(episode_path) LIKE ?
-                            ORDER BY confidence DESC, updated_utc DESC
-                            LIMIT ?
-                            """,
-                            (like_pattern, like_pattern, top_k),
-                        ).fetchall()
-                        for row in rows:
-                            hits.append(
-                                {
-                                    "id": f"episode:{drive}:{row['episode_path']}",
-                                    "kind": "episode",
-                                    "title": row["parsed_title"] or Path(row["episode_path"]).stem,
-                                    "drive": drive,
-                                    "confidence": float(row["confidence"] or 0.0),
-                                    "context": {
-                                        "season": row["season_number"],
-                                        "episodes": _load_json_list(row["episode_numbers_json"]),
-                                    },
-                                }
-                            )
-                    except sqlite3.DatabaseError:
-                        pass
-            finally:
-                conn.close()
-        hits.sort(key=lambda item: item.get("confidence", 0.0), reverse=True)
+                rows = conn.execute(
+                    f"""
+                    SELECT episode_path, parsed_title, season_number, episode_numbers_json, confidence
+                    FROM tv_episode_profile
+                    WHERE {prefilter_sql}
+                      AND (
+                        LOWER(COALESCE(parsed_title,'')) LIKE ?
+                        OR LOWER(episode_path) LIKE ?
+                      )
+                    ORDER BY confidence DESC, updated_utc DESC
+                    LIMIT ?
+                    """,
+                    (*prefilter_params, like_pattern, like_pattern, top_k),
+                ).fetchall()
+                for row in rows:
+                    episodes.append(
+                        {
+                            "id": f"episode:{drive}:{row['episode_path']}",
+                            "kind": "episode",
+                            "title": row["parsed_title"] or Path(row["episode_path"]).stem,
+                            "drive": drive,
+                            "confidence": float(row["confidence"] or 0.0),
+                            "context": {
+                                "season": row["season_number"],
+                                "episodes": _load_json_list(row["episode_numbers_json"]),
+                            },
+                        }
+                    )
+            except sqlite3.DatabaseError:
+                pass
+        # Sorting here keeps the merge exact whatever order SQLite returned.
+        hits = sorted(movies + episodes, key=_confidence_key, reverse=True)
         return hits[:top_k]
-        
+
     def _semantic_config(self) -> SemanticConfig:
         return SemanticConfig.from_settings(self.working_dir, self._settings)
 
@@ -1582,21 +1777,26 @@ class DataAccess:
 
     @contextmanager
     def _catalog(self) -> Iterator[sqlite3.Connection]:
-        conn = self._connect(self.catalog_path)
-        try:
+        with self._pooled(self.catalog_path) as conn:
             yield conn
-        finally:
-            conn.close()
 
     @contextmanager
     def _shard(self, drive_label: str) -> Iterator[sqlite3.Connection]:
         shard_path = self._shard_path_for(drive_label)
-        conn = self._connect(shard_path)
-        conn.create_function("BASENAME", 1, _lower_basename)
+        with self._pooled(shard_path) as conn:
+            yield conn
+
+    @contextmanager
+    def _pooled(self, path: Path) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.acquire(path)
+        discard = False
         try:
             yield conn
+        except sqlite3.DatabaseError:
+            discard = True
+            raise
         finally:
-            conn.close()
+            self._pool.release(conn, discard=discard)
 
     def _shard_path_for(self, drive_label: str) -> Path:
         if not drive_label:
@@ -1613,70 +1813,164 @@ class DataAccess:
             raise FileNotFoundError(f"shard not found for drive_label={drive_label!r}")
         return shard_path
 
-    def _connect(self, path: Path) -> sqlite3.Connection:
-        conn = connect(path, read_only=True, check_same_thread=False)
+    def _connect(self, path: Path, cached_statements: int = 128) -> sqlite3.Connection:
+        conn = connect(
+            path,
+            read_only=True,
+            check_same_thread=False,
+            cached_statements=cached_statements,
+        )
         try:
             conn.execute("PRAGMA query_only = 1")
         except sqlite3.DatabaseError:
             pass
         conn.row_factory = sqlite3.Row
+        conn.create_function("BASENAME", 1, _lower_basename)
         return conn
 
-    def _structure_tables_present(self, conn: sqlite3.Connection) -> bool:
+    def _open_catalog_writer(self) -> sqlite3.Connection:
+        return connect(self.catalog_path, read_only=False, check_same_thread=False)
+
+    def _load_catalog_rows(
+        self, drive_label: str, shard_path: Path, since: Optional[SourceState]
+    ) -> Optional[ShardSync]:
         try:
-            cursor = conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='folder_profile'"
+            conn = self._pool.acquire(shard_path)
+        except Exception:
+            return None
+        try:
+            return load_shard(
+                conn,
+                since,
+                movies=lambda keys: self._movies_from_shard(conn, drive_label, keys),
+                series=lambda keys: self._tv_series_from_shard(conn, drive_label, keys),
             )
-            return cursor.fetchone() is not None
-        except sqlite3.DatabaseError:
-            return False
+        finally:
+            self._pool.release(conn)
 
-    def _doc_preview_tables_present(self, conn: sqlite3.Connection) -> bool:
+    def _refresh_catalog_index(self) -> bool:
+        """Bring the catalog index up to date; ``False`` means scan shards instead."""
+
+        index = self._catalog_index
+        if index is None:
+            return False
         try:
-            cursor = conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='docs_preview'"
-            )
-            return cursor.fetchone() is not None
-        except sqlite3.DatabaseError:
+            index.refresh(self._iter_shards_with_labels(), self._load_catalog_rows)
+        except sqlite3.Error as exc:
+            LOGGER.warning("Catalog index refresh failed: %s", exc)
+            index.invalidate()
             return False
+        return True
+
+    def catalog_index_stats(self) -> Optional[Dict[str, int]]:
+        index = self._catalog_index
+        return dict(index.stats) if index is not None else None
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return hit/miss and eviction counters of the connection pool."""
+
+        return self._pool.stats()
+
+    def fanout_stats(self) -> Dict[str, Any]:
+        """Return call, timeout and failure counters of the shard fan-out."""
+
+        return self._fanout.stats()
+
+    def close(self) -> None:
+        """Close idle pooled connections and stop the fan-out threads."""
+
+        self._fanout.close()
+        self._pool.close()
+
+    def _structure_tables_present(self, conn: sqlite3.Connection) -> bool:
+        return "folder_profile" in self._table_names(conn)
+
+    def _doc_preview_tables_present(self, conn: sqlite3.Connection) -> bool:
+        return "docs_preview" in self._table_names(conn)
 
     def _textlite_tables_present(self, conn: sqlite3.Connection) -> bool:
-        try:
-            cursor = conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='textlite_preview'"
-            )
-            return cursor.fetchone() is not None
-        except sqlite3.DatabaseError:
-            return False
+        return "textlite_preview" in self._table_names(conn)
 
     def _textverify_tables_present(self, conn: sqlite3.Connection) -> bool:
-        try:
-            cursor = conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='textverify_artifacts'"
-            )
-            return cursor.fetchone() is not None
-        except sqlite3.DatabaseError:
-            return False
+        return "textverify_artifacts" in self._table_names(conn)
 
     def _music_tables_present(self, conn: sqlite3.Connection) -> bool:
-        try:
-            cursor = conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='music_minimal'"
-            )
-            return cursor.fetchone() is not None
-        except sqlite3.DatabaseError:
-            return False
+        return "music_minimal" in self._table_names(conn)
 
     def _music_review_table_present(self, conn: sqlite3.Connection) -> bool:
-        try:
-            cursor = conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='music_review_queue'"
-            )
-            return cursor.fetchone() is not None
-        except sqlite3.DatabaseError:
-            return False
+        return "music_review_queue" in self._table_names(conn)
+
+    def _resolve_cursor(self, pagination: Pagination, scope: str) -> Optional[List[Any]]:
+        """Decode ``pagination.cursor``: return its seek key or apply its offset."""
 
-    def resolve_pagination(self, limit: Optional[int], offset: Optional[int]) -> Pagination:
+        if not pagination.cursor:
+            return None
+        key, offset = decode_cursor(pagination.cursor, scope)
+        if offset is not None:
+            pagination.offset = offset
+        return key
+
+    @staticmethod
+    def _finish_keyset_page(
+        pagination: Pagination,
+        scope: str,
+        after: Optional[Sequence[Any]],
+        next_key: Optional[Sequence[Any]],
+    ) -> Optional[int]:
+        """Set ``next_cursor`` and return the legacy ``next_offset``."""
+
+        if next_key is None:
+            return None
+        pagination.next_cursor = encode_cursor(scope, key=next_key)
+        if after is not None:
+            return None
+        return pagination.offset + pagination.limit
+
+    def _keyset_page(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        table: str,
+        columns: str,
+        clauses: Sequence[str],
+        params: Sequence[Any],
+        keys: Sequence[Tuple[str, bool]],
+        pagination: Pagination,
+        scope: str,
+    ) -> Tuple[List[sqlite3.Row], Optional[int]]:
+        """Fetch one page ordered by ``keys``, seeking past a cursor when given."""
+
+        after = self._resolve_cursor(pagination, scope)
+        page_clauses = list(clauses)
+        page_params = list(params)
+        offset = pagination.offset
+        if after is not None:
+            clause, extra = after_clause(keys, after)
+            page_clauses.append(clause)
+            page_params.extend(extra)
+            offset = 0
+        where_sql = " WHERE " + " AND ".join(page_clauses) if page_clauses else ""
+        key_columns = ", ".join(f"{expr} AS _key{idx}" for idx, (expr, _) in enumerate(keys))
+        cursor = conn.execute(
+            f"""
+            SELECT {columns}, {key_columns}
+            FROM {table}
+            {where_sql}
+            {order_by(keys)}
+            LIMIT ? OFFSET ?
+            """,
+            (*page_params, pagination.limit + 1, offset),
+        )
+        fetched = cursor.fetchall()
+        next_key: Optional[List[Any]] = None
+        if len(fetched) > pagination.limit:
+            fetched = fetched[: pagination.limit]
+            next_key = [fetched[-1][f"_key{idx}"] for idx in range(len(keys))]
+        return fetched, self._finish_keyset_page(pagination, scope, after, next_key)
+
+    def resolve_pagination(
+        self, limit: Optional[int], offset: Optional[int], cursor: Optional[str] = None
+    ) -> Pagination:
         try:
             lim = int(limit) if limit is not None else self.default_limit
         except (TypeError, ValueError):
@@ -1687,7 +1981,7 @@ class DataAccess:
             off = 0
         lim = max(1, min(lim, self.max_page_size))
         off = max(0, off)
-        return Pagination(limit=lim, offset=off)
+        return Pagination(limit=lim, offset=off, cursor=cursor or None)
     def list_drives(self) -> List[Dict[str, Any]]:
         rows: List[Dict[str, Any]] = []
         with self._catalog() as conn:
@@ -1950,8 +2244,9 @@ class DataAccess:
         min_confidence: Optional[float] = None,
         limit: Optional[int] = None,
         offset: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> Tuple[List[Dict[str, Any]], Pagination, Optional[int], Optional[int]]:
-        pagination = self.resolve_pagination(limit, offset)
+        pagination = self.resolve_pagination(limit, offset, cursor)
         clauses: List[str] = ["drive_label = ?"]
         params: List[Any] = [drive_label]
         if q:
@@ -1984,22 +2279,19 @@ class DataAccess:
         with self._shard(drive_label) as conn:
             if not self._music_tables_present(conn):
                 return [], pagination, None, 0
-            limit_plus = pagination.limit + 1
-            cursor = conn.execute(
-                f"""
-                SELECT path, drive_label, ext, artist, title, album, track, score,
-                       score_reasons, parse_reasons, parsed_utc
-                FROM music_minimal
-                {where_sql}
-                ORDER BY score DESC, path COLLATE NOCASE ASC
-                LIMIT ? OFFSET ?
+            fetched, next_offset = self._keyset_page(
+                conn,
+                table="music_minimal",
+                columns="""
+                    path, drive_label, ext, artist, title, album, track, score,
+                    score_reasons, parse_reasons, parsed_utc
                 """,
-                (*params, limit_plus, pagination.offset),
+                clauses=clauses,
+                params=params,
+                keys=[("score", True), *_PATH_KEYS],
+                pagination=pagination,
+                scope=cursor_scope("music", where_sql, params),
             )
-            fetched = cursor.fetchall()
-            if len(fetched) > pagination.limit:
-                fetched = fetched[: pagination.limit]
-                next_offset = pagination.offset + pagination.limit
             for row in fetched:
                 results.append(
                     {
@@ -2016,7 +2308,9 @@ class DataAccess:
                         "parsed_utc": row["parsed_utc"],
                     }
                 )
-            total_estimate = self._estimate_total(conn, "music_minimal", clauses, params)
+            total_estimate = self._estimate_total(
+                conn, "music_minimal", clauses, params, drive_label=drive_label
+            )
         return results, pagination, next_offset, total_estimate
 
     def music_review_page(
@@ -2025,8 +2319,9 @@ class DataAccess:
         *,
         limit: Optional[int] = None,
         offset: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> Tuple[List[Dict[str, Any]], Pagination, Optional[int], Optional[int]]:
-        pagination = self.resolve_pagination(limit, offset)
+        pagination = self.resolve_pagination(limit, offset, cursor)
         results: List[Dict[str, Any]] = []
         next_offset: Optional[int] = None
         total_estimate: Optional[int] = None
@@ -2035,21 +2330,16 @@ class DataAccess:
         with self._shard(drive_label) as conn:
             if not self._music_review_table_present(conn):
                 return [], pagination, None, 0
-            limit_plus = pagination.limit + 1
-            cursor = conn.execute(
-                """
-                SELECT path, drive_label, ext, score, reasons_json, suggestions_json, queued_utc
-                FROM music_review_queue
-                WHERE drive_label = ?
-                ORDER BY score ASC, queued_utc ASC, path COLLATE NOCASE ASC
-                LIMIT ? OFFSET ?
-                """,
-                (drive_label, limit_plus, pagination.offset),
+            fetched, next_offset = self._keyset_page(
+                conn,
+                table="music_review_queue",
+                columns="path, drive_label, ext, score, reasons_json, suggestions_json, queued_utc",
+                clauses=clauses,
+                params=params,
+                keys=[("score", False), ("queued_utc", False), *_PATH_KEYS],
+                pagination=pagination,
+                scope=cursor_scope("music_review", drive_label),
             )
-            fetched = cursor.fetchall()
-            if len(fetched) > pagination.limit:
-                fetched = fetched[: pagination.limit]
-                next_offset = pagination.offset + pagination.limit
             for row in fetched:
                 results.append(
                     {
@@ -2063,7 +2353,7 @@ class DataAccess:
                     }
                 )
             total_estimate = self._estimate_total(
-                conn, "music_review_queue", clauses, params
+                conn, "music_review_queue", clauses, params, drive_label=drive_label
             )
         return results, pagination, next_offset, total_estimate
 
@@ -2159,8 +2449,9 @@ class DataAccess:
         since: Optional[str] = None,
         limit: Optional[int] = None,
         offset: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> Tuple[List[Dict[str, Any]], Pagination, Optional[int], Optional[int]]:
-        pagination = self.resolve_pagination(limit, offset)
+        pagination = self.resolve_pagination(limit, offset, cursor)
         clauses: List[str] = []
         params: List[Any] = []
         if q:
@@ -2185,21 +2476,20 @@ class DataAccess:
         next_offset: Optional[int] = None
         total_estimate: Optional[int] = None
         with self._shard(drive_label) as conn:
-            limit_plus = pagination.limit + 1
-            cursor = conn.execute(
-                f"""
-                SELECT path, size_bytes, mtime_utc, category, drive_label, ext, mime
-                FROM inventory
-                {where_sql}
-                ORDER BY path COLLATE NOCASE ASC
-                LIMIT ? OFFSET ?
-                """,
-                (*params, limit_plus, pagination.offset),
+            prefilter = match_clause("inventory", q.lower() if q else None, self._table_names(conn))
+            if prefilter is not None:
+                clauses.insert(0, prefilter[0])
+                params[0:0] = prefilter[1]
+            fetched, next_offset = self._keyset_page(
+                conn,
+                table="inventory",
+                columns="path, size_bytes, mtime_utc, category, drive_label, ext, mime",
+                clauses=clauses,
+                params=params,
+                keys=_PATH_KEYS,
+                pagination=pagination,
+                scope=cursor_scope("inventory", drive_label, where_sql, params),
             )
-            fetched = cursor.fetchall()
-            if len(fetched) > pagination.limit:
-                fetched = fetched[: pagination.limit]
-                next_offset = pagination.offset + pagination.limit
             for row in fetched:
                 path_value = row["path"]
                 results.append(
@@ -2214,7 +2504,7 @@ class DataAccess:
                         "mime": row["mime"],
                     }
                 )
-            total_estimate = self._estimate_total(conn, "inventory", clauses, params)
+            total_estimate = self._estimate_total(conn, "inventory", clauses, params, drive_label=drive_label)
         return results, pagination, next_offset, total_estimate
     def inventory_row(self, drive_label: str, path: str) -> Optional[Dict[str, Any]]:
         with self._shard(drive_label) as conn:
@@ -2232,6 +2522,15 @@ class DataAccess:
                 return None
             return {key: row[key] for key in row.keys()}
 
+    def scan_timings(self, drive_label: str) -> Optional[Dict[str, Any]]:
+        """Return the phase timings written by the drive's latest scan."""
+
+        payload = timings.load_timings(self.working_dir, drive_label)
+        if payload is None:
+            return None
+        payload["drive_label"] = drive_label
+        return payload
+
     def drive_stats(self, drive_label: str) -> Dict[str, Any]:
         totals: Dict[str, int] = {}
         total_files = 0
@@ -2346,8 +2645,9 @@ class DataAccess:
         kind: Optional[str] = None,
         limit: Optional[int] = None,
         offset: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> Tuple[List[Dict[str, Any]], Pagination, Optional[int], Optional[int]]:
-        pagination = self.resolve_pagination(limit, offset)
+        pagination = self.resolve_pagination(limit, offset, cursor)
         clauses: List[str] = []
         params: List[Any] = []
         if path_query:
@@ -2362,21 +2662,16 @@ class DataAccess:
         next_offset: Optional[int] = None
         total_estimate: Optional[int] = None
         with self._shard(drive_label) as conn:
-            limit_plus = pagination.limit + 1
-            cursor = conn.execute(
-                f"""
-                SELECT path, kind, dim, frames_used, updated_utc
-                FROM features
-                {where_sql}
-                ORDER BY path COLLATE NOCASE ASC
-                LIMIT ? OFFSET ?
-                """,
-                (*params, limit_plus, pagination.offset),
+            fetched, next_offset = self._keyset_page(
+                conn,
+                table="features",
+                columns="path, kind, dim, frames_used, updated_utc",
+                clauses=clauses,
+                params=params,
+                keys=_PATH_KEYS,
+                pagination=pagination,
+                scope=cursor_scope("features", drive_label, where_sql, params),
             )
-            fetched = cursor.fetchall()
-            if len(fetched) > pagination.limit:
-                fetched = fetched[: pagination.limit]
-                next_offset = pagination.offset + pagination.limit
             for row in fetched:
                 results.append(
                     {
@@ -2387,7 +2682,7 @@ class DataAccess:
                         "updated_utc": row["updated_utc"],
                     }
                 )
-            total_estimate = self._estimate_total(conn, "features", clauses, params)
+            total_estimate = self._estimate_total(conn, "features", clauses, params, drive_label=drive_label)
         return results, pagination, next_offset, total_estimate
 
     def feature_vector(self, drive_label: str, path: str) -> Optional[Dict[str, Any]]:
@@ -2419,8 +2714,27 @@ class DataAccess:
         table: str,
         clauses: Sequence[str],
         params: Sequence[Any],
+        *,
+        drive_label: Optional[str] = None,
     ) -> Optional[int]:
+        """Count matching rows up to ``_COUNT_GUARD``; ``None`` beyond that.
+
+        With ``drive_label`` the result is cached until the shard file
+        changes, so paging through a filter only counts it once per scan.
+        """
+
         where_sql = " WHERE " + " AND ".join(clauses) if clauses else ""
+        cache_key: Optional[Tuple[Any, ...]] = None
+        signature = None
+        if drive_label is not None:
+            signature = shard_signature(get_shard_db_path(self.working_dir, drive_label))
+        if signature is not None:
+            cache_key = (drive_label, table, where_sql, tuple(params))
+            with self._count_lock:
+                cached = self._count_cache.get(cache_key)
+                if cached is not None and cached[0] == signature:
+                    self._count_cache.move_to_end(cache_key)
+                    return cached[1]
         cursor = conn.execute(
             f"""
             SELECT COUNT(*) AS count
@@ -2434,9 +2748,14 @@ class DataAccess:
             tuple(params),
         )
         count = cursor.fetchone()["count"]
-        if count > _COUNT_GUARD:
-            return None
-        return int(count)
+        total = None if count > _COUNT_GUARD else int(count)
+        if cache_key is not None:
+            with self._count_lock:
+                self._count_cache[cache_key] = (signature, total)
+                self._count_cache.move_to_end(cache_key)
+                while len(self._count_cache) > _COUNT_CACHE_SIZE:
+                    self._count_cache.popitem(last=False)
+        return total
 
     # ------------------------------------------------------------------
     # Playlist helpers
@@ -2456,8 +2775,15 @@ class DataAccess:
         drive: Optional[str] = None,
         genres: Optional[Sequence[str]] = None,
         limit: int = 40,
+        skipped: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
-        """Return candidate playlist items across all shards honoring the filters."""
+        """Return the best ``limit`` playlist items across all shards honoring the filters.
+
+        Items rank by quality, then confidence, then shorter runtime. Each
+        shard returns its own best ``limit`` items and the lists are merged.
+        Drives that timed out or could not be opened are appended to
+        ``skipped`` when given.
+        """
 
         limit = max(1, min(int(limit or 40), 200))
         audio_filters = [lang.lower() for lang in audio_langs or [] if lang]
@@ -2471,28 +2797,19 @@ class DataAccess:
             haystack = [lang.lower() for lang in lang_list]
             return all(any(req == lang for lang in haystack) for req in required)
 
-        candidates: List[Dict[str, Any]] = []
-        for label, shard_path in self._iter_shards_with_labels():
-            if drive and drive.strip() and label != drive.strip():
-                continue
-            try:
-                conn = self._connect(shard_path)
-            except Exception:
-                continue
-            try:
-                shard_items = self._playlist_candidates_from_shard(
-                    conn,
-                    label,
-                    min_duration_s=min_duration_s,
-                    max_duration_s=max_duration_s,
-                    conf_min=conf_min,
-                    qual_min=qual_min,
-                    subs_required=subs_required,
-                    year_min=year_min,
-                    year_max=year_max,
-                )
-            finally:
-                conn.close()
+        def shard_candidates(conn: sqlite3.Connection, label: str) -> List[Dict[str, Any]]:
+            shard_items = self._playlist_candidates_from_shard(
+                conn,
+                label,
+                min_duration_s=min_duration_s,
+                max_duration_s=max_duration_s,
+                conf_min=conf_min,
+                qual_min=qual_min,
+                subs_required=subs_required,
+                year_min=year_min,
+                year_max=year_max,
+            )
+            matched: List[Dict[str, Any]] = []
             for item in shard_items:
                 if audio_filters and not _lang_match(item.get("langs_audio", []), audio_filters):
                     continue
@@ -2500,21 +2817,20 @@ class DataAccess:
                     genres_lower = [genre.lower() for genre in item.get("genres") or []]
                     if not all(any(g == genre for genre in genres_lower) for g in genre_filters):
                         continue
-                candidates.append(item)
-                if len(candidates) >= limit:
-                    break
-            if len(candidates) >= limit:
-                break
+                matched.append(item)
+            matched.sort(key=_playlist_rank, reverse=True)
+            return matched[:limit]
 
-        candidates.sort(
-            key=lambda row: (
-                float(row.get("quality") or 0.0),
-                float(row.get("confidence") or 0.0),
-                -(row.get("duration_min") or 0),
-            ),
+        requested_drive = drive.strip() if isinstance(drive, str) and drive.strip() else None
+        fanout = self._fan_out(shard_candidates, drive=requested_drive)
+        if skipped is not None:
+            skipped.extend(fanout.skipped)
+        return merge_top_k(
+            (items for _label, items in fanout.results),
+            limit,
+            key=_playlist_rank,
             reverse=True,
         )
-        return candidates[:limit]
 
     def _playlist_candidates_from_shard(
         self,
@@ -2676,7 +2992,7 @@ class DataAccess:
         for drive, kinds in grouped.items():
             try:
                 shard_path = self._shard_path_for(drive)
-                conn = self._connect(shard_path)
+                conn = self._pool.acquire(shard_path)
             except Exception:
                 continue
             try:
@@ -2687,7 +3003,7 @@ class DataAccess:
                     episode_rows = self._playlist_fetch_episodes(conn, drive, kinds["episode"])
                     resolved.update(episode_rows)
             finally:
-                conn.close()
+                self._pool.release(conn)
         return resolved
 
     def _playlist_fetch_movies(
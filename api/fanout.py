@@ -0,0 +1,261 @@
+"""Run one query per shard in parallel for catalog-wide endpoints.
+
+Catalog search, playlist suggestions and the shard-scanning catalog pages
+ask every drive shard the same question. Asking them one after another
+makes a request as slow as all shards added together. :class:`ShardFanout`
+runs the per-shard queries on a shared thread pool instead, so a request
+takes about as long as its slowest shard. sqlite3 releases the GIL while a
+statement runs, so threads are enough.
+
+Each call has a time budget. When it runs out, queries still running are
+stopped with :meth:`sqlite3.Connection.interrupt` and their shards are
+listed in :attr:`FanoutResult.timed_out`. Callers return the rows they have
+and flag the response as partial, so one slow or spun-down disk does not
+hold up the whole catalog.
+
+:func:`merge_top_k` merges per-shard lists that are already sorted, so
+each shard only has to return its own best ``k`` rows.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+
+def _default_workers() -> int:
+    # Shard queries mostly wait on disk, so use more threads than cores.
+    return min(32, (os.cpu_count() or 1) * 4)
+
+
+@dataclass(slots=True)
+class FanoutConfig:
+    """Sizing and time budget for :class:`ShardFanout`."""
+
+    enabled: bool = True
+    max_workers: int = 0
+    shard_budget_s: float = 10.0
+
+    @classmethod
+    def from_settings(cls, payload: Optional[Mapping[str, Any]]) -> "FanoutConfig":
+        """Build a config from the ``api.shard_fanout`` settings block."""
+
+        config = cls()
+        if not isinstance(payload, Mapping):
+            return config
+        if "enabled" in payload:
+            config.enabled = bool(payload.get("enabled"))
+        try:
+            config.max_workers = max(0, int(payload.get("max_workers", config.max_workers)))
+        except (TypeError, ValueError):
+            pass
+        try:
+            config.shard_budget_s = max(
+                0.0, float(payload.get("shard_budget_s", config.shard_budget_s))
+            )
+        except (TypeError, ValueError):
+            pass
+        return config
+
+    @property
+    def workers(self) -> int:
+        """Thread count; ``max_workers`` of 0 sizes the pool from the CPU count."""
+
+        return self.max_workers or _default_workers()
+
+
+@dataclass(slots=True)
+class FanoutResult(Generic[T]):
+    """Per-shard values in shard order, plus the shards that returned nothing."""
+
+    results: List[Tuple[str, T]] = field(default_factory=list)
+    timed_out: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+
+    @property
+    def skipped(self) -> List[str]:
+        return self.timed_out + self.failed
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.timed_out or self.failed)
+
+
+class _Unavailable(Exception):
+    """The shard could not be opened or started after the budget ran out."""
+
+
+class ShardFanout:
+    """Thread pool that runs ``task(label, conn)`` once per shard.
+
+    ``acquire(path)`` and ``release(conn)`` check connections in and out of
+    the caller's connection pool. A shard whose connection cannot be opened
+    is listed in :attr:`FanoutResult.failed`. Exceptions raised by ``task``
+    itself propagate to the caller, as they would from a plain loop.
+    """
+
+    def __init__(self, config: Optional[FanoutConfig] = None) -> None:
+        self.config = config or FanoutConfig()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats: Dict[str, int] = {"calls": 0, "shards": 0, "timed_out": 0, "failed": 0}
+
+    def run(
+        self,
+        shards: Iterable[Tuple[str, Path]],
+        task: Callable[[str, sqlite3.Connection], T],
+        *,
+        acquire: Callable[[Path], sqlite3.Connection],
+        release: Callable[[sqlite3.Connection], None],
+        budget_s: Optional[float] = None,
+    ) -> FanoutResult[T]:
+        """Run ``task`` for every ``(label, path)`` in ``shards``.
+
+        ``budget_s`` overrides the configured budget; 0 waits for every
+        shard. With fan-out disabled the shards run one by one in the
+        calling thread and no budget applies.
+        """
+
+        shard_list = list(shards)
+        result: FanoutResult[T] = FanoutResult()
+        if not shard_list:
+            return result
+        if budget_s is None:
+            budget_s = self.config.shard_budget_s
+        if not self.config.enabled:
+            for label, path in shard_list:
+                try:
+                    conn = acquire(path)
+                except Exception:
+                    result.failed.append(label)
+                    continue
+                try:
+                    value = task(label, conn)
+                finally:
+                    release(conn)
+                result.results.append((label, value))
+            self._record(result, len(shard_list))
+            return result
+
+        # Connections of tasks that are running, by shard index. Entries are
+        # removed under the lock before release, so an interrupt can never
+        # reach a connection that went back to the pool.
+        running: Dict[int, sqlite3.Connection] = {}
+        running_lock = threading.Lock()
+        expired = threading.Event()
+
+        def call(index: int, label: str, path: Path) -> T:
+            if expired.is_set():
+                raise _Unavailable(label)
+            try:
+                conn = acquire(path)
+            except Exception as exc:
+                raise _Unavailable(label) from exc
+            with running_lock:
+                running[index] = conn
+            try:
+                return task(label, conn)
+            finally:
+                with running_lock:
+                    running.pop(index, None)
+                release(conn)
+
+        executor = self._ensure_executor()
+        futures: List[Future] = [
+            executor.submit(call, index, label, path)
+            for index, (label, path) in enumerate(shard_list)
+        ]
+        _, pending = wait(futures, timeout=budget_s or None)
+        if pending:
+            expired.set()
+            with running_lock:
+                for index, future in enumerate(futures):
+                    if future in pending and not future.cancel():
+                        conn = running.get(index)
+                        if conn is not None:
+                            conn.interrupt()
+        for (label, _path), future in zip(shard_list, futures):
+            if future in pending:
+                result.timed_out.append(label)
+                continue
+            try:
+                value = future.result()
+            except _Unavailable:
+                result.failed.append(label)
+                continue
+            result.results.append((label, value))
+        self._record(result, len(shard_list))
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            payload: Dict[str, Any] = dict(self._stats)
+        payload["config"] = {
+            "enabled": self.config.enabled,
+            "workers": self.config.workers,
+            "shard_budget_s": self.config.shard_budget_s,
+        }
+        return payload
+
+    def close(self) -> None:
+        """Stop the worker threads once their current tasks finish."""
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.config.workers, thread_name_prefix="shard-fanout"
+                )
+            return self._executor
+
+    def _record(self, result: FanoutResult, shards: int) -> None:
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["shards"] += shards
+            self._stats["timed_out"] += len(result.timed_out)
+            self._stats["failed"] += len(result.failed)
+
+
+def merge_top_k(
+    streams: Iterable[Iterable[T]],
+    k: int,
+    *,
+    key: Optional[Callable[[T], Any]] = None,
+    reverse: bool = False,
+) -> List[T]:
+    """Return the first ``k`` items of the merged, already sorted ``streams``.
+
+    Every stream must be sorted by ``key`` in the direction given by
+    ``reverse``. Ties keep the order of the streams, so the result equals a
+    stable sort of the concatenated streams cut to ``k`` items.
+    """
+
+    return list(islice(heapq.merge(*streams, key=key, reverse=reverse), max(0, int(k))))
+
+
+__all__ = ["FanoutConfig", "FanoutResult", "ShardFanout", "merge_top_k"]
@@ -0,0 +1,94 @@
+"""Opaque cursor tokens and keyset predicates for paginated list endpoints.
+
+``LIMIT ? OFFSET ?`` makes SQLite walk and discard every row before the
+requested page, so deep pages over multi-million row shards get slower the
+further a client scrolls. A cursor instead carries the sort key of the last
+row served; the next page seeks straight to it through an index whose
+columns match the ``ORDER BY``.
+
+Tokens are URL-safe base64 JSON. Each one is bound to a *scope*, a short
+hash of the endpoint, drive, filters and sort it was issued for, so reusing
+a cursor with a different query fails loudly instead of returning a page
+from somewhere else. A token may carry an ``offset`` instead of a key for
+paths that cannot seek (the in-memory catalog fallback).
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+# (SQL expression, descending) pairs; the last one must be unique per row.
+SortKeys = Sequence[Tuple[str, bool]]
+
+
+def cursor_scope(*parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def encode_cursor(scope: str, *, key: Optional[Sequence[Any]] = None, offset: Optional[int] = None) -> str:
+    payload: dict = {"s": scope}
+    if key is not None:
+        payload["k"] = list(key)
+    else:
+        payload["o"] = int(offset or 0)
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, scope: str) -> Tuple[Optional[List[Any]], Optional[int]]:
+    """Return ``(key, offset)`` from ``token``; exactly one of them is set.
+
+    Raises ``ValueError`` for malformed tokens and for tokens issued for a
+    different query.
+    """
+
+    padding = "=" * (-len(token) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + padding).decode("utf-8"))
+    except (ValueError, binascii.Error, UnicodeDecodeError) as exc:
+        raise ValueError("invalid cursor") from exc
+    if not isinstance(payload, dict):
+        raise ValueError("invalid cursor")
+    if payload.get("s") != scope:
+        raise ValueError("cursor does not match this query")
+    key = payload.get("k")
+    if isinstance(key, list):
+        return key, None
+    offset = payload.get("o")
+    if isinstance(offset, int) and offset >= 0:
+        return None, offset
+    raise ValueError("invalid cursor")
+
+
+def order_by(keys: SortKeys) -> str:
+    return "ORDER BY " + ", ".join(f"{expr} {'DESC' if desc else 'ASC'}" for expr, desc in keys)
+
+
+def after_clause(keys: SortKeys, values: Sequence[Any]) -> Tuple[str, List[Any]]:
+    """Return a predicate selecting rows that sort strictly after ``values``.
+
+    The expanded ``a > ? OR (a = ? AND b > ?)`` form works for mixed sort
+    directions, which row-value comparisons do not. The leading ``a >= ?``
+    gives SQLite a range to seek on instead of filtering from the start.
+    """
+
+    if len(values) != len(keys):
+        raise ValueError("invalid cursor")
+    first_expr, first_desc = keys[0]
+    params: List[Any] = [values[0]]
+    branches: List[str] = []
+    for idx, (expr, desc) in enumerate(keys):
+        terms = [f"{prev} = ?" for prev, _ in keys[:idx]]
+        terms.append(f"{expr} {'<' if desc else '>'} ?")
+        branches.append("(" + " AND ".join(terms) + ")")
+        params.extend(values[: idx + 1])
+    clause = f"({first_expr} {'<=' if first_desc else '>='} ? AND ({' OR '.join(branches)}))"
+    return clause, params
+
+
+__all__ = ["after_clause", "cursor_scope", "decode_cursor", "encode_cursor", "order_by"]
@@ -23,6 +23,12 @@ class HealthResponse(BaseModel):
     last_event_age_ms: Optional[float] = Field(
         None, description="Milliseconds since the last realtime catalog event was published."
     )
+    connection_pool: Optional[Dict[str, Any]] = Field(
+        None, description="Hit, miss and eviction counters of the shard connection pool."
+    )
+    shard_fanout: Optional[Dict[str, Any]] = Field(
+        None, description="Call, timeout and failure counters of the parallel shard queries."
+    )
 
 
 class DriveInfo(BaseModel):
@@ -70,6 +76,13 @@ class PaginatedResponse(BaseModel):
             "Offset to request the next page, or null when no more data is immediately available."
         ),
     )
+    next_cursor: Optional[str] = Field(
+        None,
+        description=(
+            "Opaque cursor for the next page where the endpoint supports keyset paging; "
+            "null on the last page."
+        ),
+    )
     total_estimate: Optional[int] = Field(
         None,
         description=(
@@ -228,6 +241,12 @@ class CatalogMovieRow(BaseModel):
 
 class CatalogMoviesResponse(PaginatedResponse):
     results: List[CatalogMovieRow] = Field(..., description="Movie rows for the requested page.")
+    partial: bool = Field(
+        False, description="True when some drive shards timed out or could not be opened."
+    )
+    skipped_drives: List[str] = Field(
+        default_factory=list, description="Drive labels missing from a partial result."
+    )
 
 
 class CatalogSeriesRow(BaseModel):
@@ -245,6 +264,12 @@ class CatalogSeriesRow(BaseModel):
 
 class CatalogSeriesResponse(PaginatedResponse):
     results: List[CatalogSeriesRow] = Field(..., description="TV series rows for the requested page.")
+    partial: bool = Field(
+        False, description="True when some drive shards timed out or could not be opened."
+    )
+    skipped_drives: List[str] = Field(
+        default_factory=list, description="Drive labels missing from a partial result."
+    )
 
 
 class CatalogSeasonRow(BaseModel):
@@ -414,6 +439,12 @@ class PlaylistSuggestResponse(BaseModel):
     candidates: List[PlaylistCandidate] = Field(
         default_factory=list, description="Candidate rows ordered by descending quality/confidence."
     )
+    partial: bool = Field(
+        False, description="True when some drive shards timed out or could not be opened."
+    )
+    skipped_drives: List[str] = Field(
+        default_factory=list, description="Drive labels missing from a partial result."
+    )
 
 
 class PlaylistBuildRequest(BaseModel):
@@ -517,6 +548,12 @@ class CatalogSearchResponse(BaseModel):
     results: List[CatalogSearchHit] = Field(
         default_factory=list, description="Combined movie/episode hits ordered by relevance."
     )
+    partial: bool = Field(
+        False, description="True when some drive shards timed out or could not be opened."
+    )
+    skipped_drives: List[str] = Field(
+        default_factory=list, description="Drive labels missing from a partial result."
+    )
 
 
 class AssistantAskSource(BaseModel):
@@ -884,3 +921,37 @@ class RecentChangesReport(BaseModel):
     limit: int = Field(..., description="Maximum number of rows returned.")
     total: int = Field(..., description="Total files matching the window across the inventory.")
     results: List[RecentChangeModel] = Field(..., description="Recent change rows.")
+
+
+class PhaseTimingModel(BaseModel):
+    count: int = Field(..., description="Operations recorded for the phase.")
+    total_s: float = Field(..., description="Total seconds spent in the phase across all workers.")
+    mean_ms: Optional[float] = Field(None, description="Mean latency in milliseconds.")
+    p50_ms: Optional[float] = Field(None, description="Median latency in milliseconds.")
+    p95_ms: Optional[float] = Field(None, description="95th percentile latency in milliseconds.")
+    p99_ms: Optional[float] = Field(None, description="99th percentile latency in milliseconds.")
+    max_ms: Optional[float] = Field(None, description="Slowest operation in milliseconds.")
+
+
+class QueueDepthModel(BaseModel):
+    max: int = Field(..., description="Deepest sampled queue depth.")
+    mean: float = Field(..., description="Mean sampled queue depth.")
+    samples: int = Field(..., description="Number of samples taken.")
+
+
+class ScanTimingsResponse(BaseModel):
+    drive_label: str = Field(..., description="Drive label referenced by the timings.")
+    written_utc: Optional[str] = Field(None, description="When the scan wrote the timings (UTC).")
+    status: Optional[str] = Field(None, description="Scan outcome: ok or cancelled.")
+    profile: Optional[str] = Field(None, description="Performance profile used by the scan.")
+    total_files: Optional[int] = Field(None, description="Files seen by the scan.")
+    duration_seconds: Optional[float] = Field(None, description="Scan wall-clock duration.")
+    phases: Dict[str, PhaseTimingModel] = Field(
+        default_factory=dict, description="Latency histogram summary per scan phase."
+    )
+    queues: Dict[str, QueueDepthModel] = Field(
+        default_factory=dict, description="Depth statistics per sampled queue."
+    )
+    queue_samples: List[Dict[str, float]] = Field(
+        default_factory=list, description="Queue depth samples; t is seconds since the scan started."
+    )
@@ -0,0 +1,302 @@
+"""Pooled read-only SQLite connections for the local API.
+
+Every list endpoint visits every shard, so opening a fresh connection per
+shard per request costs a file open, the URI parse, a handful of PRAGMAs
+and a cold page cache each time. :class:`ConnectionPool` keeps a few idle
+connections per database path and hands them out again. Each connection
+keeps its SQLite page cache, its prepared-statement cache and its table
+list between requests.
+
+The pool only bounds what it keeps: callers never wait for a connection.
+Connections that sat idle longer than ``idle_seconds`` are closed on the
+next checkout or checkin. When a shard file is replaced (restore, rebuild)
+its inode changes and the stale connections are dropped rather than reused.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+_MB = 1024 * 1024
+
+
+@dataclass(slots=True)
+class PoolConfig:
+    """Sizing and per-connection tuning for :class:`ConnectionPool`."""
+
+    enabled: bool = True
+    max_per_path: int = 4
+    max_total: int = 64
+    idle_seconds: float = 300.0
+    mmap_mb: int = 64
+    cache_mb: int = 4
+    statement_cache: int = 256
+
+    @classmethod
+    def from_settings(cls, payload: Optional[Mapping[str, Any]]) -> "PoolConfig":
+        """Build a config from the ``api.connection_pool`` settings block."""
+
+        config = cls()
+        if not isinstance(payload, Mapping):
+            return config
+        if "enabled" in payload:
+            config.enabled = bool(payload.get("enabled"))
+        for name, minimum in (
+            ("max_per_path", 1),
+            ("max_total", 1),
+            ("mmap_mb", 0),
+            ("cache_mb", 0),
+            ("statement_cache", 0),
+        ):
+            try:
+                value = int(payload.get(name, getattr(config, name)))
+            except (TypeError, ValueError):
+                continue
+            setattr(config, name, max(minimum, value))
+        try:
+            config.idle_seconds = max(0.0, float(payload.get("idle_seconds", config.idle_seconds)))
+        except (TypeError, ValueError):
+            pass
+        return config
+
+
+@dataclass(slots=True, eq=False)
+class _Entry:
+    conn: sqlite3.Connection
+    key: str
+    identity: Tuple[int, int]
+    last_used: float
+    schema_version: Optional[int] = None
+    tables: Optional[frozenset] = None
+
+
+def _identity(path: Path) -> Tuple[int, int]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return (0, 0)
+    return (int(st.st_dev), int(st.st_ino))
+
+
+def _query_table_names(conn: sqlite3.Connection) -> frozenset:
+    try:
+        cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    except sqlite3.DatabaseError:
+        return frozenset()
+    return frozenset(str(row[0]) for row in cursor.fetchall() if row[0])
+
+
+class ConnectionPool:
+    """Thread-safe pool of read-only connections keyed by database path.
+
+    ``open_connection(path, statement_cache)`` creates a new connection; the
+    pool applies ``mmap_size`` and ``cache_size`` to it. Connections are
+    exclusive while checked out and go back with :meth:`release`.
+    """
+
+    def __init__(
+        self,
+        open_connection: Callable[[Path, int], sqlite3.Connection],
+        config: Optional[PoolConfig] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.config = config or PoolConfig()
+        self._open = open_connection
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Idle entries, least recently used first, per path.
+        self._idle: Dict[str, List[_Entry]] = {}
+        self._idle_count = 0
+        self._lru: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._live: Dict[int, _Entry] = {}
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "evicted_idle": 0,
+            "evicted_capacity": 0,
+            "discarded_stale": 0,
+            "discarded_error": 0,
+            "schema_hits": 0,
+            "schema_misses": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Checkout / checkin
+    # ------------------------------------------------------------------
+
+    def acquire(self, path: Path) -> sqlite3.Connection:
+        """Return an idle connection for ``path`` or open a new one."""
+
+        key = str(path)
+        identity = _identity(path)
+        to_close: List[sqlite3.Connection] = []
+        entry: Optional[_Entry] = None
+        with self._lock:
+            now = self._clock()
+            self._sweep_locked(now, to_close)
+            idle = self._idle.get(key)
+            while idle:
+                candidate = idle.pop()
+                self._idle_count -= 1
+                self._lru.pop(id(candidate.conn), None)
+                if candidate.identity != identity:
+                    self._stats["discarded_stale"] += 1
+                    self._live.pop(id(candidate.conn), None)
+                    to_close.append(candidate.conn)
+                    continue
+                entry = candidate
+                break
+            if entry is not None:
+                self._stats["hits"] += 1
+            else:
+                self._stats["misses"] += 1
+        self._close_all(to_close)
+        if entry is not None:
+            return entry.conn
+        conn = self._open(path, self.config.statement_cache)
+        self._tune(conn)
+        entry = _Entry(conn=conn, key=key, identity=identity, last_used=self._clock())
+        with self._lock:
+            self._live[id(conn)] = entry
+        return conn
+
+    def release(self, conn: sqlite3.Connection, *, discard: bool = False) -> None:
+        """Return ``conn`` to the pool, or close it when ``discard`` is set."""
+
+        with self._lock:
+            entry = self._live.get(id(conn))
+        if entry is None or entry.conn is not conn:
+            conn.close()
+            return
+        if not discard and conn.in_transaction:
+            try:
+                conn.rollback()
+            except sqlite3.DatabaseError:
+                discard = True
+        to_close: List[sqlite3.Connection] = []
+        with self._lock:
+            now = self._clock()
+            if discard or not self.config.enabled:
+                if discard:
+                    self._stats["discarded_error"] += 1
+                self._live.pop(id(conn), None)
+                to_close.append(conn)
+            else:
+                entry.last_used = now
+                idle = self._idle.setdefault(entry.key, [])
+                idle.append(entry)
+                self._idle_count += 1
+                self._lru[id(conn)] = entry
+                if len(idle) > self.config.max_per_path:
+                    self._evict_locked(idle[0], to_close, "evicted_capacity")
+                while self._idle_count > self.config.max_total and self._lru:
+                    _, oldest = next(iter(self._lru.items()))
+                    self._evict_locked(oldest, to_close, "evicted_capacity")
+            self._sweep_locked(now, to_close)
+        self._close_all(to_close)
+
+    # ------------------------------------------------------------------
+    # Cached metadata
+    # ------------------------------------------------------------------
+
+    def table_names(self, conn: sqlite3.Connection) -> frozenset:
+        """Return the table names of ``conn``, cached until the schema changes."""
+
+        entry = self._live.get(id(conn))
+        if entry is None or entry.conn is not conn:
+            return _query_table_names(conn)
+        try:
+            version = int(conn.execute("PRAGMA schema_version").fetchone()[0])
+        except sqlite3.DatabaseError:
+            return _query_table_names(conn)
+        if entry.tables is not None and entry.schema_version == version:
+            with self._lock:
+                self._stats["schema_hits"] += 1
+            return entry.tables
+        with self._lock:
+            self._stats["schema_misses"] += 1
+        entry.tables = _query_table_names(conn)
+        entry.schema_version = version
+        return entry.tables
+
+    # ------------------------------------------------------------------
+    # Housekeeping
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            payload: Dict[str, Any] = dict(self._stats)
+            payload["idle"] = self._idle_count
+            payload["in_use"] = len(self._live) - self._idle_count
+            payload["paths"] = sum(1 for idle in self._idle.values() if idle)
+        lookups = payload["hits"] + payload["misses"]
+        payload["hit_rate"] = round(payload["hits"] / lookups, 3) if lookups else None
+        payload["config"] = {
+            "enabled": self.config.enabled,
+            "max_per_path": self.config.max_per_path,
+            "max_total": self.config.max_total,
+            "idle_seconds": self.config.idle_seconds,
+            "mmap_mb": self.config.mmap_mb,
+            "cache_mb": self.config.cache_mb,
+            "statement_cache": self.config.statement_cache,
+        }
+        return payload
+
+    def close(self) -> None:
+        """Close every idle connection; checked-out ones close on release."""
+
+        with self._lock:
+            to_close = [entry.conn for idle in self._idle.values() for entry in idle]
+            for conn in to_close:
+                self._live.pop(id(conn), None)
+            self._idle.clear()
+            self._idle_count = 0
+            self._lru.clear()
+        self._close_all(to_close)
+
+    def _tune(self, conn: sqlite3.Connection) -> None:
+        for pragma in (
+            f"PRAGMA mmap_size = {int(self.config.mmap_mb) * _MB}",
+            f"PRAGMA cache_size = -{int(self.config.cache_mb) * 1024}",
+        ):
+            try:
+                conn.execute(pragma)
+            except sqlite3.DatabaseError:
+                pass
+
+    def _evict_locked(self, entry: _Entry, to_close: List[sqlite3.Connection], reason: str) -> None:
+        idle = self._idle.get(entry.key)
+        if idle and entry in idle:
+            idle.remove(entry)
+            self._idle_count -= 1
+        self._lru.pop(id(entry.conn), None)
+        self._live.pop(id(entry.conn), None)
+        self._stats[reason] += 1
+        to_close.append(entry.conn)
+
+    def _sweep_locked(self, now: float, to_close: List[sqlite3.Connection]) -> None:
+        limit = self.config.idle_seconds
+        while self._lru:
+            _, oldest = next(iter(self._lru.items()))
+            if now - oldest.last_used < limit:
+                break
+            self._evict_locked(oldest, to_close, "evicted_idle")
+
+    @staticmethod
+    def _close_all(conns: List[sqlite3.Connection]) -> None:
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+
+__all__ = ["ConnectionPool", "PoolConfig"]
@@ -75,6 +75,7 @@ from .models import (
     MusicReviewResponse,
     OverviewReport,
     RecentChangesReport,
+    ScanTimingsResponse,
     SemanticIndexRequest,
     SemanticOperationResponse,
     SemanticSearchHit,
@@ -190,6 +191,7 @@ def create_app(config: APIServerConfig) -> FastAPI:
         await web_monitor.stop()
         assistant_gateway.shutdown()
         orchestrator_service.stop()
+        data.close()
 
     @app.middleware("http")
     async def log_requests(request: Request, call_next):  # type: ignore[override]
@@ -407,6 +409,8 @@ def create_app(config: APIServerConfig) -> FastAPI:
             tool_budget_remaining=max(0, budget_remaining),
             tool_budget_total=budget_total,
             last_event_age_ms=realtime.get("last_event_age_ms"),
+            connection_pool=data.pool_stats(),
+            shard_fanout=data.fanout_stats(),
         )
 
     @app.get("/v1/assistant/status", response_model=AssistantStatusResponse)
@@ -461,6 +465,9 @@ def create_app(config: APIServerConfig) -> FastAPI:
         since: Optional[str] = Query(None, description="Return rows with mtime >= this ISO timestamp."),
         limit: Optional[int] = Query(None, ge=1),
         offset: Optional[int] = Query(None, ge=0),
+        cursor: Optional[str] = Query(
+            None, description="Opaque next_cursor from the previous page; takes precedence over offset."
+        ),
         _: str = Depends(auth_dependency),
     ) -> InventoryResponse:
         ensure_drive(drive_label)
@@ -474,6 +481,7 @@ def create_app(config: APIServerConfig) -> FastAPI:
                 since=since,
                 limit=limit,
                 offset=offset,
+                cursor=cursor,
             )
         except ValueError as exc:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -482,6 +490,7 @@ def create_app(config: APIServerConfig) -> FastAPI:
             limit=pagination.limit,
             offset=pagination.offset,
             next_offset=next_offset,
+            next_cursor=pagination.next_cursor,
             total_estimate=total,
         )
 
@@ -604,6 +613,9 @@ def create_app(config: APIServerConfig) -> FastAPI:
         ),
         limit: Optional[int] = Query(None, ge=1),
         offset: Optional[int] = Query(None, ge=0),
+        cursor: Optional[str] = Query(
+            None, description="Opaque next_cursor from the previous page; takes precedence over offset."
+        ),
         _: str = Depends(auth_dependency),
     ) -> MusicResponse:
         ensure_drive(drive_label)
@@ -615,6 +627,7 @@ def create_app(config: APIServerConfig) -> FastAPI:
                 min_confidence=min_confidence,
                 limit=limit,
                 offset=offset,
+                cursor=cursor,
             )
         except ValueError as exc:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -624,6 +637,7 @@ def create_app(config: APIServerConfig) -> FastAPI:
             limit=pagination.limit,
             offset=pagination.offset,
             next_offset=next_offset,
+            next_cursor=pagination.next_cursor,
             total_estimate=total,
         )
 
@@ -632,20 +646,28 @@ def create_app(config: APIServerConfig) -> FastAPI:
         drive_label: str = Query(..., description="Drive label to query."),
         limit: Optional[int] = Query(None, ge=1),
         offset: Optional[int] = Query(None, ge=0),
+        cursor: Optional[str] = Query(
+            None, description="Opaque next_cursor from the previous page; takes precedence over offset."
+        ),
         _: str = Depends(auth_dependency),
     ) -> MusicReviewResponse:
         ensure_drive(drive_label)
-        results, pagination, next_offset, total = data.music_review_page(
-            drive_label,
-            limit=limit,
-            offset=offset,
-        )
+        try:
+            results, pagination, next_offset, total = data.music_review_page(
+                drive_label,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
         return MusicReviewResponse(
             drive_label=drive_label,
             results=results,
             limit=pagination.limit,
             offset=pagination.offset,
             next_offset=next_offset,
+            next_cursor=pagination.next_cursor,
             total_estimate=total,
         )
 
@@ -663,24 +685,31 @@ def create_app(config: APIServerConfig) -> FastAPI:
         order: str = Query("asc", description="Sort order asc|desc."),
         limit: Optional[int] = Query(None, ge=1),
         offset: Optional[int] = Query(None, ge=0),
+        cursor: Optional[str] = Query(
+            None, description="Opaque next_cursor from the previous page; takes precedence over offset."
+        ),
         only_low_confidence: bool = Query(False, description="Return only low-confidence rows."),
         _: str = Depends(auth_dependency),
     ) -> CatalogMoviesResponse:
-        results, pagination, next_offset, total = data.catalog_movies_page(
-            query=query,
-            year_min=year_min,
-            year_max=year_max,
-            confidence_min=conf_min,
-            quality_min=quality_min,
-            audio_langs=parse_langs(lang_audio),
-            subs_langs=parse_langs(lang_sub),
-            drive=drive,
-            only_low_confidence=only_low_confidence,
-            sort=sort,
-            order=order,
-            limit=limit,
-            offset=offset,
-        )
+        try:
+            results, pagination, next_offset, total = data.catalog_movies_page(
+                query=query,
+                year_min=year_min,
+                year_max=year_max,
+                confidence_min=conf_min,
+                quality_min=quality_min,
+                audio_langs=parse_langs(lang_audio),
+                subs_langs=parse_langs(lang_sub),
+                drive=drive,
+                only_low_confidence=only_low_confidence,
+                sort=sort,
+                order=order,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
         payload = [
             {
                 **row,
@@ -694,7 +723,10 @@ def create_app(config: APIServerConfig) -> FastAPI:
             limit=pagination.limit,
             offset=pagination.offset,
             next_offset=next_offset,
+            next_cursor=pagination.next_cursor,
             total_estimate=total,
+            partial=bool(pagination.skipped_drives),
+            skipped_drives=pagination.skipped_drives,
         )
 
     @app.get("/v1/catalog/tv/series", response_model=CatalogSeriesResponse)
@@ -706,19 +738,26 @@ def create_app(config: APIServerConfig) -> FastAPI:
         order: str = Query("asc", description="Sort order asc|desc."),
         limit: Optional[int] = Query(None, ge=1),
         offset: Optional[int] = Query(None, ge=0),
+        cursor: Optional[str] = Query(
+            None, description="Opaque next_cursor from the previous page; takes precedence over offset."
+        ),
         only_low_confidence: bool = Query(False, description="Return only low confidence entries."),
         _: str = Depends(auth_dependency),
     ) -> CatalogSeriesResponse:
-        results, pagination, next_offset, total = data.catalog_tv_series_page(
-            query=query,
-            confidence_min=conf_min,
-            drive=drive,
-            only_low_confidence=only_low_confidence,
-            sort=sort,
-            order=order,
-            limit=limit,
-            offset=offset,
-        )
+        try:
+            results, pagination, next_offset, total = data.catalog_tv_series_page(
+                query=query,
+                confidence_min=conf_min,
+                drive=drive,
+                only_low_confidence=only_low_confidence,
+                sort=sort,
+                order=order,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
         payload = [
             {
                 **row,
@@ -731,7 +770,10 @@ def create_app(config: APIServerConfig) -> FastAPI:
             limit=pagination.limit,
             offset=pagination.offset,
             next_offset=next_offset,
+            next_cursor=pagination.next_cursor,
             total_estimate=total,
+            partial=bool(pagination.skipped_drives),
+            skipped_drives=pagination.skipped_drives,
         )
 
     @app.get("/v1/catalog/tv/seasons", response_model=CatalogSeasonsResponse)
@@ -822,6 +864,7 @@ def create_app(config: APIServerConfig) -> FastAPI:
         genre_filters = parse_langs(genres)
         subs_flag = parse_bool_token(subs)
         resolved_limit = clamp_limit(limit, 40)
+        skipped: List[str] = []
         candidates = data.playlist_candidates(
             dur_min=dur_min,
             dur_max=dur_max,
@@ -834,6 +877,7 @@ def create_app(config: APIServerConfig) -> FastAPI:
             drive=drive,
             genres=genre_filters,
             limit=resolved_limit,
+            skipped=skipped,
         )
         payload = [
             PlaylistCandidate(
@@ -854,7 +898,12 @@ def create_app(config: APIServerConfig) -> FastAPI:
             )
             for row in candidates
         ]
-        return PlaylistSuggestResponse(limit=resolved_limit, candidates=payload)
+        return PlaylistSuggestResponse(
+            limit=resolved_limit,
+            candidates=payload,
+            partial=bool(skipped),
+            skipped_drives=skipped,
+        )
 
     @app.post("/v1/playlist/build", response_model=PlaylistBuildResponse)
     def playlist_build(
@@ -1023,8 +1072,15 @@ def create_app(config: APIServerConfig) -> FastAPI:
         top_k: int = Query(20, ge=1, le=100),
         _: str = Depends(auth_dependency),
     ) -> CatalogSearchResponse:
-        hits = data.catalog_search(q, mode=mode, top_k=top_k)
-        return CatalogSearchResponse(mode=mode, query=q, results=hits)
+        skipped: List[str] = []
+        hits = data.catalog_search(q, mode=mode, top_k=top_k, skipped=skipped)
+        return CatalogSearchResponse(
+            mode=mode,
+            query=q,
+            results=hits,
+            partial=bool(skipped),
+            skipped_drives=skipped,
+        )
 
     @app.get("/v1/stats", response_model=DriveStatsResponse)
     def stats(
@@ -1035,6 +1091,17 @@ def create_app(config: APIServerConfig) -> FastAPI:
         payload = data.drive_stats(drive_label)
         return DriveStatsResponse(**payload)
 
+    @app.get("/v1/scan/timings", response_model=ScanTimingsResponse)
+    def scan_timings(
+        drive_label: str = Query(..., description="Drive label to query."),
+        _: str = Depends(auth_dependency),
+    ) -> ScanTimingsResponse:
+        ensure_drive(drive_label)
+        payload = data.scan_timings(drive_label)
+        if payload is None:
+            raise HTTPException(status_code=404, detail="no scan timings recorded")
+        return ScanTimingsResponse(**payload)
+
     @app.get("/v1/reports/overview", response_model=OverviewReport)
     def reports_overview(
         drive_label: str = Query(..., description="Drive label to query."),
@@ -1206,21 +1273,29 @@ def create_app(config: APIServerConfig) -> FastAPI:
         kind: Optional[str] = Query(None, description="Feature kind (image/video)."),
         limit: Optional[int] = Query(None, ge=1),
         offset: Optional[int] = Query(None, ge=0),
+        cursor: Optional[str] = Query(
+            None, description="Opaque next_cursor from the previous page; takes precedence over offset."
+        ),
         _: str = Depends(auth_dependency),
     ) -> FeaturesResponse:
         ensure_drive(drive_label)
-        results, pagination, next_offset, total = data.features_page(
-            drive_label,
-            path_query=path,
-            kind=kind,
-            limit=limit,
-            offset=offset,
-        )
+        try:
+            results, pagination, next_offset, total = data.features_page(
+                drive_label,
+                path_query=path,
+                kind=kind,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
         return FeaturesResponse(
             results=results,
             limit=pagination.limit,
             offset=pagination.offset,
             next_offset=next_offset,
+            next_cursor=pagination.next_cursor,
             total_estimate=total,
         )
 
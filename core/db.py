@@ -25,6 +25,7 @@ def connect(
     detect_types: int = 0,
     isolation_level: Optional[str] = None,
     check_same_thread: bool = False,
+    cached_statements: int = 128,
 ) -> sqlite3.Connection:
     """Return a configured SQLite connection with sane defaults."""
 
@@ -40,6 +41,7 @@ def connect(
             detect_types=detect_types,
             isolation_level=isolation_level,
             check_same_thread=check_same_thread,
+            cached_statements=cached_statements,
         )
     else:
         conn = sqlite3.connect(
@@ -48,6 +50,7 @@ def connect(
             detect_types=detect_types,
             isolation_level=isolation_level,
             check_same_thread=check_same_thread,
+            cached_statements=cached_statements,
         )
     configure_connection(conn, enable_wal=not read_only)
     return conn
@@ -0,0 +1,291 @@
+"""Persistent cache of ffprobe/mediainfo output stored in drive shards.
+
+Entries are keyed by ``(drive_label, path, tool)`` and carry the file size and
+modification time seen when the probe ran; a lookup only hits when both still
+match, so edited files are probed again. The scanner, the quality pipeline,
+visual review and the light-analysis analyzers share the same table, which
+avoids spawning one external process per consumer for every video.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import sqlite3
+import subprocess
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from .db import connect
+
+__all__ = [
+    "FFPROBE",
+    "MEDIAINFO",
+    "ProbeCache",
+    "duration_from_payload",
+    "ensure_probe_cache_table",
+    "ffprobe_json",
+]
+
+FFPROBE = "ffprobe"
+MEDIAINFO = "mediainfo"
+
+_LONG_PATH_PREFIX = "\\\\?\\"
+_LONG_UNC_PREFIX = "\\\\?\\UNC\\"
+
+PathLike = Union[str, Path]
+
+LOGGER = logging.getLogger("videocatalog.probe_cache")
+
+
+def ensure_probe_cache_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS media_probe_cache (
+            drive_label TEXT NOT NULL,
+            path TEXT NOT NULL,
+            tool TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            payload_json TEXT NOT NULL,
+            updated_utc TEXT NOT NULL,
+            PRIMARY KEY (drive_label, path, tool)
+        )
+        """
+    )
+
+
+def _cache_path(path: PathLike) -> str:
+    text = str(path)
+    if text.startswith(_LONG_UNC_PREFIX):
+        return "\\\\" + text[len(_LONG_UNC_PREFIX) :]
+    if text.startswith(_LONG_PATH_PREFIX):
+        return text[len(_LONG_PATH_PREFIX) :]
+    return text
+
+
+def _positive(value: Any) -> Optional[float]:
+    try:
+        number = float(str(value).strip()) if isinstance(value, str) else float(value)
+    except (TypeError, ValueError):
+        return None
+    if math.isfinite(number) and number > 0:
+        return number
+    return None
+
+
+def duration_from_payload(tool: str, payload: Dict[str, Any]) -> Optional[float]:
+    """Extract a duration in seconds from cached ffprobe or mediainfo JSON."""
+
+    if tool == FFPROBE:
+        fmt = payload.get("format") if isinstance(payload.get("format"), dict) else {}
+        duration = _positive(fmt.get("duration"))
+        if duration is not None:
+            return duration
+        streams = payload.get("streams") if isinstance(payload.get("streams"), list) else []
+        for stream in streams:
+            if isinstance(stream, dict) and stream.get("codec_type") == "video":
+                duration = _positive(stream.get("duration"))
+                if duration is not None:
+                    return duration
+        return None
+    media = payload.get("media") if isinstance(payload.get("media"), dict) else {}
+    tracks = media.get("track") if isinstance(media.get("track"), list) else []
+    for wanted in ("General", "Video"):
+        for track in tracks:
+            if isinstance(track, dict) and track.get("@type") == wanted:
+                duration = _positive(track.get("Duration"))
+                if duration is not None:
+                    return duration
+    return None
+
+
+def ffprobe_json(executable: PathLike, path: PathLike, *, timeout: float = 10.0) -> Dict[str, Any]:
+    """Run ``ffprobe -show_format -show_streams`` and return the parsed JSON.
+
+    Raises ``RuntimeError`` with ffprobe's message when it exits non-zero and
+    lets subprocess and JSON errors propagate to the caller.
+    """
+
+    proc = subprocess.run(
+        [str(executable), "-v", "error", "-show_streams", "-show_format", "-of", "json", str(path)],
+        check=False,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        timeout=max(1.0, float(timeout)),
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip() or proc.stdout.strip() or "ffprobe error")
+    parsed = json.loads(proc.stdout or "{}")
+    return parsed if isinstance(parsed, dict) else {}
+
+
+class ProbeCache:
+    """Thread-safe view of ``media_probe_cache`` for one drive."""
+
+    def __init__(self, conn: sqlite3.Connection, drive_label: str) -> None:
+        self._conn = conn
+        self._drive_label = drive_label
+        self._lock = threading.Lock()
+        self._owns_connection = False
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+        with self._lock:
+            ensure_probe_cache_table(self._conn)
+
+    @classmethod
+    def open(cls, shard_path: PathLike, drive_label: str) -> "ProbeCache":
+        cache = cls(connect(shard_path, read_only=False, check_same_thread=False), drive_label)
+        cache._owns_connection = True
+        return cache
+
+    def _failed(self, action: str, exc: sqlite3.Error) -> None:
+        # The cache is an optimisation: a busy or damaged shard must not fail
+        # the probe itself, so errors only turn into misses and skipped writes.
+        with self._lock:
+            self.errors += 1
+            first = self.errors == 1
+        if first:
+            LOGGER.warning(
+                "Probe cache %s failed for %s, probing without the cache: %s", action, self._drive_label, exc
+            )
+
+    def _lookup(self, tool: str, path: PathLike, st: os.stat_result) -> Optional[Dict[str, Any]]:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    """
+                    SELECT payload_json FROM media_probe_cache
+                    WHERE drive_label=? AND path=? AND tool=? AND size_bytes=? AND mtime_ns=?
+                    """,
+                    (self._drive_label, _cache_path(path), tool, int(st.st_size), int(st.st_mtime_ns)),
+                ).fetchone()
+        except sqlite3.Error as exc:
+            self._failed("lookup", exc)
+            return None
+        if row is None:
+            return None
+        try:
+            payload = json.loads(row[0])
+        except (TypeError, json.JSONDecodeError):
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, tool: str, path: PathLike, *, fs_path: Optional[PathLike] = None) -> Optional[Dict[str, Any]]:
+        """Return the cached payload for *path* if size and mtime still match."""
+
+        try:
+            st = os.stat(fs_path if fs_path is not None else path)
+        except OSError:
+            return None
+        payload = self._lookup(tool, path, st)
+        self._count(payload is not None)
+        return payload
+
+    def put(
+        self,
+        tool: str,
+        path: PathLike,
+        payload: Dict[str, Any],
+        *,
+        fs_path: Optional[PathLike] = None,
+    ) -> None:
+        try:
+            st = os.stat(fs_path if fs_path is not None else path)
+        except OSError:
+            return
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        try:
+            self._store(tool, path, payload, st, now)
+        except sqlite3.Error as exc:
+            self._failed("write", exc)
+
+    def _store(self, tool: str, path: PathLike, payload: Dict[str, Any], st: os.stat_result, now: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO media_probe_cache(
+                    drive_label, path, tool, size_bytes, mtime_ns, payload_json, updated_utc
+                )
+                VALUES(?,?,?,?,?,?,?)
+                ON CONFLICT(drive_label, path, tool) DO UPDATE SET
+                    size_bytes=excluded.size_bytes,
+                    mtime_ns=excluded.mtime_ns,
+                    payload_json=excluded.payload_json,
+                    updated_utc=excluded.updated_utc
+                """,
+                (
+                    self._drive_label,
+                    _cache_path(path),
+                    tool,
+                    int(st.st_size),
+                    int(st.st_mtime_ns),
+                    json.dumps(payload, ensure_ascii=False),
+                    now,
+                ),
+            )
+            if self._conn.in_transaction:
+                self._conn.commit()
+            self.writes += 1
+
+    def duration(
+        self,
+        path: PathLike,
+        *,
+        ffprobe: Optional[PathLike] = None,
+        timeout: float = 10.0,
+    ) -> Optional[float]:
+        """Return the media duration, probing with *ffprobe* only on a miss."""
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        for tool in (FFPROBE, MEDIAINFO):
+            payload = self._lookup(tool, path, st)
+            if payload is not None:
+                duration = duration_from_payload(tool, payload)
+                if duration is not None:
+                    self._count(True)
+                    return duration
+        self._count(False)
+        if ffprobe is None:
+            return None
+        try:
+            payload = ffprobe_json(ffprobe, path, timeout=timeout)
+        except Exception:
+            return None
+        self.put(FFPROBE, path, payload)
+        return duration_from_payload(FFPROBE, payload)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": int(self.hits),
+            "misses": int(self.misses),
+            "writes": int(self.writes),
+            "errors": int(self.errors),
+        }
+
+    def close(self) -> None:
+        if self._owns_connection:
+            with self._lock:
+                self._conn.close()
+
+    def __enter__(self) -> "ProbeCache":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
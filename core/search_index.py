@@ -0,0 +1,201 @@
+"""Trigram FTS5 indexes for substring search in drive shards.
+
+Path and title search used ``LOWER(col) LIKE '%term%'``, which reads every
+row of the table. Each searchable table gets an external-content FTS5 table
+using the ``trigram`` tokenizer. Such a table stores only the trigram index
+and reads column values from the base table by rowid, and it can answer
+substring queries of three or more characters from the index.
+
+Writing to FTS5 from a row trigger flushes its buffer on every row, which
+made inventory inserts about six times slower. So the triggers only record
+new or changed rowids in a ``<table>_fts_pending`` queue. Writers call
+:func:`sync_search_index` inside their transaction, which indexes the
+queued rows with one ``INSERT ... SELECT``. Readers also treat queued rows
+as candidates, so rows that were not synced yet are still found.
+Deletes and in-place updates remove stale entries straight from the
+trigger. The triggers rely on writers using ``INSERT ... ON CONFLICT DO
+UPDATE``: ``INSERT OR REPLACE`` deletes rows without firing delete triggers
+and would leave stale entries. VACUUM may renumber rowids of these tables,
+so :func:`rebuild_search_indexes` must run after it.
+
+Callers keep their original ``LIKE`` predicate and add
+:func:`match_clause` for the same pattern in front of it. The index narrows
+the rows to check, and the ``LIKE`` keeps the exact matching semantics
+callers had before.
+"""
+from __future__ import annotations
+
+import re
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+__all__ = [
+    "MIN_QUERY_LENGTH",
+    "SEARCH_TABLES",
+    "ensure_search_index",
+    "ensure_search_indexes",
+    "fts_table",
+    "match_clause",
+    "rebuild_search_indexes",
+    "sync_search_index",
+]
+
+# Trigrams cannot match anything shorter.
+MIN_QUERY_LENGTH = 3
+
+# Base table -> indexed columns.
+SEARCH_TABLES: Dict[str, Tuple[str, ...]] = {
+    "inventory": ("path",),
+    "folder_profile": ("folder_path", "parsed_title"),
+    "tv_episode_profile": ("episode_path", "parsed_title"),
+}
+
+
+def fts_table(table: str) -> str:
+    return f"{table}_fts"
+
+
+def _pending_table(table: str) -> str:
+    return f"{table}_fts_pending"
+
+
+def _existing(conn: sqlite3.Connection, kind: str = "table") -> set:
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type=?", (kind,)).fetchall()
+    return {str(row[0]) for row in rows}
+
+
+def ensure_search_index(conn: sqlite3.Connection, table: str) -> bool:
+    """Create the FTS table, queue and triggers for ``table`` if missing.
+
+    A newly created index (or one whose triggers went missing) is filled
+    from the existing rows. Returns ``False`` when ``table`` does not exist
+    or SQLite lacks the trigram tokenizer (before 3.34); callers then keep
+    using plain ``LIKE``.
+    """
+
+    columns = SEARCH_TABLES[table]
+    fts = fts_table(table)
+    pending = _pending_table(table)
+    existing = _existing(conn)
+    if table not in existing:
+        return False
+    triggers = {f"trg_{fts}_{name}" for name in ("ai", "ad", "au")}
+    if {fts, pending} <= existing and triggers <= _existing(conn, "trigger"):
+        return True
+    column_list = ", ".join(columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    try:
+        conn.execute(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {column_list},
+                content='{table}',
+                content_rowid='rowid',
+                tokenize='trigram'
+            )
+            """
+        )
+    except sqlite3.OperationalError:
+        return False
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {pending} (id INTEGER PRIMARY KEY)")
+    # Rows still queued were never indexed, so there is nothing to delete.
+    delete_old = (
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) "
+        f"SELECT 'delete', old.rowid, {old_values} "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {pending} WHERE id = old.rowid);\n"
+        f"DELETE FROM {pending} WHERE id = old.rowid;"
+    )
+    queue_new = f"INSERT OR IGNORE INTO {pending}(id) VALUES (new.rowid);"
+    for name, event, body in (
+        ("ai", "INSERT", queue_new),
+        ("ad", "DELETE", delete_old),
+        ("au", f"UPDATE OF {column_list}", delete_old + "\n" + queue_new),
+    ):
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS trg_{fts}_{name} AFTER {event} ON {table} BEGIN\n{body}\nEND"
+        )
+    conn.execute(f"DELETE FROM {pending}")
+    conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+    conn.commit()
+    return True
+
+
+def sync_search_index(conn: sqlite3.Connection, table: str) -> int:
+    """Index the rows queued for ``table``; returns how many were queued.
+
+    Run it inside the writer's transaction so readers never see the base
+    rows without their index entries. Does nothing when ``table`` has no
+    index.
+    """
+
+    columns = ", ".join(SEARCH_TABLES[table])
+    selected = ", ".join(f"base.{column}" for column in SEARCH_TABLES[table])
+    fts = fts_table(table)
+    pending = _pending_table(table)
+    try:
+        cursor = conn.execute(
+            f"""
+            INSERT INTO {fts}(rowid, {columns})
+            SELECT base.rowid, {selected}
+            FROM {pending} AS queued
+            JOIN {table} AS base ON base.rowid = queued.id
+            """
+        )
+    except sqlite3.OperationalError:
+        return 0
+    conn.execute(f"DELETE FROM {pending}")
+    return max(0, cursor.rowcount)
+
+
+def ensure_search_indexes(conn: sqlite3.Connection) -> List[str]:
+    """Ensure indexes for every searchable table present in ``conn``."""
+
+    return [fts_table(table) for table in SEARCH_TABLES if ensure_search_index(conn, table)]
+
+
+def rebuild_search_indexes(conn: sqlite3.Connection) -> List[str]:
+    """Rebuild existing indexes from their base tables (needed after VACUUM)."""
+
+    existing = _existing(conn)
+    rebuilt: List[str] = []
+    for table in SEARCH_TABLES:
+        fts = fts_table(table)
+        pending = _pending_table(table)
+        if {table, fts, pending} <= existing:
+            conn.execute(f"DELETE FROM {pending}")
+            conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            rebuilt.append(fts)
+    conn.commit()
+    return rebuilt
+
+
+def match_clause(
+    table: str,
+    pattern: Optional[str],
+    tables: Optional[Iterable[str]] = None,
+) -> Optional[Tuple[str, Sequence[str]]]:
+    """Return a ``rowid IN (...)`` prefilter for a ``LIKE`` pattern, or ``None``.
+
+    Every literal run between ``%`` and ``_`` wildcards must appear in a
+    matching value, so the runs of three or more characters become FTS
+    phrases that must all be present. ``tables`` holds the table names of
+    the connection; leave it out when the caller knows the index exists.
+    ``None`` means the caller should search without the index: the index
+    is missing or no run is long enough for trigrams.
+    """
+
+    fts = fts_table(table)
+    pending = _pending_table(table)
+    if not pattern:
+        return None
+    if tables is not None and not {fts, pending} <= set(tables):
+        return None
+    runs = [run for run in re.split(r"[%_]+", str(pattern)) if len(run) >= MIN_QUERY_LENGTH]
+    if not runs:
+        return None
+    query = " AND ".join('"' + run.replace('"', '""') + '"' for run in runs)
+    return (
+        f"(rowid IN (SELECT rowid FROM {fts} WHERE {fts} MATCH ?)"
+        f" OR rowid IN (SELECT id FROM {pending}))",
+        (query,),
+    )
@@ -144,6 +144,22 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
         "cors_origins": ["http://localhost", "http://127.0.0.1"],
         "default_limit": 100,
         "max_page_size": 500,
+        "catalog_index": True,
+        "catalog_index_refresh_s": 10,
+        "connection_pool": {
+            "enabled": True,
+            "max_per_path": 4,
+            "max_total": 64,
+            "idle_seconds": 300,
+            "mmap_mb": 64,
+            "cache_mb": 4,
+            "statement_cache": 256,
+        },
+        "shard_fanout": {
+            "enabled": True,
+            "max_workers": 0,
+            "shard_budget_s": 10.0,
+        },
     },
     "assistant": {
         "enable": False,
@@ -13,6 +13,7 @@ from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Un
 
 from core.db import backup_sqlite, connect, pragma_optimize
 from core.paths import get_shards_dir, resolve_working_dir, safe_label
+from core.search_index import rebuild_search_indexes
 from core.settings import load_settings, save_settings
 
 
@@ -281,6 +282,8 @@ def vacuum_if_needed(
         conn.commit()
         conn.execute("VACUUM")
         conn.commit()
+        # VACUUM may renumber the rowids the FTS search indexes point at.
+        rebuilt = rebuild_search_indexes(conn)
     after_bytes = _total_db_size(path)
     reclaimed = max(0, before_bytes - after_bytes)
     duration = time.perf_counter() - start
@@ -297,6 +300,7 @@ def vacuum_if_needed(
         "path": str(path),
         "free_bytes": free_estimate,
         "threshold": threshold_bytes,
+        "search_indexes_rebuilt": rebuilt,
     }
 
 
@@ -0,0 +1,236 @@
+"""Per-directory state used by fast delta rescans.
+
+A directory's modification time changes whenever an entry is created,
+removed or renamed inside it, on every filesystem the scanner supports.
+Fast delta scans record each directory's mtime, entry count and a digest of
+its children after a completed scan; on the next scan a directory whose
+mtime still matches is not listed at all. Its files are restored in bulk
+from the shard and only its recorded subdirectories are visited (one
+``stat`` each), so an untouched tree costs one stat per directory instead of
+one per file.
+
+Directory mtimes do not change when a file is rewritten in place, so fast
+delta trades those edits for speed; a regular rescan picks them up. Records
+whose mtime falls within :data:`MTIME_GRANULARITY_NS` of the scan that wrote
+them are never trusted, because coarse timestamps (FAT keeps two seconds)
+could hide a change made in the same tick.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+MTIME_GRANULARITY_NS = 2_000_000_000
+
+_INSERT_CHUNK = 1000
+
+
+class DirectoryRecord(NamedTuple):
+    mtime_ns: int
+    entry_count: int
+    child_digest: str
+    subdirs: Tuple[str, ...]
+    file_count: int
+    file_bytes: int
+    av_count: int
+    categories: Optional[Dict[str, int]]
+    checked_ns: int
+
+    def trusted(self) -> bool:
+        """Return ``True`` when the recorded mtime predates the recording scan."""
+
+        return self.mtime_ns + MTIME_GRANULARITY_NS <= self.checked_ns
+
+
+def ensure_directories_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS directories(
+            drive_label TEXT NOT NULL,
+            path TEXT NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            entry_count INTEGER NOT NULL,
+            child_digest TEXT NOT NULL,
+            subdirs_json TEXT NOT NULL,
+            file_count INTEGER NOT NULL,
+            file_bytes INTEGER NOT NULL,
+            av_count INTEGER NOT NULL,
+            categories_json TEXT,
+            checked_ns INTEGER NOT NULL,
+            updated_utc TEXT NOT NULL,
+            PRIMARY KEY(drive_label, path)
+        )
+        """
+    )
+
+
+def child_digest(entries: Iterable[Tuple[str, str, int, int]]) -> str:
+    """Digest ``(name, kind, size, mtime_ns)`` tuples independent of listing order."""
+
+    hasher = hashlib.blake2b(digest_size=16)
+    for name, kind, size, mtime_ns in sorted(entries):
+        hasher.update(f"{name}\0{kind}\0{int(size)}\0{int(mtime_ns)}\n".encode("utf-8", "surrogatepass"))
+    return hasher.hexdigest()
+
+
+class DirectoryState:
+    """Stored directory records for one drive plus the records of the running scan.
+
+    :meth:`match` answers whether a directory can be skipped, :meth:`keep`
+    and :meth:`record` collect what the current scan saw, and :meth:`save`
+    replaces the stored rows once the scan has completed.
+    """
+
+    def __init__(self, drive_label: str, stored: Dict[str, DirectoryRecord], *, checked_ns: int) -> None:
+        self.drive_label = drive_label
+        self._stored = stored
+        self._checked_ns = int(checked_ns)
+        self._current: Dict[str, DirectoryRecord] = {}
+        self.skipped_dirs = 0
+        self.skipped_files = 0
+        self.listed_dirs = 0
+        self.unchanged_listings = 0
+
+    @classmethod
+    def load(cls, conn: sqlite3.Connection, drive_label: str, *, checked_ns: int) -> "DirectoryState":
+        ensure_directories_table(conn)
+        stored: Dict[str, DirectoryRecord] = {}
+        for row in conn.execute(
+            """
+            SELECT path, mtime_ns, entry_count, child_digest, subdirs_json, file_count, file_bytes,
+                   av_count, categories_json, checked_ns
+            FROM directories WHERE drive_label=?
+            """,
+            (drive_label,),
+        ):
+            path, mtime_ns, entry_count, digest, subdirs_json, files, size, av, categories_json, checked = row
+            try:
+                subdirs = tuple(json.loads(subdirs_json or "[]"))
+                categories = json.loads(categories_json) if categories_json else None
+            except (TypeError, ValueError):
+                continue
+            stored[path] = DirectoryRecord(
+                int(mtime_ns),
+                int(entry_count),
+                str(digest),
+                subdirs,
+                int(files),
+                int(size),
+                int(av),
+                categories,
+                int(checked),
+            )
+        return cls(drive_label, stored, checked_ns=checked_ns)
+
+    def __len__(self) -> int:
+        return len(self._stored)
+
+    def stored(self, path: str) -> Optional[DirectoryRecord]:
+        return self._stored.get(path)
+
+    def match(self, path: str, stat_result: Optional[os.stat_result]) -> Optional[DirectoryRecord]:
+        """Return the stored record when ``path`` is unchanged since it was recorded."""
+
+        if stat_result is None:
+            return None
+        record = self._stored.get(path)
+        if record is None or not record.trusted():
+            return None
+        if int(stat_result.st_mtime_ns) != record.mtime_ns:
+            return None
+        return record
+
+    def keep(self, path: str, record: DirectoryRecord) -> None:
+        """Carry a skipped directory's record over to the current scan."""
+
+        self._current[path] = record
+        self.skipped_dirs += 1
+        self.skipped_files += record.file_count
+
+    def record(
+        self,
+        path: str,
+        *,
+        mtime_ns: int,
+        entries: List[Tuple[str, str, int, int]],
+        subdirs: List[str],
+        file_count: int,
+        file_bytes: int,
+        av_count: int,
+        categories: Optional[Dict[str, int]],
+    ) -> DirectoryRecord:
+        record = DirectoryRecord(
+            int(mtime_ns),
+            len(entries),
+            child_digest(entries),
+            tuple(subdirs),
+            int(file_count),
+            int(file_bytes),
+            int(av_count),
+            categories,
+            self._checked_ns,
+        )
+        self._current[path] = record
+        self.listed_dirs += 1
+        return record
+
+    def save(self, conn: sqlite3.Connection) -> int:
+        """Replace the drive's stored records with the ones from this scan."""
+
+        timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+        rows = [
+            (
+                self.drive_label,
+                path,
+                record.mtime_ns,
+                record.entry_count,
+                record.child_digest,
+                json.dumps(list(record.subdirs), ensure_ascii=False),
+                record.file_count,
+                record.file_bytes,
+                record.av_count,
+                json.dumps(record.categories, sort_keys=True) if record.categories is not None else None,
+                record.checked_ns,
+                timestamp,
+            )
+            for path, record in self._current.items()
+        ]
+        cur = conn.cursor()
+        cur.execute("DELETE FROM directories WHERE drive_label=?", (self.drive_label,))
+        for start in range(0, len(rows), _INSERT_CHUNK):
+            cur.executemany(
+                """
+                INSERT INTO directories(
+                    drive_label, path, mtime_ns, entry_count, child_digest, subdirs_json, file_count,
+                    file_bytes, av_count, categories_json, checked_ns, updated_utc
+                )
+                VALUES(?,?,?,?,?,?,?,?,?,?,?,?)
+                """,
+                rows[start : start + _INSERT_CHUNK],
+            )
+        conn.commit()
+        self._stored = dict(self._current)
+        return len(rows)
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "dirs_recorded": len(self._current),
+            "dirs_skipped": self.skipped_dirs,
+            "files_skipped": self.skipped_files,
+            "dirs_listed": self.listed_dirs,
+            "dirs_unchanged_listing": self.unchanged_listings,
+        }
+
+
+__all__ = [
+    "MTIME_GRANULARITY_NS",
+    "DirectoryRecord",
+    "DirectoryState",
+    "child_digest",
+    "ensure_directories_table",
+]
@@ -0,0 +1,225 @@
+"""Directory-frontier checkpoints for resuming interrupted scans.
+
+A scan walks the tree depth-first from a stack of directories. Every few
+seconds :class:`ScanFrontier` persists that stack together with the
+directories that are fully done: listed, and every file queued from them
+processed and committed. Directories that were listed but still have files
+in flight are saved as pending too, so an interrupted scan lists them again.
+Their committed files then match the shard and are skipped as unchanged.
+
+On resume the scan restores the stack instead of starting at the root. Done
+directories are never listed again; their rows are taken out of the
+reconciliation index so they are not mistaken for deleted files, and the
+file, byte and category counts stored with them keep the scan totals whole.
+Nothing is enumerated twice except the few directories that were in flight.
+
+Callers must commit the files they drained before calling :meth:`save`, so a
+directory is only recorded as done once its rows are in the shard.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+_INSERT_CHUNK = 1000
+
+
+class DirectoryTotals(NamedTuple):
+    files: int = 0
+    bytes: int = 0
+    av: int = 0
+    categories: Optional[Dict[str, int]] = None
+
+
+def ensure_frontier_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS scan_frontier(
+            drive_label TEXT NOT NULL,
+            path TEXT NOT NULL,
+            state TEXT NOT NULL,
+            seq INTEGER,
+            file_count INTEGER,
+            file_bytes INTEGER,
+            av_count INTEGER,
+            categories_json TEXT,
+            PRIMARY KEY(drive_label, path)
+        )
+        """
+    )
+
+
+class ScanFrontier:
+    """Track and persist which directories of a scan are pending or done.
+
+    The scan reports each directory with :meth:`begin` and :meth:`end`, and
+    each queued file with :meth:`add_task` and :meth:`task_done`. A directory
+    becomes done when its listing has ended and its last task is drained.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        drive_label: str,
+        *,
+        pending: Optional[List[str]] = None,
+        done: Optional[Dict[str, DirectoryTotals]] = None,
+        interval_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.conn = conn
+        self.drive_label = drive_label
+        self.restored_pending: List[str] = list(pending or [])
+        self._restored: Dict[str, DirectoryTotals] = dict(done or {})
+        self._done: Set[str] = set(self._restored)
+        self.restored_done = len(self._done)
+        self._resuming = bool(self.restored_pending or self._done)
+        # Only a resumed walk can reach a directory twice: an in-flight
+        # directory is listed again and pushes children already restored.
+        self._visited: Set[str] = set()
+        self._listing: Set[str] = set()
+        self._waiting: Set[str] = set()
+        self._outstanding: Dict[str, int] = {}
+        self._totals: Dict[str, DirectoryTotals] = {}
+        self._new_done: List[Tuple[str, DirectoryTotals]] = []
+        self._interval = max(0.0, float(interval_seconds))
+        self._clock = clock
+        self._last_save = clock()
+        self.saves = 0
+
+    @classmethod
+    def load(cls, conn: sqlite3.Connection, drive_label: str, **kwargs: object) -> "ScanFrontier":
+        ensure_frontier_table(conn)
+        pending: List[str] = []
+        done: Dict[str, DirectoryTotals] = {}
+        for path, state, files, size, av, categories_json in conn.execute(
+            """
+            SELECT path, state, file_count, file_bytes, av_count, categories_json
+            FROM scan_frontier WHERE drive_label=? ORDER BY seq, path
+            """,
+            (drive_label,),
+        ):
+            if state != "done":
+                pending.append(path)
+                continue
+            try:
+                categories = json.loads(categories_json) if categories_json else None
+            except ValueError:
+                categories = None
+            done[path] = DirectoryTotals(int(files or 0), int(size or 0), int(av or 0), categories)
+        return cls(conn, drive_label, pending=pending, done=done, **kwargs)  # type: ignore[arg-type]
+
+    @property
+    def resuming(self) -> bool:
+        return self._resuming
+
+    def restored_directories(self) -> Dict[str, DirectoryTotals]:
+        """Directories finished by the interrupted scan, with their totals."""
+
+        return dict(self._restored)
+
+    def skip(self, directory: str) -> bool:
+        """Return ``True`` when ``directory`` must not be listed again."""
+
+        if not self._resuming:
+            return False
+        return directory in self._done or directory in self._visited
+
+    def begin(self, directory: str) -> None:
+        if self._resuming:
+            self._visited.add(directory)
+        self._listing.add(directory)
+
+    def add_task(self, directory: str) -> None:
+        self._outstanding[directory] = self._outstanding.get(directory, 0) + 1
+
+    def task_done(self, directory: str) -> None:
+        remaining = self._outstanding.get(directory, 0) - 1
+        if remaining > 0:
+            self._outstanding[directory] = remaining
+            return
+        self._outstanding.pop(directory, None)
+        if directory in self._waiting:
+            self._waiting.discard(directory)
+            self._mark_done(directory)
+
+    def end(self, directory: str, *, complete: bool, totals: DirectoryTotals = DirectoryTotals()) -> None:
+        """Finish listing ``directory``; ``complete`` is false when the walk stopped inside it."""
+
+        if not complete:
+            return
+        self._listing.discard(directory)
+        if self._outstanding.get(directory):
+            self._waiting.add(directory)
+            self._totals[directory] = totals
+        else:
+            self._mark_done(directory, totals)
+
+    def _mark_done(self, directory: str, totals: Optional[DirectoryTotals] = None) -> None:
+        if self._resuming:
+            self._done.add(directory)
+        if totals is None:
+            totals = self._totals.pop(directory, DirectoryTotals())
+        self._new_done.append((directory, totals))
+
+    def due(self) -> bool:
+        return self._clock() - self._last_save >= self._interval
+
+    def save(self, stack: Iterable[str]) -> None:
+        """Persist the stack (bottom first) plus in-flight directories."""
+
+        pending = list(stack)
+        # In-flight directories go on top so a resumed scan re-lists them first.
+        pending.extend(sorted(self._waiting | self._listing))
+        cur = self.conn.cursor()
+        cur.execute(
+            "DELETE FROM scan_frontier WHERE drive_label=? AND state='pending'",
+            (self.drive_label,),
+        )
+        rows = [(self.drive_label, path, "pending", seq, None, None, None, None) for seq, path in enumerate(pending)]
+        rows.extend(
+            (
+                self.drive_label,
+                path,
+                "done",
+                None,
+                totals.files,
+                totals.bytes,
+                totals.av,
+                json.dumps(totals.categories, sort_keys=True) if totals.categories is not None else None,
+            )
+            for path, totals in self._new_done
+        )
+        for start in range(0, len(rows), _INSERT_CHUNK):
+            cur.executemany(
+                """
+                INSERT OR REPLACE INTO scan_frontier(
+                    drive_label, path, state, seq, file_count, file_bytes, av_count, categories_json
+                )
+                VALUES(?,?,?,?,?,?,?,?)
+                """,
+                rows[start : start + _INSERT_CHUNK],
+            )
+        self.conn.commit()
+        self._new_done = []
+        self._last_save = self._clock()
+        self.saves += 1
+
+    def clear(self) -> None:
+        ensure_frontier_table(self.conn)
+        self.conn.execute("DELETE FROM scan_frontier WHERE drive_label=?", (self.drive_label,))
+        self.conn.commit()
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "resumed": self._resuming,
+            "restored_pending": len(self.restored_pending),
+            "restored_done": self.restored_done,
+            "saves": self.saves,
+        }
+
+
+__all__ = ["DirectoryTotals", "ScanFrontier", "ensure_frontier_table"]
@@ -0,0 +1,389 @@
+"""Content hashing backends used by drive scans.
+
+Files are read with ``readinto`` into a per-thread reusable buffer so hashing
+does not allocate a fresh ``bytes`` object per chunk. Large files can use
+BLAKE3's internal multithreading, and the whole hash can optionally be
+offloaded to a process pool.
+
+Quick signatures hash the file size plus head/middle/tail samples. Scans in
+``quick`` strategy store only those, and ``size`` scans skip reading files
+whose size is unique; both mark the rows ``hash_deferred`` and leave the full
+hash to :func:`complete_deferred_hashes`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import importlib.util
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Literal, Optional, Tuple
+
+_blake3_spec = importlib.util.find_spec("blake3")
+_blake3_hash = importlib.import_module("blake3").blake3 if _blake3_spec is not None else None
+
+HashMode = Literal["thread", "process"]
+HashStrategy = Literal["full", "quick", "size"]
+
+HASH_MODES: Tuple[str, ...] = ("thread", "process")
+HASH_STRATEGIES: Tuple[str, ...] = ("full", "quick", "size")
+# BLAKE3 only spreads work across threads for large update() calls.
+MULTITHREAD_CHUNK_BYTES = 16 * 1024 * 1024
+DEFAULT_MULTITHREAD_MIN_BYTES = 1024 * 1024 * 1024
+QUICK_SAMPLE_BYTES = 512 * 1024
+# Files up to three samples long would be read entirely by the quick
+# signature, so they are always fully hashed instead.
+QUICK_FULL_MAX_BYTES = 3 * QUICK_SAMPLE_BYTES
+_QUICK_PREFIX = b"vcq1"
+
+ChunkCallback = Callable[[int, float], None]
+
+
+def algorithm() -> str:
+    """Return the digest algorithm used for ``hash_blake3`` values."""
+
+    return "blake3" if _blake3_hash is not None else "sha256"
+
+
+def _new_hasher(max_threads: int):
+    if _blake3_hash is None:
+        return hashlib.sha256()
+    if max_threads == 1:
+        return _blake3_hash()
+    threads = _blake3_hash.AUTO if max_threads <= 0 else int(max_threads)
+    return _blake3_hash(max_threads=threads)
+
+
+def _advise_sequential(fd: int) -> None:
+    """Ask the kernel for aggressive read-ahead on a whole-file read."""
+
+    advise = getattr(os, "posix_fadvise", None)
+    if advise is None:
+        return
+    try:
+        advise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    except OSError:
+        pass
+
+
+def hash_file(
+    file_path: str,
+    chunk: int = 1024 * 1024,
+    *,
+    buffer: Optional[bytearray] = None,
+    max_threads: int = 1,
+    on_chunk: Optional[ChunkCallback] = None,
+) -> str:
+    """Hash *file_path* with BLAKE3 (or SHA-256 when blake3 is unavailable).
+
+    ``max_threads`` of 1 hashes on the calling thread; 0 lets BLAKE3 pick a
+    thread count. ``buffer`` is reused across calls when it is large enough.
+    The file is read with a sequential read-ahead hint where the platform
+    supports ``posix_fadvise``.
+    """
+
+    chunk = max(1, int(chunk))
+    if buffer is None or len(buffer) < chunk:
+        buffer = bytearray(chunk)
+    view = memoryview(buffer)[:chunk]
+    h = _new_hasher(max_threads)
+    try:
+        with open(file_path, "rb", buffering=0) as f:
+            _advise_sequential(f.fileno())
+            while True:
+                start = time.perf_counter()
+                read = f.readinto(view)
+                elapsed = time.perf_counter() - start
+                if not read:
+                    if on_chunk is not None and elapsed > 0:
+                        on_chunk(0, elapsed)
+                    break
+                h.update(view[:read])
+                if on_chunk is not None:
+                    on_chunk(read, elapsed)
+    finally:
+        view.release()
+    return h.hexdigest()
+
+
+def quick_signature(
+    file_path: str,
+    size_bytes: int,
+    *,
+    sample_bytes: int = QUICK_SAMPLE_BYTES,
+    buffer: Optional[bytearray] = None,
+    on_chunk: Optional[ChunkCallback] = None,
+) -> str:
+    """Hash the size plus head, middle and tail samples of *file_path*."""
+
+    sample_bytes = max(1, int(sample_bytes))
+    size_bytes = max(0, int(size_bytes))
+    if buffer is None or len(buffer) < sample_bytes:
+        buffer = bytearray(sample_bytes)
+    h = _new_hasher(1)
+    h.update(_QUICK_PREFIX + size_bytes.to_bytes(8, "little"))
+    if size_bytes <= 3 * sample_bytes:
+        offsets = [0]
+        sample_bytes = max(1, size_bytes)
+        if len(buffer) < sample_bytes:
+            buffer = bytearray(sample_bytes)
+    else:
+        offsets = [0, (size_bytes - sample_bytes) // 2, size_bytes - sample_bytes]
+    view = memoryview(buffer)[:sample_bytes]
+    try:
+        with open(file_path, "rb", buffering=0) as f:
+            for offset in offsets:
+                start = time.perf_counter()
+                f.seek(offset)
+                read = f.readinto(view)
+                elapsed = time.perf_counter() - start
+                if on_chunk is not None:
+                    on_chunk(read or 0, elapsed)
+                if not read:
+                    break
+                h.update(view[:read])
+    finally:
+        view.release()
+    return h.hexdigest()
+
+
+def _hash_in_process(file_path: str, chunk: int, max_threads: int) -> Tuple[str, int, float]:
+    totals = [0, 0.0]
+
+    def _count(bytes_read: int, elapsed: float) -> None:
+        totals[0] += bytes_read
+        totals[1] += elapsed
+
+    digest = hash_file(file_path, chunk, max_threads=max_threads, on_chunk=_count)
+    return digest, int(totals[0]), float(totals[1])
+
+
+@dataclass(frozen=True)
+class HashSettings:
+    mode: HashMode = "thread"
+    chunk_bytes: int = 1024 * 1024
+    max_threads: int = 1
+    multithread_min_bytes: int = DEFAULT_MULTITHREAD_MIN_BYTES
+    process_workers: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "mode": self.mode,
+            "algorithm": algorithm(),
+            "chunk_bytes": int(self.chunk_bytes),
+            "max_threads": int(self.max_threads),
+            "multithread_min_bytes": int(self.multithread_min_bytes),
+            "process_workers": int(self.process_workers),
+        }
+
+
+class HashBackend:
+    """Hash files for scan workers using the configured strategy.
+
+    In ``thread`` mode each calling thread keeps its own read buffer. Files of
+    at least ``multithread_min_bytes`` are hashed with BLAKE3 threads when
+    ``max_threads`` allows it. In ``process`` mode hashing runs in a process
+    pool and the chunk callback receives one aggregated call per file.
+    """
+
+    def __init__(self, settings: HashSettings) -> None:
+        self.settings = settings
+        self._local = threading.local()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        if settings.mode == "process":
+            workers = settings.process_workers or (os.cpu_count() or 2)
+            self._pool = ProcessPoolExecutor(max_workers=max(1, int(workers)))
+
+    def _buffer(self, size: int) -> bytearray:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None or len(buffer) < size:
+            buffer = bytearray(size)
+            self._local.buffer = buffer
+        return buffer
+
+    def _plan(self, size_hint: Optional[int]) -> Tuple[int, int]:
+        chunk = max(64 * 1024, int(self.settings.chunk_bytes))
+        threads = 1
+        if (
+            self.settings.max_threads != 1
+            and size_hint is not None
+            and size_hint >= self.settings.multithread_min_bytes
+        ):
+            threads = int(self.settings.max_threads)
+            chunk = max(chunk, MULTITHREAD_CHUNK_BYTES)
+        return chunk, threads
+
+    def hash(
+        self,
+        file_path: str,
+        *,
+        size_hint: Optional[int] = None,
+        on_chunk: Optional[ChunkCallback] = None,
+    ) -> str:
+        chunk, threads = self._plan(size_hint)
+        if self._pool is not None:
+            digest, bytes_read, elapsed = self._pool.submit(
+                _hash_in_process, file_path, chunk, threads
+            ).result()
+            if on_chunk is not None:
+                on_chunk(bytes_read, elapsed)
+            return digest
+        return hash_file(
+            file_path,
+            chunk,
+            buffer=self._buffer(chunk),
+            max_threads=threads,
+            on_chunk=on_chunk,
+        )
+
+    def quick(
+        self,
+        file_path: str,
+        size_bytes: int,
+        *,
+        on_chunk: Optional[ChunkCallback] = None,
+    ) -> str:
+        return quick_signature(
+            file_path,
+            size_bytes,
+            buffer=self._buffer(QUICK_SAMPLE_BYTES),
+            on_chunk=on_chunk,
+        )
+
+    def close(self) -> None:
+        pool = self._pool
+        self._pool = None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+
+_DEFERRED_SELECT = """
+    SELECT id, path FROM files
+    WHERE drive_label=? AND deleted=0 AND hash_deferred=1 AND id>?
+"""
+_SIZE_FILTER = """
+    AND size_bytes IN (SELECT size_bytes FROM temp.deferred_hash_sizes)
+"""
+_COLLISION_FILTER = """
+    AND (
+        quick_hash IN (SELECT quick_hash FROM temp.deferred_hash_collisions)
+        OR size_bytes IN (SELECT size_bytes FROM temp.deferred_hash_full_sizes)
+    )
+"""
+
+
+def _collect_collisions(conn: sqlite3.Connection) -> None:
+    """Fill the temp tables :data:`_COLLISION_FILTER` reads, once per pass.
+
+    Hashing deferred rows changes neither set: it only fills ``hash_blake3``
+    on rows that already have a quick signature.
+    """
+
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS deferred_hash_collisions(quick_hash TEXT PRIMARY KEY)")
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS deferred_hash_full_sizes(size_bytes INTEGER PRIMARY KEY)")
+    conn.execute("DELETE FROM temp.deferred_hash_collisions")
+    conn.execute("DELETE FROM temp.deferred_hash_full_sizes")
+    conn.execute(
+        """
+        INSERT INTO temp.deferred_hash_collisions(quick_hash)
+        SELECT quick_hash FROM files
+        WHERE deleted=0 AND quick_hash IS NOT NULL
+        GROUP BY quick_hash HAVING COUNT(*) > 1
+        """
+    )
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO temp.deferred_hash_full_sizes(size_bytes)
+        SELECT size_bytes FROM files
+        WHERE deleted=0 AND quick_hash IS NULL AND hash_blake3 IS NOT NULL AND size_bytes IS NOT NULL
+        """
+    )
+
+
+def complete_deferred_hashes(
+    conn: sqlite3.Connection,
+    *,
+    drive_label: str,
+    backend: HashBackend,
+    collisions_only: bool,
+    sizes: Optional[Iterable[int]] = None,
+    resolve_path: Callable[[str], str] = lambda path: path,
+    workers: int = 4,
+    start_after_id: int = 0,
+    batch_size: int = 200,
+    should_stop: Optional[Callable[[], bool]] = None,
+    on_batch: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, int]:
+    """Compute full hashes for rows marked ``hash_deferred``.
+
+    With ``collisions_only`` only rows that may have a duplicate are hashed:
+    their quick signature matches another row, or their size matches a row
+    that was fully hashed without a quick signature (small files, full-hash
+    scans and legacy rows). ``sizes`` restricts the
+    pass to rows with one of the given sizes. Rows are processed in id order;
+    ``on_batch(last_id, hashed)`` runs after each committed batch so callers
+    can checkpoint and resume with ``start_after_id``.
+    """
+
+    sql = _DEFERRED_SELECT
+    if collisions_only:
+        _collect_collisions(conn)
+        sql += _COLLISION_FILTER
+    if sizes is not None:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS deferred_hash_sizes(size_bytes INTEGER PRIMARY KEY)")
+        conn.execute("DELETE FROM temp.deferred_hash_sizes")
+        conn.executemany(
+            "INSERT OR IGNORE INTO temp.deferred_hash_sizes(size_bytes) VALUES(?)",
+            ((int(size),) for size in sizes),
+        )
+        sql += _SIZE_FILTER
+    sql += " ORDER BY id LIMIT ?"
+    summary = {"candidates": 0, "hashed": 0, "errors": 0, "last_id": int(start_after_id)}
+
+    def _hash_row(row: Tuple[int, str]) -> Tuple[int, Optional[str]]:
+        file_id, path = row
+        try:
+            return file_id, backend.hash(resolve_path(path))
+        except OSError:
+            return file_id, None
+
+    with ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="hash-deferred") as pool:
+        while not (should_stop and should_stop()):
+            rows: List[Tuple[int, str]] = conn.execute(
+                sql, (drive_label, summary["last_id"], int(batch_size))
+            ).fetchall()
+            if not rows:
+                break
+            summary["candidates"] += len(rows)
+            updates = []
+            for file_id, digest in pool.map(_hash_row, rows):
+                if digest is None:
+                    summary["errors"] += 1
+                    continue
+                updates.append((digest, file_id))
+            if updates:
+                conn.executemany("UPDATE files SET hash_blake3=?, hash_deferred=0 WHERE id=?", updates)
+            conn.commit()
+            summary["hashed"] += len(updates)
+            summary["last_id"] = int(rows[-1][0])
+            if on_batch is not None:
+                on_batch(summary["last_id"], summary["hashed"])
+    return summary
+
+
+__all__ = [
+    "HASH_MODES",
+    "HASH_STRATEGIES",
+    "QUICK_FULL_MAX_BYTES",
+    "HashBackend",
+    "HashSettings",
+    "algorithm",
+    "complete_deferred_hashes",
+    "hash_file",
+    "quick_signature",
+]
@@ -0,0 +1,267 @@
+"""Tiered integrity verification for video files.
+
+Tiers, cheapest first:
+
+``container``
+    Probe the container and stream index with ffprobe (or decode the first
+    frame when ffprobe is unavailable).
+``sampled``
+    Decode ``sample_windows`` short windows spread across the duration.
+``full``
+    Decode the whole file, which is what scans always did before tiers.
+
+Scans can run a cheap tier inline and mark rows ``verify_pending`` so the
+``verify_deep`` orchestrator job performs the configured tier later.
+"""
+
+from __future__ import annotations
+
+import logging
+import shutil
+import sqlite3
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Literal, Optional, Sequence, Tuple
+
+from core.probe_cache import FFPROBE, ProbeCache, duration_from_payload, ffprobe_json
+
+LOGGER = logging.getLogger("videocatalog.integrity")
+
+VerifyTier = Literal["container", "sampled", "full"]
+
+VERIFY_TIERS: Tuple[str, ...] = ("container", "sampled", "full")
+
+
+class VerifyUnavailable(RuntimeError):
+    """Raised when ffmpeg/ffprobe could not be executed, so nothing was verified."""
+
+
+@dataclass(frozen=True)
+class VerifySettings:
+    tier: VerifyTier = "full"
+    defer_deep: bool = False
+    sample_windows: int = 4
+    sample_seconds: float = 2.0
+    timeout_s: float = 0.0
+
+    @property
+    def inline_tier(self) -> VerifyTier:
+        """Tier run during the scan; deeper tiers are left to the background job."""
+
+        return "container" if self.defer_deep else self.tier
+
+    @property
+    def deferred(self) -> bool:
+        return self.defer_deep and self.tier != "container"
+
+    def as_dict(self) -> dict:
+        return {
+            "tier": self.tier,
+            "inline_tier": self.inline_tier,
+            "defer_deep": bool(self.defer_deep),
+            "sample_windows": int(self.sample_windows),
+            "sample_seconds": float(self.sample_seconds),
+        }
+
+
+def tier_from(value: object) -> Optional[VerifyTier]:
+    if isinstance(value, str):
+        lower = value.strip().lower()
+        if lower in VERIFY_TIERS:
+            return lower  # type: ignore[return-value]
+    return None
+
+
+def ffprobe_for(ffmpeg: str) -> Optional[str]:
+    """Return the ffprobe shipped next to *ffmpeg*, falling back to PATH."""
+
+    candidate = Path(ffmpeg)
+    sibling = candidate.with_name("ffprobe" + candidate.suffix)
+    if sibling.exists():
+        return str(sibling)
+    return shutil.which("ffprobe")
+
+
+def _decode(ffmpeg: str, path: str, args: Sequence[str], input_args: Sequence[str], timeout_s: float) -> bool:
+    cmd = [ffmpeg, "-v", "error", "-xerror", *input_args, "-i", path, *args, "-f", "null", "-", "-nostdin"]
+    try:
+        proc = subprocess.run(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+            timeout=timeout_s if timeout_s > 0 else None,
+        )
+    except subprocess.TimeoutExpired:
+        return False
+    except OSError as exc:
+        raise VerifyUnavailable(f"cannot run {ffmpeg}: {exc}") from exc
+    return proc.returncode == 0
+
+
+def verify_container(
+    path: str,
+    ffmpeg: str,
+    *,
+    probe_cache: Optional[ProbeCache] = None,
+    cache_key: Optional[str] = None,
+    timeout_s: float = 0.0,
+) -> Tuple[bool, Optional[float]]:
+    """Check that the container parses and lists streams; return ``(ok, duration)``.
+
+    Raises :class:`VerifyUnavailable` when neither ffprobe nor ffmpeg can run.
+    """
+
+    ffprobe = ffprobe_for(ffmpeg)
+    if ffprobe is None:
+        return _decode(ffmpeg, path, ["-frames:v", "1"], [], timeout_s), None
+    payload = probe_cache.get(FFPROBE, cache_key or path, fs_path=path) if probe_cache is not None else None
+    if payload is None:
+        try:
+            payload = ffprobe_json(ffprobe, path, timeout=timeout_s or 30.0)
+        except (RuntimeError, ValueError, subprocess.TimeoutExpired):
+            return False, None
+        except OSError:
+            # ffprobe is broken; fall back to decoding the first frame.
+            return _decode(ffmpeg, path, ["-frames:v", "1"], [], timeout_s), None
+        if probe_cache is not None:
+            probe_cache.put(FFPROBE, cache_key or path, payload, fs_path=path)
+    streams = payload.get("streams")
+    if not isinstance(streams, list) or not streams:
+        return False, None
+    return True, duration_from_payload(FFPROBE, payload)
+
+
+def sample_offsets(duration: Optional[float], windows: int, seconds: float) -> List[float]:
+    """Start times of *windows* decode windows centred in equal slices of the file."""
+
+    windows = max(1, int(windows))
+    if not duration or duration <= seconds * windows:
+        return [0.0]
+    slice_len = duration / windows
+    return [max(0.0, slice_len * (idx + 0.5) - seconds / 2.0) for idx in range(windows)]
+
+
+def verify_file(
+    path: str,
+    ffmpeg: str,
+    tier: VerifyTier,
+    settings: VerifySettings,
+    *,
+    probe_cache: Optional[ProbeCache] = None,
+    cache_key: Optional[str] = None,
+) -> bool:
+    """Run verification *tier* on *path*; ``False`` means the file is damaged.
+
+    Raises :class:`VerifyUnavailable` when the tools could not be executed.
+    """
+
+    if tier == "full":
+        return _decode(ffmpeg, path, [], [], settings.timeout_s)
+    ok, duration = verify_container(
+        path,
+        ffmpeg,
+        probe_cache=probe_cache,
+        cache_key=cache_key,
+        timeout_s=settings.timeout_s,
+    )
+    if not ok or tier == "container":
+        return ok
+    seconds = max(0.5, float(settings.sample_seconds))
+    offsets = sample_offsets(duration, settings.sample_windows, seconds)
+    if offsets == [0.0] and duration:
+        # Short file: decoding it entirely costs about as much as the windows.
+        return _decode(ffmpeg, path, [], [], settings.timeout_s)
+    for offset in offsets:
+        if not _decode(ffmpeg, path, ["-t", f"{seconds:.3f}"], ["-ss", f"{offset:.3f}"], settings.timeout_s):
+            return False
+    return True
+
+
+def verify_pending_files(
+    conn: sqlite3.Connection,
+    *,
+    drive_label: str,
+    ffmpeg: str,
+    settings: VerifySettings,
+    resolve_path: Callable[[str], str] = lambda path: path,
+    probe_cache: Optional[ProbeCache] = None,
+    workers: int = 1,
+    start_after_id: int = 0,
+    batch_size: int = 50,
+    should_stop: Optional[Callable[[], bool]] = None,
+    on_batch: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, int]:
+    """Verify rows marked ``verify_pending`` at ``settings.tier``.
+
+    Rows are processed in id order; ``on_batch(last_id, verified)`` runs after
+    each committed batch so callers can checkpoint and resume with
+    ``start_after_id``. :class:`VerifyUnavailable` propagates before the
+    failing batch is written, so its rows stay ``verify_pending``.
+    """
+
+    summary = {"verified": 0, "failed": 0, "last_id": int(start_after_id)}
+
+    def _verify(row: Tuple[int, str]) -> Tuple[int, bool]:
+        file_id, path = row
+        return file_id, verify_file(
+            resolve_path(path),
+            ffmpeg,
+            settings.tier,
+            settings,
+            probe_cache=probe_cache,
+            cache_key=path,
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="verify-deep") as pool:
+        while not (should_stop and should_stop()):
+            rows: List[Tuple[int, str]] = conn.execute(
+                """
+                SELECT id, path FROM files
+                WHERE drive_label=? AND deleted=0 AND verify_pending=1 AND id>?
+                ORDER BY id LIMIT ?
+                """,
+                (drive_label, summary["last_id"], int(batch_size)),
+            ).fetchall()
+            if not rows:
+                break
+            updates = []
+            try:
+                results = list(pool.map(_verify, rows))
+            except VerifyUnavailable as exc:
+                LOGGER.warning("Deep verification stopped for %s: %s", drive_label, exc)
+                raise
+            for file_id, ok in results:
+                summary["verified"] += 1
+                if not ok:
+                    summary["failed"] += 1
+                updates.append((1 if ok else 0, settings.tier, file_id))
+            conn.executemany(
+                """
+                UPDATE files
+                SET integrity_ok=CASE WHEN ?=1 THEN COALESCE(integrity_ok, 1) ELSE 0 END,
+                    verify_tier=?, verify_pending=0
+                WHERE id=?
+                """,
+                updates,
+            )
+            conn.commit()
+            summary["last_id"] = int(rows[-1][0])
+            if on_batch is not None:
+                on_batch(summary["last_id"], summary["verified"])
+    return summary
+
+
+__all__ = [
+    "VERIFY_TIERS",
+    "VerifySettings",
+    "VerifyUnavailable",
+    "ffprobe_for",
+    "sample_offsets",
+    "tier_from",
+    "verify_container",
+    "verify_file",
+    "verify_pending_files",
+]
@@ -2,16 +2,30 @@
 
 Provides MIME detection, categorization helpers and a batched writer for the
 lightweight inventory table.
+
+:class:`MimeClassifier` is what scans use. In ``extension`` mode (default) it
+trusts the extension tables below for known extensions and only asks
+libmagic about unknown or ambiguous ones, from the first bytes of the file.
+Answers are memoized per extension and digest of those bytes, so identical
+headers (copies, split archives, recordings from one device) are sniffed
+once; the least recently used answers are evicted first. ``magic``
+mode keeps the original behaviour of :func:`detect_mime`: libmagic reads
+every file whenever python-magic is installed.
 """
 from __future__ import annotations
 
+import hashlib
 import mimetypes
 import sqlite3
+import sys
 import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, Literal, Optional, Tuple
+
+from core.search_index import ensure_search_index, sync_search_index
 
 try:  # pragma: no cover - optional dependency
     import magic  # type: ignore
@@ -170,9 +184,28 @@ _MIME_CATEGORY_PREFIX: Dict[str, str] = {
 }
 
 
+# Extensions shared by unrelated formats (``.ts`` is MPEG-TS or TypeScript,
+# ``.ogg`` audio or video) or used as generic containers.
+_AMBIGUOUS_EXTENSIONS = frozenset({"", "ts", "ogg", "bin", "dat", "tmp", "bak", "part", "download"})
+
+MimeMode = Literal["extension", "magic"]
+MIME_MODES: Tuple[str, ...] = ("extension", "magic")
+
+_HEAD_BYTES = 8192
+_CACHE_MAX = 4096
+
+
+def mime_mode_from(value: object) -> Optional[MimeMode]:
+    if isinstance(value, str):
+        lower = value.strip().lower()
+        if lower in MIME_MODES:
+            return lower  # type: ignore[return-value]
+    return None
+
+
 def _normalize_extension(path: str) -> str:
-    suffix = Path(path).suffix.lower().lstrip(".")
-    return suffix
+    # A drive has a few dozen distinct extensions; share one string each.
+    return sys.intern(Path(path).suffix.lower().lstrip("."))
 
 
 def detect_mime(path: str) -> Tuple[Optional[str], str]:
@@ -195,6 +228,66 @@ def detect_mime(path: str) -> Tuple[Optional[str], str]:
     return mime, ext
 
 
+class MimeClassifier:
+    """Thread-safe MIME detection for one scan; see the module docstring."""
+
+    def __init__(self, mode: MimeMode = "extension") -> None:
+        self.mode: MimeMode = mode
+        self._cache: "OrderedDict[Tuple[str, bytes], Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"extension": 0, "cache_hits": 0, "magic_calls": 0, "guessed": 0}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def detect(self, path: str) -> Tuple[Optional[str], str]:
+        if self.mode == "magic":
+            if magic is not None:
+                self._count("magic_calls")
+            return detect_mime(path)
+        ext = _normalize_extension(path)
+        if ext not in _AMBIGUOUS_EXTENSIONS and (ext in _COMMON_EXTENSION_MIME or ext in _CATEGORY_BY_EXTENSION):
+            self._count("extension")
+            mime = _COMMON_EXTENSION_MIME.get(ext)
+            if mime is None:
+                mime, _ = mimetypes.guess_type(path, strict=False)
+            return mime, ext
+        if magic is None:
+            self._count("guessed")
+            guess, _ = mimetypes.guess_type(path, strict=False)
+            return guess, ext
+        try:
+            with open(path, "rb") as handle:
+                head = handle.read(_HEAD_BYTES)
+        except OSError:
+            self._count("guessed")
+            guess, _ = mimetypes.guess_type(path, strict=False)
+            return guess, ext
+        # libmagic looks at the whole buffer, so the key must cover all of it.
+        key = (ext, hashlib.blake2b(head, digest_size=16).digest())
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                return self._cache[key], ext
+        try:
+            mime = magic.from_buffer(head, mime=True)  # type: ignore[attr-defined]
+        except Exception:
+            mime = None
+        if mime is None:
+            mime, _ = mimetypes.guess_type(path, strict=False)
+        elif isinstance(mime, str):
+            mime = sys.intern(mime)
+        with self._lock:
+            self.stats["magic_calls"] += 1
+            self._cache[key] = mime
+            self._cache.move_to_end(key)
+            while len(self._cache) > _CACHE_MAX:
+                self._cache.popitem(last=False)
+        return mime, ext
+
+
 def categorize(mime: Optional[str], ext: str) -> str:
     """Return high-level category for the given MIME/extension."""
 
@@ -211,7 +304,7 @@ def categorize(mime: Optional[str], ext: str) -> str:
     return "other"
 
 
-@dataclass
+@dataclass(slots=True)
 class InventoryRow:
     path: str
     size_bytes: int
@@ -224,8 +317,19 @@ class InventoryRow:
     indexed_utc: str
 
 
+# Queued paths indexed per FTS5 write; see InventoryWriter.
+_SEARCH_SYNC_ROWS = 10000
+
+
 class InventoryWriter:
-    """Buffered writer that batches upserts into the inventory table."""
+    """Buffered writer that batches upserts into the inventory table.
+
+    New paths are added to the ``inventory_fts`` search index (see
+    :mod:`core.search_index`) every ``_SEARCH_SYNC_ROWS`` rows and on
+    :meth:`sync` / :meth:`close`; FTS5 writes are much cheaper in large
+    batches, and queued paths are still found by searches in the meantime. The index is created
+    first if the shard predates it.
+    """
 
     def __init__(
         self,
@@ -241,6 +345,8 @@ class InventoryWriter:
         self._last_flush = time.monotonic()
         self._lock = threading.Lock()
         self.total_written = 0
+        self._search_index = ensure_search_index(connection, "inventory")
+        self._unsynced = 0
 
     def add(self, row: InventoryRow) -> None:
         with self._lock:
@@ -258,8 +364,18 @@ class InventoryWriter:
                 if (now - self._last_flush) >= self._flush_interval:
                     self._flush_locked()
 
-    def close(self) -> None:
+    def sync(self) -> None:
+        """Write buffered rows and index every queued path; the writer stays usable."""
+
         self.flush(force=True)
+        with self._lock:
+            if self._unsynced:
+                sync_search_index(self._conn, "inventory")
+                self._conn.commit()
+                self._unsynced = 0
+
+    def close(self) -> None:
+        self.sync()
 
     def _flush_locked(self) -> None:
         if not self._batch:
@@ -298,6 +414,11 @@ class InventoryWriter:
             """,
             rows,
         )
+        if self._search_index:
+            self._unsynced += len(rows)
+            if self._unsynced >= _SEARCH_SYNC_ROWS:
+                sync_search_index(self._conn, "inventory")
+                self._unsynced = 0
         self._conn.commit()
         self.total_written += len(rows)
         self._batch.clear()
@@ -307,6 +428,9 @@ class InventoryWriter:
 __all__ = [
     "InventoryWriter",
     "InventoryRow",
+    "MIME_MODES",
+    "MimeClassifier",
     "categorize",
     "detect_mime",
+    "mime_mode_from",
 ]
@@ -0,0 +1,130 @@
+"""Scan several docked drives at once in one process.
+
+``scan_drive.py --targets LABEL=MOUNT,...`` runs one :func:`scan_drive.scan_drive`
+per target on its own thread. Each target writes to its own shard through
+its own connection. Two budgets are shared between them:
+
+* one :class:`perf.AdaptiveConcurrency` per physical device, so partitions
+  of one disk share that disk's I/O ceiling instead of each claiming a full
+  profile's worth of readers;
+* one work-slot semaphore across all targets, held for the whole of each
+  hash, mediainfo and FFmpeg job. A slot therefore also covers the job's
+  disk reads and subprocess waits, so it bounds concurrent jobs rather
+  than CPU use, and :func:`default_work_slots` allows two per core.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List
+
+from perf import AdaptiveConcurrency
+
+LOGGER = logging.getLogger("videocatalog.multiscan")
+
+
+@dataclass(frozen=True)
+class ScanTarget:
+    label: str
+    mount: str
+
+
+def default_work_slots() -> int:
+    """Return the default number of hash/probe jobs running at once."""
+
+    return 2 * (os.cpu_count() or 2)
+
+
+def parse_targets(values: Iterable[str]) -> List[ScanTarget]:
+    """Parse ``LABEL=MOUNT`` items, comma-separated or repeated."""
+
+    targets: List[ScanTarget] = []
+    seen: set[str] = set()
+    for value in values:
+        for item in str(value).split(","):
+            item = item.strip()
+            if not item:
+                continue
+            label, sep, mount = item.partition("=")
+            label, mount = label.strip(), mount.strip()
+            if not sep or not label or not mount:
+                raise ValueError(f"Invalid target {item!r}; expected LABEL=MOUNT.")
+            if label in seen:
+                raise ValueError(f"Duplicate target label {label!r}.")
+            seen.add(label)
+            targets.append(ScanTarget(label, mount))
+    if not targets:
+        raise ValueError("No targets given; expected LABEL=MOUNT[,LABEL=MOUNT...].")
+    return targets
+
+
+def device_id(mount: str) -> str:
+    """Identify the physical device behind ``mount``.
+
+    On Linux, partitions resolve to their parent disk through ``/sys/dev/block``.
+    Elsewhere, or when sysfs has no entry (network shares, overlay mounts),
+    the filesystem's ``st_dev`` is used.
+    """
+
+    st_dev = os.stat(mount).st_dev
+    sys_path = f"/sys/dev/block/{os.major(st_dev)}:{os.minor(st_dev)}"
+    if os.path.exists(sys_path):
+        real = os.path.realpath(sys_path)
+        if os.path.exists(os.path.join(sys_path, "partition")):
+            real = os.path.dirname(real)
+        return os.path.basename(real)
+    return f"dev:{st_dev}"
+
+
+def run_targets(
+    targets: List[ScanTarget],
+    scan_one: Callable[[ScanTarget, AdaptiveConcurrency, threading.Semaphore], Dict[str, object]],
+    *,
+    io_budget_for: Callable[[ScanTarget], AdaptiveConcurrency],
+    work_slots: int,
+    max_parallel: int = 0,
+    device_of: Callable[[str], str] = device_id,
+) -> Dict[str, Dict[str, object]]:
+    """Run ``scan_one`` for every target and return results keyed by label.
+
+    ``io_budget_for`` builds the controller for the first target seen on
+    each device; later targets on the same device reuse it. A failing target
+    is reported as ``{"status": "error"}`` and does not stop the others.
+    """
+
+    budgets: Dict[str, AdaptiveConcurrency] = {}
+    devices: Dict[str, str] = {}
+    for target in targets:
+        try:
+            device = device_of(target.mount)
+        except OSError as exc:
+            LOGGER.warning("Cannot identify device for %s (%s); giving it its own budget", target.mount, exc)
+            device = f"target:{target.label}"
+        devices[target.label] = device
+        if device not in budgets:
+            budgets[device] = io_budget_for(target)
+    slots = max(1, int(work_slots))
+    work = threading.BoundedSemaphore(slots)
+    LOGGER.info("Scanning %s targets on %s devices (work slots=%s)", len(targets), len(budgets), slots)
+
+    def _run(target: ScanTarget) -> Dict[str, object]:
+        try:
+            result = scan_one(target, budgets[devices[target.label]], work)
+        except Exception as exc:
+            LOGGER.exception("Scan failed for %s", target.label)
+            return {"status": "error", "error": str(exc), "device": devices[target.label]}
+        if isinstance(result, dict):
+            result.setdefault("device", devices[target.label])
+        return result
+
+    workers = max(1, int(max_parallel) if max_parallel else len(targets))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scan-target") as pool:
+        futures = {target.label: pool.submit(_run, target) for target in targets}
+        return {label: future.result() for label, future in futures.items()}
+
+
+__all__ = ["ScanTarget", "default_work_slots", "device_id", "parse_targets", "run_targets"]
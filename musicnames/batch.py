@@ -0,0 +1,153 @@
+"""Batch analysis of music file names, optionally across worker processes.
+
+:func:`analyse_path` runs the whole parse → score → review pipeline for one
+path and returns a plain tuple, so batches can cross process boundaries
+cheaply. The regular expressions in :mod:`musicnames.patterns` are compiled
+once per process at import time, which makes each worker's setup a single
+import. :class:`MusicParsePool` only starts processes for batches big
+enough to pay for them; small rescans stay on the calling thread.
+"""
+
+from __future__ import annotations
+
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+from .parse import parse_music_name
+from .review import generate_review_bundle
+from .score import score_parse_result
+
+# Bump when parsing, scoring or review rules change so stored results are
+# recomputed on the next scan.
+PARSER_VERSION = 1
+
+_SEPARATORS_RE = re.compile(r"[\\/]+")
+
+
+class MusicAnalysis(NamedTuple):
+    path: str
+    artist: Optional[str]
+    title: Optional[str]
+    album: Optional[str]
+    track: Optional[str]
+    score: float
+    score_reasons: List[str]
+    parse_reasons: List[str]
+    needs_review: bool
+    review_reasons: List[str]
+    suggestions: List[str]
+
+
+def split_parents(path: str) -> List[str]:
+    """Return the non-empty folder names above the file in ``path``."""
+
+    cleaned = path.rstrip("/\\")
+    if not cleaned:
+        return []
+    parts = _SEPARATORS_RE.split(cleaned)
+    return [segment for segment in parts[:-1] if segment]
+
+
+def candidates_from(ext_count: int, *, incremental: bool) -> str:
+    """Return the ``FROM``/``WHERE`` clause that selects a drive's music files.
+
+    Its parameters are the drive label followed by ``ext_count`` extensions.
+    With ``incremental`` only files without a stored result, or modified
+    after their ``music_minimal`` / ``music_review_queue`` row was written,
+    are selected.
+    """
+
+    placeholders = ",".join("?" for _ in range(ext_count))
+    dirty_filter = ""
+    if incremental:
+        dirty_filter = """
+            AND (
+                (m.path IS NULL AND q.path IS NULL)
+                OR i.mtime_utc > COALESCE(m.parsed_utc, q.queued_utc)
+            )
+        """
+    return f"""
+        FROM inventory i
+        LEFT JOIN music_minimal m ON m.path=i.path AND m.drive_label=i.drive_label
+        LEFT JOIN music_review_queue q ON q.path=i.path AND q.drive_label=i.drive_label
+        WHERE i.drive_label=? AND i.category='audio' AND i.ext IN ({placeholders})
+        {dirty_filter}
+    """
+
+
+def analyse_path(path: str, min_confidence: float) -> MusicAnalysis:
+    parents = split_parents(path)
+    result = parse_music_name(path, parents=parents)
+    score, score_reasons = score_parse_result(result, parents=parents)
+    bundle = generate_review_bundle(result, score, score_reasons, threshold=min_confidence)
+    return MusicAnalysis(
+        path=path,
+        artist=result.artist,
+        title=result.title,
+        album=result.album,
+        track=result.track,
+        score=float(score),
+        score_reasons=list(score_reasons),
+        parse_reasons=list(result.reasons),
+        needs_review=bool(bundle.get("needs_review")),
+        review_reasons=list(bundle.get("reasons", [])),
+        suggestions=list(bundle.get("suggestions", [])),
+    )
+
+
+def analyse_batch(paths: Sequence[str], min_confidence: float) -> List[MusicAnalysis]:
+    return [analyse_path(path, min_confidence) for path in paths]
+
+
+class MusicParsePool:
+    """Analyse batches of paths in order, in-process or on a process pool.
+
+    With ``workers`` of 1, or when the whole run has fewer than
+    ``min_parallel`` paths, batches run on the calling thread. Otherwise up
+    to ``workers`` batches are in flight at once and results still come
+    back in submission order.
+    """
+
+    def __init__(self, *, workers: int, total: int, min_parallel: int = 5000) -> None:
+        self.workers = max(1, int(workers))
+        self.parallel = self.workers > 1 and total >= max(1, int(min_parallel))
+        self._executor: Optional[Executor] = None
+        if self.parallel:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def map(self, batches: Iterable[Sequence[str]], min_confidence: float) -> Iterator[List[MusicAnalysis]]:
+        if self._executor is None:
+            for batch in batches:
+                yield analyse_batch(batch, min_confidence)
+            return
+        in_flight = []
+        for batch in batches:
+            in_flight.append(self._executor.submit(analyse_batch, list(batch), min_confidence))
+            if len(in_flight) >= self.workers * 2:
+                yield in_flight.pop(0).result()
+        for future in in_flight:
+            yield future.result()
+
+    def close(self) -> None:
+        executor = self._executor
+        self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "MusicParsePool":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+
+__all__ = [
+    "PARSER_VERSION",
+    "MusicAnalysis",
+    "MusicParsePool",
+    "analyse_batch",
+    "analyse_path",
+    "candidates_from",
+    "split_parents",
+]
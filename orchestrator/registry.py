@@ -2,8 +2,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from pathlib import Path
-from typing import Any, Callable, Dict, Optional
+from pathlib import Path, PurePath
+from typing import Any, Callable, Dict, Optional, Tuple
 
 
 RunnerFn = Callable[["RunnerContext", Dict[str, Any], Dict[str, Any]], None]
@@ -16,6 +16,7 @@ PreconditionFn = Callable[["RunnerContext", Dict[str, Any]], Optional[str]]
 class RunnerContext:
     working_dir: Path
     settings: Dict[str, Any]
+    save_checkpoint: Optional[Callable[[Dict[str, Any]], None]] = None
 
 
 @dataclass(slots=True)
@@ -79,6 +80,108 @@ def _noop_light_job(ctx: RunnerContext, payload: Dict[str, Any], checkpoint: Dic
     return None
 
 
+def _open_shard(ctx: RunnerContext, payload: Dict[str, Any]) -> Tuple[Any, Path, Callable[[str], str]]:
+    """Open the payload's shard and return ``(conn, shard_path, resolve_path)``.
+
+    Paths are stored as seen at scan time; ``resolve_path`` follows the drive
+    when the payload's ``mount_path`` differs from the scanned mount.
+    """
+
+    from core.db import connect
+    from core.paths import get_shard_db_path
+
+    label = str(payload["drive_label"])
+    shard_path = Path(payload.get("shard_path") or get_shard_db_path(ctx.working_dir, label))
+    # Jobs commit once per batch, so keep sqlite3's implicit transactions.
+    conn = connect(shard_path, read_only=False, check_same_thread=False, isolation_level="DEFERRED")
+    row = conn.execute(
+        "SELECT mount_path FROM drives WHERE label=? ORDER BY id DESC LIMIT 1", (label,)
+    ).fetchone()
+    scanned_mount = row[0] if row else None
+    mount = payload.get("mount_path") or scanned_mount
+
+    def _resolve(path: str) -> str:
+        if not scanned_mount or not mount or mount == scanned_mount:
+            return path
+        try:
+            return str(Path(mount) / PurePath(path).relative_to(scanned_mount))
+        except ValueError:
+            return path
+
+    return conn, shard_path, _resolve
+
+
+def _hash_full(ctx: RunnerContext, payload: Dict[str, Any], checkpoint: Dict[str, Any]) -> None:
+    """Compute full hashes deferred by ``--hash-strategy quick`` scans."""
+
+    from hashing import HashBackend, HashSettings, complete_deferred_hashes
+
+    conn, _shard_path, resolve = _open_shard(ctx, payload)
+    backend = HashBackend(HashSettings(chunk_bytes=int(payload.get("chunk_bytes", 1024 * 1024))))
+    try:
+
+        def _on_batch(last_id: int, hashed: int) -> None:
+            if ctx.save_checkpoint is not None:
+                ctx.save_checkpoint({"last_id": last_id, "hashed": int(checkpoint.get("hashed", 0)) + hashed})
+
+        complete_deferred_hashes(
+            conn,
+            drive_label=str(payload["drive_label"]),
+            backend=backend,
+            collisions_only=bool(payload.get("collisions_only", False)),
+            resolve_path=resolve,
+            workers=int(payload.get("workers", 4)),
+            start_after_id=int(checkpoint.get("last_id", 0)),
+            on_batch=_on_batch,
+        )
+    finally:
+        backend.close()
+        conn.close()
+
+
+def _verify_deep(ctx: RunnerContext, payload: Dict[str, Any], checkpoint: Dict[str, Any]) -> None:
+    """Run the deep integrity tier on videos deferred by ``--verify-defer`` scans."""
+
+    import shutil
+
+    from core.probe_cache import ProbeCache
+    from integrity import VerifySettings, tier_from, verify_pending_files
+
+    ffmpeg = payload.get("ffmpeg_path") or shutil.which("ffmpeg")
+    if not ffmpeg:
+        raise RuntimeError("ffmpeg is required for verify_deep jobs")
+    label = str(payload["drive_label"])
+    settings = VerifySettings(
+        tier=tier_from(payload.get("tier")) or "full",
+        sample_windows=int(payload.get("sample_windows", 4)),
+        sample_seconds=float(payload.get("sample_seconds", 2.0)),
+        timeout_s=float(payload.get("timeout_s", 0.0)),
+    )
+    conn, shard_path, resolve = _open_shard(ctx, payload)
+    try:
+        with ProbeCache.open(shard_path, label) as probe_cache:
+
+            def _on_batch(last_id: int, verified: int) -> None:
+                if ctx.save_checkpoint is not None:
+                    ctx.save_checkpoint(
+                        {"last_id": last_id, "verified": int(checkpoint.get("verified", 0)) + verified}
+                    )
+
+            verify_pending_files(
+                conn,
+                drive_label=label,
+                ffmpeg=str(ffmpeg),
+                settings=settings,
+                resolve_path=resolve,
+                probe_cache=probe_cache,
+                workers=int(payload.get("workers", 1)),
+                start_after_id=int(checkpoint.get("last_id", 0)),
+                on_batch=_on_batch,
+            )
+    finally:
+        conn.close()
+
+
 def _tests_gate_precondition(ctx: RunnerContext, payload: Dict[str, Any]) -> Optional[str]:
     try:
         from tests.api import orchestrator_gate_reason
@@ -154,6 +257,26 @@ def build_default_registry() -> JobRegistry:
         )
     )
 
+    registry.register(
+        JobSpec(
+            kind="hash_full",
+            resource="io_light",
+            runner=_hash_full,
+            estimate_vram=lambda payload: 0,
+            estimate_runtime=lambda payload: int(payload.get("estimate_s", 1800)),
+        )
+    )
+
+    registry.register(
+        JobSpec(
+            kind="verify_deep",
+            resource="light_cpu",
+            runner=_verify_deep,
+            estimate_vram=lambda payload: 0,
+            estimate_runtime=lambda payload: int(payload.get("estimate_s", 3600)),
+        )
+    )
+
     registry.register(
         JobSpec(
             kind="apiguard_warmup",
@@ -9,7 +9,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-from .checkpoint import load_checkpoint
+from .checkpoint import load_checkpoint, save_checkpoint
 from .gpu import GPUManager
 from .logs import OrchestratorLogger
 from .registry import RunnerContext, build_default_registry
@@ -36,7 +36,6 @@ def run_job(
     spec = registry.get(kind)
     payload = json.loads(payload_json) if payload_json else {}
     settings = json.loads(settings_json) if settings_json else {}
-    ctx = RunnerContext(Path(working_dir), settings)
 
     heartbeat_s = int(orchestrator_cfg.get("heartbeat_s", 5))
     lease_ttl = int(orchestrator_cfg.get("lease_ttl_s", 120))
@@ -52,6 +51,11 @@ def run_job(
     conn.execute("PRAGMA journal_mode=WAL")
 
     checkpoint = load_checkpoint(conn, job_id) or {}
+    ctx = RunnerContext(
+        Path(working_dir),
+        settings,
+        save_checkpoint=lambda state: save_checkpoint(conn, job_id, state),
+    )
     start_ts = _utcnow()
     conn.execute(
         "UPDATE jobs SET status='running', started_utc=COALESCE(started_utc, ?), heartbeat_utc=? WHERE id=?",
@@ -8,6 +8,7 @@ import platform
 import random
 import statistics
 import tempfile
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
@@ -27,6 +28,14 @@ class PerformanceConfig:
     gentle_io: bool
     source: Literal["auto", "settings", "cli"]
     auto_profile: ProfileName
+    enumerate_workers: int = 1
+    hash_backend: Literal["thread", "process"] = "thread"
+    hash_max_threads: int = 1
+    hash_strategy: Literal["full", "quick", "size"] = "full"
+    concurrency: Literal["adaptive", "fixed"] = "adaptive"
+    max_workers: int = 0
+    io_order: Literal["listing", "physical"] = "listing"
+    io_order_window: int = 512
 
     def as_dict(self) -> Dict[str, Any]:
         return {
@@ -37,6 +46,14 @@ class PerformanceConfig:
             "gentle_io": bool(self.gentle_io),
             "source": self.source,
             "auto_profile": self.auto_profile,
+            "enumerate_workers": int(self.enumerate_workers),
+            "hash_backend": self.hash_backend,
+            "hash_max_threads": int(self.hash_max_threads),
+            "hash_strategy": self.hash_strategy,
+            "concurrency": self.concurrency,
+            "max_workers": int(self.max_workers),
+            "io_order": self.io_order,
+            "io_order_window": int(self.io_order_window),
         }
 
     def label(self) -> str:
@@ -47,7 +64,7 @@ class PerformanceConfig:
             chunk_str = f"{self.hash_chunk_bytes // 1024}KB"
         return (
             f"{self.profile} (threads={self.worker_threads}, chunk={chunk_str}, "
-            f"ffmpeg={self.ffmpeg_parallel})"
+            f"ffmpeg={self.ffmpeg_parallel}, enum={self.enumerate_workers})"
         )
 
 
@@ -275,24 +292,38 @@ DEFAULTS: Dict[ProfileName, Dict[str, Callable[[int], int] | Any]] = {
         "hash_chunk_bytes": 1_048_576,
         "ffmpeg_parallel": lambda cpu: max(1, min(4, cpu)),
         "gentle_io": False,
+        "enumerate_workers": lambda cpu: min(16, max(4, cpu)),
+        "hash_max_threads": 0,
+        "max_workers": lambda cpu: min(64, max(16, cpu * 4)),
     },
     "HDD": {
         "worker_threads": lambda cpu: min(16, max(6, cpu)),
         "hash_chunk_bytes": 524_288,
         "ffmpeg_parallel": lambda cpu: max(1, min(2, cpu)),
         "gentle_io": False,
+        "enumerate_workers": 2,
+        "hash_max_threads": 1,
+        "max_workers": lambda cpu: min(16, max(6, cpu)),
+        # One spindle: hash in on-disk order instead of listing order.
+        "io_order": "physical",
     },
     "USB": {
         "worker_threads": lambda cpu: min(8, max(4, cpu)),
         "hash_chunk_bytes": 262_144,
         "ffmpeg_parallel": 1,
         "gentle_io": True,
+        "enumerate_workers": 2,
+        "hash_max_threads": 1,
+        "max_workers": 8,
     },
     "NETWORK": {
         "worker_threads": lambda cpu: 6,
         "hash_chunk_bytes": 262_144,
         "ffmpeg_parallel": 1,
         "gentle_io": True,
+        "enumerate_workers": 16,
+        "hash_max_threads": 1,
+        "max_workers": 16,
     },
 }
 
@@ -320,6 +351,38 @@ def _coerce_bool(value: Any) -> Optional[bool]:
     return None
 
 
+def _hash_backend_from(value: Any) -> Optional[Literal["thread", "process"]]:
+    if isinstance(value, str):
+        lower = value.strip().lower()
+        if lower in {"thread", "process"}:
+            return lower  # type: ignore[return-value]
+    return None
+
+
+def _hash_strategy_from(value: Any) -> Optional[Literal["full", "quick", "size"]]:
+    if isinstance(value, str):
+        lower = value.strip().lower()
+        if lower in {"full", "quick", "size"}:
+            return lower  # type: ignore[return-value]
+    return None
+
+
+def _concurrency_from(value: Any) -> Optional[Literal["adaptive", "fixed"]]:
+    if isinstance(value, str):
+        lower = value.strip().lower()
+        if lower in {"adaptive", "fixed"}:
+            return lower  # type: ignore[return-value]
+    return None
+
+
+def _io_order_from(value: Any) -> Optional[Literal["listing", "physical"]]:
+    if isinstance(value, str):
+        lower = value.strip().lower()
+        if lower in {"listing", "physical"}:
+            return lower  # type: ignore[return-value]
+    return None
+
+
 def _choice_from(value: Any) -> Optional[ProfileName | Literal["AUTO"]]:
     if value is None:
         return None
@@ -394,6 +457,70 @@ def resolve_performance_config(
             default_ffmpeg(cpu) if callable(default_ffmpeg) else int(default_ffmpeg)
         )
 
+    cli_enum = _coerce_int(cli_overrides.get("enumerate_workers"))
+    settings_enum = _coerce_int(settings_block.get("enumerate_workers"))
+    if cli_enum is not None and cli_enum > 0:
+        enumerate_workers = cli_enum
+    elif settings_enum is not None and settings_enum > 0:
+        enumerate_workers = settings_enum
+    else:
+        default_enum = defaults.get("enumerate_workers", 1)
+        enumerate_workers = default_enum(cpu) if callable(default_enum) else int(default_enum)
+
+    hash_backend = (
+        _hash_backend_from(cli_overrides.get("hash_backend"))
+        or _hash_backend_from(settings_block.get("hash_backend"))
+        or "thread"
+    )
+
+    hash_strategy = (
+        _hash_strategy_from(cli_overrides.get("hash_strategy"))
+        or _hash_strategy_from(settings_block.get("hash_strategy"))
+        or "full"
+    )
+
+    # 0 lets BLAKE3 choose its own thread count for multi-GB files.
+    cli_hash_threads = _coerce_int(cli_overrides.get("hash_max_threads"))
+    settings_hash_threads = _coerce_int(settings_block.get("hash_max_threads"))
+    if cli_hash_threads is not None and cli_hash_threads >= 0:
+        hash_max_threads = cli_hash_threads
+    elif settings_hash_threads is not None and settings_hash_threads >= 0:
+        hash_max_threads = settings_hash_threads
+    else:
+        hash_max_threads = int(defaults.get("hash_max_threads", 1))
+
+    concurrency = (
+        _concurrency_from(cli_overrides.get("concurrency"))
+        or _concurrency_from(settings_block.get("concurrency"))
+        or "adaptive"
+    )
+
+    cli_max_workers = _coerce_int(cli_overrides.get("max_workers"))
+    settings_max_workers = _coerce_int(settings_block.get("max_workers"))
+    if cli_max_workers is not None and cli_max_workers > 0:
+        max_workers = cli_max_workers
+    elif settings_max_workers is not None and settings_max_workers > 0:
+        max_workers = settings_max_workers
+    else:
+        default_max = defaults.get("max_workers", 0)
+        max_workers = default_max(cpu) if callable(default_max) else int(default_max)
+
+    io_order = (
+        _io_order_from(cli_overrides.get("io_order"))
+        or _io_order_from(settings_block.get("io_order"))
+        or _io_order_from(defaults.get("io_order"))
+        or "listing"
+    )
+
+    cli_window = _coerce_int(cli_overrides.get("io_order_window"))
+    settings_window = _coerce_int(settings_block.get("io_order_window"))
+    if cli_window is not None and cli_window > 0:
+        io_order_window = cli_window
+    elif settings_window is not None and settings_window > 0:
+        io_order_window = settings_window
+    else:
+        io_order_window = 512
+
     default_gentle = bool(defaults.get("gentle_io"))
     cli_gentle = cli_overrides.get("gentle_io")
     settings_gentle = settings_block.get("gentle_io")
@@ -406,6 +533,11 @@ def resolve_performance_config(
     worker_threads = max(1, min(64, worker_threads))
     ffmpeg_parallel = max(1, min(worker_threads, ffmpeg_parallel))
     hash_chunk_bytes = max(64 * 1024, hash_chunk_bytes)
+    enumerate_workers = max(1, min(64, enumerate_workers))
+    hash_max_threads = max(0, min(64, hash_max_threads))
+    # The ceiling never drops below the starting worker count.
+    max_workers = max(worker_threads, min(64, max_workers))
+    io_order_window = max(1, min(65536, io_order_window))
 
     return PerformanceConfig(
         profile=selected_profile,
@@ -415,6 +547,14 @@ def resolve_performance_config(
         gentle_io=bool(gentle_flag),
         source=source,
         auto_profile=auto_profile,
+        enumerate_workers=enumerate_workers,
+        hash_backend=hash_backend,
+        hash_max_threads=hash_max_threads,
+        hash_strategy=hash_strategy,
+        concurrency=concurrency,
+        max_workers=max_workers,
+        io_order=io_order,
+        io_order_window=io_order_window,
     )
 
 
@@ -477,6 +617,175 @@ class RateController:
         return base + self._backoff
 
 
+class AdaptiveConcurrency:
+    """AIMD limit on how many scan workers process files at once.
+
+    Worker threads are started up to ``ceiling`` and take a slot around each
+    file. Every ``window_s`` seconds the limit is re-evaluated from the
+    chunk reads reported through :meth:`note_io`. The limit grows by one
+    while workers are waiting for a slot and the device keeps up. It is
+    halved when errors occur, when the last increase cost more than 10% of
+    throughput, or when chunk latency rises ``latency_factor`` times above
+    the best seen without throughput improving. Disabled controllers keep the
+    initial limit for the whole scan.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial: int,
+        ceiling: int,
+        minimum: int = 1,
+        enabled: bool = True,
+        window_s: float = 2.0,
+        min_samples: int = 8,
+        latency_factor: float = 2.5,
+        decrease: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.enabled = enabled
+        self.ceiling = max(1, int(ceiling))
+        self.minimum = max(1, min(int(minimum), self.ceiling))
+        self.initial = max(self.minimum, min(int(initial), self.ceiling))
+        self._limit = self.initial
+        self._window_s = max(0.1, float(window_s))
+        self._min_samples = max(1, int(min_samples))
+        self._latency_factor = max(1.0, float(latency_factor))
+        self._decrease = min(0.9, max(0.1, float(decrease)))
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+        self._started = clock()
+        self._window_start = self._started
+        self._bytes = 0
+        self._chunks = 0
+        self._latency = 0.0
+        self._errors = 0
+        self._baseline: Optional[float] = None
+        self._prev_throughput: Optional[float] = None
+        self._last_step = "hold"
+        self._peak = self._limit
+        self._adjustments = 0
+        self._limit_seconds = 0.0
+        self._last_change = self._started
+        self._timeline: list[Dict[str, float]] = [{"t": 0.0, "limit": self._limit}]
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def thread_count(self) -> int:
+        return self.ceiling if self.enabled else self._limit
+
+    def acquire(self) -> None:
+        with self._cond:
+            self._waiting += 1
+            try:
+                while self._active >= self._limit:
+                    self._cond.wait(0.5)
+            finally:
+                self._waiting -= 1
+            self._active += 1
+
+    def release(self) -> None:
+        with self._cond:
+            self._active = max(0, self._active - 1)
+            self._cond.notify()
+
+    @contextlib.contextmanager
+    def slot(self):
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def note_io(self, bytes_read: int, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._cond:
+            self._bytes += max(0, int(bytes_read))
+            self._chunks += 1
+            self._latency += max(0.0, float(seconds))
+            self._maybe_adjust()
+
+    def note_error(self) -> None:
+        if not self.enabled:
+            return
+        with self._cond:
+            self._errors += 1
+            self._maybe_adjust()
+
+    def _set_limit(self, value: int, now: float, step: str) -> None:
+        value = max(self.minimum, min(self.ceiling, value))
+        self._last_step = step if value != self._limit else "hold"
+        if value == self._limit:
+            return
+        self._limit_seconds += self._limit * (now - self._last_change)
+        self._last_change = now
+        self._limit = value
+        self._peak = max(self._peak, value)
+        self._adjustments += 1
+        if len(self._timeline) < 500:
+            self._timeline.append({"t": round(now - self._started, 2), "limit": value})
+        self._cond.notify_all()
+
+    def _maybe_adjust(self) -> None:
+        now = self._clock()
+        elapsed = now - self._window_start
+        if elapsed < self._window_s or (self._chunks < self._min_samples and not self._errors):
+            return
+        throughput = self._bytes / elapsed if elapsed > 0 else 0.0
+        latency = self._latency / self._chunks if self._chunks else 0.0
+        if latency > 0:
+            # Let the baseline drift up so one cached burst does not pin it low.
+            self._baseline = latency if self._baseline is None else min(latency, self._baseline * 1.05)
+        prev = self._prev_throughput
+        improved = prev is None or throughput > prev * 1.05
+        if self._errors:
+            step = "error"
+        elif self._last_step == "increase" and prev is not None and throughput < prev * 0.9:
+            step = "throughput"
+        elif (
+            self._baseline is not None
+            and latency > self._baseline * self._latency_factor
+            and not improved
+        ):
+            step = "latency"
+        else:
+            step = ""
+        if step:
+            self._set_limit(min(self._limit - 1, int(self._limit * self._decrease)), now, "decrease")
+        elif self._waiting > 0:
+            self._set_limit(self._limit + 1, now, "increase")
+        else:
+            self._set_limit(self._limit, now, "hold")
+        self._prev_throughput = throughput
+        self._window_start = now
+        self._bytes = 0
+        self._chunks = 0
+        self._latency = 0.0
+        self._errors = 0
+
+    def summary(self) -> Dict[str, Any]:
+        with self._cond:
+            now = self._clock()
+            total = now - self._started
+            weighted = self._limit_seconds + self._limit * (now - self._last_change)
+            return {
+                "mode": "adaptive" if self.enabled else "fixed",
+                "initial": self.initial,
+                "ceiling": self.ceiling,
+                "final": self._limit,
+                "peak": self._peak,
+                "mean": round(weighted / total, 2) if total > 0 else float(self._limit),
+                "adjustments": self._adjustments,
+                "timeline": list(self._timeline),
+            }
+
+
 def enumerate_sleep_range(profile: ProfileName, gentle: bool) -> Optional[Tuple[float, float]]:
     if not gentle:
         if profile == "NETWORK":
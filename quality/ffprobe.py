@@ -5,7 +5,9 @@ import json
 import shutil
 import subprocess
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+
+from core.probe_cache import FFPROBE, ProbeCache
 
 # Optional helpers for language normalization
 try:  # pragma: no cover - optional dependency
@@ -120,8 +122,23 @@ def _safe_float(value: Optional[str]) -> Optional[float]:
         return None
 
 
-def run_ffprobe(path: str, *, timeout: float) -> ProbeResult:
-    """Execute ffprobe for *path* and return structured stream metadata."""
+def run_ffprobe(
+    path: str,
+    *,
+    timeout: float,
+    cache: Optional[ProbeCache] = None,
+    cache_key: Optional[str] = None,
+) -> ProbeResult:
+    """Execute ffprobe for *path* and return structured stream metadata.
+
+    With a *cache*, output stored for the same path, size and mtime is reused
+    instead of spawning ffprobe, and fresh successful output is stored.
+    """
+
+    if cache is not None:
+        cached = cache.get(FFPROBE, cache_key or path, fs_path=path)
+        if cached is not None:
+            return parse_ffprobe_output(cached)
 
     ffprobe_path = shutil.which("ffprobe")
     if not ffprobe_path:
@@ -164,6 +181,15 @@ def run_ffprobe(path: str, *, timeout: float) -> ProbeResult:
         parsed = json.loads(proc.stdout or "{}")
     except json.JSONDecodeError as exc:
         return ProbeResult(ok=False, error=f"invalid ffprobe output: {exc}", reason="probe_error")
+    if not isinstance(parsed, dict):
+        return ProbeResult(ok=False, error="invalid ffprobe output", reason="probe_error")
+    if cache is not None:
+        cache.put(FFPROBE, cache_key or path, parsed, fs_path=path)
+    return parse_ffprobe_output(parsed)
+
+
+def parse_ffprobe_output(parsed: Dict[str, Any]) -> ProbeResult:
+    """Convert ``ffprobe -show_streams -show_format`` JSON into a :class:`ProbeResult`."""
 
     format_section = parsed.get("format") if isinstance(parsed.get("format"), dict) else {}
     container = format_section.get("format_name") or format_section.get("format_long_name")
@@ -234,5 +260,6 @@ __all__ = [
     "AudioStream",
     "SubtitleStream",
     "ffprobe_available",
+    "parse_ffprobe_output",
     "run_ffprobe",
 ]
@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import Callable, Dict, List, Optional
 
 from core.db import connect
+from core.probe_cache import ProbeCache
 from robust import CancellationToken, to_fs_path
 
 from .ffprobe import ProbeResult, ffprobe_available, run_ffprobe
@@ -93,6 +94,15 @@ class QualityRunner:
         self.long_path_mode = long_path_mode
         self.store = QualityStore(self.conn)
         self.conn.row_factory = sqlite3.Row
+        self._probe_caches: Dict[str, ProbeCache] = {}
+
+    def _probe_cache(self, drive_label: object) -> ProbeCache:
+        label = str(drive_label or "")
+        cache = self._probe_caches.get(label)
+        if cache is None:
+            cache = ProbeCache(self.conn, label)
+            self._probe_caches[label] = cache
+        return cache
 
     def _emit(self, payload: Dict[str, object]) -> None:
         if self.progress_callback is None:
@@ -180,7 +190,12 @@ class QualityRunner:
                 summary.skipped += 1
                 continue
             fs_path = self._fs_path(inv_path)
-            probe_result = run_ffprobe(fs_path, timeout=self.settings.timeout_s)
+            probe_result = run_ffprobe(
+                fs_path,
+                timeout=self.settings.timeout_s,
+                cache=self._probe_cache(row.get("drive_label")),
+                cache_key=inv_path,
+            )
             if probe_result.ok and probe_result.data is not None:
                 quality_row = self._build_row(inv_path, probe_result)
                 summary.updated += 1
@@ -0,0 +1,233 @@
+"""Compact index of a drive's existing ``files`` rows for rescans.
+
+Rescans look up every enumerated path in the shard to decide whether it is
+unchanged, changed or new, and whatever was never looked up is marked
+deleted afterwards. Holding one dict per row for that costs gigabytes on
+multi-million-file drives, so :class:`ExistingFileIndex` keeps parallel
+integer arrays sorted by the hash of each path key instead (about 42 bytes
+per row). Path strings are not retained: a second, independent 64-bit
+BLAKE2b digest of each key confirms a hash match, so a new path whose hash
+equals an existing key is not mistaken for that row. Rows whose key hashes
+collide are resolved through a small exact-key dict, and deleted rows are
+reported by id.
+Modification times are kept as 64-bit string hashes; they are only compared
+for equality, like the strings they replace. Fast delta scans also load the
+hash of each row's parent directory so a whole unchanged directory can be
+marked seen at once.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from array import array
+from hashlib import blake2b
+from bisect import bisect_left
+from functools import partial
+from typing import Dict, Iterator, NamedTuple, Optional, Set
+
+import numpy as np
+
+from robust import key_for_path
+
+_UNKNOWN = -1
+_ID_CHUNK = 500
+
+
+def _check_digest(key: str) -> int:
+    digest = blake2b(key.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+class ExistingFile(NamedTuple):
+    id: int
+    size_bytes: int
+    mtime_hash: int
+    deleted: bool
+
+    def unchanged(self, size_bytes: int, mtime_utc: str) -> bool:
+        """Return ``True`` when size and mtime match the enumerated file."""
+
+        if self.size_bytes == _UNKNOWN:
+            return False
+        return self.size_bytes == int(size_bytes) and self.mtime_hash == hash(mtime_utc)
+
+
+class ExistingFileIndex:
+    """Read-once lookup of the rows a rescan has not seen yet.
+
+    :meth:`pop` returns a row the first time its key is looked up and marks it
+    seen; :meth:`unseen_ids` lists the live rows that were never popped.
+    """
+
+    def __init__(
+        self,
+        keys: array,
+        checks: array,
+        ids: array,
+        sizes: array,
+        mtimes: array,
+        deleted: bytearray,
+        collisions: Optional[Dict[str, int]] = None,
+        parents: Optional[array] = None,
+    ) -> None:
+        self._keys = keys
+        self._checks = checks
+        self._ids = ids
+        self._sizes = sizes
+        self._mtimes = mtimes
+        self._deleted = deleted
+        self._seen = bytearray(len(keys))
+        self._collisions = collisions or {}
+        self._collided: Set[int] = {hash(key) for key in self._collisions}
+        self._parent_keys: Optional[np.ndarray] = None
+        self._parent_slots: Optional[np.ndarray] = None
+        if parents is not None:
+            parent_view = np.frombuffer(parents, dtype=np.int64)
+            self._parent_slots = np.argsort(parent_view, kind="stable")
+            self._parent_keys = parent_view[self._parent_slots]
+
+    @classmethod
+    def load(
+        cls,
+        conn: sqlite3.Connection,
+        drive_label: str,
+        *,
+        casefold: bool,
+        with_parents: bool = False,
+    ) -> "ExistingFileIndex":
+        key_of = partial(key_for_path, casefold=casefold)
+        keys = array("q")
+        checks = array("q")
+        parents: Optional[array] = array("q") if with_parents else None
+        ids = array("q")
+        sizes = array("q")
+        mtimes = array("q")
+        deleted = bytearray()
+        cur = conn.execute(
+            """
+            SELECT id, path, COALESCE(size_bytes, -1), mtime_utc, COALESCE(deleted, 0) != 0
+            FROM files WHERE drive_label=?
+            """,
+            (drive_label,),
+        )
+        while True:
+            rows = cur.fetchmany(10_000)
+            if not rows:
+                break
+            batch_ids, paths, batch_sizes, batch_mtimes, batch_deleted = zip(*rows)
+            path_keys = list(map(key_of, paths))
+            keys.extend(map(hash, path_keys))
+            checks.extend(map(_check_digest, path_keys))
+            if parents is not None:
+                parents.extend(map(hash, map(os.path.dirname, path_keys)))
+            ids.extend(batch_ids)
+            sizes.extend(batch_sizes)
+            mtimes.extend(map(hash, batch_mtimes))
+            deleted.extend(batch_deleted)
+
+        # Sort every column by key hash so lookups can bisect the key array.
+        order = np.argsort(np.frombuffer(keys, dtype=np.int64), kind="stable")
+
+        def _sorted(column: array) -> array:
+            return array("q", np.frombuffer(column, dtype=np.int64)[order].tobytes())
+
+        keys, checks, ids = _sorted(keys), _sorted(checks), _sorted(ids)
+        sizes, mtimes = _sorted(sizes), _sorted(mtimes)
+        if parents is not None:
+            parents = _sorted(parents)
+        deleted = bytearray(np.frombuffer(deleted, dtype=np.uint8)[order].tobytes())
+        del order
+
+        collisions: Dict[str, int] = {}
+        key_view = np.frombuffer(keys, dtype=np.int64)
+        dup = np.flatnonzero(key_view[1:] == key_view[:-1]) if len(keys) > 1 else ()
+        if len(dup):
+            slots = np.unique(np.concatenate([dup, dup + 1]))
+            by_id = {ids[int(slot)]: int(slot) for slot in slots}
+            id_list = sorted(by_id)
+            for start in range(0, len(id_list), _ID_CHUNK):
+                chunk = id_list[start : start + _ID_CHUNK]
+                placeholders = ",".join("?" for _ in chunk)
+                for file_id, path in conn.execute(
+                    f"SELECT id, path FROM files WHERE id IN ({placeholders}) ORDER BY id", chunk
+                ):
+                    collisions[key_of(path)] = by_id[int(file_id)]
+        del key_view
+        return cls(keys, checks, ids, sizes, mtimes, deleted, collisions, parents)
+
+    def _slot(self, key: str) -> Optional[int]:
+        digest = hash(key)
+        if digest in self._collided:
+            return self._collisions.get(key)
+        slot = bisect_left(self._keys, digest)
+        if slot < len(self._keys) and self._keys[slot] == digest and self._checks[slot] == _check_digest(key):
+            return slot
+        return None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        slot = self._slot(key)
+        return slot is not None and not self._seen[slot]
+
+    def pop(self, key: str) -> Optional[ExistingFile]:
+        slot = self._slot(key)
+        if slot is None or self._seen[slot]:
+            return None
+        self._seen[slot] = 1
+        return ExistingFile(
+            id=self._ids[slot],
+            size_bytes=self._sizes[slot],
+            mtime_hash=self._mtimes[slot],
+            deleted=bool(self._deleted[slot]),
+        )
+
+    def _directory_slots(self, dir_key: str) -> np.ndarray:
+        if self._parent_keys is None or self._parent_slots is None:
+            raise RuntimeError("index was loaded without parent directories")
+        digest = hash(dir_key)
+        lo = int(np.searchsorted(self._parent_keys, digest, side="left"))
+        hi = int(np.searchsorted(self._parent_keys, digest, side="right"))
+        slots = self._parent_slots[lo:hi]
+        deleted = np.frombuffer(self._deleted, dtype=np.uint8)
+        return slots[deleted[slots] == 0]
+
+    def live_in_directory(self, dir_key: str) -> int:
+        """Count live rows directly inside ``dir_key`` that were not popped yet."""
+
+        slots = self._directory_slots(dir_key)
+        seen = np.frombuffer(self._seen, dtype=np.uint8)
+        return int(np.count_nonzero(seen[slots] == 0))
+
+    def pop_directory(self, dir_key: str) -> int:
+        """Mark every live row directly inside ``dir_key`` seen; return how many were unseen."""
+
+        slots = self._directory_slots(dir_key)
+        seen = np.frombuffer(self._seen, dtype=np.uint8)
+        fresh = slots[seen[slots] == 0]
+        seen[fresh] = 1
+        return int(len(fresh))
+
+    def unseen_ids(self, chunk: int = 10_000) -> Iterator[int]:
+        """Yield ids of rows that are not deleted yet and were never popped."""
+
+        seen = np.frombuffer(self._seen, dtype=np.uint8)
+        deleted = np.frombuffer(self._deleted, dtype=np.uint8)
+        ids = np.frombuffer(self._ids, dtype=np.int64)[(seen | deleted) == 0]
+        del seen, deleted
+        for start in range(0, len(ids), chunk):
+            yield from ids[start : start + chunk].tolist()
+
+    def nbytes(self) -> int:
+        columns = (self._keys, self._checks, self._ids, self._sizes, self._mtimes)
+        total = sum(column.itemsize * len(column) for column in columns) + len(self._deleted) + len(self._seen)
+        if self._parent_keys is not None and self._parent_slots is not None:
+            total += self._parent_keys.nbytes + self._parent_slots.nbytes
+        return total
+
+
+__all__ = ["ExistingFile", "ExistingFileIndex"]
@@ -8,9 +8,11 @@ import sys
 import threading
 import time
 import unicodedata
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Sequence
+from itertools import islice
+from typing import Callable, Dict, Generic, Iterable, Optional, Sequence, Tuple, TypeVar
 
 _WINDOWS = sys.platform.startswith("win")
 
@@ -31,6 +33,9 @@ _TRANSIENT_ERRNOS = {
 }
 
 
+T = TypeVar("T")
+
+
 class PathTooLongError(OSError):
     """Raised when a path exceeds platform limits and cannot be processed."""
 
@@ -211,6 +216,94 @@ class CancellationToken:
         return self._evt.wait(timeout)
 
 
+class DirectoryPrefetcher(Generic[T]):
+    """Run directory listings ahead of a traversal on a small thread pool.
+
+    The caller keeps ownership of the traversal order: :meth:`prefetch`
+    schedules listings for directories that are about to be visited and
+    :meth:`take` returns the listing for one directory, waiting on the
+    in-flight request or running the loader inline when nothing was queued.
+    With a single worker no threads are started and every listing is inline.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str, str], T],
+        *,
+        workers: int,
+        window: Optional[int] = None,
+    ) -> None:
+        self._loader = loader
+        self.workers = max(1, int(workers))
+        self.window = max(self.workers, int(window or self.workers * 4))
+        self._pending: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if self.workers > 1:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="scan-enum",
+            )
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    def prefetch(self, candidates: Iterable[Tuple[str, str]]) -> None:
+        if self._executor is None:
+            return
+        for fs_path, display_path in candidates:
+            if fs_path in self._pending:
+                continue
+            if len(self._pending) >= self.window:
+                break
+            self._pending[fs_path] = self._executor.submit(self._loader, fs_path, display_path)
+
+    def prefetch_stack(
+        self,
+        stack: Sequence[Tuple[str, str]],
+        skip: Optional[Callable[[str], bool]] = None,
+    ) -> None:
+        """Prefetch the next directories of a depth-first walk.
+
+        ``stack`` holds ``(display_path, fs_path)`` entries and is popped from
+        the end; display paths for which ``skip`` returns true are not listed.
+        """
+
+        self.prefetch(
+            islice(
+                (
+                    (fs_path, display_path)
+                    for display_path, fs_path in reversed(stack)
+                    if skip is None or not skip(display_path)
+                ),
+                self.window,
+            )
+        )
+
+    def take(self, fs_path: str, display_path: str) -> T:
+        future = self._pending.pop(fs_path, None)
+        if future is None:
+            return self._loader(fs_path, display_path)
+        return future.result()
+
+    def discard(self, fs_path: str) -> None:
+        """Drop the listing of a directory the traversal will not visit."""
+
+        future = self._pending.pop(fs_path, None)
+        if future is not None:
+            future.cancel()
+
+    def close(self) -> None:
+        executor = self._executor
+        self._executor = None
+        if executor is None:
+            return
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        executor.shutdown(wait=True)
+
+
 __all__ = [
     "RobustSettings",
     "merge_settings",
@@ -224,4 +317,5 @@ __all__ = [
     "PathTooLongError",
     "clamp_batch_seconds",
     "CancellationToken",
+    "DirectoryPrefetcher",
 ]
@@ -1,13 +1,12 @@
 import argparse
-import hashlib
 import importlib
 import importlib.util
 import json
 import logging
+import math
 import os
 import queue
 import random
-import re
 import shutil
 import sqlite3
 import subprocess
@@ -15,10 +14,13 @@ import sys
 import threading
 import time
 from collections import deque
+from contextlib import nullcontext
+from functools import lru_cache
+from itertools import islice
 from dataclasses import dataclass, replace
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import numpy as np
 
@@ -61,13 +63,17 @@ from core.paths import (
 )
 from core.ann import ANNIndexManager
 from core.db import connect, transaction
+from core.probe_cache import MEDIAINFO, ProbeCache
+from core.search_index import ensure_search_index
 from backup import BackupError, BackupOptions, BackupService
 from core.settings import load_settings
 from learning import LearningEngine, load_learning_settings
 from learning.db import count_examples
 from assistant_monitor import get_dashboard
 from exports import ExportFilters, export_catalog, parse_since
-from inventory import InventoryRow, InventoryWriter, categorize, detect_mime
+from hashing import QUICK_FULL_MAX_BYTES, HashBackend, HashSettings, complete_deferred_hashes, hash_file
+from integrity import VerifySettings, VerifyUnavailable, tier_from, verify_file
+from inventory import InventoryRow, InventoryWriter, MimeClassifier, categorize, mime_mode_from
 from semantic import (
     SemanticConfig,
     SemanticIndexer,
@@ -85,13 +91,21 @@ from fingerprints import (
     video_vhash as fp_vhash,
 )
 
+from dirstate import DirectoryRecord, DirectoryState, ensure_directories_table
+from frontier import DirectoryTotals, ScanFrontier, ensure_frontier_table
+from ioorder import PhysicalOrderBuffer
+from reconcile import ExistingFileIndex
+from multiscan import ScanTarget, default_work_slots, parse_targets, run_targets
+from watch import WatchSettings, run_watch
 from perf import (
+    AdaptiveConcurrency,
     RateController,
     enumerate_sleep_range,
     resolve_performance_config,
 )
 from robust import (
     CancellationToken,
+    DirectoryPrefetcher,
     PathTooLongError,
     clamp_batch_seconds,
     from_fs_path,
@@ -103,6 +117,7 @@ from robust import (
     should_ignore,
     to_fs_path,
 )
+from timings import ScanTimings, timings_path
 
 from db_maint import (
     MaintenanceOptions,
@@ -128,10 +143,11 @@ from visualreview import load_visualreview_settings
 from diskmark.marker import MarkerRuntime, MarkerWriteResult, load_marker, prepare_runtime, write_marker
 from diskmark.winvol import get_volume_info, query_usn_journal
 from visualreview.run import process_queue
-from musicnames import (
-    generate_review_bundle,
-    parse_music_name,
-    score_parse_result,
+from musicnames.batch import (
+    PARSER_VERSION as MUSIC_PARSER_VERSION,
+    MusicParsePool,
+    candidates_from as music_candidates_from,
+    split_parents,
 )
 
 WORKING_DIR_PATH = resolve_working_dir()
@@ -170,9 +186,6 @@ if _tqdm_spec is None:
 else:
     tqdm = importlib.import_module("tqdm").tqdm
 
-_blake3_spec = importlib.util.find_spec("blake3")
-_blake3_hash = importlib.import_module("blake3").blake3 if _blake3_spec is not None else None
-
 VIDEO_EXTS = {'.mp4','.mkv','.avi','.mov','.wmv','.m4v','.ts','.m2ts','.webm','.mpg','.mpeg'}
 AUDIO_EXTS = {'.mp3','.flac','.aac','.m4a','.wav','.wma','.ogg','.opus','.alac','.aiff','.ape','.dsf','.dff'}
 AV_EXTS = VIDEO_EXTS | AUDIO_EXTS
@@ -200,6 +213,17 @@ class FileInfo:
     is_av: bool
     existing_id: Optional[int] = None
     was_deleted: bool = False
+    inode: int = 0
+
+
+@dataclass(slots=True)
+class ListedEntry:
+    kind: str  # "dir", "file" or "ignored"
+    path: str  # display path
+    fs_path: str
+    stat: Optional[os.stat_result] = None
+    mime: Optional[str] = None
+    ext: Optional[str] = None
 
 
 @dataclass(slots=True)
@@ -210,6 +234,10 @@ class WorkerResult:
     integrity_ok: Optional[int]
     error_message: Optional[str] = None
     media_metadata: Optional[dict] = None
+    quick_hash: Optional[str] = None
+    hash_deferred: int = 0
+    verify_tier: Optional[str] = None
+    verify_pending: int = 0
 
 
 @dataclass
@@ -233,6 +261,9 @@ class LightAnalysisSettings:
     caption_max_length: int
     ann_enabled: bool
     ann_backend: str
+    workers: int = 1
+    queue_max: int = 256
+    batch_size: int = 16
 
 
 @dataclass
@@ -270,6 +301,9 @@ class LightAnalysisPipeline:
         progress_callback: Optional[Callable[[dict], None]],
         start_time: float,
         drive_label: str,
+        probe_cache: Optional[ProbeCache] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        timings: Optional[ScanTimings] = None,
     ) -> None:
         self._requested = bool(settings.enabled)
         self._settings = settings
@@ -280,6 +314,7 @@ class LightAnalysisPipeline:
         self._progress_callback = progress_callback
         self._start = start_time
         self._drive_label = drive_label
+        self._probe_cache = probe_cache
         self._last_emit = 0.0
         self._writer: Optional[FeatureWriter] = None
         self._embedder: Optional[ImageEmbedder] = None
@@ -299,6 +334,18 @@ class LightAnalysisPipeline:
         self._features_updated = False
         self._transcripts_written = 0
         self._captions_written = 0
+        self._cancel = cancel_token
+        self._timings = timings
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max(1, int(settings.queue_max)))
+        self._sentinel = object()
+        self._threads: List[threading.Thread] = []
+        self._stats_lock = threading.Lock()
+        self._submitted = 0
+        self._processed = 0
+        self._batches = 0
+        self._blocked_submits = 0
+        self._blocked_seconds = 0.0
+        self._max_depth = 0
 
     def prepare(self) -> None:
         if not self._requested:
@@ -332,7 +379,8 @@ class LightAnalysisPipeline:
                         max_video_frames=self._settings.max_video_frames,
                         scene_threshold=self._settings.scene_threshold,
                         min_scene_len=self._settings.scene_min_len,
-                    )
+                    ),
+                    probe_cache=self._probe_cache,
                 )
                 semantic_ready = True
             except SemanticModelError as exc:
@@ -392,6 +440,7 @@ class LightAnalysisPipeline:
                 max_frames=self._settings.max_video_frames,
                 rate_limit_profile=self._profile,
                 hwaccel_args=self._ffmpeg_hwaccel_args,
+                probe_cache=self._probe_cache,
             )
         elif self._semantic is None and not self._ffmpeg_path:
             self._warning = "FFmpeg not available — video thumbnails skipped."
@@ -468,6 +517,147 @@ class LightAnalysisPipeline:
             arr = arr / norm
         return arr.astype(np.float32, copy=False)
 
+    @property
+    def wants_metadata(self) -> bool:
+        return bool(self._active and self._writer)
+
+    def submit(self, info: FileInfo, metadata: Optional[dict] = None) -> None:
+        """Queue *info* for the light-analysis workers.
+
+        Blocks while the queue is full, which is the backpressure the scan
+        feels; the time spent waiting is reported in progress payloads.
+        """
+
+        if not self._active or not self._writer:
+            return
+        try:
+            suffix = Path(info.path).suffix.lower()
+        except Exception:
+            return
+        if suffix not in IMAGE_EXTS and suffix not in VIDEO_EXTS:
+            if not (self._transcriber and suffix in AV_EXTS):
+                return
+        self._ensure_workers()
+        item = (info, metadata)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            started = time.perf_counter()
+            while True:
+                if self._cancel is not None and self._cancel.is_set():
+                    return
+                try:
+                    self._queue.put(item, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+            with self._stats_lock:
+                self._blocked_submits += 1
+                self._blocked_seconds += time.perf_counter() - started
+        with self._stats_lock:
+            self._submitted += 1
+            self._max_depth = max(self._max_depth, self._queue.qsize())
+
+    def backpressure(self) -> Dict[str, object]:
+        with self._stats_lock:
+            return {
+                "light_queue_depth": self._queue.qsize(),
+                "light_queue_max": self._queue.maxsize,
+                "light_queue_peak": self._max_depth,
+                "light_submitted": self._submitted,
+                "light_processed": self._processed,
+                "light_blocked_submits": self._blocked_submits,
+                "light_blocked_s": round(self._blocked_seconds, 3),
+            }
+
+    def _ensure_workers(self) -> None:
+        if self._threads:
+            return
+        for idx in range(max(1, int(self._settings.workers))):
+            thread = threading.Thread(target=self._worker, name=f"light-worker-{idx+1}")
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def _worker(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if item is self._sentinel:
+                self._queue.task_done()
+                break
+            # Take whatever else is already waiting so images share one inference call.
+            batch = [item]
+            stop = False
+            while len(batch) < self._settings.batch_size:
+                try:
+                    extra = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if extra is self._sentinel:
+                    stop = True
+                    break
+                batch.append(extra)
+            started = time.perf_counter()
+            try:
+                if self._cancel is None or not self._cancel.is_set():
+                    self._process_batch(batch)  # type: ignore[arg-type]
+            except Exception as exc:  # pragma: no cover - defensive guard
+                LOGGER.warning("Light analysis batch failed: %s", exc)
+            finally:
+                if self._timings is not None:
+                    self._timings.observe("light_analysis", time.perf_counter() - started)
+                with self._stats_lock:
+                    self._processed += len(batch)
+                    self._batches += 1
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                self._queue.task_done()
+                break
+
+    def _process_batch(self, batch: List[Tuple[FileInfo, Optional[dict]]]) -> None:
+        images = [(info, metadata) for info, metadata in batch if Path(info.path).suffix.lower() in IMAGE_EXTS]
+        if images:
+            paths = [Path(info.fs_path) for info, _ in images]
+            vectors: List[Optional[np.ndarray]] = [None] * len(paths)
+            if self._semantic is not None:
+                vectors = self._semantic.encode_image_paths(paths)
+            elif self._embedder is not None:
+                vectors = self._embedder.embed_paths(paths)
+            for (info, _metadata), vector in zip(images, vectors):
+                if vector is not None:
+                    self._store_image(info, vector)
+        for info, metadata in batch:
+            if Path(info.path).suffix.lower() not in IMAGE_EXTS:
+                self.process(info, metadata=metadata)
+
+    def _store_image(self, info: FileInfo, vector: np.ndarray) -> None:
+        assert self._writer is not None
+        normalized = self._normalize_vector(vector)
+        record = FeatureRecord(
+            path=info.path,
+            kind="image",
+            vector=normalized,
+            frames_used=1,
+        )
+        self._writer.add(record)
+        self._features_updated = True
+        if self._captioner and self._caption_writer:
+            caption = self._captioner.generate(Path(info.fs_path))
+            if caption:
+                self._caption_writer.add(
+                    CaptionRecord(
+                        path=info.path,
+                        content=caption,
+                        model=self._settings.caption_model,
+                    )
+                )
+                self._captions_written += 1
+        self._emit_progress()
+
     def process(self, info: FileInfo, metadata: Optional[dict] = None) -> None:
         if not self._active or not self._writer:
             return
@@ -482,27 +672,7 @@ class LightAnalysisPipeline:
             elif self._embedder is not None:
                 vector = self._embedder.embed_path(Path(info.fs_path))
             if vector is not None:
-                normalized = self._normalize_vector(vector)
-                record = FeatureRecord(
-                    path=info.path,
-                    kind="image",
-                    vector=normalized,
-                    frames_used=1,
-                )
-                self._writer.add(record)
-                self._features_updated = True
-                if self._captioner and self._caption_writer:
-                    caption = self._captioner.generate(Path(info.fs_path))
-                    if caption:
-                        self._caption_writer.add(
-                            CaptionRecord(
-                                path=info.path,
-                                content=caption,
-                                model=self._settings.caption_model,
-                            )
-                        )
-                        self._captions_written += 1
-                self._emit_progress()
+                self._store_image(info, vector)
         elif suffix in VIDEO_EXTS:
             vector: Optional[np.ndarray] = None
             frames_used = 0
@@ -537,6 +707,13 @@ class LightAnalysisPipeline:
                 )
                 self._transcripts_written += 1
 
+    def _stop_workers(self) -> None:
+        for _ in self._threads:
+            self._queue.put(self._sentinel)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
     def finalize(self) -> Dict[str, object]:
         summary = {
             "requested": self._requested,
@@ -548,6 +725,7 @@ class LightAnalysisPipeline:
             "gpu_policy": self._gpu.policy,
             "hwaccel": self._gpu_hwaccel,
         }
+        self._stop_workers()
         if not self._active or not self._writer:
             if self._error:
                 summary["status"] = "error"
@@ -565,6 +743,11 @@ class LightAnalysisPipeline:
         summary["videos"] = self._writer.total_videos
         summary["avg_dim"] = self._writer.average_dimension()
         summary["status"] = "ok"
+        summary["queue"] = {
+            key.replace("light_", "", 1): value for key, value in self.backpressure().items()
+        }
+        summary["queue"]["batches"] = self._batches
+        summary["queue"]["workers"] = int(self._settings.workers)
         if self._warning:
             summary["warning"] = self._warning
         if self._transcript_writer:
@@ -596,6 +779,7 @@ class LightAnalysisPipeline:
             "light_videos": self._writer.total_videos,
             "light_avg_dim": self._writer.average_dimension(),
         }
+        payload.update(self.backpressure())
         if self._transcripts_written:
             payload["light_transcripts"] = self._transcripts_written
         if self._captions_written:
@@ -642,9 +826,11 @@ class FingerprintPipeline:
         start_time: float,
         perf_profile: str,
         cancel_token: CancellationToken,
+        timings: Optional[ScanTimings] = None,
     ) -> None:
         self._settings = settings
         self._shard_path = shard_path
+        self._timings = timings
         self._progress_callback = progress_callback
         self._start = start_time
         self._last_emit = 0.0
@@ -722,6 +908,10 @@ class FingerprintPipeline:
             self._settings.phase_mode,
         )
 
+    @property
+    def wants_metadata(self) -> bool:
+        return self._enabled
+
     def submit(self, result: WorkerResult) -> None:
         if not self._enabled:
             return
@@ -864,6 +1054,7 @@ class FingerprintPipeline:
         duration_hint = _extract_duration(task.metadata)
         suffix = Path(info.path).suffix.lower()
         errors: List[str] = []
+        started = time.perf_counter()
         try:
             if self._prefilter_enabled and suffix in VIDEO_EXTS and not self._cancel.is_set():
                 if not store.has_vhash(info.path):
@@ -904,6 +1095,8 @@ class FingerprintPipeline:
         except Exception as exc:
             errors.append(str(exc))
         finally:
+            if self._timings is not None:
+                self._timings.observe("fingerprint", time.perf_counter() - started)
             if errors:
                 with self._lock:
                     self._errors.extend(errors)
@@ -1032,6 +1225,12 @@ def _resolve_light_analysis(
     ann_enabled = bool((ann_cfg or {}).get("enabled", True))
     ann_backend = str((ann_cfg or {}).get("backend", "auto"))
 
+    def _positive_int(name: str, default: int) -> int:
+        try:
+            return max(1, int(config.get(name, default)))
+        except (TypeError, ValueError):
+            return default
+
     return LightAnalysisSettings(
         enabled=enabled,
         model_path=model_path,
@@ -1052,6 +1251,9 @@ def _resolve_light_analysis(
         caption_max_length=caption_max_length,
         ann_enabled=ann_enabled,
         ann_backend=ann_backend,
+        workers=_positive_int("workers", 1),
+        queue_max=_positive_int("queue_max", 256),
+        batch_size=_positive_int("batch_size", 16),
     )
 
 
@@ -1157,6 +1359,80 @@ def _resolve_fingerprint_settings(
     )
 
 
+def _resolve_verify_settings(
+    settings: Optional[Dict[str, object]], overrides: Optional[Dict[str, object]]
+) -> VerifySettings:
+    config: Dict[str, object] = {}
+    if isinstance(settings, dict):
+        maybe = settings.get("integrity")
+        if isinstance(maybe, dict):
+            config = maybe
+    overrides = overrides or {}
+
+    def _bool(name: str, default: bool) -> bool:
+        if name in overrides:
+            return bool(overrides[name])
+        return bool(config.get(name, default))
+
+    def _float(name: str, default: float, minimum: float = 0.0) -> float:
+        value = overrides.get(name, config.get(name, default))
+        try:
+            return max(minimum, float(value))
+        except (TypeError, ValueError):
+            return default
+
+    def _int(name: str, default: int, minimum: int = 1) -> int:
+        value = overrides.get(name, config.get(name, default))
+        try:
+            result = int(value)
+        except (TypeError, ValueError):
+            result = default
+        return max(minimum, result)
+
+    tier = tier_from(overrides.get("tier", config.get("tier"))) or "full"
+    return VerifySettings(
+        tier=tier,
+        defer_deep=_bool("defer_deep", False),
+        sample_windows=_int("sample_windows", 4, minimum=1),
+        sample_seconds=_float("sample_seconds", 2.0, minimum=0.5),
+        timeout_s=_float("timeout_s", 0.0),
+    )
+
+
+def _resolve_watch_settings(
+    settings: Optional[Dict[str, object]], overrides: Optional[Dict[str, object]]
+) -> WatchSettings:
+    config: Dict[str, object] = {}
+    if isinstance(settings, dict):
+        maybe = settings.get("watch")
+        if isinstance(maybe, dict):
+            config = maybe
+    overrides = overrides or {}
+
+    def _float(name: str, default: float, minimum: float) -> float:
+        value = overrides.get(name, config.get(name, default))
+        try:
+            return max(minimum, float(value))
+        except (TypeError, ValueError):
+            return default
+
+    def _int(name: str, default: int) -> int:
+        value = overrides.get(name, config.get(name, default))
+        try:
+            return max(0, int(value))
+        except (TypeError, ValueError):
+            return default
+
+    debounce = _float("debounce_seconds", 5.0, 0.5)
+    return WatchSettings(
+        use_inotify=bool(overrides.get("use_inotify", config.get("use_inotify", True))),
+        debounce_s=debounce,
+        max_batch_s=max(debounce, _float("max_batch_seconds", 60.0, 1.0)),
+        poll_s=_float("poll_seconds", 300.0, 5.0),
+        max_watches=_int("max_watches", 0),
+    )
+
+
 class ScanStateStore:
     def __init__(self, conn: sqlite3.Connection, drive_label: str, interval_seconds: int = 5):
         self.conn = conn
@@ -1221,25 +1497,57 @@ def run(cmd:list[str]) -> tuple[int,str,str]:
         # are not installed.
         return 127, "", str(exc)
 
-def mediainfo_json(file_path: str, executable: Optional[str]) -> Optional[dict]:
+def mediainfo_json(
+    file_path: str,
+    executable: Optional[str],
+    *,
+    cache: Optional[ProbeCache] = None,
+    cache_key: Optional[str] = None,
+) -> Optional[dict]:
     if not executable:
         return None
+    if cache is not None:
+        cached = cache.get(MEDIAINFO, cache_key or file_path, fs_path=file_path)
+        if cached is not None:
+            return cached
     code, out, err = run([executable, "--Output=JSON", file_path])
     if code == 0 and out.strip():
         try:
-            return json.loads(out)
+            metadata = json.loads(out)
         except Exception:
             return None
+        if cache is not None and isinstance(metadata, dict):
+            cache.put(MEDIAINFO, cache_key or file_path, metadata, fs_path=file_path)
+        return metadata
     return None
 
-def ffmpeg_verify(file_path: str, executable: Optional[str]) -> bool:
+def ffmpeg_verify(
+    file_path: str,
+    executable: Optional[str],
+    *,
+    tier: str = "full",
+    settings: Optional[VerifySettings] = None,
+    probe_cache: Optional[ProbeCache] = None,
+    cache_key: Optional[str] = None,
+) -> Optional[bool]:
+    """Verify *file_path*; ``None`` means ffmpeg could not run so nothing was checked."""
+
     if not any(file_path.lower().endswith(e) for e in VIDEO_EXTS):
         return True
     if not executable:
         return True
-    # -v error: only show errors; -xerror: stop on error
-    code, out, err = run([executable, "-v", "error", "-xerror", "-i", file_path, "-f", "null", "-", "-nostdin"])
-    return code == 0
+    try:
+        return verify_file(
+            file_path,
+            executable,
+            tier_from(tier) or "full",
+            settings or VerifySettings(),
+            probe_cache=probe_cache,
+            cache_key=cache_key,
+        )
+    except VerifyUnavailable as exc:
+        LOGGER.warning("Integrity check skipped for %s: %s", file_path, exc)
+        return None
 
 def hash_blake3(
     file_path: str,
@@ -1247,27 +1555,41 @@ def hash_blake3(
     *,
     on_chunk: Optional[Callable[[int, float], None]] = None,
 ) -> str:
-    if _blake3_hash is None:
-        h = hashlib.sha256()
-    else:
-        h = _blake3_hash()
-    with open(file_path, "rb") as f:
-        while True:
-            start = time.perf_counter()
-            b = f.read(chunk)
-            elapsed = time.perf_counter() - start
-            if not b:
-                if on_chunk is not None and elapsed > 0:
-                    on_chunk(0, elapsed)
-                break
-            h.update(b)
-            if on_chunk is not None:
-                on_chunk(len(b), elapsed)
-    return h.hexdigest()
+    return hash_file(file_path, chunk, on_chunk=on_chunk)
+
+
+@lru_cache(maxsize=65536)
+def _iso_from_second(second: int) -> str:
+    return datetime.utcfromtimestamp(second).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
 def _iso_from_timestamp(ts: float) -> str:
-    return datetime.utcfromtimestamp(ts).strftime("%Y-%m-%dT%H:%M:%SZ")
+    # Files copied together share mtime seconds; the cache hands them one
+    # string object instead of formatting and keeping a copy per file.
+    # Round to microseconds first, as datetime.utcfromtimestamp does, so
+    # .9999995 and later roll into the next second like stored mtimes did.
+    frac, whole = math.modf(ts)
+    micros = round(frac * 1e6)
+    second = int(whole)
+    if micros >= 1_000_000:
+        second += 1
+    elif micros < 0:
+        second -= 1
+    return _iso_from_second(second)
+
+
+_NOW_ISO: Tuple[int, str] = (-1, "")
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time as ISO text, formatted once per second."""
+
+    global _NOW_ISO
+    second = int(time.time())
+    cached = _NOW_ISO
+    if cached[0] != second:
+        cached = _NOW_ISO = (second, _iso_from_second(second))
+    return cached[1]
 
 
 def _is_av(path: str) -> bool:
@@ -1275,14 +1597,7 @@ def _is_av(path: str) -> bool:
 
 
 def _split_music_parents(path: str) -> List[str]:
-    cleaned = path.rstrip("/\\")
-    if not cleaned:
-        return []
-    parts = re.split(r"[\\/]+", cleaned)
-    if not parts:
-        return []
-    # Drop the file segment and empty components.
-    return [segment for segment in parts[:-1] if segment]
+    return split_parents(path)
 
 
 def _float_close(a: Optional[float], b: Optional[float], *, tolerance: float = 1e-6) -> bool:
@@ -1291,45 +1606,116 @@ def _float_close(a: Optional[float], b: Optional[float], *, tolerance: float = 1
     return abs(a - b) <= tolerance
 
 
-def _load_existing(
-    conn: sqlite3.Connection, drive_label: str, *, casefold: bool
-) -> Dict[str, dict]:
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT id, path, size_bytes, mtime_utc, deleted FROM files WHERE drive_label=?",
-        (drive_label,),
-    )
-    existing: Dict[str, dict] = {}
-    for row in cur.fetchall():
-        file_id, path, size_bytes, mtime_utc, deleted = row
-        key = key_for_path(path, casefold=casefold)
-        existing[key] = {
-            "id": file_id,
-            "path": path,
-            "size_bytes": size_bytes,
-            "mtime_utc": mtime_utc,
-            "deleted": int(deleted or 0),
-        }
-    return existing
+def _duplicate_sizes(conn: sqlite3.Connection, label: str, *, shard_path: Path) -> Set[int]:
+    """Return sizes of deferred rows that another live file shares on any shard.
+
+    The histogram is built from the shards' own ``files`` tables, which hold
+    every live file, rather than from ``catalog.db``. Only the sizes of this
+    drive's deferred rows are tracked, so the other shards are streamed once
+    instead of loaded into memory.
+    """
+
+    candidates = {
+        int(row[0])
+        for row in conn.execute(
+            "SELECT DISTINCT size_bytes FROM files WHERE drive_label=? AND deleted=0 AND hash_deferred=1",
+            (label,),
+        )
+        if row[0] is not None
+    }
+    if not candidates:
+        return set()
+    duplicates: Set[int] = {
+        int(row[0])
+        for row in conn.execute(
+            "SELECT size_bytes FROM files WHERE deleted=0 GROUP BY size_bytes HAVING COUNT(*) > 1"
+        )
+        if row[0] in candidates
+    }
+    remaining = candidates - duplicates
+    shards_dir = get_shards_dir(WORKING_DIR_PATH)
+    current = shard_path.resolve()
+    for other_path in sorted(shards_dir.glob("*.db")) if shards_dir.exists() else []:
+        if not remaining:
+            break
+        if other_path.resolve() == current:
+            continue
+        try:
+            other = connect(other_path, read_only=True)
+        except sqlite3.Error as exc:
+            LOGGER.debug("Size histogram skipped %s: %s", other_path, exc)
+            continue
+        try:
+            for (size,) in other.execute("SELECT size_bytes FROM files WHERE deleted=0"):
+                if size in remaining:
+                    duplicates.add(int(size))
+                    remaining.discard(size)
+        except sqlite3.Error as exc:
+            LOGGER.debug("Size histogram skipped %s: %s", other_path, exc)
+        finally:
+            other.close()
+    return duplicates
 
 
 def _mark_deleted(
     conn: sqlite3.Connection,
     drive_label: str,
     *,
-    deleted_paths: Iterable[str],
+    deleted_paths: Iterable[str] = (),
+    deleted_ids: Iterable[int] = (),
+    chunk: int = 1000,
 ) -> Tuple[int, List[str]]:
+    """Flag vanished files as deleted and drop their ``inventory`` rows.
+
+    ``files`` keeps deleted rows for history; the inventory only lists what
+    is on the drive. Both tables change in one transaction.
+    """
+
     cur = conn.cursor()
     timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
     deleted_paths = list(deleted_paths)
-    if not deleted_paths:
-        return 0, []
-    cur.executemany(
-        "UPDATE files SET deleted=1, deleted_ts=? WHERE drive_label=? AND path=? AND deleted=0",
-        [(timestamp, drive_label, path) for path in deleted_paths],
-    )
+    example_ids: List[int] = []
+
+    count = 0
+    if deleted_paths:
+        cur.executemany(
+            "UPDATE files SET deleted=1, deleted_ts=? WHERE drive_label=? AND path=? AND deleted=0",
+            [(timestamp, drive_label, path) for path in deleted_paths],
+        )
+        count += max(0, cur.rowcount)
+        cur.executemany(
+            "DELETE FROM inventory WHERE path=? AND drive_label=?",
+            [(path, drive_label) for path in deleted_paths],
+        )
+    ids = iter(deleted_ids)
+    while True:
+        batch = [int(file_id) for file_id in islice(ids, max(1, int(chunk)))]
+        if not batch:
+            break
+        example_ids.extend(batch[: 5 - len(example_ids)])
+        cur.executemany(
+            "UPDATE files SET deleted=1, deleted_ts=? WHERE drive_label=? AND id=? AND deleted=0",
+            [(timestamp, drive_label, file_id) for file_id in batch],
+        )
+        count += max(0, cur.rowcount)
+        cur.executemany(
+            """
+            DELETE FROM inventory
+            WHERE drive_label=? AND path=(SELECT path FROM files WHERE id=?)
+            """,
+            [(drive_label, file_id) for file_id in batch],
+        )
     conn.commit()
-    return cur.rowcount, deleted_paths[:5]
+    examples = deleted_paths[:5]
+    if example_ids and len(examples) < 5:
+        placeholders = ",".join("?" for _ in example_ids)
+        examples += [
+            row[0]
+            for row in conn.execute(
+                f"SELECT path FROM files WHERE id IN ({placeholders}) ORDER BY id", example_ids
+            )
+        ][: 5 - len(examples)]
+    return count, examples
 
 
 def _restore_active(conn: sqlite3.Connection, drive_label: str, paths: Iterable[str]) -> None:
@@ -1422,7 +1808,11 @@ def init_db(db_path: str):
         integrity_ok INTEGER,
         mtime_utc TEXT,
         deleted INTEGER DEFAULT 0,
-        deleted_ts TEXT
+        deleted_ts TEXT,
+        quick_hash TEXT,
+        hash_deferred INTEGER DEFAULT 0,
+        verify_tier TEXT,
+        verify_pending INTEGER DEFAULT 0
     );
     CREATE INDEX IF NOT EXISTS idx_files_drive ON files(drive_label);
     CREATE INDEX IF NOT EXISTS idx_files_hash ON files(hash_blake3);
@@ -1442,6 +1832,7 @@ def init_db(db_path: str):
     CREATE INDEX IF NOT EXISTS idx_inventory_mime ON inventory(mime);
     CREATE INDEX IF NOT EXISTS idx_inventory_category ON inventory(category);
     CREATE INDEX IF NOT EXISTS idx_inventory_mtime ON inventory(mtime_utc);
+    CREATE INDEX IF NOT EXISTS idx_inventory_path_nocase ON inventory(path COLLATE NOCASE, path);
     CREATE TABLE IF NOT EXISTS scan_state(
         key TEXT PRIMARY KEY,
         value TEXT
@@ -1462,6 +1853,8 @@ def init_db(db_path: str):
         PRIMARY KEY(path, drive_label)
     );
     CREATE INDEX IF NOT EXISTS idx_music_minimal_drive ON music_minimal(drive_label);
+    CREATE INDEX IF NOT EXISTS idx_music_minimal_score
+        ON music_minimal(drive_label, score DESC, path COLLATE NOCASE, path);
     CREATE TABLE IF NOT EXISTS music_review_queue(
         path TEXT NOT NULL,
         drive_label TEXT NOT NULL,
@@ -1474,6 +1867,13 @@ def init_db(db_path: str):
     );
     CREATE INDEX IF NOT EXISTS idx_music_review_drive ON music_review_queue(drive_label);
     CREATE INDEX IF NOT EXISTS idx_music_review_queued ON music_review_queue(queued_utc);
+    CREATE INDEX IF NOT EXISTS idx_music_review_order
+        ON music_review_queue(drive_label, score, queued_utc, path COLLATE NOCASE, path);
+    CREATE TABLE IF NOT EXISTS music_parse_state(
+        drive_label TEXT PRIMARY KEY,
+        signature TEXT NOT NULL,
+        updated_utc TEXT NOT NULL
+    );
     CREATE TABLE IF NOT EXISTS video_thumbs(
         drive_label TEXT NOT NULL,
         path TEXT NOT NULL,
@@ -1514,11 +1914,20 @@ def init_db(db_path: str):
     for name, ddl in (
         ("deleted", "ALTER TABLE files ADD COLUMN deleted INTEGER DEFAULT 0"),
         ("deleted_ts", "ALTER TABLE files ADD COLUMN deleted_ts TEXT"),
+        ("quick_hash", "ALTER TABLE files ADD COLUMN quick_hash TEXT"),
+        ("hash_deferred", "ALTER TABLE files ADD COLUMN hash_deferred INTEGER DEFAULT 0"),
+        ("verify_tier", "ALTER TABLE files ADD COLUMN verify_tier TEXT"),
+        ("verify_pending", "ALTER TABLE files ADD COLUMN verify_pending INTEGER DEFAULT 0"),
     ):
         if name not in existing_cols:
             c.execute(ddl)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_files_quick_hash ON files(quick_hash)")
     conn.commit()
     ensure_features_table(conn)
+    ensure_directories_table(conn)
+    ensure_frontier_table(conn)
+    ensure_search_index(conn, "inventory")
+    conn.commit()
     return conn
 
 
@@ -1596,7 +2005,7 @@ def record_inventory_stats(
 
 
 def _iso_from_stat(stat_result: os.stat_result) -> str:
-    return datetime.utcfromtimestamp(stat_result.st_mtime).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return _iso_from_timestamp(stat_result.st_mtime)
 
 
 def _inventory_scan(
@@ -1609,8 +2018,10 @@ def _inventory_scan(
     perf_config,
     robust_cfg,
     debug_slow: bool,
+    mime_classifier: Optional[MimeClassifier] = None,
     progress_callback: Optional[Callable[[dict], None]] = None,
 ) -> Dict[str, object]:
+    classifier = mime_classifier or MimeClassifier()
     totals: Dict[str, int] = {
         "video": 0,
         "audio": 0,
@@ -1772,11 +2183,11 @@ def _inventory_scan(
                     continue
 
                 metrics["files_seen"] += 1
-                mime, ext = detect_mime(fs_path)
+                mime, ext = classifier.detect(fs_path)
                 category = categorize(mime, ext)
                 totals[category] = totals.get(category, 0) + 1
                 total_bytes += int(stat_result.st_size)
-                indexed_utc = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+                indexed_utc = _utc_now_iso()
                 row = InventoryRow(
                     path=display_path,
                     size_bytes=int(stat_result.st_size),
@@ -1796,7 +2207,7 @@ def _inventory_scan(
         elif debug_slow:
             time.sleep(0.01)
 
-    writer.flush(force=True)
+    writer.close()
     emit_progress(force=True)
 
     duration_seconds = time.perf_counter() - start_time
@@ -1816,6 +2227,7 @@ def _inventory_scan(
         "skipped_toolong": metrics["skipped_toolong"],
         "skipped_ignored": metrics["skipped_ignored"],
         "inventory_written": writer.total_written,
+        "mime": {"mode": classifier.mode, **classifier.stats},
     }
 
 
@@ -1828,19 +2240,30 @@ def _process_music_candidates(
     progress_callback: Optional[Callable[[dict], None]],
     start_time: float,
     batch_size: int = 200,
+    workers: int = 1,
+    full_reparse: bool = False,
 ) -> Dict[str, object]:
+    """Parse music file names into ``music_minimal`` / ``music_review_queue``.
+
+    Only candidates without a stored result, or whose inventory mtime is
+    newer than that result, are parsed again. A change of parser version or
+    confidence threshold (or ``full_reparse``) re-parses everything.
+    """
+
     phase_start = time.monotonic()
     min_confidence = max(0.0, min(1.0, float(min_confidence)))
     summary: Dict[str, object] = {
         "status": "skipped",
         "reason": "no_candidates",
         "candidates": 0,
+        "skipped_unchanged": 0,
         "processed": 0,
         "stored": 0,
         "queued": 0,
         "unchanged": 0,
         "removed_minimal": 0,
         "removed_queue": 0,
+        "workers": 1,
         "duration_seconds": 0.0,
     }
     if cancel_token.is_set():
@@ -1865,6 +2288,18 @@ def _process_music_candidates(
         summary["duration_seconds"] = time.monotonic() - phase_start
         return summary
 
+    signature = f"v{MUSIC_PARSER_VERSION}:{min_confidence:.4f}"
+    state_row = conn.execute(
+        "SELECT signature FROM music_parse_state WHERE drive_label=?",
+        (drive_label,),
+    ).fetchone()
+    incremental = not full_reparse and state_row is not None and state_row[0] == signature
+    candidates_from = music_candidates_from(len(exts), incremental=incremental)
+    dirty_row = conn.execute(f"SELECT COUNT(1) {candidates_from}", params).fetchone()
+    dirty_candidates = int(dirty_row[0]) if dirty_row and dirty_row[0] is not None else 0
+    summary["incremental"] = incremental
+    summary["skipped_unchanged"] = total_candidates - dirty_candidates
+
     processed = 0
     stored = 0
     queued = 0
@@ -1873,8 +2308,10 @@ def _process_music_candidates(
     removed_queue = 0
 
     to_upsert_minimal: List[tuple] = []
+    to_touch_minimal: List[tuple] = []
     to_delete_minimal: List[tuple[str, str]] = []
     to_upsert_queue: List[tuple] = []
+    to_touch_queue: List[tuple] = []
     to_delete_queue: List[tuple[str, str]] = []
     delete_minimal_keys: set[tuple[str, str]] = set()
     delete_queue_keys: set[tuple[str, str]] = set()
@@ -1891,6 +2328,7 @@ def _process_music_candidates(
             "phase": "musicnames",
             "elapsed_s": int(time.monotonic() - start_time),
             "music_total": total_candidates,
+            "music_dirty": dirty_candidates,
             "music_processed": processed,
             "music_stored": stored,
             "music_queued": queued,
@@ -1903,8 +2341,16 @@ def _process_music_candidates(
         progress_last_emit = now
 
     def flush_pending() -> None:
-        nonlocal to_upsert_minimal, to_delete_minimal, to_upsert_queue, to_delete_queue
-        if not (to_upsert_minimal or to_delete_minimal or to_upsert_queue or to_delete_queue):
+        nonlocal to_upsert_minimal, to_touch_minimal, to_delete_minimal
+        nonlocal to_upsert_queue, to_touch_queue, to_delete_queue
+        if not (
+            to_upsert_minimal
+            or to_touch_minimal
+            or to_delete_minimal
+            or to_upsert_queue
+            or to_touch_queue
+            or to_delete_queue
+        ):
             return
         with transaction(conn) as tx:
             if to_delete_minimal:
@@ -1933,6 +2379,13 @@ def _process_music_candidates(
                     """,
                     to_upsert_minimal,
                 )
+            if to_touch_minimal:
+                # Re-parsed with the same outcome: only move parsed_utc past the
+                # file's mtime so the next scan skips it.
+                tx.executemany(
+                    "UPDATE music_minimal SET parsed_utc=? WHERE path=? AND drive_label=?",
+                    to_touch_minimal,
+                )
             if to_delete_queue:
                 tx.executemany(
                     "DELETE FROM music_review_queue WHERE path=? AND drive_label=?",
@@ -1954,162 +2407,183 @@ def _process_music_candidates(
                     """,
                     to_upsert_queue,
                 )
+            if to_touch_queue:
+                # Same for review-queue rows, via queued_utc.
+                tx.executemany(
+                    "UPDATE music_review_queue SET queued_utc=? WHERE path=? AND drive_label=?",
+                    to_touch_queue,
+                )
         to_upsert_minimal = []
+        to_touch_minimal = []
         to_delete_minimal = []
         to_upsert_queue = []
+        to_touch_queue = []
         to_delete_queue = []
 
-    select_sql = (
-        "SELECT path, drive_label, category, ext FROM inventory "
-        f"WHERE drive_label=? AND category='audio' AND ext IN ({placeholders}) ORDER BY path"
-    )
     iter_cur = conn.cursor()
-    iter_cur.execute(select_sql, params)
+    iter_cur.execute(f"SELECT i.path, i.ext {candidates_from} ORDER BY i.path", params)
     emit_progress(force=True)
 
-    while not cancel_token.is_set():
-        batch = iter_cur.fetchmany(batch_size)
-        if not batch:
-            break
-        paths = [row[0] for row in batch if row and row[0]]
-        if not paths:
-            continue
-        path_placeholders = ",".join("?" for _ in paths)
-        existing_params = [drive_label, *paths]
-        minimal_existing: Dict[str, dict] = {}
-        queue_existing: Dict[str, dict] = {}
-        for row in conn.execute(
-            f"""
-            SELECT path, ext, artist, title, album, track, score, score_reasons, parse_reasons
-            FROM music_minimal
-            WHERE drive_label=? AND path IN ({path_placeholders})
-            """,
-            existing_params,
-        ):
-            minimal_existing[row[0]] = {
-                "ext": row[1],
-                "artist": row[2],
-                "title": row[3],
-                "album": row[4],
-                "track": row[5],
-                "score": float(row[6]) if row[6] is not None else None,
-                "score_reasons": row[7],
-                "parse_reasons": row[8],
-            }
-        for row in conn.execute(
-            f"""
-            SELECT path, ext, score, reasons_json, suggestions_json
-            FROM music_review_queue
-            WHERE drive_label=? AND path IN ({path_placeholders})
-            """,
-            existing_params,
-        ):
-            queue_existing[row[0]] = {
-                "ext": row[1],
-                "score": float(row[2]) if row[2] is not None else None,
-                "reasons_json": row[3],
-                "suggestions_json": row[4],
-            }
+    # Rows of each batch handed to the parser, consumed in the same order.
+    batch_rows: Deque[List[Tuple[str, Optional[str]]]] = deque()
 
-        for entry in batch:
+    def _path_batches() -> Iterator[List[str]]:
+        while not cancel_token.is_set():
+            fetched = iter_cur.fetchmany(batch_size)
+            if not fetched:
+                return
+            rows = [row for row in fetched if row and row[0]]
+            if not rows:
+                continue
+            batch_rows.append(rows)
+            yield [row[0] for row in rows]
+
+    pool = MusicParsePool(workers=workers, total=dirty_candidates)
+    summary["workers"] = pool.workers if pool.parallel else 1
+    try:
+        for analyses in pool.map(_path_batches(), min_confidence):
+            rows = batch_rows.popleft()
             if cancel_token.is_set():
                 break
-            path, row_drive, category, ext = entry
-            if not path or row_drive != drive_label:
-                continue
-            ext_value = (ext or "").lower() or None
-            parents = _split_music_parents(path)
-            result = parse_music_name(path, parents=parents)
-            score, score_reasons = score_parse_result(result, parents=parents)
-            review_bundle = generate_review_bundle(
-                result,
-                score,
-                score_reasons,
-                threshold=min_confidence,
-            )
-            processed += 1
-            score_reasons_json = json.dumps(score_reasons, ensure_ascii=False)
-            parse_reasons_json = json.dumps(result.reasons, ensure_ascii=False)
+            paths = [row[0] for row in rows]
+            path_placeholders = ",".join("?" for _ in paths)
+            existing_params = [drive_label, *paths]
+            minimal_existing: Dict[str, dict] = {}
+            queue_existing: Dict[str, dict] = {}
+            for row in conn.execute(
+                f"""
+                SELECT path, ext, artist, title, album, track, score, score_reasons, parse_reasons
+                FROM music_minimal
+                WHERE drive_label=? AND path IN ({path_placeholders})
+                """,
+                existing_params,
+            ):
+                minimal_existing[row[0]] = {
+                    "ext": row[1],
+                    "artist": row[2],
+                    "title": row[3],
+                    "album": row[4],
+                    "track": row[5],
+                    "score": float(row[6]) if row[6] is not None else None,
+                    "score_reasons": row[7],
+                    "parse_reasons": row[8],
+                }
+            for row in conn.execute(
+                f"""
+                SELECT path, ext, score, reasons_json, suggestions_json
+                FROM music_review_queue
+                WHERE drive_label=? AND path IN ({path_placeholders})
+                """,
+                existing_params,
+            ):
+                queue_existing[row[0]] = {
+                    "ext": row[1],
+                    "score": float(row[2]) if row[2] is not None else None,
+                    "reasons_json": row[3],
+                    "suggestions_json": row[4],
+                }
+
             now_utc = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
-            minimal_existing_row = minimal_existing.get(path)
-            queue_existing_row = queue_existing.get(path)
-
-            if review_bundle.get("needs_review"):
-                reasons_json = json.dumps(review_bundle.get("reasons", []), ensure_ascii=False)
-                suggestions_json = json.dumps(review_bundle.get("suggestions", []), ensure_ascii=False)
-                payload = (
-                    path,
-                    drive_label,
-                    ext_value,
-                    float(score),
-                    reasons_json,
-                    suggestions_json,
-                    now_utc,
-                )
-                if queue_existing_row and (
-                    _float_close(queue_existing_row.get("score"), score)
-                    and queue_existing_row.get("reasons_json") == reasons_json
-                    and queue_existing_row.get("suggestions_json") == suggestions_json
-                    and queue_existing_row.get("ext") == ext_value
-                ):
-                    unchanged += 1
-                else:
-                    to_upsert_queue.append(payload)
-                    queued += 1
-                if minimal_existing_row:
-                    key = (path, drive_label)
-                    if key not in delete_minimal_keys:
-                        to_delete_minimal.append(key)
-                        delete_minimal_keys.add(key)
-                        removed_minimal += 1
-            else:
-                payload = (
-                    path,
-                    drive_label,
-                    ext_value,
-                    result.artist,
-                    result.title,
-                    result.album,
-                    result.track,
-                    float(score),
-                    score_reasons_json,
-                    parse_reasons_json,
-                    now_utc,
-                )
-                if minimal_existing_row and (
-                    minimal_existing_row.get("ext") == ext_value
-                    and minimal_existing_row.get("artist") == result.artist
-                    and minimal_existing_row.get("title") == result.title
-                    and minimal_existing_row.get("album") == result.album
-                    and minimal_existing_row.get("track") == result.track
-                    and _float_close(minimal_existing_row.get("score"), score)
-                    and minimal_existing_row.get("score_reasons") == score_reasons_json
-                    and minimal_existing_row.get("parse_reasons") == parse_reasons_json
-                ):
-                    unchanged += 1
+            for (path, ext), analysis in zip(rows, analyses):
+                ext_value = (ext or "").lower() or None
+                score = analysis.score
+                processed += 1
+                score_reasons_json = json.dumps(analysis.score_reasons, ensure_ascii=False)
+                parse_reasons_json = json.dumps(analysis.parse_reasons, ensure_ascii=False)
+                minimal_existing_row = minimal_existing.get(path)
+                queue_existing_row = queue_existing.get(path)
+
+                if analysis.needs_review:
+                    reasons_json = json.dumps(analysis.review_reasons, ensure_ascii=False)
+                    suggestions_json = json.dumps(analysis.suggestions, ensure_ascii=False)
+                    payload = (
+                        path,
+                        drive_label,
+                        ext_value,
+                        float(score),
+                        reasons_json,
+                        suggestions_json,
+                        now_utc,
+                    )
+                    if queue_existing_row and (
+                        _float_close(queue_existing_row.get("score"), score)
+                        and queue_existing_row.get("reasons_json") == reasons_json
+                        and queue_existing_row.get("suggestions_json") == suggestions_json
+                        and queue_existing_row.get("ext") == ext_value
+                    ):
+                        unchanged += 1
+                        to_touch_queue.append((now_utc, path, drive_label))
+                    else:
+                        to_upsert_queue.append(payload)
+                        queued += 1
+                    if minimal_existing_row:
+                        key = (path, drive_label)
+                        if key not in delete_minimal_keys:
+                            to_delete_minimal.append(key)
+                            delete_minimal_keys.add(key)
+                            removed_minimal += 1
                 else:
-                    to_upsert_minimal.append(payload)
-                    stored += 1
-                if queue_existing_row:
-                    key = (path, drive_label)
-                    if key not in delete_queue_keys:
-                        to_delete_queue.append(key)
-                        delete_queue_keys.add(key)
-                        removed_queue += 1
+                    payload = (
+                        path,
+                        drive_label,
+                        ext_value,
+                        analysis.artist,
+                        analysis.title,
+                        analysis.album,
+                        analysis.track,
+                        float(score),
+                        score_reasons_json,
+                        parse_reasons_json,
+                        now_utc,
+                    )
+                    if minimal_existing_row and (
+                        minimal_existing_row.get("ext") == ext_value
+                        and minimal_existing_row.get("artist") == analysis.artist
+                        and minimal_existing_row.get("title") == analysis.title
+                        and minimal_existing_row.get("album") == analysis.album
+                        and minimal_existing_row.get("track") == analysis.track
+                        and _float_close(minimal_existing_row.get("score"), score)
+                        and minimal_existing_row.get("score_reasons") == score_reasons_json
+                        and minimal_existing_row.get("parse_reasons") == parse_reasons_json
+                    ):
+                        unchanged += 1
+                        to_touch_minimal.append((now_utc, path, drive_label))
+                    else:
+                        to_upsert_minimal.append(payload)
+                        stored += 1
+                    if queue_existing_row:
+                        key = (path, drive_label)
+                        if key not in delete_queue_keys:
+                            to_delete_queue.append(key)
+                            delete_queue_keys.add(key)
+                            removed_queue += 1
 
             if (
                 len(to_upsert_minimal)
+                + len(to_touch_minimal)
                 + len(to_delete_minimal)
                 + len(to_upsert_queue)
+                + len(to_touch_queue)
                 + len(to_delete_queue)
             ) >= batch_size:
                 flush_pending()
             emit_progress()
-
-        if cancel_token.is_set():
-            break
+    finally:
+        pool.close()
 
     flush_pending()
+    if not cancel_token.is_set():
+        with transaction(conn) as tx:
+            tx.execute(
+                """
+                INSERT INTO music_parse_state(drive_label, signature, updated_utc)
+                VALUES(?,?,?)
+                ON CONFLICT(drive_label) DO UPDATE SET
+                    signature=excluded.signature,
+                    updated_utc=excluded.updated_utc
+                """,
+                (drive_label, signature, datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")),
+            )
     emit_progress(force=True)
 
     status = "cancelled" if cancel_token.is_set() else "ok"
@@ -2160,6 +2634,7 @@ def scan_drive(
     settings: Optional[Dict[str, object]] = None,
     perf_overrides: Optional[Dict[str, object]] = None,
     fingerprint_overrides: Optional[Dict[str, object]] = None,
+    verify_overrides: Optional[Dict[str, object]] = None,
     robust_overrides: Optional[Dict[str, object]] = None,
     light_analysis: Optional[bool] = None,
     gpu_overrides: Optional[Dict[str, object]] = None,
@@ -2169,6 +2644,12 @@ def scan_drive(
     disk_marker_enable: Optional[bool] = None,
     disk_marker_filename: Optional[str] = None,
     delta_scan_mode: Optional[str] = None,
+    mime_mode: Optional[str] = None,
+    changed_dirs: Optional[Iterable[str]] = None,
+    two_phase_inventory: bool = False,
+    io_budget: Optional[AdaptiveConcurrency] = None,
+    work_slots: Optional[threading.Semaphore] = None,
+    cancel_token: Optional[CancellationToken] = None,
 ) -> dict:
     mount = Path(mount_path)
     if not mount.exists():
@@ -2195,6 +2676,12 @@ def scan_drive(
         except (TypeError, ValueError):
             music_confidence = default_music_conf
     music_confidence = max(0.0, min(1.0, music_confidence))
+    try:
+        music_workers = int(music_settings_raw.get("workers") or 0)
+    except (TypeError, ValueError):
+        music_workers = 0
+    if music_workers <= 0:
+        music_workers = max(1, min(8, (os.cpu_count() or 2) - 1))
     if not isinstance(effective_settings, dict):
         effective_settings = {}
     marker_runtime = prepare_runtime(
@@ -2208,12 +2695,22 @@ def scan_drive(
         delta_raw = {}
     use_ntfs_usn = bool(delta_raw.get("use_ntfs_usn", True))
     fallback_sampling = bool(delta_raw.get("fallback_sampling", True))
+    fast_directories = bool(delta_raw.get("fast_directories", False))
     if isinstance(delta_scan_mode, str):
         mode = delta_scan_mode.strip().lower()
         if mode == "usn":
             use_ntfs_usn = True
+        elif mode == "fast":
+            fast_directories = True
         elif mode == "off":
             use_ntfs_usn = False
+            fast_directories = False
+    inventory_raw = effective_settings.get("inventory") if isinstance(effective_settings, dict) else {}
+    if not isinstance(inventory_raw, dict):
+        inventory_raw = {}
+    mime_classifier = MimeClassifier(
+        mime_mode_from(mime_mode) or mime_mode_from(inventory_raw.get("mime_mode")) or "extension"
+    )
     volume_info = get_volume_info(mount)
     marker_path = mount / marker_runtime.filename
     marker_read = load_marker(
@@ -2237,6 +2734,7 @@ def scan_drive(
     perf_overrides = perf_overrides or {}
     light_cfg = _resolve_light_analysis(effective_settings, light_analysis)
     fingerprint_cfg = _resolve_fingerprint_settings(effective_settings, fingerprint_overrides)
+    verify_cfg = _resolve_verify_settings(effective_settings, verify_overrides)
     gpu_cfg = _resolve_gpu_settings(effective_settings, gpu_overrides)
     perf_config = resolve_performance_config(
         str(mount),
@@ -2244,12 +2742,19 @@ def scan_drive(
         cli_overrides=perf_overrides,
     )
     LOGGER.info(
-        "Perf: profile=%s threads=%s chunk=%s ffmpeg_parallel=%s gentle_io=%s",
+        "Perf: profile=%s threads=%s chunk=%s ffmpeg_parallel=%s gentle_io=%s enumerate_workers=%s "
+        "hash_backend=%s hash_max_threads=%s hash_strategy=%s concurrency=%s max_workers=%s",
         perf_config.profile,
         perf_config.worker_threads,
         perf_config.hash_chunk_bytes,
         perf_config.ffmpeg_parallel,
         str(bool(perf_config.gentle_io)).lower(),
+        perf_config.enumerate_workers,
+        perf_config.hash_backend,
+        perf_config.hash_max_threads,
+        perf_config.hash_strategy,
+        perf_config.concurrency,
+        perf_config.max_workers,
     )
     LOGGER.info(
         "Music filename parsing: enabled=%s min_conf=%.2f",
@@ -2279,6 +2784,10 @@ def scan_drive(
                     "hash_chunk_bytes": perf_config.hash_chunk_bytes,
                     "ffmpeg_parallel": perf_config.ffmpeg_parallel,
                     "gentle_io": bool(perf_config.gentle_io),
+                    "enumerate_workers": perf_config.enumerate_workers,
+                    "hash_strategy": perf_config.hash_strategy,
+                    "concurrency": perf_config.concurrency,
+                    "max_workers": perf_config.max_workers,
                 }
             ),
             flush=True,
@@ -2294,6 +2803,7 @@ def scan_drive(
     )
 
     start_time = time.perf_counter()
+    timings = ScanTimings()
 
     statuses = _refresh_tool_status()
     missing_required = [tool for tool in REQUIRED_TOOLS if not statuses.get(tool, {}).get("present")]
@@ -2310,19 +2820,31 @@ def scan_drive(
         LOGGER.warning("smartctl not found. SMART data will be skipped.")
 
     total, used, free = shutil.disk_usage(mount)
+    shard_path = Path(shard_db_path) if shard_db_path else get_shard_db_path(WORKING_DIR_PATH, label)
+    if cancel_token is None:
+        cancel_token = CancellationToken()
     conn = init_db(str(shard_path))
     light_pipeline: Optional[LightAnalysisPipeline] = None
     fingerprint_pipeline: Optional[FingerprintPipeline] = None
+    probe_cache: Optional[ProbeCache] = None
+    light_conn = conn
     if not inventory_only:
+        probe_cache = ProbeCache.open(shard_path, label)
+        if light_cfg.enabled:
+            # Light-analysis workers write features from their own threads.
+            light_conn = connect(shard_path)
         light_pipeline = LightAnalysisPipeline(
             settings=light_cfg,
             gpu_settings=gpu_cfg,
-            connection=conn,
+            connection=light_conn,
             ffmpeg_path=TOOL_PATHS.get("ffmpeg"),
             perf_profile=str(perf_config.profile),
             progress_callback=progress_callback,
             start_time=start_time,
             drive_label=label,
+            probe_cache=probe_cache,
+            cancel_token=cancel_token,
+            timings=timings,
         )
         light_pipeline.prepare()
         fingerprint_pipeline = FingerprintPipeline(
@@ -2332,6 +2854,7 @@ def scan_drive(
             start_time=start_time,
             perf_profile=str(perf_config.profile),
             cancel_token=cancel_token,
+            timings=timings,
         )
         fingerprint_pipeline.prepare(conn)
     conn.execute(
@@ -2382,71 +2905,6 @@ def scan_drive(
     else:
         ignore_patterns = []
 
-    if inventory_only:
-        drive_type_value = str(perf_config.profile)
-        result = _inventory_scan(
-            shard_conn=conn,
-            catalog_db_path=str(catalog_db_path),
-            drive_label=label,
-            drive_type=drive_type_value,
-            mount_path=mount,
-            perf_config=perf_config,
-            robust_cfg=robust_cfg,
-            debug_slow=debug_slow,
-            progress_callback=progress_callback,
-        )
-        conn.close()
-        scan_completed_utc = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
-        counts_files = int(result.get("total_files", 0)) if isinstance(result, dict) else 0
-        counts_bytes = int(result.get("total_bytes", 0)) if isinstance(result, dict) else 0
-        marker_info = _finalize_marker(counts_files, counts_bytes, last_scan_utc=scan_completed_utc)
-        delta_info = {
-            "requested_usn": bool(use_ntfs_usn),
-            "supports_usn": volume_info.supports_usn,
-            "fallback_sampling": bool(fallback_sampling),
-            "journal": {
-                "available": bool(usn_info),
-                "journal_id": getattr(usn_info, "journal_id", None),
-                "next_usn": getattr(usn_info, "next_usn", None),
-                "timestamp_utc": getattr(usn_info, "timestamp_utc", None),
-            },
-        }
-        if isinstance(result, dict):
-            result["disk_marker"] = marker_info
-            result["delta_scan"] = delta_info
-        return result
-
-    state_store = ScanStateStore(conn, label, interval_seconds=int(checkpoint_seconds))
-    if not resume:
-        state_store.clear()
-        resume_state: Dict[str, str] = {}
-    else:
-        resume_state = state_store.load()
-
-    resume_path = resume_state.get("last_path_processed") if resume_state else None
-    resume_key = key_for_path(resume_path, casefold=is_windows) if resume_path else None
-    resume_consumed = not bool(resume_key)
-
-    cancel_token = CancellationToken()
-
-    metrics = {
-        "dirs_scanned": 0,
-        "files_seen": 0,
-        "av_total": 0,
-        "skipped_perm": 0,
-        "skipped_toolong": 0,
-        "skipped_ignored": 0,
-        "retries": 0,
-        "bytes_seen": 0,
-    }
-
-    processed_files = 0
-    processed_av = 0
-    unchanged_count = 0
-    total_enqueued = 0
-    pending_tasks = 0
-    last_processed_path = resume_path
-
     marker_write_result: Optional[MarkerWriteResult] = None
     usn_info = None
 
@@ -2594,7 +3052,85 @@ def scan_drive(
         except sqlite3.DatabaseError as exc:
             LOGGER.warning("Unable to update drive_binding for %s: %s", label, exc)
 
-        return marker_info
+        return marker_info
+
+    drive_type_value = str(perf_config.profile)
+    if inventory_only:
+        result = _inventory_scan(
+            shard_conn=conn,
+            catalog_db_path=str(catalog_db_path),
+            drive_label=label,
+            drive_type=drive_type_value,
+            mount_path=mount,
+            perf_config=perf_config,
+            robust_cfg=robust_cfg,
+            debug_slow=debug_slow,
+            mime_classifier=mime_classifier,
+            progress_callback=progress_callback,
+        )
+        conn.close()
+        scan_completed_utc = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+        counts_files = int(result.get("total_files", 0)) if isinstance(result, dict) else 0
+        counts_bytes = int(result.get("total_bytes", 0)) if isinstance(result, dict) else 0
+        marker_info = _finalize_marker(counts_files, counts_bytes, last_scan_utc=scan_completed_utc)
+        delta_info = {
+            "requested_usn": bool(use_ntfs_usn),
+            "supports_usn": volume_info.supports_usn,
+            "fallback_sampling": bool(fallback_sampling),
+            "fast_directories": None,
+            "journal": {
+                "available": bool(usn_info),
+                "journal_id": getattr(usn_info, "journal_id", None),
+                "next_usn": getattr(usn_info, "next_usn", None),
+                "timestamp_utc": getattr(usn_info, "timestamp_utc", None),
+            },
+        }
+        if isinstance(result, dict):
+            result["disk_marker"] = marker_info
+            result["delta_scan"] = delta_info
+        return result
+
+    state_store = ScanStateStore(conn, label, interval_seconds=int(checkpoint_seconds))
+    if not resume:
+        state_store.clear()
+        resume_state: Dict[str, str] = {}
+    else:
+        resume_state = state_store.load()
+
+    resume_path = resume_state.get("last_path_processed") if resume_state else None
+    resume_key = key_for_path(resume_path, casefold=is_windows) if resume_path else None
+    resume_consumed = not bool(resume_key)
+
+    # The directory frontier supersedes the last-path checkpoint: a resumed
+    # walk restarts from the saved stack instead of re-listing everything up
+    # to the last processed file.
+    frontier: Optional[ScanFrontier] = None
+    if resume:
+        frontier = ScanFrontier.load(conn, label, interval_seconds=int(checkpoint_seconds))
+        if frontier.resuming:
+            resume_consumed = True
+    else:
+        ScanFrontier(conn, label).clear()
+
+    metrics = {
+        "dirs_scanned": 0,
+        "files_seen": 0,
+        "av_total": 0,
+        "skipped_perm": 0,
+        "skipped_toolong": 0,
+        "skipped_ignored": 0,
+        "retries": 0,
+        "bytes_seen": 0,
+    }
+    # Enumeration workers report skips/retries concurrently with the main thread.
+    metrics_lock = threading.Lock()
+
+    processed_files = 0
+    processed_av = 0
+    unchanged_count = 0
+    total_enqueued = 0
+    pending_tasks = 0
+    last_processed_path = resume_path
 
     progress_last_emit = 0.0
 
@@ -2618,6 +3154,14 @@ def scan_drive(
         }
         if metrics["av_total"]:
             payload["total_av"] = metrics["av_total"]
+        if inventory_writer is not None:
+            payload["inventory_written"] = inventory_writer.total_written
+        if light_pipeline is not None and light_cfg.enabled:
+            payload.update(light_pipeline.backpressure())
+        payload["workers_active"] = concurrency.limit
+        payload["phase_p95_ms"] = {
+            name: stats["p95_ms"] for name, stats in timings.phase_summary().items() if stats["count"]
+        }
         if progress_callback is not None:
             try:
                 progress_callback(payload)
@@ -2651,16 +3195,19 @@ def scan_drive(
                 start = time.monotonic()
                 result = os.stat(path, follow_symlinks=follow_symlinks)
                 elapsed = time.monotonic() - start
+                timings.observe("stat", elapsed)
                 if elapsed > robust_cfg.op_timeout_s:
                     raise TimeoutError(f"stat timeout after {elapsed:.1f}s")
                 return result
             except PermissionError:
-                metrics["skipped_perm"] += 1
+                with metrics_lock:
+                    metrics["skipped_perm"] += 1
                 LOGGER.warning("Permission denied while stating %s", from_fs_path(path))
                 return None
             except OSError as exc:
                 if is_transient(exc) and attempts < 3:
-                    metrics["retries"] += 1
+                    with metrics_lock:
+                        metrics["retries"] += 1
                     time.sleep(min(2.0, delay))
                     delay *= 2
                     continue
@@ -2668,7 +3215,7 @@ def scan_drive(
                 return None
         return None
 
-    def _open_scandir(fs_path: str, display_path: str) -> Optional[os.ScandirIterator]:
+    def _open_scandir(fs_path: str, display_path: str) -> Optional[Iterator[os.DirEntry]]:
         attempts = 0
         delay = 0.5
         while attempts < 3 and not cancel_token.is_set():
@@ -2682,12 +3229,14 @@ def scan_drive(
                     raise TimeoutError(f"scandir timeout after {elapsed:.1f}s")
                 return iterator
             except PermissionError:
-                metrics["skipped_perm"] += 1
+                with metrics_lock:
+                    metrics["skipped_perm"] += 1
                 LOGGER.warning("Permission denied while enumerating %s", display_path)
                 return None
             except OSError as exc:
                 if is_transient(exc) and attempts < 3:
-                    metrics["retries"] += 1
+                    with metrics_lock:
+                        metrics["retries"] += 1
                     time.sleep(min(2.0, delay))
                     delay *= 2
                     continue
@@ -2696,6 +3245,58 @@ def scan_drive(
         LOGGER.warning("Giving up on %s after repeated failures", display_path)
         return None
 
+    def _list_directory(fs_dir: str, display_dir: str) -> Optional[List[ListedEntry]]:
+        """Enumerate one directory and stat its entries.
+
+        Runs on the enumeration workers, so it only touches the filesystem and
+        leaves traversal order, loop detection and queueing to the caller.
+        """
+
+        started = time.perf_counter()
+        iterator = _open_scandir(fs_dir, display_dir)
+        if iterator is None:
+            return None
+        listing: List[ListedEntry] = []
+        with iterator as it:
+            for entry in it:
+                if cancel_token.is_set():
+                    break
+                entry_fs = entry.path
+                display_entry = from_fs_path(entry_fs)
+                if robust_cfg.skip_hidden and is_hidden(entry, fs_path=entry_fs, display_path=display_entry):
+                    listing.append(ListedEntry("ignored", display_entry, entry_fs))
+                    continue
+                if ignore_patterns and should_ignore(display_entry, patterns=ignore_patterns):
+                    listing.append(ListedEntry("ignored", display_entry, entry_fs))
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=robust_cfg.follow_symlinks):
+                        dir_stat = None
+                        if robust_cfg.follow_symlinks:
+                            dir_stat = _stat_path(entry_fs, follow_symlinks=True)
+                            if not dir_stat:
+                                continue
+                        elif directory_state is not None:
+                            dir_stat = _stat_path(entry_fs, follow_symlinks=False)
+                        listing.append(ListedEntry("dir", display_entry, entry_fs, dir_stat))
+                        continue
+                except OSError:
+                    continue
+                try:
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                except OSError:
+                    continue
+                stat_result = _stat_path(entry_fs, follow_symlinks=False)
+                if stat_result is None:
+                    continue
+                listed = ListedEntry("file", display_entry, entry_fs, stat_result)
+                if inventory_writer is not None:
+                    listed.mime, listed.ext = mime_classifier.detect(entry_fs)
+                listing.append(listed)
+        timings.observe("enumerate", time.perf_counter() - started)
+        return listing
+
     enumeration_sleep = enumerate_sleep_range(perf_config.profile, perf_config.gentle_io)
 
     base_sleep_range = None
@@ -2710,7 +3311,26 @@ def scan_drive(
         base_sleep_range=base_sleep_range,
         latency_threshold=0.05 if perf_config.profile == "NETWORK" else 0.04,
     )
+    # Multi-target scans pass the controller shared by every target on the
+    # same physical device, and one set of work slots shared by all targets.
+    # A slot is held for a whole hash or probe job, including its reads and
+    # subprocess waits.
+    concurrency = io_budget or AdaptiveConcurrency(
+        initial=perf_config.worker_threads,
+        ceiling=perf_config.max_workers,
+        enabled=perf_config.concurrency == "adaptive",
+    )
+    work_gate = work_slots if work_slots is not None else nullcontext()
     ffmpeg_semaphore = threading.Semaphore(max(1, perf_config.ffmpeg_parallel))
+    hash_backend = HashBackend(
+        HashSettings(
+            mode=perf_config.hash_backend,
+            chunk_bytes=perf_config.hash_chunk_bytes,
+            max_threads=perf_config.hash_max_threads,
+            process_workers=perf_config.worker_threads,
+        )
+    )
+    hash_strategy = perf_config.hash_strategy
     task_queue: "queue.Queue[object]" = queue.Queue(maxsize=max(1, int(robust_cfg.queue_max)))
     result_queue: "queue.Queue[WorkerResult]" = queue.Queue()
     sentinel = object()
@@ -2718,13 +3338,74 @@ def scan_drive(
     ffmpeg_path = TOOL_PATHS.get("ffmpeg")
     retry_delays = (0.1, 0.3, 0.9)
 
-    existing_rows = _load_existing(conn, label, casefold=is_windows)
+    inventory_writer: Optional[InventoryWriter] = None
+    inventory_totals: Dict[str, int] = {
+        "video": 0,
+        "audio": 0,
+        "image": 0,
+        "document": 0,
+        "archive": 0,
+        "executable": 0,
+        "other": 0,
+    }
+    inventory_summary: Optional[Dict[str, object]] = None
+    if two_phase_inventory:
+        # Legacy comparison mode: a full inventory walk before the hashing walk.
+        inventory_summary = _inventory_scan(
+            shard_conn=conn,
+            catalog_db_path=str(catalog_db_path),
+            drive_label=label,
+            drive_type=drive_type_value,
+            mount_path=mount,
+            perf_config=perf_config,
+            robust_cfg=robust_cfg,
+            debug_slow=debug_slow,
+            mime_classifier=mime_classifier,
+            progress_callback=progress_callback,
+        )
+        inventory_summary["mode"] = "two-phase"
+    else:
+        inventory_writer = InventoryWriter(
+            conn,
+            batch_size=max(1, int(robust_cfg.batch_files)),
+            flush_interval=max(0.5, float(robust_cfg.batch_seconds)),
+        )
+
+    directory_state: Optional[DirectoryState] = None
+    if fast_directories and not full_rescan:
+        directory_state = DirectoryState.load(conn, label, checked_ns=time.time_ns())
+    resuming_frontier = frontier is not None and frontier.resuming
+    existing_rows = ExistingFileIndex.load(
+        conn, label, casefold=is_windows, with_parents=directory_state is not None or resuming_frontier
+    )
     if resume_key and resume_key not in existing_rows:
         resume_consumed = True
 
-    restore_batch: List[str] = []
-    pending_updates: List[Tuple[int, Optional[str], Optional[str], Optional[int], str, int]] = []
-    pending_inserts: List[Tuple[str, str, int, Optional[str], Optional[str], Optional[int], str]] = []
+    # Directories finished before the interruption are not listed again:
+    # their committed rows leave the reconciliation index and their stored
+    # totals count towards this scan.
+    files_restored = 0
+    if frontier is not None and resuming_frontier:
+        for done_dir, done_totals in frontier.restored_directories().items():
+            existing_rows.pop_directory(key_for_path(done_dir, casefold=is_windows))
+            files_restored += done_totals.files
+            metrics["dirs_scanned"] += 1
+            metrics["files_seen"] += done_totals.files
+            metrics["bytes_seen"] += done_totals.bytes
+            metrics["av_total"] += done_totals.av
+            if inventory_writer is not None:
+                for category, count in (done_totals.categories or {}).items():
+                    inventory_totals[category] = inventory_totals.get(category, 0) + int(count)
+        processed_files += files_restored
+        processed_av += sum(done_totals.av for done_totals in frontier.restored_directories().values())
+
+    restore_batch: List[int] = []
+    pending_updates: List[
+        Tuple[int, Optional[str], Optional[str], int, Optional[str], Optional[int], str, int]
+    ] = []
+    pending_inserts: List[
+        Tuple[str, str, int, Optional[str], Optional[str], int, Optional[str], Optional[int], str]
+    ] = []
     last_flush = time.monotonic()
     pragma_batches = 0
 
@@ -2736,13 +3417,15 @@ def scan_drive(
                 and (time.monotonic() - last_flush) < robust_cfg.batch_seconds
             ):
                 return
+        flush_started = time.perf_counter()
         cur = conn.cursor()
         executed = False
         if pending_updates:
             cur.executemany(
                 """
                 UPDATE files
-                SET size_bytes=?, hash_blake3=?, media_json=?, integrity_ok=?, mtime_utc=?, deleted=0, deleted_ts=NULL
+                SET size_bytes=?, hash_blake3=?, quick_hash=?, hash_deferred=?, media_json=?, integrity_ok=?,
+                    verify_tier=?, verify_pending=?, mtime_utc=?, deleted=0, deleted_ts=NULL
                 WHERE id=?
                 """,
                 pending_updates,
@@ -2753,9 +3436,10 @@ def scan_drive(
             cur.executemany(
                 """
                 INSERT INTO files(
-                    drive_label, path, size_bytes, hash_blake3, media_json, integrity_ok, mtime_utc, deleted, deleted_ts
+                    drive_label, path, size_bytes, hash_blake3, quick_hash, hash_deferred, media_json,
+                    integrity_ok, verify_tier, verify_pending, mtime_utc, deleted, deleted_ts
                 )
-                VALUES(?,?,?,?,?,?,?,0,NULL)
+                VALUES(?,?,?,?,?,?,?,?,?,?,?,0,NULL)
                 """,
                 pending_inserts,
             )
@@ -2763,13 +3447,14 @@ def scan_drive(
             executed = True
         if restore_batch:
             cur.executemany(
-                "UPDATE files SET deleted=0, deleted_ts=NULL WHERE drive_label=? AND path=?",
-                [(label, path) for path in restore_batch],
+                "UPDATE files SET deleted=0, deleted_ts=NULL WHERE id=?",
+                [(file_id,) for file_id in restore_batch],
             )
             restore_batch = []
             executed = True
         if executed:
             conn.commit()
+            timings.observe("db_flush", time.perf_counter() - flush_started)
             pragma_batches += 1
             if pragma_batches % 25 == 0:
                 try:
@@ -2779,6 +3464,51 @@ def scan_drive(
         if executed or force:
             last_flush = time.monotonic()
 
+    # Queued file -> the directory it was listed from, for the frontier.
+    task_dirs: Dict[str, str] = {}
+    frontier_stack: Deque[Tuple[str, str]] = deque()
+
+    def _checkpoint_frontier(force: bool = False) -> None:
+        if frontier is None or not (force or frontier.due()):
+            return
+        # Drained files are committed first so "done" never runs ahead of the shard.
+        _flush_db(force=True)
+        if inventory_writer is not None:
+            inventory_writer.sync()
+        frontier.save(display for display, _fs in frontier_stack)
+
+    io_buffer: Optional[PhysicalOrderBuffer[FileInfo]] = None
+    if perf_config.io_order == "physical":
+        io_buffer = PhysicalOrderBuffer(
+            perf_config.io_order_window,
+            path_of=lambda item: item.fs_path,
+            inode_of=lambda item: item.inode,
+        )
+
+    def _dispatch(items: Iterable[FileInfo]) -> None:
+        nonlocal pending_tasks, total_enqueued
+        for item in items:
+            while not cancel_token.is_set():
+                try:
+                    task_queue.put(item, timeout=0.5)
+                    pending_tasks += 1
+                    total_enqueued += 1
+                    _sample_queues()
+                    break
+                except queue.Full:
+                    _drain_results(block=True)
+                    _flush_db(force=False)
+            if cancel_token.is_set():
+                return
+
+    def _sample_queues() -> None:
+        if not timings.should_sample():
+            return
+        depths = {"task_queue": task_queue.qsize(), "result_queue": result_queue.qsize()}
+        if light_pipeline is not None and light_cfg.enabled:
+            depths["light_queue"] = int(light_pipeline.backpressure()["light_queue_depth"])
+        timings.sample_queues(**depths)
+
     def _drain_results(block: bool = False) -> None:
         nonlocal pending_tasks, processed_files, processed_av, last_processed_path
         timeout = 0.5 if block else 0.0
@@ -2789,6 +3519,9 @@ def scan_drive(
                 break
             pending_tasks -= 1
             info = result.info
+            task_dir = task_dirs.pop(info.path, None)
+            if frontier is not None and task_dir is not None and result.error_message != "cancelled":
+                frontier.task_done(task_dir)
             processed_files += 1
             if info.is_av:
                 processed_av += 1
@@ -2800,8 +3533,12 @@ def scan_drive(
                     (
                         int(info.size_bytes),
                         result.hash_value,
+                        result.quick_hash,
+                        result.hash_deferred,
                         result.media_blob,
                         result.integrity_ok,
+                        result.verify_tier,
+                        result.verify_pending,
                         info.mtime_utc,
                         int(info.existing_id),
                     )
@@ -2813,22 +3550,37 @@ def scan_drive(
                         info.path,
                         int(info.size_bytes),
                         result.hash_value,
+                        result.quick_hash,
+                        result.hash_deferred,
                         result.media_blob,
                         result.integrity_ok,
+                        result.verify_tier,
+                        result.verify_pending,
                         info.mtime_utc,
                     )
                 )
             if light_pipeline is not None:
-                light_pipeline.process(info, metadata=result.media_metadata)
+                light_pipeline.submit(info, metadata=result.media_metadata)
             if fingerprint_pipeline is not None:
                 fingerprint_pipeline.submit(result)
             _flush_db(force=False)
+            _sample_queues()
             _emit_progress("hashing")
 
+    keep_media_metadata = bool(
+        (light_pipeline is not None and light_pipeline.wants_metadata)
+        or (fingerprint_pipeline is not None and fingerprint_pipeline.wants_metadata)
+    )
+
     def _process_file(info: FileInfo) -> WorkerResult:
         integrity_ok: Optional[int] = None if info.is_av else 1
         media_blob: Optional[str] = None
         hash_value: Optional[str] = None
+        quick_hash: Optional[str] = None
+        hash_deferred = 0
+        verify_tier: Optional[str] = None
+        verify_pending = 0
+        metadata: Optional[dict] = None
         error_message: Optional[str] = None
         attempts = 0
 
@@ -2841,13 +3593,36 @@ def scan_drive(
                 def _on_chunk(bytes_read: int, elapsed: float) -> None:
                     if bytes_read > 0:
                         rate_controller.note_io(elapsed)
+                        concurrency.note_io(bytes_read, elapsed)
 
-                hash_value = hash_blake3(
-                    info.fs_path,
-                    chunk=perf_config.hash_chunk_bytes,
-                    on_chunk=_on_chunk,
-                )
-                metadata = mediainfo_json(info.fs_path, mediainfo_path) if info.is_av else None
+                if hash_strategy == "size":
+                    # Sizes are only known to be unique once the walk is done.
+                    quick_hash = None
+                    hash_value = None
+                    hash_deferred = 1
+                else:
+                    with work_gate, timings.time("hash"):
+                        # The quick signature only matters for rows whose
+                        # full hash is deferred; fully hashed rows are
+                        # matched by size in complete_deferred_hashes.
+                        if hash_strategy == "full" or info.size_bytes <= QUICK_FULL_MAX_BYTES:
+                            quick_hash = None
+                            hash_value = hash_backend.hash(
+                                info.fs_path,
+                                size_hint=info.size_bytes,
+                                on_chunk=_on_chunk,
+                            )
+                            hash_deferred = 0
+                        else:
+                            quick_hash = hash_backend.quick(info.fs_path, info.size_bytes, on_chunk=_on_chunk)
+                            hash_value = None
+                            hash_deferred = 1
+                metadata = None
+                if info.is_av:
+                    with work_gate, timings.time("mediainfo"):
+                        metadata = mediainfo_json(
+                            info.fs_path, mediainfo_path, cache=probe_cache, cache_key=info.path
+                        )
                 if metadata is not None:
                     media_blob = json.dumps(metadata, ensure_ascii=False)
                     integrity_ok = 0 if metadata.get("error") else 1
@@ -2855,15 +3630,27 @@ def scan_drive(
                     media_blob = None
                     integrity_ok = None if info.is_av else 1
                 if info.is_av and not cancel_token.is_set():
-                    with ffmpeg_semaphore:
-                        ok = ffmpeg_verify(info.fs_path, ffmpeg_path)
+                    with ffmpeg_semaphore, work_gate, timings.time("ffmpeg_verify"):
+                        ok = ffmpeg_verify(
+                            info.fs_path,
+                            ffmpeg_path,
+                            tier=verify_cfg.inline_tier,
+                            settings=verify_cfg,
+                            probe_cache=probe_cache,
+                            cache_key=info.path,
+                        )
                     if ok is False:
                         integrity_ok = 0
+                    if ffmpeg_path and info.path.lower().endswith(tuple(VIDEO_EXTS)):
+                        # Unverified files stay pending for the verify_deep job.
+                        verify_tier = verify_cfg.inline_tier if ok is not None else None
+                        verify_pending = 1 if ok is None or (verify_cfg.deferred and ok) else 0
                 rate_controller.note_success()
                 error_message = None
                 break
             except (OSError, IOError) as exc:
                 rate_controller.note_error()
+                concurrency.note_error()
                 attempts += 1
                 if attempts < len(retry_delays):
                     time.sleep(retry_delays[attempts - 1])
@@ -2872,6 +3659,8 @@ def scan_drive(
                 media_blob = json.dumps({"error": str(exc)}, ensure_ascii=False)
                 integrity_ok = 0
                 hash_value = None
+                quick_hash = None
+                hash_deferred = 0
                 error_message = str(exc)
                 break
             except Exception as exc:
@@ -2880,6 +3669,8 @@ def scan_drive(
                 media_blob = json.dumps({"error": str(exc)}, ensure_ascii=False)
                 integrity_ok = 0
                 hash_value = None
+                quick_hash = None
+                hash_deferred = 0
                 error_message = str(exc)
                 break
         else:
@@ -2891,7 +3682,13 @@ def scan_drive(
             media_blob=media_blob,
             integrity_ok=integrity_ok,
             error_message=error_message,
-            media_metadata=metadata,
+            # Results can pile up in result_queue; only carry the parsed dict
+            # next to its JSON text when a pipeline will read it.
+            media_metadata=metadata if keep_media_metadata else None,
+            quick_hash=quick_hash,
+            hash_deferred=hash_deferred,
+            verify_tier=verify_tier,
+            verify_pending=verify_pending,
         )
 
     def _worker() -> None:
@@ -2908,12 +3705,16 @@ def scan_drive(
                 assert isinstance(item, FileInfo)
                 if cancel_token.is_set():
                     continue
-                result_queue.put(_process_file(item))
+                with concurrency.slot():
+                    result = _process_file(item)
+                result_queue.put(result)
             finally:
                 task_queue.task_done()
 
+    # Adaptive scans start threads up to the ceiling; the controller decides
+    # how many of them hold a slot at any time.
     workers: List[threading.Thread] = []
-    for _ in range(perf_config.worker_threads):
+    for _ in range(concurrency.thread_count):
         thread = threading.Thread(target=_worker, name="scan-worker")
         thread.daemon = True
         thread.start()
@@ -2929,61 +3730,144 @@ def scan_drive(
             cancel_token.set()
             root_fs = root_display
 
-        stack: Deque[Tuple[str, str]] = deque()
-        stack.append((root_display, root_fs))
+        stack = frontier_stack
+        if frontier is not None and frontier.resuming:
+            for pending_display in frontier.restored_pending:
+                try:
+                    stack.append((pending_display, to_fs_path(pending_display, mode=robust_cfg.long_paths)))
+                except PathTooLongError:
+                    metrics["skipped_toolong"] += 1
+        else:
+            stack.append((root_display, root_fs))
         visited_dirs: set[Tuple[int, int]] = set()
         if robust_cfg.follow_symlinks:
             root_stat = _stat_path(root_fs, follow_symlinks=True)
             if root_stat:
                 visited_dirs.add((root_stat.st_dev, root_stat.st_ino))
 
-        while stack and not cancel_token.is_set():
-            display_dir, fs_dir = stack.pop()
-            iterator = _open_scandir(fs_dir, display_dir)
-            if iterator is None:
-                continue
-            metrics["dirs_scanned"] += 1
-            with iterator as it:
-                for entry in it:
-                    if cancel_token.is_set():
-                        break
-                    entry_fs = entry.path
-                    display_entry = from_fs_path(entry_fs)
-                    if robust_cfg.skip_hidden and is_hidden(entry, fs_path=entry_fs, display_path=display_entry):
-                        metrics["skipped_ignored"] += 1
-                        continue
-                    if ignore_patterns and should_ignore(display_entry, patterns=ignore_patterns):
-                        metrics["skipped_ignored"] += 1
+        # Fast delta: mtimes are taken before a directory is listed, and
+        # directories whose stored record still matches are never listed.
+        # Directories reported by --watch are always listed, even when their
+        # mtime did not change (files rewritten in place).
+        dir_mtimes: Dict[str, int] = {}
+        skippable: Dict[str, DirectoryRecord] = {}
+        forced_dirs = {key_for_path(str(Path(path)), casefold=is_windows) for path in changed_dirs or ()}
+
+        def _track_dir(display_entry: str, dir_stat: Optional[os.stat_result]) -> None:
+            if directory_state is None or dir_stat is None:
+                return
+            dir_mtimes[display_entry] = int(dir_stat.st_mtime_ns)
+            if forced_dirs and key_for_path(display_entry, casefold=is_windows) in forced_dirs:
+                return
+            record = directory_state.match(display_entry, dir_stat)
+            if record is not None:
+                skippable[display_entry] = record
+
+        if directory_state is not None:
+            for tracked_display, tracked_fs in stack:
+                _track_dir(tracked_display, _stat_path(tracked_fs, follow_symlinks=True))
+
+        def _skip_listing(display_entry: str) -> bool:
+            # Directories left unlisted by the fast delta or the resumed frontier.
+            return display_entry in skippable or (frontier is not None and frontier.skip(display_entry))
+
+        prefetcher = DirectoryPrefetcher(_list_directory, workers=perf_config.enumerate_workers)
+        try:
+            while stack and not cancel_token.is_set():
+                display_dir, fs_dir = stack.pop()
+                skip_record = skippable.pop(display_dir, None)
+                if frontier is not None:
+                    if frontier.skip(display_dir):
+                        prefetcher.discard(fs_dir)
                         continue
-                    try:
-                        if entry.is_dir(follow_symlinks=robust_cfg.follow_symlinks):
+                    frontier.begin(display_dir)
+                if directory_state is not None and skip_record is not None:
+                    dir_key = key_for_path(display_dir, casefold=is_windows)
+                    if existing_rows.live_in_directory(dir_key) == skip_record.file_count and (
+                        inventory_writer is None or skip_record.categories is not None
+                    ):
+                        unchanged_count += existing_rows.pop_directory(dir_key)
+                        directory_state.keep(display_dir, skip_record)
+                        metrics["dirs_scanned"] += 1
+                        metrics["files_seen"] += skip_record.file_count
+                        metrics["bytes_seen"] += skip_record.file_bytes
+                        metrics["av_total"] += skip_record.av_count
+                        if inventory_writer is not None:
+                            for category, count in (skip_record.categories or {}).items():
+                                inventory_totals[category] = inventory_totals.get(category, 0) + int(count)
+                        for name in skip_record.subdirs:
+                            child_display = os.path.join(display_dir, name)
                             try:
-                                next_fs = to_fs_path(display_entry, mode=robust_cfg.long_paths)
+                                child_fs = to_fs_path(child_display, mode=robust_cfg.long_paths)
                             except PathTooLongError:
                                 metrics["skipped_toolong"] += 1
-                                LOGGER.warning("Skipping long directory %s", display_entry)
                                 continue
-                            if robust_cfg.follow_symlinks:
-                                dir_stat = _stat_path(next_fs, follow_symlinks=True)
-                                if not dir_stat:
-                                    continue
-                                inode_key = (dir_stat.st_dev, dir_stat.st_ino)
-                                if inode_key in visited_dirs:
-                                    LOGGER.warning("Detected symlink loop at %s", display_entry)
-                                    continue
-                                visited_dirs.add(inode_key)
-                            stack.append((display_entry, next_fs))
-                            continue
-                    except OSError:
+                            child_stat = _stat_path(child_fs, follow_symlinks=robust_cfg.follow_symlinks)
+                            if child_stat is None:
+                                continue
+                            _track_dir(child_display, child_stat)
+                            stack.append((child_display, child_fs))
+                        if frontier is not None:
+                            frontier.end(
+                                display_dir,
+                                complete=True,
+                                totals=DirectoryTotals(
+                                    skip_record.file_count,
+                                    skip_record.file_bytes,
+                                    skip_record.av_count,
+                                    skip_record.categories,
+                                ),
+                            )
+                            _checkpoint_frontier()
+                        _emit_progress("enumerating")
+                        continue
+                listing = prefetcher.take(fs_dir, display_dir)
+                if listing is None:
+                    if frontier is not None:
+                        frontier.end(display_dir, complete=True)
+                    continue
+                metrics["dirs_scanned"] += 1
+                dir_entries: List[Tuple[str, str, int, int]] = []
+                dir_subdirs: List[str] = []
+                dir_files = 0
+                dir_bytes = 0
+                dir_av = 0
+                dir_categories: Dict[str, int] = {}
+                for listed in listing:
+                    if listed.kind != "dir":
                         continue
+                    display_entry = listed.path
                     try:
-                        if not entry.is_file(follow_symlinks=False):
+                        next_fs = to_fs_path(display_entry, mode=robust_cfg.long_paths)
+                    except PathTooLongError:
+                        metrics["skipped_toolong"] += 1
+                        LOGGER.warning("Skipping long directory %s", display_entry)
+                        continue
+                    if robust_cfg.follow_symlinks and listed.stat is not None:
+                        inode_key = (listed.stat.st_dev, listed.stat.st_ino)
+                        if inode_key in visited_dirs:
+                            LOGGER.warning("Detected symlink loop at %s", display_entry)
                             continue
-                    except OSError:
+                        visited_dirs.add(inode_key)
+                    stack.append((display_entry, next_fs))
+                    if directory_state is not None:
+                        name = os.path.basename(display_entry)
+                        dir_subdirs.append(name)
+                        dir_entries.append((name, "dir", 0, 0))
+                        _track_dir(display_entry, listed.stat)
+                # Subdirectories are on the stack before this directory's files
+                # are queued, so the workers list them while hashing proceeds.
+                prefetcher.prefetch_stack(stack, _skip_listing)
+                for listed in listing:
+                    if cancel_token.is_set():
+                        break
+                    if listed.kind == "ignored":
+                        metrics["skipped_ignored"] += 1
                         continue
-                    stat_result = _stat_path(entry_fs, follow_symlinks=False)
-                    if stat_result is None:
+                    if listed.kind != "file":
                         continue
+                    display_entry = listed.path
+                    stat_result = listed.stat
                     try:
                         fs_file = to_fs_path(display_entry, mode=robust_cfg.long_paths)
                     except PathTooLongError:
@@ -2996,23 +3880,52 @@ def scan_drive(
                         size_bytes=int(stat_result.st_size),
                         mtime_utc=_iso_from_timestamp(stat_result.st_mtime),
                         is_av=_is_av(display_entry),
+                        inode=int(getattr(stat_result, "st_ino", 0) or 0),
                     )
                     metrics["files_seen"] += 1
                     metrics["bytes_seen"] += int(stat_result.st_size)
                     if info.is_av:
                         metrics["av_total"] += 1
+                    dir_files += 1
+                    dir_bytes += info.size_bytes
+                    dir_av += int(info.is_av)
+                    if directory_state is not None:
+                        dir_entries.append(
+                            (
+                                os.path.basename(display_entry),
+                                "file",
+                                info.size_bytes,
+                                int(stat_result.st_mtime_ns),
+                            )
+                        )
+                    if inventory_writer is not None:
+                        category = categorize(listed.mime, listed.ext or "")
+                        inventory_totals[category] = inventory_totals.get(category, 0) + 1
+                        dir_categories[category] = dir_categories.get(category, 0) + 1
+                        inventory_writer.add(
+                            InventoryRow(
+                                path=display_entry,
+                                size_bytes=info.size_bytes,
+                                mtime_utc=info.mtime_utc,
+                                ext=listed.ext or None,
+                                mime=listed.mime,
+                                category=category,
+                                drive_label=label,
+                                drive_type=drive_type_value,
+                                indexed_utc=_utc_now_iso(),
+                            )
+                        )
                     existing_key = key_for_path(info.path, casefold=is_windows)
-                    existing_row = existing_rows.pop(existing_key, None)
+                    existing_row = existing_rows.pop(existing_key)
                     if existing_row is not None:
-                        info.existing_id = existing_row["id"]
-                        info.was_deleted = bool(existing_row["deleted"])
+                        info.existing_id = existing_row.id
+                        info.was_deleted = existing_row.deleted
                         if (
                             not full_rescan
                             and not info.was_deleted
-                            and int(existing_row["size_bytes"]) == info.size_bytes
-                            and existing_row["mtime_utc"] == info.mtime_utc
+                            and existing_row.unchanged(info.size_bytes, info.mtime_utc)
                         ):
-                            restore_batch.append(existing_row["path"])
+                            restore_batch.append(existing_row.id)
                             unchanged_count += 1
                             if len(restore_batch) >= 2000:
                                 _flush_db(force=True)
@@ -3025,15 +3938,13 @@ def scan_drive(
                         if resume_key == existing_key:
                             resume_consumed = True
                         continue
-                    while not cancel_token.is_set():
-                        try:
-                            task_queue.put(info, timeout=0.5)
-                            pending_tasks += 1
-                            total_enqueued += 1
-                            break
-                        except queue.Full:
-                            _drain_results(block=True)
-                            _flush_db(force=False)
+                    if frontier is not None:
+                        task_dirs[info.path] = display_dir
+                        frontier.add_task(display_dir)
+                    if io_buffer is not None:
+                        _dispatch(io_buffer.add(info))
+                    else:
+                        _dispatch((info,))
                     if cancel_token.is_set():
                         break
                     if enumeration_sleep:
@@ -3042,6 +3953,40 @@ def scan_drive(
                         time.sleep(0.01)
                     _drain_results(block=False)
                     _emit_progress("enumerating")
+                dir_mtime = dir_mtimes.pop(display_dir, None)
+                if directory_state is not None and dir_mtime is not None and not cancel_token.is_set():
+                    previous = directory_state.stored(display_dir)
+                    recorded = directory_state.record(
+                        display_dir,
+                        mtime_ns=dir_mtime,
+                        entries=dir_entries,
+                        subdirs=dir_subdirs,
+                        file_count=dir_files,
+                        file_bytes=dir_bytes,
+                        av_count=dir_av,
+                        categories=dir_categories if inventory_writer is not None else None,
+                    )
+                    if previous is not None and previous.child_digest == recorded.child_digest:
+                        directory_state.unchanged_listings += 1
+                # Idle workers cost more than an unsorted batch.
+                if io_buffer is not None and len(io_buffer) and task_queue.empty():
+                    _dispatch(io_buffer.drain())
+                if frontier is not None:
+                    frontier.end(
+                        display_dir,
+                        complete=not cancel_token.is_set(),
+                        totals=DirectoryTotals(
+                            dir_files,
+                            dir_bytes,
+                            dir_av,
+                            dir_categories if inventory_writer is not None else None,
+                        ),
+                    )
+                    _checkpoint_frontier()
+            if io_buffer is not None and not cancel_token.is_set():
+                _dispatch(io_buffer.drain())
+        finally:
+            prefetcher.close()
     except KeyboardInterrupt:
         cancel_token.set()
         LOGGER.warning("Scan cancelled by user.")
@@ -3061,8 +4006,29 @@ def scan_drive(
                 _flush_db(force=False)
 
     while pending_tasks:
+        # Workers drop queued files once cancelled, so those never report back.
+        if cancel_token.is_set() and task_queue.unfinished_tasks == 0 and result_queue.empty():
+            break
         _drain_results(block=True)
     _flush_db(force=True)
+    if frontier is not None and cancel_token.is_set():
+        _checkpoint_frontier(force=True)
+    if inventory_writer is not None:
+        inventory_writer.close()
+        inventory_summary = {
+            "mode": "single-pass",
+            "total_files": metrics["files_seen"],
+            "totals": dict(inventory_totals),
+            "inventory_written": inventory_writer.total_written,
+            "mime": {"mode": mime_classifier.mode, **mime_classifier.stats},
+        }
+        if not cancel_token.is_set():
+            record_inventory_stats(
+                str(catalog_db_path),
+                drive_label=label,
+                totals=inventory_totals,
+                total_files=metrics["files_seen"],
+            )
 
     task_queue.join()
     for thread in workers:
@@ -3073,8 +4039,9 @@ def scan_drive(
     deleted_count = 0
     deleted_examples: List[str] = []
     if not cancel_token.is_set():
-        stale_paths = [row["path"] for row in existing_rows.values()]
-        deleted_count, deleted_examples = _mark_deleted(conn, label, deleted_paths=stale_paths)
+        deleted_count, deleted_examples = _mark_deleted(conn, label, deleted_ids=existing_rows.unseen_ids())
+        if directory_state is not None:
+            directory_state.save(conn)
         if deleted_count:
             LOGGER.info(
                 "Marked %s files as deleted (examples: %s)",
@@ -3082,10 +4049,54 @@ def scan_drive(
                 ", ".join(deleted_examples) if deleted_examples else "—",
             )
 
-    if resume:
+    deferred_hash_summary: Optional[Dict[str, object]] = None
+    if hash_strategy != "full":
+        # Full hashes only where a quick signature or a size collides; the rest
+        # wait for a "hash_full" orchestrator job.
+        collision_result: Dict[str, int] = {"candidates": 0, "hashed": 0, "errors": 0}
+        duplicate_sizes: Optional[Set[int]] = None
+        if not cancel_token.is_set():
+            if hash_strategy == "size":
+                duplicate_sizes = _duplicate_sizes(conn, label, shard_path=Path(shard_path))
+            collision_result = complete_deferred_hashes(
+                conn,
+                drive_label=label,
+                backend=hash_backend,
+                collisions_only=hash_strategy == "quick",
+                sizes=duplicate_sizes,
+                resolve_path=lambda path: to_fs_path(path, mode=robust_cfg.long_paths),
+                workers=perf_config.worker_threads,
+                should_stop=cancel_token.is_set,
+            )
+        deferred_row = conn.execute(
+            "SELECT COUNT(*) FROM files WHERE drive_label=? AND deleted=0 AND hash_deferred=1",
+            (label,),
+        ).fetchone()
+        deferred_hash_summary = {
+            "strategy": hash_strategy,
+            "duplicate_sizes": len(duplicate_sizes) if duplicate_sizes is not None else None,
+            "collision_candidates": int(collision_result["candidates"]),
+            "collision_hashed": int(collision_result["hashed"]),
+            "collision_errors": int(collision_result["errors"]),
+            "deferred": int(deferred_row[0]) if deferred_row else 0,
+        }
+        LOGGER.info(
+            "Deferred hashing (%s): %s collision(s) fully hashed, %s file(s) deferred",
+            hash_strategy,
+            deferred_hash_summary["collision_hashed"],
+            deferred_hash_summary["deferred"],
+        )
+    hash_backend.close()
+
+    if resume and cancel_token.is_set():
+        # Keep the checkpoints so the next run resumes instead of starting over.
+        state_store.checkpoint("cancelled", last_processed_path, force=True)
+    elif resume:
         state_store.checkpoint("hashing", last_processed_path, force=True)
         state_store.checkpoint("finalizing", None, force=True)
         state_store.clear()
+        if frontier is not None:
+            frontier.clear()
 
     duration = time.perf_counter() - start_time
     scan_completed_utc = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -3096,6 +4107,7 @@ def scan_drive(
         "requested_usn": bool(use_ntfs_usn),
         "supports_usn": volume_info.supports_usn,
         "fallback_sampling": bool(fallback_sampling),
+        "fast_directories": directory_state.summary() if directory_state is not None else None,
         "journal": {
             "available": bool(usn_info),
             "journal_id": getattr(usn_info, "journal_id", None),
@@ -3135,12 +4147,16 @@ def scan_drive(
                 cancel_token=cancel_token,
                 progress_callback=progress_callback,
                 start_time=start_time,
+                workers=music_workers,
+                full_reparse=full_rescan,
             )
         except Exception as exc:
             LOGGER.exception("Music filename parsing failed: %s", exc)
             music_summary = {"status": "error", "message": str(exc)}
     if light_pipeline is not None:
         light_summary = light_pipeline.finalize()
+    if light_conn is not conn:
+        light_conn.close()
     if fingerprint_pipeline is not None:
         fingerprint_summary = fingerprint_pipeline.finalize()
     if isinstance(music_summary, dict):
@@ -3159,8 +4175,42 @@ def scan_drive(
                 "Music filename parsing cancelled after %s rows.",
                 int(music_summary.get("processed") or 0),
             )
+    probe_cache_summary: Optional[Dict[str, int]] = None
+    if probe_cache is not None:
+        probe_cache_summary = probe_cache.stats()
+        probe_cache.close()
+    verify_summary: Dict[str, object] = verify_cfg.as_dict()
+    pending_row = conn.execute(
+        "SELECT COUNT(*) FROM files WHERE drive_label=? AND deleted=0 AND verify_pending=1",
+        (label,),
+    ).fetchone()
+    verify_summary["pending"] = int(pending_row[0]) if pending_row else 0
+    if verify_summary["pending"]:
+        LOGGER.info(
+            "Integrity: %s video(s) passed the %s check and are queued for %s verification (verify_deep job).",
+            verify_summary["pending"],
+            verify_cfg.inline_tier,
+            verify_cfg.tier,
+        )
     conn.close()
+    timings_file: Optional[str] = None
+    try:
+        timings_file = str(
+            timings.write(
+                timings_path(WORKING_DIR_PATH, label),
+                drive_label=label,
+                mount_path=str(mount),
+                profile=perf_config.profile,
+                status="cancelled" if cancel_token.is_set() else "ok",
+                total_files=metrics["files_seen"],
+                total_bytes=metrics.get("bytes_seen", 0),
+                duration_seconds=duration,
+            )
+        )
+    except OSError as exc:
+        LOGGER.warning("Unable to write scan timings: %s", exc)
     result_summary = {
+        "status": "cancelled" if cancel_token.is_set() else "ok",
         "total_files": metrics["files_seen"],
         "total_bytes": metrics.get("bytes_seen", 0),
         "av_files": metrics["av_total"],
@@ -3169,14 +4219,22 @@ def scan_drive(
         "deleted": deleted_count,
         "duration_seconds": duration,
         "performance": perf_config.as_dict(),
+        "concurrency": concurrency.summary(),
+        "io_order": io_buffer.summary() if io_buffer is not None else None,
         "skipped_perm": metrics["skipped_perm"],
         "skipped_toolong": metrics["skipped_toolong"],
         "skipped_ignored": metrics["skipped_ignored"],
         "light_analysis": light_summary,
         "fingerprints": fingerprint_summary,
         "music_names": music_summary,
+        "inventory": inventory_summary,
+        "deferred_hash": deferred_hash_summary,
+        "probe_cache": probe_cache_summary,
+        "verify": verify_summary,
         "disk_marker": marker_info,
         "delta_scan": delta_info,
+        "timings": {"path": timings_file, "phases": timings.phase_summary()},
+        "resume": {**frontier.summary(), "files_restored": files_restored} if frontier is not None else None,
     }
     return result_summary
 
@@ -3192,6 +4250,18 @@ def _parse_args(argv: list[str]) -> argparse.Namespace:
         dest="mount_path",
         help="Filesystem path where the drive is mounted.",
     )
+    parser.add_argument(
+        "--targets",
+        action="append",
+        metavar="LABEL=MOUNT[,LABEL=MOUNT...]",
+        help="Scan several drives concurrently in one process (repeatable). Replaces --label/--mount.",
+    )
+    parser.add_argument(
+        "--work-slots",
+        dest="work_slots",
+        type=int,
+        help="With --targets, hash/probe jobs running at once across all drives (default: twice the CPU count).",
+    )
     parser.add_argument(
         "--catalog-db",
         dest="catalog_db",
@@ -3560,8 +4630,37 @@ def _parse_args(argv: list[str]) -> argparse.Namespace:
     )
     parser.add_argument(
         "--delta-scan",
-        choices=["usn", "off"],
-        help="Select delta scan mode (usn to use NTFS Change Journal, off to disable).",
+        choices=["usn", "fast", "off"],
+        help=(
+            "Select delta scan mode (usn to use NTFS Change Journal, fast to skip directories whose "
+            "mtime is unchanged since the last scan, off to disable)."
+        ),
+    )
+    parser.add_argument(
+        "--mime-mode",
+        choices=["extension", "magic"],
+        help=(
+            "MIME detection for inventory rows: extension trusts known extensions and only reads the "
+            "header of unknown or ambiguous files; magic runs libmagic on every file."
+        ),
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "After the scan, keep watching the mount (inotify on Linux, mtime polling elsewhere) "
+            "and apply changes to the shard until interrupted."
+        ),
+    )
+    parser.add_argument(
+        "--watch-debounce",
+        type=float,
+        help="Seconds without new events before a watch batch is applied (default: 5).",
+    )
+    parser.add_argument(
+        "--watch-poll",
+        type=float,
+        help="Seconds between polling passes when inotify is unavailable or out of watches (default: 300).",
     )
     parser.add_argument(
         "--op-timeout",
@@ -3578,6 +4677,11 @@ def _parse_args(argv: list[str]) -> argparse.Namespace:
         action="store_true",
         help="Enumerate files without hashing and populate the lightweight inventory table.",
     )
+    parser.add_argument(
+        "--two-phase-inventory",
+        action="store_true",
+        help="Walk the tree once for the inventory table and again for hashing (legacy comparison mode).",
+    )
     parser.add_argument(
         "--music-from-filenames",
         dest="music_from_filenames",
@@ -3615,7 +4719,37 @@ def _parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument(
         "--perf-threads",
         type=int,
-        help="Override worker thread count.",
+        help="Override worker thread count (the starting point when concurrency is adaptive).",
+    )
+    parser.add_argument(
+        "--perf-concurrency",
+        dest="perf_concurrency",
+        choices=["adaptive", "fixed"],
+        help="Grow and shrink active hashing workers at runtime (adaptive, default) or keep --perf-threads fixed.",
+    )
+    parser.add_argument(
+        "--perf-max-workers",
+        dest="perf_max_workers",
+        type=int,
+        help="Ceiling for adaptive concurrency (default depends on the performance profile).",
+    )
+    parser.add_argument(
+        "--io-order",
+        dest="perf_io_order",
+        choices=["listing", "physical"],
+        help="Hash files in listing order or sorted by on-disk location (default: physical on HDDs).",
+    )
+    parser.add_argument(
+        "--io-order-window",
+        dest="perf_io_order_window",
+        type=int,
+        help="Files buffered and sorted per batch in physical order (default: 512).",
+    )
+    parser.add_argument(
+        "--perf-enum-workers",
+        dest="perf_enum_workers",
+        type=int,
+        help="Override the number of concurrent directory enumeration workers.",
     )
     parser.add_argument(
         "--gpu-policy",
@@ -3645,6 +4779,27 @@ def _parse_args(argv: list[str]) -> argparse.Namespace:
         type=int,
         help="Override FFmpeg parallelism.",
     )
+    parser.add_argument(
+        "--perf-hash-backend",
+        dest="perf_hash_backend",
+        choices=["thread", "process"],
+        help="Hash on the scan worker threads (default) or in a process pool.",
+    )
+    parser.add_argument(
+        "--perf-hash-threads",
+        dest="perf_hash_threads",
+        type=int,
+        help="BLAKE3 threads per multi-GB file (0 = automatic, 1 = single-threaded).",
+    )
+    parser.add_argument(
+        "--hash-strategy",
+        dest="hash_strategy",
+        choices=["full", "quick", "size"],
+        help=(
+            "quick stores size+head/middle/tail signatures and fully hashes only collisions; "
+            "size fully hashes only files whose size matches another file on any drive."
+        ),
+    )
     parser.add_argument(
         "--perf-gentle-io",
         dest="perf_gentle_io",
@@ -3753,6 +4908,34 @@ def _parse_args(argv: list[str]) -> argparse.Namespace:
         dest="fingerprint_fpcalc",
         help="Path to Chromaprint fpcalc executable.",
     )
+    parser.add_argument(
+        "--verify-tier",
+        dest="verify_tier",
+        choices=["container", "sampled", "full"],
+        help=(
+            "Video integrity check: container probes the stream index, sampled decodes short windows "
+            "across the duration, full decodes the whole file (default)."
+        ),
+    )
+    parser.add_argument(
+        "--verify-defer",
+        dest="verify_defer",
+        action="store_true",
+        help="Run only the container check inline and leave the deeper tier to the verify_deep job.",
+    )
+    parser.add_argument(
+        "--no-verify-defer",
+        dest="verify_defer",
+        action="store_false",
+        help=argparse.SUPPRESS,
+    )
+    parser.set_defaults(verify_defer=None)
+    parser.add_argument(
+        "--verify-samples",
+        dest="verify_samples",
+        type=int,
+        help="Number of decode windows for the sampled tier (default 4).",
+    )
     parser.add_argument(
         "--semantic-index",
         choices=["build", "rebuild"],
@@ -3795,6 +4978,18 @@ def _parse_args(argv: list[str]) -> argparse.Namespace:
         namespace.positional = positional
         return namespace
 
+    if namespace.targets:
+        try:
+            namespace.targets = parse_targets(namespace.targets)
+        except ValueError as exc:
+            parser.error(str(exc))
+        if namespace.shard_db:
+            parser.error("--shard-db cannot be combined with --targets.")
+        if namespace.label is not None or namespace.mount_path is not None:
+            parser.error("--targets replaces --label and --mount.")
+        namespace.label = namespace.targets[0].label
+        namespace.mount_path = namespace.targets[0].mount
+
     if namespace.label is None or namespace.mount_path is None:
         parser.error("Both --label and --mount are required.")
 
@@ -4045,6 +5240,140 @@ def _run_cli_semantic(
     return 0
 
 
+def _run_targets_cli(
+    args: argparse.Namespace,
+    settings_data: Dict[str, object],
+    catalog_db_path: str,
+    scan_kwargs: Dict[str, object],
+    perf_cli_overrides: Dict[str, object],
+) -> int:
+    targets: List[ScanTarget] = list(args.targets)
+    missing = [target for target in targets if not Path(target.mount).exists()]
+    for target in missing:
+        print(f"[ERROR] Mount path not found for {target.label}: {target.mount}", file=sys.stderr)
+    if missing:
+        return 2
+    if getattr(args, "watch", False):
+        print("[ERROR] --watch cannot be combined with --targets.", file=sys.stderr)
+        return 2
+
+    def _io_budget(target: ScanTarget) -> AdaptiveConcurrency:
+        config = resolve_performance_config(target.mount, settings=settings_data, cli_overrides=perf_cli_overrides)
+        return AdaptiveConcurrency(
+            initial=config.worker_threads,
+            ceiling=config.max_workers,
+            enabled=config.concurrency == "adaptive",
+        )
+
+    print_lock = threading.Lock()
+
+    def _progress_for(label: str) -> Callable[[dict], None]:
+        def _emit(payload: dict) -> None:
+            with print_lock:
+                print(json.dumps({**payload, "label": label}), flush=True)
+
+        return _emit
+
+    def _scan(target: ScanTarget, io_budget: AdaptiveConcurrency, work_slots: threading.Semaphore) -> dict:
+        shard_path = get_shard_db_path(WORKING_DIR_PATH, target.label)
+        _ensure_directory(shard_path.parent)
+        return scan_drive(
+            target.label,
+            target.mount,
+            catalog_db_path,
+            **{
+                **scan_kwargs,
+                "shard_db_path": str(shard_path),
+                "progress_callback": _progress_for(target.label),
+                "io_budget": io_budget,
+                "work_slots": work_slots,
+            },
+        )
+
+    work_slots = getattr(args, "work_slots", None) or default_work_slots()
+    results = run_targets(targets, _scan, io_budget_for=_io_budget, work_slots=work_slots)
+    exit_code = 0
+    for target in targets:
+        result = results.get(target.label) or {}
+        if result.get("status") == "error":
+            exit_code = 1
+            print(f"{target.label}: failed — {result.get('error')}")
+            continue
+        print(
+            f"{target.label}: total files: {int(result.get('total_files', 0)):,} — "
+            f"AV files: {int(result.get('av_files', 0)):,} — device: {result.get('device')} — "
+            f"duration: {_format_duration(float(result.get('duration_seconds', 0.0)))}"
+        )
+    return exit_code
+
+
+def _run_watch_cli(
+    args: argparse.Namespace,
+    settings_data: Dict[str, object],
+    catalog_db_path: str,
+    scan_kwargs: Dict[str, object],
+) -> int:
+    watch_overrides: Dict[str, object] = {}
+    if getattr(args, "watch_debounce", None) is not None:
+        watch_overrides["debounce_seconds"] = args.watch_debounce
+    if getattr(args, "watch_poll", None) is not None:
+        watch_overrides["poll_seconds"] = args.watch_poll
+    watch_cfg = _resolve_watch_settings(settings_data, watch_overrides)
+    root = str(Path(args.mount_path))
+
+    cancel_token = CancellationToken()
+    initial = scan_drive(
+        args.label,
+        args.mount_path,
+        catalog_db_path,
+        **{**scan_kwargs, "delta_scan_mode": "fast", "cancel_token": cancel_token},
+    )
+    total_files = int(initial.get("total_files", 0)) if isinstance(initial, dict) else 0
+    duration_seconds = float(initial.get("duration_seconds", 0.0)) if isinstance(initial, dict) else 0.0
+    print(f"Done — total files: {total_files:,} — duration: {_format_duration(duration_seconds)}")
+    if cancel_token.is_set():
+        print("Watch stopped.")
+        return 0
+
+    pass_kwargs = {**scan_kwargs, "full_rescan": False, "resume": False}
+
+    def _rescan(changed: Set[str], thorough: bool) -> Dict[str, object]:
+        # scan_drive turns Ctrl+C during enumeration into a cancelled pass and
+        # sets the shared token, which ends the watch loop.
+        return scan_drive(
+            args.label,
+            args.mount_path,
+            catalog_db_path,
+            **{
+                **pass_kwargs,
+                "delta_scan_mode": "off" if thorough else "fast",
+                "changed_dirs": changed,
+                "cancel_token": cancel_token,
+            },
+        )
+
+    def _report(kind: str, result: Dict[str, object]) -> None:
+        if not isinstance(result, dict):
+            return
+        print(
+            f"Watch {kind} — total files: {int(result.get('total_files', 0)):,} — "
+            f"unchanged: {int(result.get('unchanged', 0)):,} — deleted: {int(result.get('deleted', 0)):,} — "
+            f"duration: {_format_duration(float(result.get('duration_seconds', 0.0)))}"
+        )
+
+    print(f"Watching {root} (Ctrl+C to stop)…")
+    try:
+        summary = run_watch(root, _rescan, watch_cfg, cancel_token=cancel_token, on_pass=_report)
+    except KeyboardInterrupt:
+        cancel_token.set()
+        print("Watch stopped.")
+        return 0
+    LOGGER.info("Watch summary: %s", summary)
+    if cancel_token.is_set():
+        print("Watch stopped.")
+    return 0
+
+
 def _run_cli_maintenance(args: argparse.Namespace, catalog_db_path: Path) -> int:
     targets = _resolve_maintenance_targets(args.maint_target, catalog_db_path)
     if not targets:
@@ -5276,10 +6605,26 @@ def main(argv: Optional[list[str]] = None) -> int:
         perf_cli_overrides["profile"] = args.perf_profile
     if getattr(args, "perf_threads", None) is not None:
         perf_cli_overrides["worker_threads"] = args.perf_threads
+    if getattr(args, "perf_enum_workers", None) is not None:
+        perf_cli_overrides["enumerate_workers"] = args.perf_enum_workers
+    if getattr(args, "perf_concurrency", None) is not None:
+        perf_cli_overrides["concurrency"] = args.perf_concurrency
+    if getattr(args, "perf_max_workers", None) is not None:
+        perf_cli_overrides["max_workers"] = args.perf_max_workers
+    if getattr(args, "perf_io_order", None) is not None:
+        perf_cli_overrides["io_order"] = args.perf_io_order
+    if getattr(args, "perf_io_order_window", None) is not None:
+        perf_cli_overrides["io_order_window"] = args.perf_io_order_window
     if getattr(args, "perf_chunk", None) is not None:
         perf_cli_overrides["hash_chunk_bytes"] = args.perf_chunk
     if getattr(args, "perf_ffmpeg", None) is not None:
         perf_cli_overrides["ffmpeg_parallel"] = args.perf_ffmpeg
+    if getattr(args, "perf_hash_backend", None) is not None:
+        perf_cli_overrides["hash_backend"] = args.perf_hash_backend
+    if getattr(args, "perf_hash_threads", None) is not None:
+        perf_cli_overrides["hash_max_threads"] = args.perf_hash_threads
+    if getattr(args, "hash_strategy", None) is not None:
+        perf_cli_overrides["hash_strategy"] = args.hash_strategy
     if getattr(args, "perf_gentle_io", None) is not None:
         perf_cli_overrides["gentle_io"] = args.perf_gentle_io
 
@@ -5322,16 +6667,21 @@ def main(argv: Optional[list[str]] = None) -> int:
     if getattr(args, "fingerprint_fpcalc", None):
         fingerprint_cli_overrides["fpcalc_path"] = args.fingerprint_fpcalc
 
+    verify_cli_overrides: Dict[str, object] = {}
+    if getattr(args, "verify_tier", None):
+        verify_cli_overrides["tier"] = args.verify_tier
+    if getattr(args, "verify_defer", None) is not None:
+        verify_cli_overrides["defer_deep"] = args.verify_defer
+    if getattr(args, "verify_samples", None) is not None:
+        verify_cli_overrides["sample_windows"] = args.verify_samples
+
     gpu_cli_overrides: Dict[str, object] = {}
     if getattr(args, "gpu_policy", None):
         gpu_cli_overrides["policy"] = args.gpu_policy
     if getattr(args, "gpu_hwaccel", None) is not None:
         gpu_cli_overrides["allow_hwaccel_video"] = bool(args.gpu_hwaccel)
 
-    result = scan_drive(
-        args.label,
-        args.mount_path,
-        str(catalog_db_path),
+    scan_kwargs: Dict[str, object] = dict(
         shard_db_path=str(shard_db_path),
         inventory_only=bool(getattr(args, "inventory_only", False)),
         full_rescan=bool(getattr(args, "full_rescan", False)),
@@ -5341,6 +6691,7 @@ def main(argv: Optional[list[str]] = None) -> int:
         settings=settings_data,
         perf_overrides=perf_cli_overrides,
         fingerprint_overrides=fingerprint_cli_overrides,
+        verify_overrides=verify_cli_overrides,
         robust_overrides=robust_cli_overrides,
         light_analysis=getattr(args, "light_analysis", None),
         gpu_overrides=gpu_cli_overrides,
@@ -5349,7 +6700,15 @@ def main(argv: Optional[list[str]] = None) -> int:
         disk_marker_enable=disk_marker_override,
         disk_marker_filename=disk_marker_name_override,
         delta_scan_mode=delta_scan_mode,
+        mime_mode=getattr(args, "mime_mode", None),
+        two_phase_inventory=bool(getattr(args, "two_phase_inventory", False)),
     )
+    if getattr(args, "targets", None):
+        return _run_targets_cli(args, settings_data, str(catalog_db_path), scan_kwargs, perf_cli_overrides)
+    if getattr(args, "watch", False):
+        return _run_watch_cli(args, settings_data, str(catalog_db_path), scan_kwargs)
+
+    result = scan_drive(args.label, args.mount_path, str(catalog_db_path), **scan_kwargs)
 
     total_files = int(result.get("total_files", 0)) if isinstance(result, dict) else 0
     duration_seconds = float(result.get("duration_seconds", 0.0)) if isinstance(result, dict) else 0.0
@@ -5496,6 +6855,12 @@ def main(argv: Optional[list[str]] = None) -> int:
         extra = f" next_usn={next_usn}" if next_usn is not None else ""
         mode = "usn" if delta_info.get("requested_usn") else "off"
         print(f"Delta scan {mode}, USN {availability}{extra}")
+        fast = delta_info.get("fast_directories")
+        if isinstance(fast, dict):
+            print(
+                f"Fast delta: skipped {fast.get('dirs_skipped', 0)} unchanged directories "
+                f"({fast.get('files_skipped', 0)} files), listed {fast.get('dirs_listed', 0)}"
+            )
     if not getattr(args, "inventory_only", False):
         try:
             maintenance_options = resolve_options(settings_data)
@@ -7,7 +7,9 @@ import os
 import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Sequence, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.search_index import match_clause
 
 MIN_QUERY_LENGTH = 3
 EXPORT_PREFIX = "quick-search"
@@ -55,25 +57,35 @@ def ensure_inventory_name(conn: sqlite3.Connection, *, batch_size: int = 500) ->
     return True
 
 
-def build_search_query(like: str, *, use_name: bool = True) -> Tuple[str, Sequence[str]]:
+def build_search_query(
+    like: str, *, use_name: bool = True, tables: Optional[Iterable[str]] = None
+) -> Tuple[str, Sequence[str]]:
+    """Return the Quick Search SQL for ``like``.
+
+    ``tables`` holds the shard's table names; when they include the
+    ``inventory_fts`` trigram index (see :mod:`core.search_index`) it narrows
+    the scan before the ``LIKE`` checks run.
+    """
+    prefilter = match_clause("inventory", like, tables) if tables is not None else None
+    prefilter_sql, prefilter_params = prefilter or ("1", ())
     if use_name:
         sql = (
             "SELECT path, name, category, size_bytes, mtime_utc, drive_label "
             "FROM inventory "
-            "WHERE name LIKE ? OR path LIKE ? COLLATE NOCASE "
+            f"WHERE {prefilter_sql} AND (name LIKE ? OR path LIKE ? COLLATE NOCASE) "
             "ORDER BY mtime_utc DESC "
             "LIMIT 1000"
         )
-        params = (like, like)
+        params = (*prefilter_params, like, like)
     else:
         sql = (
             "SELECT path, name, category, size_bytes, mtime_utc, drive_label "
             "FROM inventory "
-            "WHERE path LIKE ? COLLATE NOCASE "
+            f"WHERE {prefilter_sql} AND path LIKE ? COLLATE NOCASE "
             "ORDER BY mtime_utc DESC "
             "LIMIT 1000"
         )
-        params = (like,)
+        params = (*prefilter_params, like)
     return sql, params
 
 
@@ -10,6 +10,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional
 
+from core.search_index import ensure_search_index, sync_search_index
+
 from . import guess, review, rules, score
 from .types import ConfidenceBreakdown, FolderAnalysis, GuessResult, VerificationSignals
 from .verify import collect_verification
@@ -135,6 +137,7 @@ def ensure_structure_tables(conn: sqlite3.Connection) -> None:
         )
         """
     )
+    ensure_search_index(conn, "folder_profile")
 
 
 @dataclass(slots=True)
@@ -287,6 +290,7 @@ class StructureProfiler:
                     now,
                 ),
             )
+            sync_search_index(self.conn, "folder_profile")
             self.conn.execute(
                 "DELETE FROM folder_candidates WHERE folder_path = ?",
                 (folder_key,),
@@ -6,6 +6,8 @@ import sqlite3
 from datetime import datetime, timezone
 from typing import Optional, Sequence
 
+from core.search_index import ensure_search_index, sync_search_index
+
 from .tv_types import TVConfidenceBreakdown
 
 SERIES = "series"
@@ -74,6 +76,7 @@ def ensure_tv_tables(conn: sqlite3.Connection) -> None:
         )
         """
     )
+    ensure_search_index(conn, "tv_episode_profile")
 
 
 def _utc_now() -> str:
@@ -214,6 +217,7 @@ def upsert_episode_profile(
             _utc_now(),
         ),
     )
+    sync_search_index(conn, "tv_episode_profile")
 
 
 def enqueue_review_item(
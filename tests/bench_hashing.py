@@ -0,0 +1,124 @@
+"""Microbenchmark comparing the scan hashing backends.
+
+Generates a large file (4 GB by default) and reports MB/s for each mode::
+
+    python -m tests.bench_hashing --size-mb 4096
+
+Modes: ``read`` (legacy ``f.read`` per chunk), ``readinto`` (reused buffer),
+``readinto-mt`` (reused buffer + BLAKE3 threads) and ``process`` (process
+pool). Every mode after the first reads from a warm page cache, so compare
+CPU-side throughput rather than device speed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import hashing
+from hashing import HashBackend, HashSettings
+
+_BLOCK_BYTES = 16 * 1024 * 1024
+
+
+def generate_file(path: Path, size_bytes: int) -> None:
+    block = os.urandom(_BLOCK_BYTES)
+    remaining = size_bytes
+    with open(path, "wb") as handle:
+        while remaining > 0:
+            step = min(remaining, len(block))
+            handle.write(block[:step])
+            remaining -= step
+
+
+def _legacy_read(path: str, chunk: int) -> str:
+    h = hashing._new_hasher(1)
+    with open(path, "rb") as f:
+        while True:
+            b = f.read(chunk)
+            if not b:
+                break
+            h.update(b)
+    return h.hexdigest()
+
+
+def _backend_runner(settings: HashSettings) -> Callable[[str], str]:
+    backend = HashBackend(settings)
+
+    def _run(path: str) -> str:
+        try:
+            return backend.hash(path, size_hint=os.path.getsize(path))
+        finally:
+            backend.close()
+
+    return _run
+
+
+def run_benchmark(path: Path, *, chunk: int, modes: List[str]) -> Dict[str, object]:
+    size = path.stat().st_size
+    runners: Dict[str, Callable[[str], str]] = {
+        "read": lambda p: _legacy_read(p, chunk),
+        "readinto": _backend_runner(HashSettings(chunk_bytes=chunk, max_threads=1)),
+        "readinto-mt": _backend_runner(
+            HashSettings(chunk_bytes=chunk, max_threads=0, multithread_min_bytes=0)
+        ),
+        "process": _backend_runner(HashSettings(mode="process", chunk_bytes=chunk, process_workers=1)),
+    }
+    results: Dict[str, object] = {}
+    digests: Dict[str, str] = {}
+    for mode in modes:
+        runner = runners[mode]
+        start = time.perf_counter()
+        digests[mode] = runner(str(path))
+        elapsed = time.perf_counter() - start
+        results[mode] = {
+            "seconds": round(elapsed, 3),
+            "mb_s": round((size / 1_000_000) / elapsed, 1) if elapsed > 0 else None,
+        }
+    return {
+        "algorithm": hashing.algorithm(),
+        "size_bytes": size,
+        "chunk_bytes": chunk,
+        "digests_match": len(set(digests.values())) <= 1,
+        "modes": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=4096, help="Size of the generated file (default: 4096).")
+    parser.add_argument("--chunk", type=int, default=1024 * 1024, help="Read chunk size in bytes.")
+    parser.add_argument("--dir", dest="directory", help="Directory for the generated file (default: temp dir).")
+    parser.add_argument(
+        "--modes",
+        default="read,readinto,readinto-mt,process",
+        help="Comma-separated modes to run.",
+    )
+    parser.add_argument("--keep", action="store_true", help="Keep the generated file.")
+    args = parser.parse_args(argv)
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    directory = Path(args.directory) if args.directory else Path(tempfile.gettempdir())
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"vc_hash_bench_{args.size_mb}mb.bin"
+    if not path.exists() or path.stat().st_size != args.size_mb * 1024 * 1024:
+        generate_file(path, args.size_mb * 1024 * 1024)
+    try:
+        report = run_benchmark(path, chunk=args.chunk, modes=modes)
+    finally:
+        if not args.keep:
+            path.unlink(missing_ok=True)
+    print(json.dumps(report, indent=2))
+    return 0 if report["digests_match"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""Memory benchmark for the scan pipeline's per-file records.
+
+Two parts, both measured with tracemalloc::
+
+    python -m tests.bench_memory --records 1000000
+    python -m tests.bench_memory --files 20000 --scan full --top 15
+
+``records`` builds ``--records`` of each per-file record the scan creates
+(``FileInfo``, ``WorkerResult``, ``InventoryRow`` and the flush row) and
+reports bytes per record, next to plain ``dataclass`` equivalents of the
+same fields. Timestamps repeat the way they do on a real drive, where many
+files share a modification second and every row of a batch shares its
+indexing second.
+
+``scan`` generates a synthetic drive (see ``tests.bench_scan``), scans it
+under tracemalloc in a fresh process and reports the traced peak plus the
+allocation sites still holding the most memory when the scan returns.
+``--scan inventory`` runs an inventory-only scan, which needs neither
+mediainfo nor ffmpeg.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+@dataclass
+class _PlainFileInfo:
+    path: str
+    fs_path: str
+    size_bytes: int
+    mtime_utc: str
+    is_av: bool
+    existing_id: Optional[int] = None
+    was_deleted: bool = False
+    inode: int = 0
+
+
+@dataclass
+class _PlainWorkerResult:
+    info: _PlainFileInfo
+    hash_value: Optional[str]
+    media_blob: Optional[str]
+    integrity_ok: Optional[int]
+    error_message: Optional[str] = None
+    media_metadata: Optional[dict] = None
+    quick_hash: Optional[str] = None
+    hash_deferred: int = 0
+    verify_tier: Optional[str] = None
+    verify_pending: int = 0
+
+
+@dataclass
+class _PlainInventoryRow:
+    path: str
+    size_bytes: int
+    mtime_utc: str
+    ext: Optional[str]
+    mime: Optional[str]
+    category: str
+    drive_label: str
+    drive_type: Optional[str]
+    indexed_utc: str
+
+
+def _plain_records(idx: int, label: str) -> tuple:
+    path = f"/mnt/bench/{idx % 997:03d}/file_{idx:08d}.mkv"
+    mtime = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(1_700_000_000 + idx // 50))
+    indexed = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(1_800_000_000 + idx // 1000))
+    info = _PlainFileInfo(path, path, 1_000_000 + idx, mtime, True)
+    result = _PlainWorkerResult(info, f"{idx:064x}", None, 1)
+    ext = Path(path).suffix.lower().lstrip(".")
+    row = _PlainInventoryRow(path, info.size_bytes, mtime, ext, "video/x-matroska", "video", label, "hdd", indexed)
+    flush_row = (label, path, info.size_bytes, result.hash_value, None, 0, None, 1, "full", 0, mtime)
+    return info, result, row, flush_row
+
+
+def _compact_records(idx: int, label: str) -> tuple:
+    import scan_drive
+    from inventory import InventoryRow, _normalize_extension
+
+    path = f"/mnt/bench/{idx % 997:03d}/file_{idx:08d}.mkv"
+    mtime = scan_drive._iso_from_timestamp(1_700_000_000 + idx // 50)
+    indexed = scan_drive._iso_from_timestamp(1_800_000_000 + idx // 1000)
+    info = scan_drive.FileInfo(path, path, 1_000_000 + idx, mtime, True)
+    result = scan_drive.WorkerResult(info, f"{idx:064x}", None, 1)
+    ext = _normalize_extension(path)
+    row = InventoryRow(path, info.size_bytes, mtime, ext, "video/x-matroska", "video", label, "hdd", indexed)
+    flush_row = (label, path, info.size_bytes, result.hash_value, None, 0, None, 1, "full", 0, mtime)
+    return info, result, row, flush_row
+
+
+def _measure_records(build: Callable[[int, str], tuple], count: int) -> Dict[str, object]:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    before, _ = tracemalloc.get_traced_memory()
+    label = "BENCH_DRIVE"
+    kept = [build(idx, label) for idx in range(count)]
+    current, peak = tracemalloc.get_traced_memory()
+    seconds = time.perf_counter() - started
+    tracemalloc.stop()
+    del kept
+    gc.collect()
+    return {
+        "records": count,
+        "seconds": round(seconds, 3),
+        "retained_mb": round((current - before) / 1_000_000, 1),
+        "bytes_per_file": round((current - before) / max(1, count), 1),
+        "peak_mb": round((peak - before) / 1_000_000, 1),
+    }
+
+
+def run_records(count: int) -> Dict[str, object]:
+    # Import outside the traced region so module state is not counted.
+    import scan_drive  # noqa: F401
+    import inventory  # noqa: F401
+
+    plain = _measure_records(_plain_records, count)
+    compact = _measure_records(_compact_records, count)
+    saved = 1 - compact["bytes_per_file"] / plain["bytes_per_file"] if plain["bytes_per_file"] else 0.0
+    return {"plain": plain, "compact": compact, "saved": f"{saved:.0%}"}
+
+
+def _traced_scan(home: str, mount: str, mode: str, top: int) -> Dict[str, object]:
+    """Scan ``mount`` under tracemalloc; executed in a fresh process."""
+
+    # scan_drive resolves its working directory at import time, so the
+    # variable must be set before the first import in this process.
+    os.environ["VIDEOCATALOG_HOME"] = home
+    import scan_drive
+
+    gc.collect()
+    tracemalloc.start(8)
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = scan_drive.scan_drive(
+                "BENCH",
+                mount,
+                str(Path(home) / "catalog.db"),
+                shard_db_path=str(Path(home) / "bench.db"),
+                inventory_only=mode == "inventory",
+                resume=False,
+                progress_callback=lambda _payload: None,
+            )
+    except SystemExit as exc:
+        tracemalloc.stop()
+        return {"status": "skipped", "reason": f"scan exited with code {exc.code} (missing tools?)"}
+    seconds = time.perf_counter() - started
+    _current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    root = str(Path(__file__).resolve().parents[1])
+    sites: List[Dict[str, object]] = []
+    for stat in snapshot.statistics("lineno")[: max(0, top)]:
+        frame = stat.traceback[0]
+        filename = frame.filename[len(root) + 1 :] if frame.filename.startswith(root) else frame.filename
+        sites.append({"site": f"{filename}:{frame.lineno}", "kb": round(stat.size / 1024, 1), "blocks": stat.count})
+    return {
+        "status": "ok",
+        "mode": mode,
+        "files": int(result.get("total_files", 0) or 0),
+        "seconds": round(seconds, 3),
+        "traced_peak_mb": round(peak / 1_000_000, 1),
+        "retained_at_end": sites,
+    }
+
+
+def run_scan(files: int, mode: str, top: int, directory: Optional[str]) -> Dict[str, object]:
+    from tests.bench_scan import DriveShape, generate_drive
+
+    base = Path(directory) if directory else Path(tempfile.gettempdir())
+    work = Path(tempfile.mkdtemp(prefix="vc_mem_bench_", dir=str(base)))
+    try:
+        home = work / "home"
+        home.mkdir()
+        tree = generate_drive(work / "drive", DriveShape(files=files))
+        # The records part may already have imported scan_drive here, bound to
+        # the default working directory; scan in a fresh process instead.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            report = pool.submit(_traced_scan, str(home), str(work / "drive"), mode, top).result()
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    if report.get("status") == "ok" and not report.get("files"):
+        report["files"] = tree["files"]
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=0, help="Per-file records to build (0 skips the part).")
+    parser.add_argument("--files", type=int, default=5000, help="Files on the synthetic drive (default: 5000).")
+    parser.add_argument(
+        "--scan", choices=["none", "inventory", "full"], default="inventory", help="Scan to trace (default: inventory)."
+    )
+    parser.add_argument("--top", type=int, default=10, help="Allocation sites to list (default: 10).")
+    parser.add_argument("--dir", dest="directory", help="Directory for the generated drive (default: temp dir).")
+    args = parser.parse_args(argv)
+
+    report: Dict[str, object] = {}
+    if args.records > 0:
+        report["records"] = run_records(args.records)
+    if args.scan != "none":
+        report["scan"] = run_scan(args.files, args.scan, args.top, args.directory)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""Throughput benchmark for inventory MIME classification.
+
+Generates a tree of small files with a realistic extension mix (mostly known
+media and document extensions, some ambiguous or unknown ones) and varied
+content (a format header, random bytes, and some duplicate files) and reports
+files per second for each :class:`inventory.MimeClassifier` mode::
+
+    python -m tests.bench_mime --files 20000
+
+``magic`` only differs from ``extension`` when python-magic is installed;
+the report records whether it was. Pass ``--dir`` on a slow or cold drive to
+see the difference in bytes read as well as CPU.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import inventory
+from inventory import MIME_MODES, MimeClassifier
+
+_EXTENSIONS = ["mkv", "mp4", "jpg", "jpg", "png", "mp3", "flac", "pdf", "srt", "nfo", "ts", "bin", "dat", ""]
+
+
+# Leading bytes per extension; the rest of each file is random.
+_HEADERS = {
+    "mkv": b"\x1a\x45\xdf\xa3",
+    "mp4": b"\x00\x00\x00\x18ftypmp42",
+    "jpg": b"\xff\xd8\xff\xe0",
+    "png": b"\x89PNG\r\n\x1a\n",
+    "mp3": b"ID3\x04\x00",
+    "flac": b"fLaC",
+    "pdf": b"%PDF-1.7\n",
+    "srt": b"1\n00:00:01,000 --> 00:00:02,000\n",
+    "nfo": b"<?xml version=\"1.0\"?>\n<movie>",
+    "ts": b"\x47\x40\x00\x10",
+}
+# Every n-th file is a copy of an earlier one, as backups and split
+# recordings are on real drives.
+_COPY_EVERY = 10
+
+
+def generate_tree(root: Path, files: int) -> List[str]:
+    paths: List[str] = []
+    payloads: Dict[str, bytes] = {}
+    for idx in range(files):
+        folder = root / f"{idx % 97:02d}"
+        folder.mkdir(parents=True, exist_ok=True)
+        ext = _EXTENSIONS[idx % len(_EXTENSIONS)]
+        path = folder / (f"file_{idx:07d}.{ext}" if ext else f"file_{idx:07d}")
+        if idx % _COPY_EVERY == _COPY_EVERY - 1 and ext in payloads:
+            payload = payloads[ext]
+        else:
+            payload = _HEADERS.get(ext, b"") + os.urandom(4096)
+            payloads[ext] = payload
+        path.write_bytes(payload)
+        paths.append(str(path))
+    return paths
+
+
+def _measure(paths: List[str], mode: str) -> dict:
+    classifier = MimeClassifier(mode)  # type: ignore[arg-type]
+    start = time.perf_counter()
+    for path in paths:
+        classifier.detect(path)
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": round(elapsed, 3),
+        "files_per_s": round(len(paths) / elapsed) if elapsed > 0 else None,
+        **classifier.stats,
+    }
+
+
+def run_benchmark(paths: List[str], *, modes: List[str]) -> Dict[str, object]:
+    return {
+        "files": len(paths),
+        "libmagic": inventory.magic is not None,
+        "modes": {mode: _measure(paths, mode) for mode in modes},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20_000, help="Synthetic files (default: 20000).")
+    parser.add_argument("--dir", dest="directory", help="Directory for the generated tree (default: temp dir).")
+    parser.add_argument("--modes", default=",".join(MIME_MODES), help="Comma-separated modes to run.")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated tree.")
+    args = parser.parse_args(argv)
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in MIME_MODES]
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(unknown)}")
+    base = Path(args.directory) if args.directory else Path(tempfile.gettempdir())
+    root = base / f"vc_mime_bench_{args.files}"
+    try:
+        paths = generate_tree(root, args.files)
+        report = run_benchmark(paths, modes=modes)
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
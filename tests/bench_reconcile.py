@@ -0,0 +1,151 @@
+"""Memory benchmark for rescan reconciliation of existing ``files`` rows.
+
+Builds a shard with synthetic rows (5M by default) and reports load time,
+tracemalloc peak, retained size and lookup rate for each mode::
+
+    python -m tests.bench_reconcile --rows 5000000
+
+Modes: ``dict`` (the legacy per-row dict keyed by path) and ``compact``
+(:class:`reconcile.ExistingFileIndex`). The shard is built once and reused
+when ``--keep`` is given.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from reconcile import ExistingFileIndex
+from robust import key_for_path
+
+_LABEL = "BENCH"
+
+
+def _path_for(idx: int) -> str:
+    return f"/mnt/bench/library/{idx % 997:03d}/season {idx % 13:02d}/episode_{idx:08d}.mkv"
+
+
+def generate_shard(path: Path, rows: int) -> None:
+    conn = sqlite3.connect(str(path))
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute(
+        "CREATE TABLE files(id INTEGER PRIMARY KEY, drive_label TEXT NOT NULL, path TEXT NOT NULL, "
+        "size_bytes INTEGER, mtime_utc TEXT, deleted INTEGER DEFAULT 0)"
+    )
+    batch = 50_000
+    for start in range(0, rows, batch):
+        conn.executemany(
+            "INSERT INTO files(id, drive_label, path, size_bytes, mtime_utc, deleted) VALUES(?,?,?,?,?,0)",
+            (
+                (idx + 1, _LABEL, _path_for(idx), 1_000_000 + idx, "2024-03-01T12:00:00Z")
+                for idx in range(start, min(rows, start + batch))
+            ),
+        )
+    conn.execute("CREATE INDEX idx_files_drive ON files(drive_label)")
+    conn.commit()
+    conn.close()
+
+
+def _load_dict(conn: sqlite3.Connection) -> Dict[str, dict]:
+    existing: Dict[str, dict] = {}
+    for file_id, path, size_bytes, mtime_utc, deleted in conn.execute(
+        "SELECT id, path, size_bytes, mtime_utc, deleted FROM files WHERE drive_label=?", (_LABEL,)
+    ):
+        existing[key_for_path(path, casefold=False)] = {
+            "id": file_id,
+            "path": path,
+            "size_bytes": size_bytes,
+            "mtime_utc": mtime_utc,
+            "deleted": int(deleted or 0),
+        }
+    return existing
+
+
+def _load_compact(conn: sqlite3.Connection) -> ExistingFileIndex:
+    return ExistingFileIndex.load(conn, _LABEL, casefold=False)
+
+
+def _measure(
+    conn: sqlite3.Connection,
+    loader: Callable[[sqlite3.Connection], object],
+    rows: int,
+    lookups: int,
+) -> dict:
+    # Time an untraced load first; tracemalloc slows allocation-heavy loaders unevenly.
+    gc.collect()
+    start = time.perf_counter()
+    index = loader(conn)
+    load_s = time.perf_counter() - start
+    step = max(1, rows // max(1, lookups))
+    keys = [key_for_path(_path_for(idx), casefold=False) for idx in range(0, rows, step)]
+    start = time.perf_counter()
+    for key in keys:
+        index.pop(key)  # type: ignore[attr-defined]
+    lookup_s = time.perf_counter() - start
+    del index
+    gc.collect()
+    tracemalloc.start()
+    index = loader(conn)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del index
+    gc.collect()
+    return {
+        "load_seconds": round(load_s, 2),
+        "retained_mb": round(retained / 1_000_000, 1),
+        "peak_mb": round(peak / 1_000_000, 1),
+        "bytes_per_row": round(retained / rows, 1) if rows else None,
+        "lookups_per_s": round(len(keys) / lookup_s) if lookup_s > 0 else None,
+    }
+
+
+def run_benchmark(path: Path, *, rows: int, modes: List[str], lookups: int) -> Dict[str, object]:
+    loaders: Dict[str, Callable[[sqlite3.Connection], object]] = {
+        "dict": _load_dict,
+        "compact": _load_compact,
+    }
+    conn = sqlite3.connect(str(path))
+    try:
+        results = {mode: _measure(conn, loaders[mode], rows, lookups) for mode in modes}
+    finally:
+        conn.close()
+    return {"rows": rows, "modes": results}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000_000, help="Synthetic rows (default: 5000000).")
+    parser.add_argument("--lookups", type=int, default=200_000, help="Timed pop() calls per mode.")
+    parser.add_argument("--dir", dest="directory", help="Directory for the generated shard (default: temp dir).")
+    parser.add_argument("--modes", default="compact,dict", help="Comma-separated modes to run.")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated shard.")
+    args = parser.parse_args(argv)
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    directory = Path(args.directory) if args.directory else Path(tempfile.gettempdir())
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"vc_reconcile_bench_{args.rows}.db"
+    if not path.exists():
+        generate_shard(path, args.rows)
+    try:
+        report = run_benchmark(path, rows=args.rows, modes=modes, lookups=args.lookups)
+    finally:
+        if not args.keep:
+            path.unlink(missing_ok=True)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
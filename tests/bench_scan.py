@@ -0,0 +1,293 @@
+"""End-to-end scan benchmark on a synthetic drive.
+
+Generates a tree with a configurable shape and times four scans of it::
+
+    python -m tests.bench_scan --files 20000 --depth 4 --fanout 6
+    python -m tests.bench_scan --files 20000 --write-baseline bench_scan.json
+    python -m tests.bench_scan --files 20000 --baseline bench_scan.json --threshold 0.15
+
+Phases: ``inventory`` (inventory-only scan into its own shard), ``full``
+(first scan), ``rescan`` (delta rescan, nothing changed) and ``rescan_1pct``
+(delta rescan after 1% of the files were modified, added or deleted). Each
+phase runs in a fresh process so ``peak_rss_mb`` is that phase's own peak.
+``mb_per_s`` is the tree's size divided by the phase's wall time, so
+rescans report effective rather than read throughput.
+
+With ``--baseline`` the run fails (exit code 1) when a phase's files/s drops,
+or its peak RSS grows, by more than ``--threshold`` relative to the
+baseline. Baselines are only comparable on the same shape and machine.
+
+Full scans need ``mediainfo`` and ``ffmpeg`` like any other scan; without
+them those phases are reported as skipped.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+_LABEL = "BENCH"
+_PHASES = ("inventory", "full", "rescan", "rescan_1pct")
+_MEDIA_EXTS = ("mkv", "mp4", "avi", "mp3", "flac", "jpg", "png")
+_OTHER_EXTS = ("txt", "pdf", "nfo", "srt", "zip", "json", "docx")
+_SIZE_RANGES = {
+    "small": (512, 64 * 1024),
+    "mixed": (1024, 8 * 1024 * 1024),
+    "large": (4 * 1024 * 1024, 64 * 1024 * 1024),
+}
+_BLOCK = os.urandom(1024 * 1024)
+
+
+@dataclass(frozen=True)
+class DriveShape:
+    files: int = 5000
+    depth: int = 3
+    fanout: int = 6
+    sizes: str = "small"
+    media_ratio: float = 0.4
+    long_path_ratio: float = 0.02
+    seed: int = 1
+
+
+def _size_for(rng: random.Random, sizes: str) -> int:
+    low, high = _SIZE_RANGES[sizes]
+    # Log-uniform, so small files dominate the count and large ones the bytes.
+    return int(round(low * (high / low) ** rng.random()))
+
+
+def _write(path: Path, size: int, salt: int) -> None:
+    offset = salt % len(_BLOCK)
+    with open(path, "wb") as handle:
+        handle.write(salt.to_bytes(8, "little"))
+        remaining = max(0, size - 8)
+        while remaining > 0:
+            chunk = _BLOCK[offset : offset + remaining] or _BLOCK[:remaining]
+            handle.write(chunk)
+            remaining -= len(chunk)
+            offset = 0
+
+
+def _directories(root: Path, shape: DriveShape, rng: random.Random) -> List[Path]:
+    level = [root]
+    directories = [root]
+    for depth in range(max(0, shape.depth)):
+        level = [parent / f"d{depth}_{idx:02d}" for parent in level for idx in range(max(1, shape.fanout))]
+        directories.extend(level)
+    for idx in range(max(1, int(len(directories) * shape.long_path_ratio))):
+        nested = rng.choice(directories)
+        for part in range(3):
+            nested = nested / (f"long_directory_name_{idx:03d}_{part}_" + "x" * 48)
+        directories.append(nested)
+    return directories
+
+
+def generate_drive(root: Path, shape: DriveShape) -> Dict[str, int]:
+    """Create the synthetic tree under ``root`` and return its totals."""
+
+    rng = random.Random(shape.seed)
+    directories = _directories(root, shape, rng)
+    for directory in directories:
+        directory.mkdir(parents=True, exist_ok=True)
+    total_bytes = 0
+    for idx in range(shape.files):
+        directory = directories[rng.randrange(len(directories))]
+        is_media = rng.random() < shape.media_ratio
+        ext = rng.choice(_MEDIA_EXTS if is_media else _OTHER_EXTS)
+        size = _size_for(rng, shape.sizes)
+        _write(directory / f"file_{idx:07d}.{ext}", size, idx)
+        total_bytes += size
+    return {"files": shape.files, "bytes": total_bytes, "directories": len(directories)}
+
+
+def mutate_drive(root: Path, fraction: float, seed: int) -> Dict[str, int]:
+    """Modify, delete and add files for ``fraction`` of the tree (60/20/20)."""
+
+    rng = random.Random(seed + 1)
+    files = sorted(path for path in root.rglob("*") if path.is_file())
+    picked = rng.sample(files, max(1, int(len(files) * fraction))) if files else []
+    counts = {"modified": 0, "deleted": 0, "added": 0}
+    future = time.time() + 5
+    for idx, path in enumerate(picked):
+        roll = idx % 5
+        if roll < 3:
+            with open(path, "ab") as handle:
+                handle.write(b"changed")
+            os.utime(path, (future, future))
+            counts["modified"] += 1
+        elif roll == 3:
+            path.unlink()
+            counts["deleted"] += 1
+        else:
+            _write(path.with_name(f"added_{idx:06d}{path.suffix}"), 4096, 10_000_000 + idx)
+            counts["added"] += 1
+    return counts
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    divisor = 1_000_000 if sys.platform == "darwin" else 1_000
+    return round(peak / divisor, 1)
+
+
+def _run_phase(home: str, mount: str, phase: str, tree_bytes: int) -> Dict[str, object]:
+    """Run one phase; executed in a fresh process."""
+
+    os.environ["VIDEOCATALOG_HOME"] = home
+    import scan_drive
+
+    label = f"{_LABEL}_INV" if phase == "inventory" else _LABEL
+    shard = Path(home) / f"{label.lower()}.db"
+    started = time.perf_counter()
+    try:
+        # The scan prints a few status lines itself; keep stdout for the report.
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = scan_drive.scan_drive(
+                label,
+                mount,
+                str(Path(home) / "catalog.db"),
+                shard_db_path=str(shard),
+                inventory_only=phase == "inventory",
+                resume=False,
+                progress_callback=lambda _payload: None,
+            )
+    except SystemExit as exc:
+        return {"status": "skipped", "reason": f"scan exited with code {exc.code} (missing tools?)"}
+    seconds = time.perf_counter() - started
+    files = int(result.get("total_files", 0) or 0)
+    report: Dict[str, object] = {
+        "status": "ok",
+        "seconds": round(seconds, 3),
+        "files": files,
+        "files_per_s": round(files / seconds, 1) if seconds > 0 else None,
+        "mb_per_s": round(tree_bytes / 1_000_000 / seconds, 1) if seconds > 0 else None,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    if phase != "inventory":
+        report["unchanged"] = result.get("unchanged")
+        report["deleted"] = result.get("deleted")
+    return report
+
+
+def run_benchmark(root: Path, home: Path, shape: DriveShape, phases: List[str]) -> Dict[str, object]:
+    totals = generate_drive(root, shape)
+    results: Dict[str, Dict[str, object]] = {}
+    context = multiprocessing.get_context("spawn")
+    for phase in _PHASES:
+        if phase == "rescan_1pct":
+            totals["mutated"] = mutate_drive(root, 0.01, shape.seed)  # type: ignore[assignment]
+        # Rescans need the first scan's rows even when its timing is not wanted.
+        needed = phase in phases or (phase == "full" and bool({"rescan", "rescan_1pct"} & set(phases)))
+        if not needed:
+            continue
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            outcome = pool.submit(_run_phase, str(home), str(root), phase, totals["bytes"]).result()
+        if phase in phases:
+            results[phase] = outcome
+    return {
+        "shape": asdict(shape),
+        "tree": totals,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "phases": results,
+    }
+
+
+def compare(report: Dict[str, object], baseline: Dict[str, object], threshold: float) -> List[str]:
+    """Return one message per phase metric that regressed beyond ``threshold``."""
+
+    regressions: List[str] = []
+    current_phases = report.get("phases") or {}
+    for phase, base in (baseline.get("phases") or {}).items():
+        current = current_phases.get(phase)  # type: ignore[union-attr]
+        if not isinstance(current, dict) or current.get("status") != "ok" or base.get("status") != "ok":
+            continue
+        base_rate, rate = base.get("files_per_s"), current.get("files_per_s")
+        if base_rate and rate is not None and rate < base_rate * (1 - threshold):
+            regressions.append(f"{phase}: files/s {rate} < baseline {base_rate} (-{1 - rate / base_rate:.0%})")
+        base_rss, rss = base.get("peak_rss_mb"), current.get("peak_rss_mb")
+        if base_rss and rss is not None and rss > base_rss * (1 + threshold):
+            regressions.append(f"{phase}: peak RSS {rss} MB > baseline {base_rss} MB (+{rss / base_rss - 1:.0%})")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=DriveShape.files, help="Files to generate (default: 5000).")
+    parser.add_argument("--depth", type=int, default=DriveShape.depth, help="Directory depth (default: 3).")
+    parser.add_argument("--fanout", type=int, default=DriveShape.fanout, help="Subdirectories per level (default: 6).")
+    parser.add_argument("--sizes", choices=sorted(_SIZE_RANGES), default=DriveShape.sizes, help="File size distribution.")
+    parser.add_argument("--media-ratio", type=float, default=DriveShape.media_ratio, help="Share of media files (0-1).")
+    parser.add_argument(
+        "--long-path-ratio", type=float, default=DriveShape.long_path_ratio, help="Share of extra deeply nested directories."
+    )
+    parser.add_argument("--seed", type=int, default=DriveShape.seed, help="Random seed for the tree layout.")
+    parser.add_argument("--phases", default=",".join(_PHASES), help="Comma-separated phases to run.")
+    parser.add_argument("--dir", dest="directory", help="Directory for the generated drive (default: temp dir).")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against.")
+    parser.add_argument("--write-baseline", help="Write this run's report to the given path.")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed relative regression (default: 0.15).")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated drive and working directory.")
+    args = parser.parse_args(argv)
+
+    phases = [phase.strip() for phase in args.phases.split(",") if phase.strip()]
+    unknown = [phase for phase in phases if phase not in _PHASES]
+    if unknown:
+        parser.error(f"unknown phases: {', '.join(unknown)}")
+    shape = DriveShape(
+        files=args.files,
+        depth=args.depth,
+        fanout=args.fanout,
+        sizes=args.sizes,
+        media_ratio=args.media_ratio,
+        long_path_ratio=args.long_path_ratio,
+        seed=args.seed,
+    )
+    base = Path(args.directory) if args.directory else Path(tempfile.gettempdir())
+    work = Path(tempfile.mkdtemp(prefix="vc_scan_bench_", dir=str(base)))
+    try:
+        (work / "home").mkdir()
+        report = run_benchmark(work / "drive", work / "home", shape, phases)
+    finally:
+        if not args.keep:
+            shutil.rmtree(work, ignore_errors=True)
+
+    status = 0
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        if baseline.get("shape") != report["shape"]:
+            print(f"Baseline shape {baseline.get('shape')} differs from this run's; not comparing.", file=sys.stderr)
+            status = 2
+        else:
+            report["regressions"] = compare(report, baseline, args.threshold)
+            status = 1 if report["regressions"] else 0
+    if args.write_baseline:
+        Path(args.write_baseline).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(json.dumps(report, indent=2))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,124 @@
+import importlib
 import os
+import random
+import sqlite3
 import sys
+from pathlib import Path
 
+import pytest
+
+# pytest puts tests/ first on sys.path again for every test module, where
+# tests/api.py would shadow the api package. Binding the package here, with
+# the repository root in front, settles ``import api`` for the whole session.
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
-if ROOT not in sys.path:
-    sys.path.insert(0, ROOT)
+if ROOT in sys.path:
+    sys.path.remove(ROOT)
+sys.path.insert(0, ROOT)
+
+import api  # noqa: E402,F401
+from core.paths import get_shards_dir  # noqa: E402
+from quality.store import ensure_tables as ensure_quality_tables  # noqa: E402
+from structure.service import ensure_structure_tables  # noqa: E402
+from structure.tv_review import ensure_tv_tables  # noqa: E402
+
+CATALOG_STAMP = "2024-01-01T00:00:00Z"
+
+
+@pytest.fixture(scope="session")
+def scan_module(tmp_path_factory):
+    """``scan_drive`` imported against a throwaway working directory.
+
+    Importing the module prepares its working directory, so
+    ``VIDEOCATALOG_HOME`` points at a temp dir first. mediainfo and FFmpeg are
+    reported present; tests only scan files that are neither audio nor video,
+    so neither tool runs.
+    """
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("VIDEOCATALOG_HOME", str(tmp_path_factory.mktemp("home")))
+        module = importlib.import_module("scan_drive")
+        patch.setattr(
+            module,
+            "_refresh_tool_status",
+            lambda: {tool: {"present": True} for tool in module.REQUIRED_TOOLS},
+        )
+        yield module
+
+
+def _build_catalog_shard(path: Path, seed: int, movies: int = 60, series: int = 12) -> None:
+    """Write a shard with random movie folders, quality rows, thumbnails and series."""
+
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    ensure_structure_tables(conn)
+    ensure_quality_tables(conn)
+    ensure_tv_tables(conn)
+    conn.execute("CREATE TABLE video_thumbs(item_type TEXT, item_key TEXT, updated_utc TEXT)")
+    conn.execute("CREATE TABLE contact_sheets(item_type TEXT, item_key TEXT, updated_utc TEXT)")
+    langs = ["en", "fr", "de", "EN", "es"]
+    for idx in range(movies):
+        folder = f"/Movies/{rng.choice(['Alien', 'alien', 'Brazil', 'Heat', 'Ran'])} {idx}"
+        video = f"{folder}/movie.mkv"
+        title = None if idx % 9 == 0 else folder.rsplit("/", 1)[1]
+        year = rng.choice([None, 0, 1979, 1985, 1995, 2001])
+        conn.execute(
+            """
+            INSERT INTO folder_profile(folder_path, kind, main_video_path, parsed_title, parsed_year,
+                                       confidence, updated_utc)
+            VALUES(?,?,?,?,?,?,?)
+            """,
+            (folder, rng.choice([None, "movie", "MOVIE"]), video, title, year, rng.choice([0.3, 0.5, 0.8, 0.95]), CATALOG_STAMP),
+        )
+        if idx % 3:
+            conn.execute(
+                "INSERT INTO video_quality(path, score, audio_langs, subs_langs, updated_utc) VALUES(?,?,?,?,?)",
+                (
+                    video,
+                    rng.choice([None, 0, 40, 70, 90]),
+                    ",".join(rng.sample(langs, 2)),
+                    ";".join(rng.sample(langs, rng.randint(0, 2))),
+                    CATALOG_STAMP,
+                ),
+            )
+        if idx % 4 == 0:
+            conn.execute("INSERT INTO video_thumbs VALUES('folder', ?, ?)", (folder, CATALOG_STAMP))
+        if idx % 5 == 0:
+            conn.execute("INSERT INTO contact_sheets VALUES('movie', ?, ?)", (folder, CATALOG_STAMP))
+    conn.execute(
+        "INSERT INTO folder_profile(folder_path, kind, parsed_title, confidence, updated_utc) VALUES(?,?,?,?,?)",
+        ("/Shows/Not a movie", "tv", "Skip me", 0.9, CATALOG_STAMP),
+    )
+    for idx in range(series):
+        root = f"/Shows/{rng.choice(['Lost', 'Dark', 'Fargo'])} {idx}"
+        conn.execute(
+            """
+            INSERT INTO tv_series_profile(series_root, show_title, show_year, seasons_found, confidence, updated_utc)
+            VALUES(?,?,?,?,?,?)
+            """,
+            (root, None if idx % 5 == 0 else root.rsplit("/", 1)[1], 2010, rng.randint(0, 6), rng.random(), CATALOG_STAMP),
+        )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture()
+def catalog_shards(tmp_path: Path):
+    """Build catalog shards under ``tmp_path``; returns the working dir.
+
+    ``catalog_shards(labels, seed=0, movies=60)`` writes one random shard per
+    label, seeded ``seed``, ``seed + 1``, ...
+    """
+
+    def build(labels=("DRIVE_A", "DRIVE_B", "DRIVE_C"), *, seed: int = 0, movies: int = 60) -> Path:
+        shards = get_shards_dir(tmp_path)
+        shards.mkdir(parents=True, exist_ok=True)
+        for offset, label in enumerate(labels):
+            _build_catalog_shard(shards / f"{label}.db", seed + offset, movies=movies)
+        return tmp_path
+
+    return build
+
+
+@pytest.fixture()
+def working_dir(catalog_shards) -> Path:
+    return catalog_shards()
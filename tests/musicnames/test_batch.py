@@ -0,0 +1,95 @@
+import sqlite3
+
+from musicnames.batch import MusicParsePool, analyse_batch, analyse_path, candidates_from, split_parents
+from musicnames.parse import parse_music_name
+from musicnames.score import score_parse_result
+
+
+def test_split_parents_handles_both_separators():
+    assert split_parents("D:\\Music\\Artist/Album\\01 - Song.mp3") == ["D:", "Music", "Artist", "Album"]
+    assert split_parents("song.mp3") == []
+    assert split_parents("") == []
+
+
+def test_analyse_path_matches_the_pipeline():
+    path = "/music/Artist/Best Album/01 - Artist - Song Title.mp3"
+    analysis = analyse_path(path, 0.65)
+    result = parse_music_name(path, parents=split_parents(path))
+    score, reasons = score_parse_result(result, parents=split_parents(path))
+
+    assert (analysis.artist, analysis.title, analysis.album) == (result.artist, result.title, result.album)
+    assert analysis.score == score
+    assert analysis.score_reasons == reasons
+    assert analysis.needs_review is False
+
+
+def test_low_confidence_names_need_review():
+    analysis = analyse_path("/music/Track.mp3", 0.8)
+    assert analysis.needs_review is True
+    assert analysis.suggestions
+
+
+def test_pool_keeps_batch_order_in_and_out_of_process():
+    batches = [[f"/m/Artist {idx} - Song {idx}.mp3"] for idx in range(6)]
+    expected = [analyse_batch(batch, 0.65) for batch in batches]
+
+    with MusicParsePool(workers=4, total=6) as pool:
+        assert not pool.parallel
+        assert list(pool.map(iter(batches), 0.65)) == expected
+    with MusicParsePool(workers=2, total=6, min_parallel=1) as pool:
+        assert pool.parallel
+        assert list(pool.map(iter(batches), 0.65)) == expected
+
+
+def _music_db():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(
+        """
+        CREATE TABLE inventory(path TEXT, drive_label TEXT, category TEXT, ext TEXT, mtime_utc TEXT);
+        CREATE TABLE music_minimal(path TEXT, drive_label TEXT, parsed_utc TEXT);
+        CREATE TABLE music_review_queue(path TEXT, drive_label TEXT, queued_utc TEXT);
+        """
+    )
+    return conn
+
+
+def test_incremental_selection_picks_new_and_modified_files():
+    conn = _music_db()
+    inventory = [
+        ("new.mp3", "2024-01-02T00:00:00Z"),
+        ("minimal_clean.mp3", "2024-01-01T00:00:00Z"),
+        ("minimal_dirty.mp3", "2024-01-03T00:00:00Z"),
+        ("queue_clean.mp3", "2024-01-01T00:00:00Z"),
+        ("queue_dirty.mp3", "2024-01-03T00:00:00Z"),
+    ]
+    conn.executemany(
+        "INSERT INTO inventory VALUES(?, 'D', 'audio', 'mp3', ?)",
+        inventory,
+    )
+    conn.executemany(
+        "INSERT INTO inventory VALUES(?, ?, ?, ?, '2024-01-03T00:00:00Z')",
+        [("other_drive.mp3", "E", "audio", "mp3"), ("clip.wav", "D", "audio", "wav"), ("notes.mp3", "D", "text", "mp3")],
+    )
+    conn.executemany(
+        "INSERT INTO music_minimal VALUES(?, 'D', '2024-01-02T00:00:00Z')",
+        [("minimal_clean.mp3",), ("minimal_dirty.mp3",)],
+    )
+    conn.executemany(
+        "INSERT INTO music_review_queue VALUES(?, 'D', '2024-01-02T00:00:00Z')",
+        [("queue_clean.mp3",), ("queue_dirty.mp3",)],
+    )
+
+    def selected(incremental):
+        rows = conn.execute(
+            f"SELECT i.path {candidates_from(1, incremental=incremental)} ORDER BY i.path",
+            ("D", "mp3"),
+        )
+        return [row[0] for row in rows]
+
+    assert selected(True) == ["minimal_dirty.mp3", "new.mp3", "queue_dirty.mp3"]
+    assert selected(False) == sorted(path for path, _ in inventory)
+
+    # Touching a stored row past the file's mtime makes it clean again.
+    conn.execute("UPDATE music_minimal SET parsed_utc='2024-01-04T00:00:00Z' WHERE path='minimal_dirty.mp3'")
+    conn.execute("UPDATE music_review_queue SET queued_utc='2024-01-04T00:00:00Z' WHERE path='queue_dirty.mp3'")
+    assert selected(True) == ["new.mp3"]
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+from api.db import DataAccess
+from api.pool import ConnectionPool, PoolConfig
+from core.paths import get_shards_dir
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _make_db(path: Path, *tables: str) -> Path:
+    conn = sqlite3.connect(path)
+    for table in tables:
+        conn.execute(f"CREATE TABLE {table}(id INTEGER)")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _open(path: Path, statement_cache: int) -> sqlite3.Connection:
+    return sqlite3.connect(path, cached_statements=statement_cache, check_same_thread=False)
+
+
+def test_pool_reuses_connections_and_bounds_idle(tmp_path: Path) -> None:
+    db = _make_db(tmp_path / "a.db", "files")
+    pool = ConnectionPool(_open, PoolConfig(max_per_path=2))
+
+    first = pool.acquire(db)
+    pool.release(first)
+    assert pool.acquire(db) is first
+
+    extra = [pool.acquire(db) for _ in range(2)]
+    for conn in (first, *extra):
+        pool.release(conn)
+
+    stats = pool.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 3
+    assert stats["idle"] == 2
+    assert stats["evicted_capacity"] == 1
+    pool.close()
+    assert pool.stats()["idle"] == 0
+
+
+def test_pool_evicts_idle_and_replaced_files(tmp_path: Path) -> None:
+    clock = FakeClock()
+    db = _make_db(tmp_path / "a.db", "files")
+    pool = ConnectionPool(_open, PoolConfig(idle_seconds=60), clock=clock)
+
+    conn = pool.acquire(db)
+    pool.release(conn)
+    clock.now = 120.0
+    assert pool.acquire(db) is not conn
+    assert pool.stats()["evicted_idle"] == 1
+
+    conn = pool.acquire(db)
+    pool.release(conn)
+    db.unlink()
+    _make_db(tmp_path / "other.db", "files").rename(db)
+    assert pool.acquire(db) is not conn
+    assert pool.stats()["discarded_stale"] >= 1
+
+
+def test_table_names_follow_schema_changes(tmp_path: Path) -> None:
+    db = _make_db(tmp_path / "a.db", "files")
+    pool = ConnectionPool(_open)
+    conn = pool.acquire(db)
+
+    assert pool.table_names(conn) == {"files"}
+    assert pool.table_names(conn) == {"files"}
+    assert pool.stats()["schema_hits"] == 1
+
+    _make_db(db, "folder_profile")
+    assert pool.table_names(conn) == {"files", "folder_profile"}
+    pool.release(conn)
+
+
+def test_data_access_pools_shard_connections(tmp_path: Path) -> None:
+    shards = get_shards_dir(tmp_path)
+    shards.mkdir(parents=True, exist_ok=True)
+    for label in ("DRIVE_A", "DRIVE_B"):
+        _make_db(shards / f"{label}.db", "tv_series_profile")
+    data = DataAccess(working_dir=tmp_path, settings={})
+
+    first = data.catalog_summary()
+    second = data.catalog_summary()
+
+    assert first == second
+    stats = data.pool_stats()
+    assert stats["hits"] >= 2
+    assert stats["in_use"] == 0
+    data.close()
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from api.db import DataAccess
+from core.paths import get_shards_dir
+
+LATER = "2024-01-02T00:00:00Z"
+
+
+MOVIE_CASES = [
+    {},
+    {"sort": "year", "order": "desc"},
+    {"sort": "confidence"},
+    {"sort": "quality", "order": "desc"},
+    {"query": "ALIEN"},
+    {"year_min": 1980, "year_max": 2000},
+    {"confidence_min": 0.6, "quality_min": 50},
+    {"only_low_confidence": True, "drive": "DRIVE_B"},
+    {"audio_langs": ["en"], "subs_langs": ["FR"]},
+    {"limit": 7, "offset": 14},
+]
+
+SERIES_CASES = [
+    {},
+    {"sort": "seasons", "order": "desc"},
+    {"sort": "confidence", "query": "dark"},
+    {"only_low_confidence": True},
+    {"confidence_min": 0.5, "drive": "DRIVE_A", "limit": 3},
+]
+
+
+def _sorted_ids(rows):
+    return sorted(row["id"] for row in rows)
+
+
+@pytest.mark.parametrize("kwargs", MOVIE_CASES)
+def test_movies_page_matches_shard_scan(working_dir: Path, kwargs) -> None:
+    indexed = DataAccess(working_dir=working_dir, settings={})
+    scanned = DataAccess(working_dir=working_dir, settings={"api": {"catalog_index": False}})
+    query = {"limit": 500, **kwargs}
+
+    rows, _, next_offset, total = indexed.catalog_movies_page(**query)
+    expected, _, expected_next, expected_total = scanned.catalog_movies_page(**query)
+
+    assert (total, next_offset) == (expected_total, expected_next)
+    if "limit" in kwargs:
+        assert len(rows) == len(expected)
+    else:
+        assert _sorted_ids(rows) == _sorted_ids(expected)
+        assert {row["id"]: row for row in rows} == {row["id"]: row for row in expected}
+        key = {"year": "year", "confidence": "confidence", "quality": "quality"}.get(kwargs.get("sort", ""))
+        if key:
+            assert [row[key] or 0 for row in rows] == [row[key] or 0 for row in expected]
+
+
+@pytest.mark.parametrize("kwargs", SERIES_CASES)
+def test_series_page_matches_shard_scan(working_dir: Path, kwargs) -> None:
+    indexed = DataAccess(working_dir=working_dir, settings={})
+    scanned = DataAccess(working_dir=working_dir, settings={"api": {"catalog_index": False}})
+    query = {"limit": 500, **kwargs}
+
+    rows, _, next_offset, total = indexed.catalog_tv_series_page(**query)
+    expected, _, expected_next, expected_total = scanned.catalog_tv_series_page(**query)
+
+    assert (total, next_offset) == (expected_total, expected_next)
+    if "limit" not in kwargs:
+        assert {row["id"]: row for row in rows} == {row["id"]: row for row in expected}
+
+
+def _add_zardoz(working_dir: Path) -> None:
+    conn = sqlite3.connect(get_shards_dir(working_dir) / "DRIVE_A.db")
+    conn.execute(
+        "INSERT INTO folder_profile(folder_path, kind, parsed_title, confidence, updated_utc) VALUES(?,?,?,?,?)",
+        ("/Movies/Zardoz", "movie", "Zardoz", 0.9, LATER),
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_index_follows_shard_changes(working_dir: Path) -> None:
+    settings = {"api": {"catalog_index_refresh_s": 0}}
+    data = DataAccess(working_dir=working_dir, settings=settings)
+    _, _, _, before = data.catalog_movies_page()
+    assert data.catalog_index_stats()["shards_synced"] == 3
+
+    data.catalog_movies_page()
+    assert data.catalog_index_stats()["shards_synced"] == 3
+
+    _add_zardoz(working_dir)
+    # The changed shard is re-read in the background; the page does not wait.
+    data.catalog_movies_page()
+    assert data._catalog_index.wait(5)
+    rows, _, _, _ = data.catalog_movies_page(query="zardoz")
+    assert [row["title"] for row in rows] == ["Zardoz"]
+    assert data.catalog_index_stats()["background_syncs"] == 1
+
+    (get_shards_dir(working_dir) / "DRIVE_C.db").unlink()
+    data.catalog_movies_page()
+    stats = data.catalog_index_stats()
+    assert stats["shards_synced"] == 4
+    assert stats["shards_removed"] == 1
+    _, _, _, total = data.catalog_movies_page()
+    assert total < before
+
+    restarted = DataAccess(working_dir=working_dir, settings=settings)
+    assert restarted.catalog_movies_page()[3] == total
+    assert restarted.catalog_index_stats()["shards_synced"] == 0
+
+
+def test_changed_shards_resync_at_most_once_per_interval(working_dir: Path) -> None:
+    data = DataAccess(working_dir=working_dir, settings={"api": {"catalog_index_refresh_s": 3600}})
+    data.catalog_movies_page()
+    _add_zardoz(working_dir)
+
+    rows, _, _, _ = data.catalog_movies_page(query="zardoz")
+    assert data._catalog_index.wait(5)
+
+    assert rows == []
+    assert data.catalog_movies_page(query="zardoz")[0] == []
+    assert data.catalog_index_stats()["shards_synced"] == 3
+    assert data.catalog_index_stats()["background_syncs"] == 0
+
+
+def test_writes_outside_the_source_tables_reread_nothing(working_dir: Path) -> None:
+    data = DataAccess(working_dir=working_dir, settings={"api": {"catalog_index_refresh_s": 0}})
+    data.catalog_movies_page()
+    stats = data.catalog_index_stats()
+
+    conn = sqlite3.connect(get_shards_dir(working_dir) / "DRIVE_A.db")
+    conn.execute("CREATE TABLE inventory(path TEXT, size_bytes INTEGER)")
+    conn.executemany("INSERT INTO inventory VALUES(?, ?)", [(f"/f{idx}", idx) for idx in range(50)])
+    conn.commit()
+    conn.close()
+    data.catalog_movies_page()
+    assert data._catalog_index.wait(5)
+
+    after = data.catalog_index_stats()
+    assert after["shards_unchanged"] == stats["shards_unchanged"] + 1
+    assert after["shards_synced"] == stats["shards_synced"]
+    assert after["rows_upserted"] == stats["rows_upserted"]
+
+
+def test_changed_source_rows_are_upserted_alone(working_dir: Path) -> None:
+    settings = {"api": {"catalog_index_refresh_s": 0}}
+    data = DataAccess(working_dir=working_dir, settings=settings)
+    data.catalog_movies_page()
+    data.catalog_tv_series_page()
+    upserted = data.catalog_index_stats()["rows_upserted"]
+
+    conn = sqlite3.connect(get_shards_dir(working_dir) / "DRIVE_A.db")
+    folders = [row[0] for row in conn.execute("SELECT folder_path FROM folder_profile WHERE kind IS NOT 'tv' LIMIT 3")]
+    conn.execute(
+        "UPDATE folder_profile SET parsed_title = 'Renamed', updated_utc = ? WHERE folder_path = ?",
+        (LATER, folders[0]),
+    )
+    conn.execute("DELETE FROM folder_profile WHERE folder_path = ?", (folders[1],))
+    conn.execute("INSERT INTO contact_sheets VALUES('movie', ?, ?)", (folders[2], LATER))
+    conn.execute("UPDATE tv_series_profile SET seasons_found = 42, updated_utc = ? WHERE rowid = 1", (LATER,))
+    conn.commit()
+    conn.close()
+    data.catalog_movies_page()
+    assert data._catalog_index.wait(5)
+
+    # The renamed movie, the movie with a new sheet and the changed series.
+    assert data.catalog_index_stats()["rows_upserted"] == upserted + 3
+    scanned = DataAccess(working_dir=working_dir, settings={"api": {"catalog_index": False}})
+    for page in ("catalog_movies_page", "catalog_tv_series_page"):
+        rows = getattr(data, page)(limit=500)[0]
+        expected = getattr(scanned, page)(limit=500)[0]
+        assert {row["id"]: row for row in rows} == {row["id"]: row for row in expected}
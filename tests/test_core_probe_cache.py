@@ -0,0 +1,67 @@
+"""Tests for the shard-backed media probe cache."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+
+from core.probe_cache import FFPROBE, MEDIAINFO, ProbeCache
+from quality.ffprobe import run_ffprobe
+
+
+def _ffprobe_payload(duration: str) -> dict:
+    return {
+        "format": {"format_name": "matroska,webm", "duration": duration, "bit_rate": "8000000"},
+        "streams": [
+            {"codec_type": "video", "codec_name": "hevc", "width": 3840, "height": 2160},
+            {"codec_type": "audio", "codec_name": "eac3", "channels": 6, "tags": {"language": "eng"}},
+        ],
+    }
+
+
+def test_entries_are_invalidated_by_size_or_mtime(tmp_path: Path) -> None:
+    video = tmp_path / "movie.mkv"
+    video.write_bytes(b"x" * 128)
+    cache = ProbeCache(sqlite3.connect(":memory:"), "DRIVE")
+
+    assert cache.get(MEDIAINFO, str(video)) is None
+    cache.put(MEDIAINFO, str(video), {"media": {"track": [{"@type": "General", "Duration": "42.5"}]}})
+    assert cache.get(MEDIAINFO, str(video)) is not None
+    assert cache.duration(video) == 42.5
+
+    stat = video.stat()
+    os.utime(video, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.get(MEDIAINFO, str(video)) is None
+    assert cache.duration(video) is None
+    assert cache.stats() == {"hits": 2, "misses": 3, "writes": 1, "errors": 0}
+
+
+def test_run_ffprobe_reads_cached_output(tmp_path: Path, monkeypatch) -> None:
+    video = tmp_path / "movie.mkv"
+    video.write_bytes(b"x" * 64)
+    cache = ProbeCache(sqlite3.connect(":memory:"), "DRIVE")
+    cache.put(FFPROBE, "/catalog/movie.mkv", _ffprobe_payload("5400.0"), fs_path=video)
+    monkeypatch.setattr("quality.ffprobe.shutil.which", lambda _name: None)
+
+    result = run_ffprobe(str(video), timeout=5, cache=cache, cache_key="/catalog/movie.mkv")
+
+    assert result.ok and result.data is not None
+    assert result.data.duration_s == 5400.0
+    assert result.data.video is not None and result.data.video.codec == "hevc"
+    assert len(result.data.audio_streams) == 1
+
+
+def test_database_errors_degrade_to_misses(tmp_path: Path, caplog) -> None:
+    video = tmp_path / "movie.mkv"
+    video.write_bytes(b"x" * 32)
+    conn = sqlite3.connect(":memory:")
+    cache = ProbeCache(conn, "DRIVE")
+    conn.execute("DROP TABLE media_probe_cache")
+
+    assert cache.get(FFPROBE, str(video)) is None
+    cache.put(FFPROBE, str(video), _ffprobe_payload("10.0"))
+    assert cache.duration(video) is None
+
+    assert cache.stats() == {"hits": 0, "misses": 2, "writes": 0, "errors": 4}
+    assert len([r for r in caplog.records if r.name == "videocatalog.probe_cache"]) == 1
@@ -0,0 +1,55 @@
+"""Tests for the directory records behind fast delta rescans."""
+
+from __future__ import annotations
+
+import sqlite3
+from types import SimpleNamespace
+
+from dirstate import MTIME_GRANULARITY_NS, DirectoryState, child_digest
+
+_CHECKED_NS = 10 * MTIME_GRANULARITY_NS
+
+
+def _stat(mtime_ns: int) -> SimpleNamespace:
+    return SimpleNamespace(st_mtime_ns=mtime_ns)
+
+
+def _record(state: DirectoryState, path: str, mtime_ns: int) -> None:
+    state.record(
+        path,
+        mtime_ns=mtime_ns,
+        entries=[("a.mkv", "file", 10, 5), ("s01", "dir", 0, 0)],
+        subdirs=["s01"],
+        file_count=1,
+        file_bytes=10,
+        av_count=1,
+        categories={"video": 1},
+    )
+
+
+def test_child_digest_ignores_listing_order() -> None:
+    entries = [("b", "file", 2, 1), ("a", "dir", 0, 0)]
+    assert child_digest(entries) == child_digest(list(reversed(entries)))
+    assert child_digest(entries) != child_digest([("b", "file", 3, 1), ("a", "dir", 0, 0)])
+
+
+def test_saved_records_match_only_unchanged_settled_directories() -> None:
+    conn = sqlite3.connect(":memory:")
+    state = DirectoryState.load(conn, "D", checked_ns=_CHECKED_NS)
+    _record(state, "/m/show", mtime_ns=MTIME_GRANULARITY_NS)
+    _record(state, "/m/racy", mtime_ns=_CHECKED_NS - 1)
+    assert state.save(conn) == 2
+
+    reloaded = DirectoryState.load(conn, "D", checked_ns=2 * _CHECKED_NS)
+    record = reloaded.match("/m/show", _stat(MTIME_GRANULARITY_NS))
+    assert record is not None
+    assert record.subdirs == ("s01",) and record.categories == {"video": 1}
+    assert record.entry_count == 2 and record.file_count == 1
+    assert reloaded.match("/m/show", _stat(MTIME_GRANULARITY_NS + 1)) is None
+    assert reloaded.match("/m/racy", _stat(_CHECKED_NS - 1)) is None
+    assert reloaded.match("/m/new", _stat(MTIME_GRANULARITY_NS)) is None
+
+    reloaded.keep("/m/show", record)
+    reloaded.save(conn)
+    assert conn.execute("SELECT path FROM directories WHERE drive_label='D'").fetchall() == [("/m/show",)]
+    assert reloaded.summary()["files_skipped"] == 1
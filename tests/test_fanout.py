@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from api.db import DataAccess
+from api.fanout import FanoutConfig, ShardFanout, merge_top_k
+from core.paths import get_shards_dir
+
+_LABELS = ("DRIVE_A", "DRIVE_B", "DRIVE_C", "DRIVE_D")
+
+
+def _open(path: Path) -> sqlite3.Connection:
+    return sqlite3.connect(path, check_same_thread=False)
+
+
+def _close(conn: sqlite3.Connection) -> None:
+    conn.close()
+
+
+def _empty_shards(tmp_path: Path, count: int):
+    shards = []
+    for idx in range(count):
+        path = tmp_path / f"s{idx}.db"
+        sqlite3.connect(path).close()
+        shards.append((f"S{idx}", path))
+    return shards
+
+
+@pytest.fixture()
+def working_dir(catalog_shards) -> Path:
+    return catalog_shards(_LABELS, seed=10, movies=40)
+
+
+def test_merge_top_k_matches_stable_sort() -> None:
+    rng = random.Random(1)
+    streams = [
+        sorted(((rng.randint(0, 5), name, idx) for idx in range(rng.randint(0, 9))), key=lambda t: t[0], reverse=True)
+        for name in "abcd"
+    ]
+    expected = sorted((item for stream in streams for item in stream), key=lambda t: t[0], reverse=True)
+
+    for k in (0, 3, 10, 100):
+        assert merge_top_k(streams, k, key=lambda t: t[0], reverse=True) == expected[:k]
+
+
+def test_shards_run_concurrently(tmp_path: Path) -> None:
+    fanout = ShardFanout(FanoutConfig(max_workers=4))
+
+    def task(label: str, conn: sqlite3.Connection) -> str:
+        time.sleep(0.2)
+        return label
+
+    started = time.perf_counter()
+    result = fanout.run(_empty_shards(tmp_path, 4), task, acquire=_open, release=_close)
+    elapsed = time.perf_counter() - started
+    fanout.close()
+
+    assert [value for _, value in result.results] == ["S0", "S1", "S2", "S3"]
+    assert not result.partial
+    assert elapsed < 0.6
+
+
+def test_budget_interrupts_slow_shard(tmp_path: Path) -> None:
+    fanout = ShardFanout(FanoutConfig(max_workers=4, shard_budget_s=0.3))
+    interrupted = threading.Event()
+
+    def task(label: str, conn: sqlite3.Connection) -> int:
+        if label == "S1":
+            try:
+                conn.execute(
+                    "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) SELECT COUNT(*) FROM n"
+                ).fetchone()
+            except sqlite3.OperationalError:
+                interrupted.set()
+                raise
+        return 1
+
+    shards = _empty_shards(tmp_path, 3) + [("GONE", tmp_path / "missing" / "x.db")]
+    started = time.perf_counter()
+    result = fanout.run(shards, task, acquire=_open, release=_close)
+
+    assert time.perf_counter() - started < 2.0
+    assert [label for label, _ in result.results] == ["S0", "S2"]
+    assert result.timed_out == ["S1"]
+    assert result.failed == ["GONE"]
+    assert result.partial
+    assert interrupted.wait(2.0)
+    assert fanout.stats()["timed_out"] == 1
+    fanout.close()
+
+
+def test_task_errors_propagate(tmp_path: Path) -> None:
+    def task(label: str, conn: sqlite3.Connection) -> None:
+        raise RuntimeError(label)
+
+    for config in (FanoutConfig(), FanoutConfig(enabled=False)):
+        fanout = ShardFanout(config)
+        with pytest.raises(RuntimeError):
+            fanout.run(_empty_shards(tmp_path, 2), task, acquire=_open, release=_close)
+        fanout.close()
+
+
+def test_catalog_search_returns_global_top_k(working_dir: Path) -> None:
+    data = DataAccess(working_dir=working_dir, settings={})
+    sequential = DataAccess(working_dir=working_dir, settings={"api": {"shard_fanout": {"enabled": False}}})
+    confidences = []
+    for label in _LABELS:
+        conn = sqlite3.connect(get_shards_dir(working_dir) / f"{label}.db")
+        confidences += [
+            row[0]
+            for row in conn.execute(
+                "SELECT confidence FROM folder_profile WHERE COALESCE(LOWER(kind),'') IN ('','movie')"
+                " AND (LOWER(COALESCE(parsed_title,'')) LIKE '%alien%' OR LOWER(folder_path) LIKE '%alien%')"
+            )
+        ]
+        conn.close()
+
+    skipped: list = []
+    hits = data.catalog_search("alien", top_k=15, skipped=skipped)
+
+    assert [hit["confidence"] for hit in hits] == sorted(confidences, reverse=True)[:15]
+    assert hits == sequential.catalog_search("alien", top_k=15)
+    assert skipped == []
+    data.close()
+
+
+def test_playlist_candidates_merge_per_shard_top_k(working_dir: Path) -> None:
+    data = DataAccess(working_dir=working_dir, settings={})
+
+    everything = data.playlist_candidates(limit=200)
+    top = data.playlist_candidates(limit=9)
+
+    rank = lambda row: (row["quality"] or 0, row["confidence"], -(row["duration_min"] or 0))  # noqa: E731
+    assert [rank(row) for row in top] == [rank(row) for row in everything[:9]]
+    assert [rank(row) for row in everything] == sorted(map(rank, everything), reverse=True)
+    assert {row["drive"] for row in everything} == set(_LABELS)
+    data.close()
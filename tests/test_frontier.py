@@ -0,0 +1,75 @@
+"""Tests for directory-frontier scan checkpoints."""
+
+from __future__ import annotations
+
+import sqlite3
+
+from frontier import DirectoryTotals, ScanFrontier
+
+
+def _conn() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    ScanFrontier(conn, "D").clear()
+    return conn
+
+
+def test_directory_is_done_only_after_its_tasks_drain() -> None:
+    conn = _conn()
+    frontier = ScanFrontier(conn, "D", interval_seconds=0)
+    frontier.begin("/m")
+    frontier.add_task("/m")
+    frontier.end("/m", complete=True, totals=DirectoryTotals(1, 10, 1, {"video": 1}))
+    frontier.begin("/m/a")
+    frontier.end("/m/a", complete=True)
+    frontier.save(["/m/b"])
+
+    restored = ScanFrontier.load(conn, "D")
+    assert restored.restored_pending == ["/m/b", "/m"]
+    assert set(restored.restored_directories()) == {"/m/a"}
+
+    frontier.task_done("/m")
+    frontier.save([])
+
+    restored = ScanFrontier.load(conn, "D")
+    assert restored.restored_pending == []
+    assert restored.restored_directories()["/m"] == DirectoryTotals(1, 10, 1, {"video": 1})
+
+
+def test_interrupted_listing_stays_pending() -> None:
+    conn = _conn()
+    frontier = ScanFrontier(conn, "D")
+    frontier.begin("/m")
+    frontier.end("/m", complete=False)
+    frontier.save(["/m/z"])
+
+    restored = ScanFrontier.load(conn, "D")
+    assert restored.resuming
+    assert restored.restored_pending == ["/m/z", "/m"]
+    assert restored.restored_done == 0
+
+
+def test_resumed_walk_skips_done_and_revisited_directories() -> None:
+    conn = _conn()
+    frontier = ScanFrontier(conn, "D")
+    frontier.begin("/m/a")
+    frontier.end("/m/a", complete=True)
+    frontier.save(["/m/b"])
+
+    resumed = ScanFrontier.load(conn, "D")
+    assert resumed.skip("/m/a")
+    assert not resumed.skip("/m/b")
+    resumed.begin("/m/b")
+    assert resumed.skip("/m/b")
+    # A fresh scan never skips, whatever it is told.
+    assert not ScanFrontier(conn, "other").skip("/m/a")
+
+
+def test_frontiers_are_per_drive_and_clear() -> None:
+    conn = _conn()
+    for label in ("A", "B"):
+        frontier = ScanFrontier(conn, label)
+        frontier.save([f"/{label}"])
+    ScanFrontier(conn, "A").clear()
+
+    assert not ScanFrontier.load(conn, "A").resuming
+    assert ScanFrontier.load(conn, "B").restored_pending == ["/B"]
@@ -0,0 +1,182 @@
+"""Tests for the scan hashing backends."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from pathlib import Path
+
+import hashing
+from hashing import HashBackend, HashSettings, complete_deferred_hashes, hash_file, quick_signature
+
+
+def _reference_digest(data: bytes) -> str:
+    hasher = hashing._new_hasher(1)
+    hasher.update(data)
+    return hasher.hexdigest()
+
+
+def test_hash_file_requests_sequential_readahead(tmp_path: Path, monkeypatch) -> None:
+    target = tmp_path / "sample.bin"
+    target.write_bytes(b"x" * 10)
+    advice: list[int] = []
+    monkeypatch.setattr(hashing.os, "posix_fadvise", lambda fd, offset, length, flag: advice.append(flag), raising=False)
+    monkeypatch.setattr(hashing.os, "POSIX_FADV_SEQUENTIAL", 2, raising=False)
+
+    hash_file(str(target), 4096)
+
+    assert advice == [2]
+
+
+def test_hash_file_matches_reference_and_reports_chunks(tmp_path: Path) -> None:
+    data = bytes(range(256)) * 1000
+    target = tmp_path / "sample.bin"
+    target.write_bytes(data)
+    seen: list[int] = []
+
+    digest = hash_file(str(target), 4096, on_chunk=lambda size, _elapsed: seen.append(size))
+
+    assert digest == _reference_digest(data)
+    assert sum(seen) == len(data)
+    if hashing.algorithm() == "sha256":
+        assert digest == hashlib.sha256(data).hexdigest()
+
+
+def test_backends_agree(tmp_path: Path) -> None:
+    data = b"videocatalog" * 50_000
+    target = tmp_path / "sample.bin"
+    target.write_bytes(data)
+    expected = _reference_digest(data)
+
+    threaded = HashBackend(HashSettings(chunk_bytes=64 * 1024, max_threads=0, multithread_min_bytes=1))
+    try:
+        assert threaded.hash(str(target), size_hint=len(data)) == expected
+        assert threaded.hash(str(target), size_hint=len(data)) == expected
+    finally:
+        threaded.close()
+
+    totals: list[int] = []
+    pooled = HashBackend(HashSettings(mode="process", chunk_bytes=64 * 1024, process_workers=1))
+    try:
+        digest = pooled.hash(str(target), on_chunk=lambda size, _elapsed: totals.append(size))
+    finally:
+        pooled.close()
+    assert digest == expected
+    assert totals == [len(data)]
+
+
+def test_quick_signature_samples_head_middle_tail(tmp_path: Path) -> None:
+    sample = 1024
+    base = bytes(range(256)) * 64  # 16 KiB, well above three samples
+    first = tmp_path / "first.bin"
+    first.write_bytes(base)
+
+    untouched = bytearray(base)
+    untouched[5000] ^= 0xFF  # between the head and middle samples
+    second = tmp_path / "second.bin"
+    second.write_bytes(bytes(untouched))
+
+    tail_changed = bytearray(base)
+    tail_changed[-1] ^= 0xFF
+    third = tmp_path / "third.bin"
+    third.write_bytes(bytes(tail_changed))
+
+    sig = quick_signature(str(first), len(base), sample_bytes=sample)
+    assert quick_signature(str(second), len(base), sample_bytes=sample) == sig
+    assert quick_signature(str(third), len(base), sample_bytes=sample) != sig
+    assert quick_signature(str(first), len(base) + 1, sample_bytes=sample) != sig
+
+
+def test_complete_deferred_hashes_only_collisions(tmp_path: Path) -> None:
+    payloads = {"a.bin": b"a" * 4096, "b.bin": b"a" * 4096, "c.bin": b"c" * 2048}
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE files(id INTEGER PRIMARY KEY, drive_label TEXT, path TEXT, size_bytes INTEGER,"
+        " hash_blake3 TEXT, quick_hash TEXT, hash_deferred INTEGER DEFAULT 0, deleted INTEGER DEFAULT 0)"
+    )
+    for name, data in payloads.items():
+        path = tmp_path / name
+        path.write_bytes(data)
+        conn.execute(
+            "INSERT INTO files(drive_label, path, size_bytes, quick_hash, hash_deferred) VALUES('D', ?, ?, ?, 1)",
+            (str(path), len(data), quick_signature(str(path), len(data))),
+        )
+    backend = HashBackend(HashSettings())
+    batches: list[int] = []
+    try:
+        summary = complete_deferred_hashes(
+            conn,
+            drive_label="D",
+            backend=backend,
+            collisions_only=True,
+            on_batch=lambda last_id, _hashed: batches.append(last_id),
+        )
+    finally:
+        backend.close()
+
+    hashed = dict(conn.execute("SELECT path, hash_blake3 FROM files").fetchall())
+    assert summary["hashed"] == 2
+    assert hashed[str(tmp_path / "a.bin")] == _reference_digest(payloads["a.bin"])
+    assert hashed[str(tmp_path / "c.bin")] is None
+    assert batches == [2]
+
+    assert conn.execute("SELECT COUNT(*) FROM files WHERE hash_deferred=1").fetchone()[0] == 1
+
+    backend = HashBackend(HashSettings())
+    try:
+        by_size = complete_deferred_hashes(
+            conn, drive_label="D", backend=backend, collisions_only=False, sizes=[4096]
+        )
+        assert by_size["candidates"] == 0
+        by_size = complete_deferred_hashes(
+            conn, drive_label="D", backend=backend, collisions_only=False, sizes=[2048]
+        )
+    finally:
+        backend.close()
+    assert by_size["hashed"] == 1
+    assert conn.execute("SELECT COUNT(*) FROM files WHERE hash_deferred=1").fetchone()[0] == 0
+
+
+def test_collision_candidates_are_collected_once_per_pass(tmp_path: Path) -> None:
+    payloads = {"a.bin": b"a" * 4096, "b.bin": b"a" * 4096, "c.bin": b"c" * 2048, "d.bin": b"d" * 2048}
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE files(id INTEGER PRIMARY KEY, drive_label TEXT, path TEXT, size_bytes INTEGER,"
+        " hash_blake3 TEXT, quick_hash TEXT, hash_deferred INTEGER DEFAULT 0, deleted INTEGER DEFAULT 0)"
+    )
+    for name, data in payloads.items():
+        path = tmp_path / name
+        path.write_bytes(data)
+        conn.execute(
+            "INSERT INTO files(drive_label, path, size_bytes, quick_hash, hash_deferred) VALUES('D', ?, ?, ?, 1)",
+            (str(path), len(data), quick_signature(str(path), len(data))),
+        )
+    # A small file hashed in full during the scan shares d.bin's size.
+    conn.execute("INSERT INTO files(drive_label, path, size_bytes, hash_blake3) VALUES('D', 'small', 2048, 'ff')")
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    backend = HashBackend(HashSettings())
+    try:
+        summary = complete_deferred_hashes(
+            conn, drive_label="D", backend=backend, collisions_only=True, batch_size=1
+        )
+    finally:
+        backend.close()
+
+    assert summary["hashed"] == 4
+    assert sum("GROUP BY quick_hash" in statement for statement in statements) == 1
+
+
+def test_falls_back_to_sha256_without_blake3(tmp_path: Path, monkeypatch) -> None:
+    data = b"fallback" * 20_000
+    target = tmp_path / "sample.bin"
+    target.write_bytes(data)
+    monkeypatch.setattr(hashing, "_blake3_hash", None)
+
+    backend = HashBackend(HashSettings(chunk_bytes=64 * 1024, max_threads=0, multithread_min_bytes=1))
+    try:
+        assert hashing.algorithm() == "sha256"
+        assert backend.hash(str(target), size_hint=len(data)) == hashlib.sha256(data).hexdigest()
+        assert hash_file(str(target), 4096) == hashlib.sha256(data).hexdigest()
+    finally:
+        backend.close()
@@ -0,0 +1,65 @@
+"""Tests for batched ONNX image embedding."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+
+import numpy as np
+from PIL import Image
+
+from analyzers.image_embed import ImageEmbedder
+
+
+class _FakeSession:
+    def __init__(self) -> None:
+        self.batch_sizes: List[int] = []
+
+    def run(self, _outputs, feeds):
+        batch = next(iter(feeds.values()))
+        self.batch_sizes.append(int(batch.shape[0]))
+        return [np.tile(np.array([[3.0, 4.0]], dtype=np.float32), (batch.shape[0], 1))]
+
+
+def _embedder(batchable: bool) -> ImageEmbedder:
+    embedder = ImageEmbedder.__new__(ImageEmbedder)
+    embedder._session = _FakeSession()
+    embedder._input_name = "input"
+    embedder._size = 8
+    embedder._batchable = batchable
+    embedder._primary_provider = "CPUExecutionProvider"
+    embedder._fallback_triggered = False
+    return embedder
+
+
+def _images(tmp_path: Path) -> List[Path]:
+    paths = []
+    for idx in range(3):
+        path = tmp_path / f"img{idx}.png"
+        Image.new("RGB", (16, 12), color=(idx * 40, 10, 10)).save(path)
+        paths.append(path)
+    broken = tmp_path / "broken.png"
+    broken.write_bytes(b"not an image")
+    paths.insert(1, broken)
+    return paths
+
+
+def test_embed_paths_runs_one_batch_and_normalizes(tmp_path: Path) -> None:
+    embedder = _embedder(batchable=True)
+
+    vectors = embedder.embed_paths(_images(tmp_path))
+
+    assert embedder._session.batch_sizes == [3]
+    assert vectors[1] is None
+    for vector in (vectors[0], vectors[2], vectors[3]):
+        assert vector is not None
+        np.testing.assert_allclose(vector, [0.6, 0.8], rtol=1e-6)
+
+
+def test_embed_paths_falls_back_to_single_runs_for_fixed_batch_models(tmp_path: Path) -> None:
+    embedder = _embedder(batchable=False)
+
+    vectors = embedder.embed_paths(_images(tmp_path))
+
+    assert embedder._session.batch_sizes == [1, 1, 1]
+    assert [vector is None for vector in vectors] == [False, True, False, False]
@@ -0,0 +1,102 @@
+"""Tests for tiered video integrity verification."""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import List
+
+import pytest
+
+import integrity
+from integrity import VerifySettings, VerifyUnavailable, sample_offsets, tier_from, verify_pending_files
+
+
+def test_sample_offsets_spread_windows_across_duration() -> None:
+    assert sample_offsets(None, 4, 2.0) == [0.0]
+    assert sample_offsets(6.0, 4, 2.0) == [0.0]
+    assert sample_offsets(100.0, 4, 2.0) == [11.5, 36.5, 61.5, 86.5]
+
+
+def test_deferred_settings_run_container_tier_inline() -> None:
+    assert tier_from(" Sampled ") == "sampled"
+    assert tier_from("bogus") is None
+    deferred = VerifySettings(tier="full", defer_deep=True)
+    assert deferred.inline_tier == "container"
+    assert deferred.deferred
+    assert not VerifySettings(tier="container", defer_deep=True).deferred
+    assert VerifySettings(tier="sampled").inline_tier == "sampled"
+
+
+def test_verify_pending_files_updates_rows_and_resumes(monkeypatch) -> None:
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        """
+        CREATE TABLE files(
+            id INTEGER PRIMARY KEY, drive_label TEXT, path TEXT, integrity_ok INTEGER,
+            deleted INTEGER DEFAULT 0, verify_tier TEXT, verify_pending INTEGER DEFAULT 0
+        )
+        """
+    )
+    conn.executemany(
+        "INSERT INTO files(id, drive_label, path, integrity_ok, verify_tier, verify_pending) VALUES(?,?,?,?,?,?)",
+        [
+            (1, "D", "/m/a.mkv", 1, "container", 1),
+            (2, "D", "/m/broken.mkv", 1, "container", 1),
+            (3, "D", "/m/c.mkv", 1, "container", 1),
+            (4, "D", "/m/done.mkv", 1, "full", 0),
+        ],
+    )
+    decoded: List[str] = []
+
+    def _fake_decode(ffmpeg, path, args, input_args, timeout_s):
+        decoded.append(path)
+        return "broken" not in path
+
+    monkeypatch.setattr(integrity, "_decode", _fake_decode)
+    batches = []
+
+    summary = verify_pending_files(
+        conn,
+        drive_label="D",
+        ffmpeg="ffmpeg",
+        settings=VerifySettings(tier="full"),
+        resolve_path=lambda path: path.replace("/m/", "/mnt/"),
+        start_after_id=1,
+        batch_size=1,
+        on_batch=lambda last_id, verified: batches.append((last_id, verified)),
+    )
+
+    assert decoded == ["/mnt/broken.mkv", "/mnt/c.mkv"]
+    assert summary == {"verified": 2, "failed": 1, "last_id": 3}
+    assert batches == [(2, 1), (3, 2)]
+    rows = conn.execute("SELECT id, integrity_ok, verify_tier, verify_pending FROM files ORDER BY id").fetchall()
+    assert rows == [
+        (1, 1, "container", 1),
+        (2, 0, "full", 0),
+        (3, 1, "full", 0),
+        (4, 1, "full", 0),
+    ]
+
+
+def test_missing_ffmpeg_leaves_rows_pending(tmp_path) -> None:
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        """
+        CREATE TABLE files(
+            id INTEGER PRIMARY KEY, drive_label TEXT, path TEXT, integrity_ok INTEGER,
+            deleted INTEGER DEFAULT 0, verify_tier TEXT, verify_pending INTEGER DEFAULT 0
+        )
+        """
+    )
+    conn.execute(
+        "INSERT INTO files(id, drive_label, path, integrity_ok, verify_tier, verify_pending) VALUES(1,'D','/m/a.mkv',1,'container',1)"
+    )
+    bogus = str(tmp_path / "no-such-ffmpeg")
+
+    with pytest.raises(VerifyUnavailable):
+        integrity.verify_file("/m/a.mkv", bogus, "full", VerifySettings())
+    with pytest.raises(VerifyUnavailable):
+        verify_pending_files(conn, drive_label="D", ffmpeg=bogus, settings=VerifySettings(tier="full"))
+
+    row = conn.execute("SELECT integrity_ok, verify_tier, verify_pending FROM files").fetchone()
+    assert row == (1, "container", 1)
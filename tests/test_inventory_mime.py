@@ -0,0 +1,114 @@
+"""Tests for extension-first MIME classification."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+import inventory
+from inventory import MimeClassifier, categorize
+
+
+class _FakeMagic:
+    def __init__(self) -> None:
+        self.files: List[str] = []
+        self.buffers: List[bytes] = []
+
+    def from_file(self, path: str, mime: bool = False) -> str:
+        self.files.append(path)
+        return "application/x-from-file"
+
+    def from_buffer(self, data: bytes, mime: bool = False) -> str:
+        self.buffers.append(data)
+        if data.startswith(b"\x47"):
+            return "video/mp2t"
+        return "application/octet-stream"
+
+
+@pytest.fixture
+def fake_magic(monkeypatch: pytest.MonkeyPatch) -> _FakeMagic:
+    fake = _FakeMagic()
+    monkeypatch.setattr(inventory, "magic", fake)
+    return fake
+
+
+def test_known_extensions_never_open_the_file(tmp_path: Path, fake_magic: _FakeMagic) -> None:
+    classifier = MimeClassifier("extension")
+
+    # The files do not exist: a known extension must not be read at all.
+    mime, ext = classifier.detect(str(tmp_path / "movie.MKV"))
+    assert (mime, ext) == ("video/x-matroska", "mkv")
+    mime, ext = classifier.detect(str(tmp_path / "cover.jpg"))
+    assert ext == "jpg"
+    assert categorize(mime, ext) == "image"
+
+    assert fake_magic.files == []
+    assert fake_magic.buffers == []
+    assert classifier.stats["extension"] == 2
+
+
+def test_ambiguous_extensions_use_cached_header_sniffing(tmp_path: Path, fake_magic: _FakeMagic) -> None:
+    for idx in range(3):
+        (tmp_path / f"clip{idx}.ts").write_bytes(b"\x47" + bytes(200))
+    # Same first bytes, different content further into the sniffed buffer.
+    (tmp_path / "clip3.ts").write_bytes(b"\x47" + bytes(200) + b"\x01")
+    (tmp_path / "script.ts").write_bytes(b"export const x = 1;\n")
+    classifier = MimeClassifier("extension")
+
+    results = [classifier.detect(str(tmp_path / f"clip{idx}.ts")) for idx in range(4)]
+    script = classifier.detect(str(tmp_path / "script.ts"))
+
+    assert results == [("video/mp2t", "ts")] * 4
+    assert script == ("application/octet-stream", "ts")
+    assert len(fake_magic.buffers) == 3
+    assert classifier.stats["cache_hits"] == 2
+    assert classifier.stats["magic_calls"] == 3
+
+
+def test_header_cache_evicts_least_recently_used(
+    tmp_path: Path, fake_magic: _FakeMagic, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(inventory, "_CACHE_MAX", 2)
+    for name in "abc":
+        (tmp_path / f"{name}.bin").write_bytes(name.encode() * 64)
+    classifier = MimeClassifier("extension")
+
+    for name in "abac":
+        classifier.detect(str(tmp_path / f"{name}.bin"))
+    # "b" was least recently used when "c" arrived; "a" is still cached.
+    classifier.detect(str(tmp_path / "a.bin"))
+    classifier.detect(str(tmp_path / "b.bin"))
+
+    assert classifier.stats["cache_hits"] == 2
+    assert classifier.stats["magic_calls"] == 4
+
+
+def test_magic_mode_keeps_per_file_libmagic(tmp_path: Path, fake_magic: _FakeMagic) -> None:
+    path = tmp_path / "movie.mkv"
+    path.write_bytes(b"data")
+    classifier = MimeClassifier("magic")
+
+    assert classifier.detect(str(path)) == ("application/x-from-file", "mkv")
+    assert fake_magic.files == [str(path)]
+
+
+def test_without_libmagic_unknown_extensions_fall_back_to_mimetypes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(inventory, "magic", None)
+    classifier = MimeClassifier("extension")
+
+    assert classifier.detect(str(tmp_path / "page.html")) == ("text/html", "html")
+    assert classifier.detect(str(tmp_path / "blob.bin"))[1] == "bin"
+    assert classifier.stats["guessed"] == 2
+
+
+def test_extensions_are_shared_between_rows(tmp_path: Path) -> None:
+    classifier = MimeClassifier("extension")
+
+    _mime, first = classifier.detect(str(tmp_path / "a.MKV"))
+    _mime, second = classifier.detect(str(tmp_path / "b.mkv"))
+
+    assert first is second
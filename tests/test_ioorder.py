@@ -0,0 +1,70 @@
+"""Tests for physical-order dispatch of hash work."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+import ioorder
+from ioorder import PhysicalOrderBuffer
+
+Item = Tuple[str, int]
+
+
+def _buffer(window: int, offsets: Dict[str, Optional[int]], calls: Optional[List[str]] = None) -> PhysicalOrderBuffer[Item]:
+    def locate(path: str) -> Optional[int]:
+        if calls is not None:
+            calls.append(path)
+        if path not in offsets:
+            raise OSError("unsupported")
+        return offsets[path]
+
+    return PhysicalOrderBuffer(window, path_of=lambda item: item[0], inode_of=lambda item: item[1], locate=locate)
+
+
+def test_batches_are_released_in_physical_then_inode_order() -> None:
+    buffer = _buffer(4, {"a": 900, "b": 100, "c": None, "d": 500})
+
+    assert buffer.add(("a", 1)) == []
+    assert buffer.add(("b", 2)) == []
+    assert buffer.add(("c", 3)) == []
+    batch = buffer.add(("d", 4))
+
+    assert [path for path, _inode in batch] == ["b", "d", "a", "c"]
+    assert len(buffer) == 0
+    assert buffer.summary()["physical"] == 3 and buffer.summary()["inode"] == 1
+
+
+def test_drain_flushes_partial_window_by_inode() -> None:
+    buffer = _buffer(100, {})
+    for path, inode in (("x", 30), ("y", 10), ("z", 20)):
+        buffer.add((path, inode))
+
+    assert [path for path, _inode in buffer.drain()] == ["y", "z", "x"]
+    assert buffer.drain() == []
+
+
+def test_fiemap_is_disabled_after_repeated_failures() -> None:
+    calls: List[str] = []
+    buffer = _buffer(1000, {}, calls)
+    for idx in range(100):
+        buffer.add((f"f{idx}", idx))
+
+    assert len(calls) == ioorder._FIEMAP_DISABLE_AFTER
+    assert buffer.summary()["fiemap"] is False
+
+
+@pytest.mark.skipif(not ioorder.fiemap_supported(), reason="FIEMAP is Linux-only")
+def test_physical_offset_reads_a_real_file(tmp_path: Path) -> None:
+    target = tmp_path / "data.bin"
+    target.write_bytes(b"x" * 65536)
+    try:
+        offset = ioorder.physical_offset(str(target))
+    except OSError:
+        pytest.skip("filesystem does not support FIEMAP")
+    assert offset is None or offset >= 0
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    assert ioorder.physical_offset(str(empty)) is None
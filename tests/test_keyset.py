@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import random
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from api.db import DataAccess
+from api.keyset import after_clause, cursor_scope, decode_cursor, encode_cursor, order_by
+from core.paths import get_shards_dir
+
+
+def _build_inventory_shard(path: Path, rows: int = 230) -> None:
+    rng = random.Random(7)
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE inventory(
+            path TEXT PRIMARY KEY, size_bytes INTEGER, mtime_utc TEXT, ext TEXT,
+            mime TEXT, category TEXT, drive_label TEXT, indexed_utc TEXT
+        )
+        """
+    )
+    conn.execute("CREATE INDEX idx_inventory_path_nocase ON inventory(path COLLATE NOCASE, path)")
+    names = ["alpha", "Alpha", "ALPHA", "beta", "Gamma", "delta"]
+    for idx in range(rows):
+        name = f"/{rng.choice(names)}/{rng.choice(names)}{idx % 17}.{rng.choice(['mkv', 'MP3', 'jpg'])}"
+        conn.execute(
+            "INSERT OR IGNORE INTO inventory VALUES(?,?,?,?,?,?,?,?)",
+            (name, idx, "2024-01-01T00:00:00Z", name.rsplit(".", 1)[1].lower(), None, "video", "DRIVE_A", "x"),
+        )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture()
+def working_dir(catalog_shards) -> Path:
+    working_dir = catalog_shards(("DRIVE_B", "DRIVE_C"))
+    _build_inventory_shard(get_shards_dir(working_dir) / "DRIVE_A.db")
+    return working_dir
+
+
+def _walk(fetch, **kwargs):
+    pages = []
+    cursor = None
+    while True:
+        rows, pagination, _, _ = fetch(limit=13, cursor=cursor, **kwargs)
+        pages.extend(rows)
+        cursor = pagination.next_cursor
+        if cursor is None:
+            return pages
+
+
+def _offset_walk(fetch, **kwargs):
+    rows, _, _, _ = fetch(limit=500, **kwargs)
+    return rows
+
+
+def test_cursor_round_trip_and_scope() -> None:
+    scope = cursor_scope("inventory", "DRIVE_A", "")
+    token = encode_cursor(scope, key=["b", "B", 3])
+    assert decode_cursor(token, scope) == (["b", "B", 3], None)
+    assert decode_cursor(encode_cursor(scope, offset=40), scope) == (None, 40)
+
+    with pytest.raises(ValueError, match="does not match"):
+        decode_cursor(token, cursor_scope("inventory", "DRIVE_B", ""))
+    with pytest.raises(ValueError, match="invalid cursor"):
+        decode_cursor("not-a-cursor", scope)
+
+
+def test_after_clause_matches_sort_order() -> None:
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t(a INTEGER, b TEXT, id INTEGER PRIMARY KEY)")
+    rng = random.Random(3)
+    conn.executemany(
+        "INSERT INTO t(a, b) VALUES(?, ?)",
+        [(rng.randint(0, 3), rng.choice("abcd")) for _ in range(100)],
+    )
+    keys = [("a", True), ("b", False), ("id", False)]
+    ordered = conn.execute(f"SELECT a, b, id FROM t {order_by(keys)}").fetchall()
+    for position in (0, 17, 63, 99):
+        clause, params = after_clause(keys, ordered[position])
+        rest = conn.execute(f"SELECT a, b, id FROM t WHERE {clause} {order_by(keys)}", params).fetchall()
+        assert rest == ordered[position + 1 :]
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"ext": "mp3"}, {"q": "alpha"}])
+def test_inventory_cursor_walk_matches_offset(working_dir: Path, kwargs) -> None:
+    data = DataAccess(working_dir=working_dir, settings={})
+    fetch = lambda **kw: data.inventory_page("DRIVE_A", **kw)  # noqa: E731
+
+    walked = _walk(fetch, **kwargs)
+
+    assert walked == _offset_walk(fetch, **kwargs)
+    assert len({row["path"] for row in walked}) == len(walked)
+
+
+@pytest.mark.parametrize("sort,order", [("title", "asc"), ("year", "desc"), ("quality", "asc")])
+def test_catalog_cursor_walk_matches_offset(working_dir: Path, sort: str, order: str) -> None:
+    data = DataAccess(working_dir=working_dir, settings={})
+
+    walked = _walk(data.catalog_movies_page, sort=sort, order=order)
+
+    assert [row["id"] for row in walked] == [
+        row["id"] for row in _offset_walk(data.catalog_movies_page, sort=sort, order=order)
+    ]
+
+
+def test_cursor_rejected_for_other_filters(working_dir: Path) -> None:
+    data = DataAccess(working_dir=working_dir, settings={})
+    _, pagination, _, _ = data.inventory_page("DRIVE_A", limit=5)
+
+    with pytest.raises(ValueError, match="does not match"):
+        data.inventory_page("DRIVE_A", ext="mp3", cursor=pagination.next_cursor)
+
+
+def test_fallback_catalog_hands_out_offset_cursors(working_dir: Path) -> None:
+    data = DataAccess(working_dir=working_dir, settings={"api": {"catalog_index": False}})
+
+    walked = _walk(data.catalog_tv_series_page)
+
+    assert [row["id"] for row in walked] == [
+        row["id"] for row in _offset_walk(data.catalog_tv_series_page)
+    ]
+
+
+def test_inventory_count_is_cached_until_shard_changes(working_dir: Path) -> None:
+    data = DataAccess(working_dir=working_dir, settings={})
+    _, _, _, before = data.inventory_page("DRIVE_A", ext="mkv", limit=5)
+    assert len(data._count_cache) == 1
+
+    shard = get_shards_dir(working_dir) / "DRIVE_A.db"
+    conn = sqlite3.connect(shard)
+    conn.execute(
+        "INSERT INTO inventory(path, ext, drive_label) VALUES('/zzz/new.mkv', 'mkv', 'DRIVE_A')"
+    )
+    conn.commit()
+    conn.close()
+
+    _, _, _, after = data.inventory_page("DRIVE_A", ext="mkv", limit=5)
+    assert after == before + 1
@@ -0,0 +1,54 @@
+"""Tests for concurrent multi-target scanning."""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from multiscan import ScanTarget, device_id, parse_targets, run_targets
+from perf import AdaptiveConcurrency
+
+
+def test_parse_targets_accepts_lists_and_repeats() -> None:
+    assert parse_targets(["A=/mnt/a, B=/mnt/b", "C=/mnt/c=x"]) == [
+        ScanTarget("A", "/mnt/a"),
+        ScanTarget("B", "/mnt/b"),
+        ScanTarget("C", "/mnt/c=x"),
+    ]
+    for bad in (["A"], ["=/mnt/a"], ["A=/a,A=/b"], [" , "]):
+        with pytest.raises(ValueError):
+            parse_targets(bad)
+
+
+def test_targets_on_one_device_share_an_io_budget() -> None:
+    targets = parse_targets(["A=/mnt/a,B=/mnt/b,C=/mnt/c"])
+    devices = {"/mnt/a": "sda", "/mnt/b": "sda", "/mnt/c": "sdb"}
+    built: List[str] = []
+    seen: Dict[str, tuple] = {}
+    lock = threading.Lock()
+
+    def _budget(target: ScanTarget) -> AdaptiveConcurrency:
+        built.append(target.label)
+        return AdaptiveConcurrency(initial=2, ceiling=4)
+
+    def _scan(target: ScanTarget, io_budget: AdaptiveConcurrency, work: threading.Semaphore) -> dict:
+        with lock:
+            seen[target.label] = (io_budget, work)
+        if target.label == "C":
+            raise RuntimeError("drive vanished")
+        return {"total_files": 1}
+
+    results = run_targets(targets, _scan, io_budget_for=_budget, work_slots=2, device_of=devices.__getitem__)
+
+    assert built == ["A", "C"]
+    assert seen["A"][0] is seen["B"][0] and seen["A"][0] is not seen["C"][0]
+    assert seen["A"][1] is seen["C"][1]
+    assert results["A"] == {"total_files": 1, "device": "sda"}
+    assert results["C"]["status"] == "error" and "vanished" in str(results["C"]["error"])
+
+
+def test_device_id_resolves_a_real_mount(tmp_path: Path) -> None:
+    assert device_id(str(tmp_path)) == device_id(str(tmp_path.parent))
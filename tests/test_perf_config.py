@@ -0,0 +1,134 @@
+"""Tests for perf.resolve_performance_config and the adaptive concurrency controller."""
+
+from __future__ import annotations
+
+import perf
+
+
+def _resolve(monkeypatch, profile: str, **kwargs) -> perf.PerformanceConfig:
+    monkeypatch.setattr(perf, "detect_profile", lambda mount_path: profile)
+    return perf.resolve_performance_config("/mnt/drive", cpu_count=8, **kwargs)
+
+
+def test_enumerate_workers_follow_detected_profile(monkeypatch) -> None:
+    assert _resolve(monkeypatch, "NETWORK").enumerate_workers == 16
+    assert _resolve(monkeypatch, "HDD").enumerate_workers == 2
+    assert _resolve(monkeypatch, "USB").enumerate_workers == 2
+    assert _resolve(monkeypatch, "SSD").enumerate_workers == 8
+
+
+def test_enumerate_workers_overrides(monkeypatch) -> None:
+    settings = {"performance": {"enumerate_workers": 3}}
+    assert _resolve(monkeypatch, "NETWORK", settings=settings).enumerate_workers == 3
+
+    config = _resolve(
+        monkeypatch,
+        "NETWORK",
+        settings=settings,
+        cli_overrides={"enumerate_workers": 500},
+    )
+    assert config.enumerate_workers == 64
+    assert config.as_dict()["enumerate_workers"] == 64
+
+
+def test_io_order_defaults_to_physical_on_hdd(monkeypatch) -> None:
+    assert _resolve(monkeypatch, "HDD").io_order == "physical"
+    assert _resolve(monkeypatch, "SSD").io_order == "listing"
+    assert _resolve(monkeypatch, "HDD", settings={"performance": {"io_order": "listing"}}).io_order == "listing"
+
+    config = _resolve(monkeypatch, "USB", cli_overrides={"io_order": "physical", "io_order_window": 64})
+    assert (config.io_order, config.io_order_window) == ("physical", 64)
+    assert config.as_dict()["io_order_window"] == 64
+
+
+def test_hash_backend_settings(monkeypatch) -> None:
+    assert _resolve(monkeypatch, "SSD").hash_max_threads == 0
+    assert _resolve(monkeypatch, "USB").hash_max_threads == 1
+    assert _resolve(monkeypatch, "USB").hash_backend == "thread"
+
+    config = _resolve(
+        monkeypatch,
+        "HDD",
+        settings={"performance": {"hash_backend": "process", "hash_max_threads": 4}},
+        cli_overrides={"hash_backend": "bogus"},
+    )
+    assert config.hash_backend == "process"
+    assert config.hash_max_threads == 4
+
+
+def test_hash_strategy_defaults_to_full(monkeypatch) -> None:
+    assert _resolve(monkeypatch, "SSD").hash_strategy == "full"
+    config = _resolve(
+        monkeypatch,
+        "HDD",
+        settings={"performance": {"hash_strategy": "quick"}},
+    )
+    assert config.hash_strategy == "quick"
+    assert config.as_dict()["hash_strategy"] == "quick"
+    assert _resolve(monkeypatch, "HDD", cli_overrides={"hash_strategy": "full"}).hash_strategy == "full"
+
+
+def test_concurrency_defaults_and_ceiling(monkeypatch) -> None:
+    config = _resolve(monkeypatch, "SSD")
+    assert config.concurrency == "adaptive"
+    assert config.max_workers == 32
+    assert _resolve(monkeypatch, "USB").max_workers == 8
+    fixed = _resolve(
+        monkeypatch,
+        "HDD",
+        settings={"performance": {"concurrency": "fixed", "max_workers": 2}},
+        cli_overrides={"worker_threads": 4},
+    )
+    assert fixed.concurrency == "fixed"
+    assert fixed.max_workers == 4
+    assert fixed.as_dict()["concurrency"] == "fixed"
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _window(controller: perf.AdaptiveConcurrency, clock: _Clock, *, mb_per_s: float, latency: float) -> None:
+    clock.now += 1.0
+    for _ in range(8):
+        controller.note_io(int(mb_per_s * 1_000_000 / 8), latency)
+
+
+def test_aimd_grows_under_demand_and_halves_on_congestion() -> None:
+    clock = _Clock()
+    controller = perf.AdaptiveConcurrency(initial=4, ceiling=8, window_s=1.0, clock=clock)
+    controller._waiting = 3  # workers queued for a slot
+
+    _window(controller, clock, mb_per_s=100, latency=0.01)
+    _window(controller, clock, mb_per_s=120, latency=0.01)
+    assert controller.limit == 6
+    # The last increase lost throughput: back off multiplicatively.
+    _window(controller, clock, mb_per_s=90, latency=0.012)
+    assert controller.limit == 3
+    _window(controller, clock, mb_per_s=90, latency=0.012)
+    assert controller.limit == 4
+    # Latency far above the best window without more throughput is congestion.
+    _window(controller, clock, mb_per_s=90, latency=0.05)
+    assert controller.limit == 2
+    controller.note_error()
+    clock.now += 1.0
+    controller.note_error()
+    assert controller.limit == 1
+
+    summary = controller.summary()
+    assert summary["initial"] == 4 and summary["peak"] == 6 and summary["final"] == 1
+    assert [step["limit"] for step in summary["timeline"]] == [4, 5, 6, 3, 4, 2, 1]
+
+
+def test_fixed_controller_keeps_limit() -> None:
+    clock = _Clock()
+    controller = perf.AdaptiveConcurrency(initial=3, ceiling=8, enabled=False, window_s=1.0, clock=clock)
+    controller._waiting = 2
+    _window(controller, clock, mb_per_s=100, latency=0.01)
+    _window(controller, clock, mb_per_s=200, latency=0.01)
+    assert controller.limit == 3 and controller.thread_count == 3
+    assert controller.summary()["mode"] == "fixed"
@@ -0,0 +1,95 @@
+"""Tests for the compact existing-row index used by rescans."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import reconcile
+from reconcile import ExistingFileIndex
+
+
+def _shard(rows) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE files(id INTEGER PRIMARY KEY, drive_label TEXT, path TEXT, size_bytes INTEGER, "
+        "mtime_utc TEXT, deleted INTEGER DEFAULT 0)"
+    )
+    conn.executemany(
+        "INSERT INTO files(id, drive_label, path, size_bytes, mtime_utc, deleted) VALUES(?,?,?,?,?,?)", rows
+    )
+    return conn
+
+
+def test_pop_classifies_rows_and_reports_unseen_ids() -> None:
+    conn = _shard(
+        [
+            (1, "D", "/m/same.mkv", 10, "2024-01-01T00:00:00Z", 0),
+            (2, "D", "/m/changed.mkv", 10, "2024-01-01T00:00:00Z", 0),
+            (3, "D", "/m/gone.mkv", 10, "2024-01-01T00:00:00Z", 0),
+            (4, "D", "/m/already_gone.mkv", 10, "2024-01-01T00:00:00Z", 1),
+            (5, "D", "/m/legacy.mkv", None, "2024-01-01T00:00:00Z", 0),
+            (7, "D", "/m/no_mtime.mkv", 10, None, 0),
+            (6, "OTHER", "/m/gone.mkv", 10, "2024-01-01T00:00:00Z", 0),
+        ]
+    )
+    index = ExistingFileIndex.load(conn, "D", casefold=False)
+
+    assert len(index) == 6
+    assert "/m/same.mkv" in index
+    same = index.pop("/m/same.mkv")
+    assert same is not None and same.id == 1 and not same.deleted
+    assert same.unchanged(10, "2024-01-01T00:00:00Z")
+    assert index.pop("/m/same.mkv") is None
+    assert "/m/same.mkv" not in index
+
+    changed = index.pop("/m/changed.mkv")
+    assert changed is not None and not changed.unchanged(10, "2024-01-02T00:00:00Z")
+    legacy = index.pop("/m/legacy.mkv")
+    assert legacy is not None and not legacy.unchanged(0, "2024-01-01T00:00:00Z")
+    no_mtime = index.pop("/m/no_mtime.mkv")
+    assert no_mtime is not None and not no_mtime.unchanged(10, "2024-01-01T00:00:00Z")
+    assert index.pop("/m/new.mkv") is None
+
+    assert list(index.unseen_ids()) == [3]
+
+
+def test_hash_collisions_fall_back_to_exact_keys(monkeypatch) -> None:
+    conn = _shard(
+        [
+            (1, "D", "/m/a", 1, "2024-01-01T00:00:00Z", 0),
+            (2, "D", "/m/b", 2, "2024-01-01T00:00:00Z", 0),
+            (3, "D", "/m/c", 3, "2024-01-01T00:00:00Z", 0),
+        ]
+    )
+    monkeypatch.setattr(reconcile, "hash", lambda key: 0 if key in {"/m/a", "/m/b", "/m/x"} else 7, raising=False)
+    index = ExistingFileIndex.load(conn, "D", casefold=False)
+
+    assert index.pop("/m/x") is None
+    # "/m/new" hashes like "/m/c" but is not that row.
+    assert "/m/new" not in index
+    assert index.pop("/m/new") is None
+    b = index.pop("/m/b")
+    assert b is not None and b.id == 2 and b.size_bytes == 2
+    c = index.pop("/m/c")
+    assert c is not None and c.id == 3
+    assert list(index.unseen_ids()) == [1]
+
+
+def test_pop_directory_marks_only_direct_children_seen() -> None:
+    conn = _shard(
+        [
+            (1, "D", "/m/show/a.mkv", 10, "2024-01-01T00:00:00Z", 0),
+            (2, "D", "/m/show/b.mkv", 10, "2024-01-01T00:00:00Z", 0),
+            (3, "D", "/m/show/old.mkv", 10, "2024-01-01T00:00:00Z", 1),
+            (4, "D", "/m/show/s01/e01.mkv", 10, "2024-01-01T00:00:00Z", 0),
+            (5, "D", "/m/other.mkv", 10, "2024-01-01T00:00:00Z", 0),
+        ]
+    )
+    index = ExistingFileIndex.load(conn, "D", casefold=False, with_parents=True)
+
+    assert index.pop("/m/show/a.mkv") is not None
+    assert index.live_in_directory("/m/show") == 1
+    assert index.pop_directory("/m/show") == 1
+    assert index.live_in_directory("/m/show") == 0
+    assert "/m/show/b.mkv" not in index
+    assert sorted(index.unseen_ids()) == [4, 5]
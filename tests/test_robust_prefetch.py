@@ -0,0 +1,94 @@
+"""Tests for robust.DirectoryPrefetcher."""
+
+from __future__ import annotations
+
+import threading
+
+from robust import DirectoryPrefetcher
+
+
+def test_prefetcher_runs_inline_with_single_worker() -> None:
+    calls: list[tuple[str, str, str]] = []
+
+    def loader(fs_path: str, display_path: str) -> str:
+        calls.append((fs_path, display_path, threading.current_thread().name))
+        return fs_path.upper()
+
+    prefetcher = DirectoryPrefetcher(loader, workers=1)
+    prefetcher.prefetch([("a", "A"), ("b", "B")])
+    assert prefetcher.in_flight == 0
+    assert prefetcher.take("a", "A") == "A"
+    prefetcher.close()
+    assert calls == [("a", "A", threading.current_thread().name)]
+
+
+def test_prefetcher_bounds_in_flight_and_returns_results() -> None:
+    release = threading.Event()
+
+    def loader(fs_path: str, display_path: str) -> list[str]:
+        release.wait(5)
+        return [fs_path, display_path]
+
+    prefetcher = DirectoryPrefetcher(loader, workers=2, window=3)
+    try:
+        prefetcher.prefetch((f"d{i}", f"D{i}") for i in range(10))
+        assert prefetcher.in_flight == 3
+        prefetcher.prefetch([("d0", "D0")])
+        assert prefetcher.in_flight == 3
+        release.set()
+        assert prefetcher.take("d1", "D1") == ["d1", "D1"]
+        assert prefetcher.take("d9", "D9") == ["d9", "D9"]
+        assert prefetcher.in_flight == 2
+    finally:
+        prefetcher.close()
+    assert prefetcher.in_flight == 0
+
+
+def test_prefetch_stack_keys_by_fs_path() -> None:
+    calls: list[tuple[str, str]] = []
+    lock = threading.Lock()
+
+    def loader(fs_path: str, display_path: str) -> str:
+        with lock:
+            calls.append((fs_path, display_path))
+        return display_path
+
+    # Long-path mode: the fs path carries a \\?\ prefix the display path lacks.
+    stack = [(f"C:\\d{i}", f"\\\\?\\C:\\d{i}") for i in range(4)]
+    entries = list(stack)
+    prefetcher = DirectoryPrefetcher(loader, workers=2)
+    try:
+        prefetcher.prefetch_stack(stack, skip={"C:\\d2"}.__contains__)
+        assert prefetcher.in_flight == 3
+        while stack:
+            display_path, fs_path = stack.pop()
+            assert prefetcher.take(fs_path, display_path) == display_path
+    finally:
+        prefetcher.close()
+    # Every directory is listed exactly once: prefetched ones are not listed again.
+    assert sorted(calls) == sorted((fs_path, display_path) for display_path, fs_path in entries)
+    assert prefetcher.in_flight == 0
+
+
+def test_discarded_listings_free_the_window() -> None:
+    release = threading.Event()
+
+    def loader(fs_path: str, display_path: str) -> str:
+        release.wait(5)
+        return display_path
+
+    prefetcher = DirectoryPrefetcher(loader, workers=2, window=2)
+    try:
+        prefetcher.prefetch([("a", "A"), ("b", "B")])
+        prefetcher.prefetch([("c", "C")])
+        assert prefetcher.in_flight == 2
+        # A resumed scan skips directories it finished before the interruption.
+        prefetcher.discard("a")
+        prefetcher.discard("b")
+        prefetcher.discard("missing")
+        prefetcher.prefetch([("c", "C")])
+        assert prefetcher.in_flight == 1
+        release.set()
+        assert prefetcher.take("c", "C") == "C"
+    finally:
+        prefetcher.close()
@@ -0,0 +1,49 @@
+"""End-to-end scans of a small temporary tree."""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+_SETTINGS = {"musicnames": {"from_filenames": False}}
+
+
+def _make_tree(root: Path, count: int) -> None:
+    for idx in range(count):
+        folder = root / f"dir{idx % 3}"
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"note{idx}.txt").write_text("x" * (idx + 1))
+
+
+@pytest.mark.parametrize("inventory_only", [False, True])
+def test_scan_indexes_every_inventory_path(scan_module, tmp_path: Path, inventory_only: bool) -> None:
+    mount = tmp_path / "mount"
+    _make_tree(mount, 10)
+    shard = tmp_path / "shard.db"
+
+    scan_module.scan_drive(
+        "TEST",
+        str(mount),
+        str(tmp_path / "catalog.db"),
+        shard_db_path=str(shard),
+        inventory_only=inventory_only,
+        settings=_SETTINGS,
+    )
+
+    conn = sqlite3.connect(shard)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM inventory").fetchone()[0] == 10
+        assert conn.execute("SELECT COUNT(*) FROM inventory_fts_pending").fetchone()[0] == 0
+    finally:
+        conn.close()
+
+
+def test_mtime_text_rounds_like_utcfromtimestamp(scan_module) -> None:
+    # Stored mtimes came from datetime.utcfromtimestamp, which rounds to
+    # microseconds before dropping the fraction.
+    assert scan_module._iso_from_timestamp(1700000000.9999995) == "2023-11-14T22:13:21Z"
+    assert scan_module._iso_from_timestamp(1700000000.999999) == "2023-11-14T22:13:20Z"
+    assert scan_module._iso_from_timestamp(-0.0000004) == "1970-01-01T00:00:00Z"
+    assert scan_module._iso_from_timestamp(-0.5) == "1969-12-31T23:59:59Z"
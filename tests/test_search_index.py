@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import random
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from api.db import DataAccess
+from core.paths import get_shards_dir
+from core.search_index import (
+    ensure_search_index,
+    match_clause,
+    rebuild_search_indexes,
+    sync_search_index,
+)
+from inventory import InventoryRow, InventoryWriter
+from search_util import build_search_query
+from structure.service import ensure_structure_tables
+
+_INVENTORY_SQL = """
+CREATE TABLE inventory(
+    path TEXT PRIMARY KEY, size_bytes INTEGER NOT NULL, mtime_utc TEXT NOT NULL, ext TEXT,
+    mime TEXT, category TEXT, drive_label TEXT, drive_type TEXT, indexed_utc TEXT NOT NULL,
+    name TEXT
+)
+"""
+
+_PATHS = [
+    "/Movies/Alien (1979)/Alien.mkv",
+    "/Movies/Aliens/aliens_1986.MKV",
+    "/Music/Daft Punk/One More Time.flac",
+    "/Photos/2019/IMG_0001.jpg",
+    "/Docs/Résumé.pdf",
+    "/Shows/Dark/S01E01 Secrets.mkv",
+]
+
+_PATTERNS = ["alien", "ALIEN", "mkv", "img_0", "ore t", "ums/d", "%", "al", "19_9", "s01%secrets", "sumé", "zzz"]
+
+
+def _row(path: str) -> InventoryRow:
+    ext = path.rsplit(".", 1)[-1].lower()
+    return InventoryRow(path, 1, "2024-01-01T00:00:00Z", ext, None, "other", "D", None, "x")
+
+
+def _fill(conn: sqlite3.Connection, paths) -> None:
+    writer = InventoryWriter(conn, batch_size=4)
+    for path in paths:
+        writer.add(_row(path))
+    writer.close()
+
+
+def _search(conn: sqlite3.Connection, text: str, *, indexed: bool) -> list:
+    like = f"%{text.lower()}%"
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")} if indexed else set()
+    prefilter_sql, prefilter_params = match_clause("inventory", like, tables) or ("1", ())
+    rows = conn.execute(
+        f"SELECT path FROM inventory WHERE {prefilter_sql} AND LOWER(path) LIKE ? ORDER BY path",
+        (*prefilter_params, like),
+    )
+    return [row[0] for row in rows]
+
+
+@pytest.fixture()
+def conn() -> sqlite3.Connection:
+    connection = sqlite3.connect(":memory:")
+    connection.execute(_INVENTORY_SQL)
+    return connection
+
+
+def test_writer_keeps_index_in_step(conn: sqlite3.Connection) -> None:
+    _fill(conn, _PATHS[:3])
+    assert ensure_search_index(conn, "inventory")
+    _fill(conn, _PATHS[3:] + _PATHS[:2])
+
+    assert conn.execute("SELECT COUNT(*) FROM inventory_fts_pending").fetchone()[0] == 0
+    conn.execute("INSERT INTO inventory_fts(inventory_fts) VALUES('integrity-check')")
+    for text in _PATTERNS:
+        assert _search(conn, text, indexed=True) == _search(conn, text, indexed=False), text
+
+
+def test_unsynced_and_deleted_rows(conn: sqlite3.Connection) -> None:
+    _fill(conn, _PATHS)
+    conn.execute(
+        "INSERT INTO inventory(path, size_bytes, mtime_utc, indexed_utc) VALUES('/new/Alien Covenant.mkv', 1, 'x', 'x')"
+    )
+    conn.execute("DELETE FROM inventory WHERE path = ?", (_PATHS[0],))
+    conn.execute("UPDATE inventory SET path = '/Movies/Renamed.mkv' WHERE path = ?", (_PATHS[1],))
+
+    assert _search(conn, "alien", indexed=True) == ["/new/Alien Covenant.mkv"]
+    assert _search(conn, "renamed", indexed=True) == ["/Movies/Renamed.mkv"]
+
+    assert sync_search_index(conn, "inventory") == 2
+    conn.execute("INSERT INTO inventory_fts(inventory_fts) VALUES('integrity-check')")
+    assert rebuild_search_indexes(conn) == ["inventory_fts"]
+    assert _search(conn, "alien", indexed=True) == ["/new/Alien Covenant.mkv"]
+
+
+def test_match_clause_needs_a_trigram() -> None:
+    tables = {"inventory_fts", "inventory_fts_pending"}
+
+    assert match_clause("inventory", "%al%", tables) is None
+    assert match_clause("inventory", "%alien%", set()) is None
+    assert match_clause("inventory", "%a_b%", tables) is None
+    assert match_clause("inventory", '%say "hi"%', tables)[1] == ('"say ""hi"""',)
+    assert match_clause("inventory", "%s01%secrets%", tables)[1] == ('"s01" AND "secrets"',)
+
+
+def test_quick_search_query_uses_index(conn: sqlite3.Connection) -> None:
+    _fill(conn, _PATHS)
+    conn.execute("UPDATE inventory SET name = LOWER(path)")
+
+    plain = conn.execute(*build_search_query("%alien%")).fetchall()
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    sql, params = build_search_query("%alien%", tables=tables)
+
+    assert "inventory_fts" in sql
+    assert sorted(conn.execute(sql, params).fetchall()) == sorted(plain)
+
+
+def test_api_search_paths_use_index(tmp_path: Path) -> None:
+    shards = get_shards_dir(tmp_path)
+    shards.mkdir(parents=True)
+    conn = sqlite3.connect(shards / "D.db")
+    conn.execute(_INVENTORY_SQL)
+    rng = random.Random(5)
+    paths = [f"/{rng.choice(['Alien', 'heat', 'Ran'])}/{idx}_{rng.choice(['x', 'alien'])}.mkv" for idx in range(300)]
+    _fill(conn, paths)
+    ensure_structure_tables(conn)
+    conn.execute(
+        "INSERT INTO folder_profile(folder_path, kind, parsed_title, confidence, updated_utc) VALUES(?,?,?,?,?)",
+        ("/Movies/A", "movie", "Alien", 0.9, "x"),
+    )
+    conn.commit()
+    conn.close()
+
+    data = DataAccess(working_dir=tmp_path, settings={})
+    rows, _, _, total = data.inventory_page("D", q="ALIEN", limit=500)
+
+    assert [row["path"] for row in rows] == sorted(
+        (p for p in paths if "alien" in p.lower()), key=lambda p: (p.lower(), p)
+    )
+    assert total == len(rows)
+    assert [hit["title"] for hit in data.catalog_search("alien")] == ["Alien"]
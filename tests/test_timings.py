@@ -0,0 +1,75 @@
+"""Tests for scan phase timings."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from timings import LatencyHistogram, ScanTimings, load_timings, timings_path
+
+
+def test_histogram_percentiles_stay_within_bucket_error() -> None:
+    histogram = LatencyHistogram()
+    for millis in range(1, 1001):
+        histogram.add(millis / 1000.0)
+
+    summary = histogram.summary()
+
+    assert summary["count"] == 1000
+    assert summary["max_ms"] == pytest.approx(1000.0)
+    for key, expected in (("p50_ms", 500.0), ("p95_ms", 950.0), ("p99_ms", 990.0)):
+        assert expected <= summary[key] <= expected * 1.2
+
+
+def test_histogram_clamps_to_observed_range() -> None:
+    histogram = LatencyHistogram()
+    histogram.add(0.0031)
+
+    assert histogram.percentile(0.5) == pytest.approx(0.0031)
+    assert LatencyHistogram().summary() == {"count": 0, "total_s": 0.0}
+
+
+def test_queue_samples_are_rate_limited_and_summarised() -> None:
+    now = [0.0]
+    timings = ScanTimings(sample_interval_s=1.0, clock=lambda: now[0])
+    due = []
+    for step in range(10):
+        now[0] = step * 0.5
+        due.append(timings.should_sample())
+        timings.sample_queues(task_queue=step, result_queue=0)
+
+    summary = timings.summary()
+
+    assert [sample["t"] for sample in summary["queue_samples"]] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert due == [step % 2 == 0 for step in range(10)]
+    assert summary["queues"]["task_queue"] == {"max": 8, "mean": 4.0, "samples": 5}
+
+
+def test_full_sample_buffer_halves_and_slows_down() -> None:
+    now = [0.0]
+    timings = ScanTimings(sample_interval_s=1.0, clock=lambda: now[0])
+    for step in range(600):
+        now[0] = float(step)
+        timings.sample_queues(task_queue=1)
+
+    samples = timings.summary()["queue_samples"]
+
+    assert len(samples) == 300
+    assert samples[1]["t"] - samples[0]["t"] == 2.0
+
+
+def test_written_timings_round_trip(tmp_path: Path) -> None:
+    timings = ScanTimings()
+    with timings.time("hash"):
+        pass
+    timings.observe("stat", 0.002)
+
+    path = timings.write(timings_path(tmp_path, "My Drive"), drive_label="My Drive", status="ok")
+    payload = load_timings(tmp_path, "My Drive")
+
+    assert path.name == "My_Drive.json"
+    assert payload is not None
+    assert payload["status"] == "ok"
+    assert set(payload["phases"]) == {"hash", "stat"}
+    assert load_timings(tmp_path, "other") is None
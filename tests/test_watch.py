@@ -0,0 +1,191 @@
+"""Tests for the --watch event coalescing and polling fallback."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+from pathlib import Path
+from typing import List, Set, Tuple
+
+import pytest
+
+import watch
+from robust import CancellationToken
+from watch import IN_CLOSE_WRITE, IN_CREATE, IN_ISDIR, IN_Q_OVERFLOW, WatchSettings, dirty_directories, run_watch
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakeWatcher:
+    def __init__(self, clock: _Clock, script: List[list], token: CancellationToken, exhausted: bool = False) -> None:
+        self._clock = clock
+        self._script = script
+        self._token = token
+        self.exhausted = exhausted
+        self.watch_count = 3
+        self.closed = False
+
+    def read(self, timeout_s: float):
+        self._clock.now += 1.0
+        if not self._script:
+            self._token.set()
+            return []
+        return self._script.pop(0)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _run(script: List[list], settings: WatchSettings, exhausted: bool = False):
+    clock = _Clock()
+    token = CancellationToken()
+    watcher = _FakeWatcher(clock, script, token, exhausted)
+    passes: List[Tuple[Set[str], bool]] = []
+
+    def _rescan(changed: Set[str], thorough: bool) -> dict:
+        passes.append((changed, thorough))
+        return {}
+
+    summary = run_watch(
+        "/m",
+        _rescan,
+        settings,
+        cancel_token=token,
+        watcher_factory=lambda root, limit: watcher,
+        clock=clock,
+    )
+    assert watcher.closed
+    return passes, summary
+
+
+def test_dirty_directories_include_new_subdirectories() -> None:
+    dirty, overflow = dirty_directories(
+        [("/m/a", IN_CLOSE_WRITE, "x.mkv"), ("/m", IN_CREATE | IN_ISDIR, "b"), ("/m/a", IN_CREATE, "y")]
+    )
+    assert dirty == {"/m/a", "/m", "/m/b"} and not overflow
+    assert dirty_directories([("/m", IN_Q_OVERFLOW, "")]) == (set(), True)
+
+
+def test_events_are_coalesced_until_quiet() -> None:
+    settings = WatchSettings(debounce_s=2.0, max_batch_s=60.0)
+    script = [[("/m/a", IN_CLOSE_WRITE, "x")], [("/m/b", IN_CREATE, "y")], [], [], [], [("/m", IN_Q_OVERFLOW, "")]]
+
+    passes, summary = _run(script, settings)
+
+    assert passes == [({"/m/a", "/m/b"}, False), (set(), True)]
+    assert summary["batches"] == 1 and summary["overflows"] == 1 and summary["mode"] == "inotify"
+
+
+def test_busy_trees_flush_at_max_batch_and_exhausted_watchers_poll() -> None:
+    busy = [[("/m/a", IN_CLOSE_WRITE, str(idx))] for idx in range(8)]
+    passes, _ = _run(busy, WatchSettings(debounce_s=2.0, max_batch_s=3.0))
+    assert passes == [({"/m/a"}, False), ({"/m/a"}, False)]
+
+    passes, summary = _run([[]] * 12, WatchSettings(debounce_s=1.0, poll_s=5.0), exhausted=True)
+    assert summary["polls"] == 2 and passes == [(set(), False), (set(), False)]
+
+
+def test_unavailable_inotify_falls_back_to_polling(monkeypatch) -> None:
+    token = CancellationToken()
+    passes: List[bool] = []
+
+    def _fail(root: str, limit: int):
+        raise OSError("no inotify")
+
+    def _rescan(changed: Set[str], thorough: bool) -> dict:
+        passes.append(thorough)
+        token.set()
+        return {}
+
+    clock = _Clock()
+    monkeypatch.setattr(token, "wait", lambda timeout: setattr(clock, "now", clock.now + timeout))
+    summary = run_watch(
+        "/m", _rescan, WatchSettings(poll_s=5.0), cancel_token=token, watcher_factory=_fail, clock=clock
+    )
+    assert summary["mode"] == "poll" and passes == [False]
+
+
+def test_cancelled_pass_stops_the_loop_and_keeps_its_directories() -> None:
+    clock = _Clock()
+    token = CancellationToken()
+    script = [[("/m/a", IN_CLOSE_WRITE, "x")], [], [], [("/m/b", IN_CLOSE_WRITE, "y")], [], [], []]
+    watcher = _FakeWatcher(clock, script, token)
+    passes: List[Set[str]] = []
+
+    def _rescan(changed: Set[str], thorough: bool) -> dict:
+        passes.append(changed)
+        return {"status": "cancelled"}
+
+    summary = run_watch(
+        "/m",
+        _rescan,
+        WatchSettings(debounce_s=2.0, max_batch_s=60.0),
+        cancel_token=token,
+        watcher_factory=lambda root, limit: watcher,
+        clock=clock,
+    )
+
+    assert passes == [{"/m/a"}]
+    assert token.is_set() and watcher.closed
+    assert summary["unapplied_dirs"] == ["/m/a"]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_watcher_reports_new_directories_and_in_place_writes(tmp_path: Path) -> None:
+    (tmp_path / "a").mkdir()
+    target = tmp_path / "a" / "x.bin"
+    target.write_bytes(b"1")
+    watcher = watch.InotifyWatcher(str(tmp_path))
+    try:
+        assert watcher.watch_count == 2
+        (tmp_path / "b").mkdir()
+        with open(target, "ab") as handle:
+            handle.write(b"2")
+        events = watcher.read(timeout_s=1.0)
+        (tmp_path / "b" / "new.bin").write_bytes(b"3")
+        events += watcher.read(timeout_s=1.0)
+    finally:
+        watcher.close()
+    dirty, overflow = dirty_directories(events)
+    assert not overflow
+    assert {str(tmp_path), str(tmp_path / "a"), str(tmp_path / "b")} <= dirty
+    assert watcher.watch_count == 3
+    assert os.path.isdir(tmp_path / "b")
+
+
+def test_watch_passes_apply_creates_modifies_and_deletes(scan_module, tmp_path: Path) -> None:
+    mount = tmp_path / "mount"
+    for name in ("a", "b", "c"):
+        (mount / name).mkdir(parents=True)
+        for idx in range(3):
+            (mount / name / f"{idx}.txt").write_text(name * (idx + 1))
+    shard = tmp_path / "shard.db"
+    kwargs = {"shard_db_path": str(shard), "settings": {"watch": {}}, "resume": False, "delta_scan_mode": "fast"}
+    scan_module.scan_drive("WATCH", str(mount), str(tmp_path / "catalog.db"), **kwargs)
+
+    (mount / "a" / "new.txt").write_text("new")
+    modified = mount / "b" / "0.txt"
+    modified.write_text("changed contents")
+    os.utime(modified, (modified.stat().st_atime, modified.stat().st_mtime + 10))
+    (mount / "c" / "1.txt").unlink()
+    changed = {str(mount / name) for name in ("a", "b", "c")}
+    scan_module.scan_drive("WATCH", str(mount), str(tmp_path / "catalog.db"), changed_dirs=changed, **kwargs)
+
+    expected = {str(path): path.stat().st_size for path in mount.rglob("*.txt")}
+    conn = sqlite3.connect(shard)
+    try:
+        files = dict(conn.execute("SELECT path, size_bytes FROM files WHERE deleted=0"))
+        inventory = dict(conn.execute("SELECT path, size_bytes FROM inventory"))
+        deleted = [row[0] for row in conn.execute("SELECT path FROM files WHERE deleted=1")]
+    finally:
+        conn.close()
+    assert files == expected
+    assert inventory == expected
+    assert deleted == [str(mount / "c" / "1.txt")]
@@ -0,0 +1,222 @@
+"""Per-phase timing for scans.
+
+:class:`ScanTimings` collects one :class:`LatencyHistogram` per operation
+(``enumerate``, ``stat``, ``hash``, ``mediainfo``, ``ffmpeg_verify``,
+``db_flush``, ``light_analysis``, ``fingerprint``) plus periodic depth
+samples of the scan's queues. Histograms use log-spaced buckets (four per
+power of two, from one microsecond), so recording is one dict increment
+under a lock and percentiles are accurate to about 19%.
+
+At the end of a scan the summary is written to
+``<working_dir>/logs/scan_timings/<label>.json``; the API serves the latest
+file per drive from ``/v1/scan/timings``.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from core.paths import get_logs_dir, safe_label
+
+PHASES = (
+    "enumerate",
+    "stat",
+    "hash",
+    "mediainfo",
+    "ffmpeg_verify",
+    "db_flush",
+    "light_analysis",
+    "fingerprint",
+)
+
+_BUCKETS_PER_OCTAVE = 4
+_MAX_QUEUE_SAMPLES = 600
+
+
+def _bucket_of(seconds: float) -> int:
+    micros = seconds * 1_000_000.0
+    if micros <= 1.0:
+        return 0
+    return int(math.log2(micros) * _BUCKETS_PER_OCTAVE) + 1
+
+
+def _bucket_upper_s(index: int) -> float:
+    return (2.0 ** (index / _BUCKETS_PER_OCTAVE)) / 1_000_000.0
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram; not thread-safe on its own."""
+
+    __slots__ = ("count", "total_s", "min_s", "max_s", "_buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_s = 0.0
+        self.min_s = math.inf
+        self.max_s = 0.0
+        self._buckets: Dict[int, int] = {}
+
+    def add(self, seconds: float) -> None:
+        seconds = max(0.0, float(seconds))
+        self.count += 1
+        self.total_s += seconds
+        self.min_s = min(self.min_s, seconds)
+        self.max_s = max(self.max_s, seconds)
+        index = _bucket_of(seconds)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    def percentile(self, q: float) -> float:
+        """Return the upper bound of the bucket holding the ``q`` quantile (0–1)."""
+
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return min(self.max_s, max(self.min_s, _bucket_upper_s(index)))
+        return self.max_s
+
+    def summary(self) -> Dict[str, float]:
+        if not self.count:
+            return {"count": 0, "total_s": 0.0}
+        return {
+            "count": self.count,
+            "total_s": round(self.total_s, 3),
+            "mean_ms": round(self.total_s * 1000.0 / self.count, 3),
+            "p50_ms": round(self.percentile(0.50) * 1000.0, 3),
+            "p95_ms": round(self.percentile(0.95) * 1000.0, 3),
+            "p99_ms": round(self.percentile(0.99) * 1000.0, 3),
+            "max_ms": round(self.max_s * 1000.0, 3),
+        }
+
+
+class ScanTimings:
+    """Thread-safe phase histograms and queue-depth samples for one scan."""
+
+    def __init__(self, *, sample_interval_s: float = 1.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._start = clock()
+        self._lock = threading.Lock()
+        self._phases: Dict[str, LatencyHistogram] = {}
+        self._sample_interval = max(0.0, float(sample_interval_s))
+        self._last_sample: Optional[float] = None
+        self._samples: List[Dict[str, float]] = []
+
+    def observe(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._phases.get(phase)
+            if histogram is None:
+                histogram = self._phases[phase] = LatencyHistogram()
+            histogram.add(seconds)
+
+    @contextmanager
+    def time(self, phase: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - started)
+
+    def should_sample(self) -> bool:
+        """Return whether :meth:`sample_queues` would record a sample now.
+
+        Lets callers skip gathering depths that would only be dropped.
+        """
+
+        now = self._clock()
+        with self._lock:
+            return self._last_sample is None or now - self._last_sample >= self._sample_interval
+
+    def sample_queues(self, **depths: int) -> None:
+        """Record queue depths, at most once per ``sample_interval_s``.
+
+        When the buffer is full every other sample is dropped and the interval
+        doubles, so long scans keep an even view of the whole run.
+        """
+
+        now = self._clock()
+        with self._lock:
+            if self._last_sample is not None and now - self._last_sample < self._sample_interval:
+                return
+            self._last_sample = now
+            sample: Dict[str, float] = {"t": round(now - self._start, 3)}
+            sample.update({name: int(depth) for name, depth in depths.items()})
+            self._samples.append(sample)
+            if len(self._samples) >= _MAX_QUEUE_SAMPLES:
+                self._samples = self._samples[::2]
+                self._sample_interval = max(self._sample_interval * 2, 0.001)
+
+    def phase_summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {phase: histogram.summary() for phase, histogram in sorted(self._phases.items())}
+
+    def summary(self) -> Dict[str, object]:
+        phases = self.phase_summary()
+        with self._lock:
+            samples = list(self._samples)
+        queues: Dict[str, Dict[str, float]] = {}
+        for sample in samples:
+            for name, depth in sample.items():
+                if name == "t":
+                    continue
+                stats = queues.setdefault(name, {"max": 0, "total": 0, "samples": 0})
+                stats["max"] = max(stats["max"], depth)
+                stats["total"] += depth
+                stats["samples"] += 1
+        return {
+            "elapsed_s": round(self._clock() - self._start, 3),
+            "phases": phases,
+            "queues": {
+                name: {
+                    "max": int(stats["max"]),
+                    "mean": round(stats["total"] / stats["samples"], 2),
+                    "samples": int(stats["samples"]),
+                }
+                for name, stats in sorted(queues.items())
+            },
+            "queue_samples": samples,
+        }
+
+    def write(self, path: Path, **meta: object) -> Path:
+        payload: Dict[str, object] = {
+            "written_utc": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+            **meta,
+            **self.summary(),
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2, default=str), encoding="utf-8")
+        os.replace(tmp_path, path)
+        return path
+
+
+def timings_path(working_dir: Path, drive_label: str) -> Path:
+    return get_logs_dir(working_dir) / "scan_timings" / f"{safe_label(drive_label)}.json"
+
+
+def load_timings(working_dir: Path, drive_label: str) -> Optional[Dict[str, object]]:
+    path = timings_path(working_dir, drive_label)
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+__all__ = [
+    "PHASES",
+    "LatencyHistogram",
+    "ScanTimings",
+    "load_timings",
+    "timings_path",
+]
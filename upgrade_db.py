@@ -15,7 +15,14 @@ from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 from audit.baseline import ensure_table as ensure_audit_table
 from backup.api import _BACKUPS_TABLE_SQL  # type: ignore
 from core.db import connect
-from core.paths import ensure_working_dir_structure, get_exports_dir, get_logs_dir, resolve_working_dir
+from core.paths import (
+    ensure_working_dir_structure,
+    get_exports_dir,
+    get_logs_dir,
+    get_shards_dir,
+    resolve_working_dir,
+)
+from core.search_index import ensure_search_indexes
 from core.settings import load_settings, save_settings
 from quality.store import ensure_tables as ensure_quality_tables
 from textlite.store import ensure_tables as ensure_textlite_tables
@@ -380,6 +387,28 @@ def _ensure_orchestrator_schema(working_dir: Path) -> List[str]:
     return executed
 
 
+def _ensure_shard_search_indexes(working_dir: Path) -> List[str]:
+    executed: List[str] = []
+    shards_dir = get_shards_dir(working_dir)
+    if not shards_dir.exists():
+        return executed
+    for shard_path in sorted(shards_dir.glob("*.db")):
+        try:
+            conn = connect(shard_path, read_only=False, check_same_thread=False)
+        except sqlite3.Error as exc:
+            LOGGER.warning("Unable to open shard %s: %s", shard_path.name, exc)
+            continue
+        try:
+            created = ensure_search_indexes(conn)
+        except sqlite3.Error as exc:
+            LOGGER.warning("Search index migration failed for %s: %s", shard_path.name, exc)
+            continue
+        finally:
+            conn.close()
+        executed.extend(f"{shard_path.stem}.{name}" for name in created)
+    return executed
+
+
 def _ensure_web_metrics_schema(working_dir: Path) -> List[str]:
     db_path = working_dir / "data" / "web_metrics.db"
     conn = sqlite3.connect(db_path)
@@ -417,6 +446,7 @@ def prepare_environment(*, log_path: Optional[Path], prepare_only: bool) -> Upgr
         executed.extend(_ensure_catalog_schema(catalog_path))
         executed.extend(_ensure_orchestrator_schema(working_dir))
         executed.extend(_ensure_web_metrics_schema(working_dir))
+        executed.extend(_ensure_shard_search_indexes(working_dir))
 
     wal_path = Path(str(catalog_path) + "-wal")
     shm_path = Path(str(catalog_path) + "-shm")
@@ -10,6 +10,7 @@ from fractions import Fraction
 from pathlib import Path
 from typing import Iterable, List, Optional, Sequence, Tuple
 
+from core.probe_cache import ProbeCache
 from gpu.runtime import get_hwaccel_args
 from .pillow_support import (
     PillowImage,
@@ -85,14 +86,24 @@ class FrameSampler:
         self._crop_filter: Optional[str] = None
         self._hwaccel_enabled = bool(self._config.allow_hwaccel)
 
-    def sample(self, video_path: Path, *, max_frames: Optional[int] = None) -> List[FrameSample]:
-        """Return a list of sampled frames ordered by timestamp."""
+    def sample(
+        self,
+        video_path: Path,
+        *,
+        max_frames: Optional[int] = None,
+        probe_cache: Optional[ProbeCache] = None,
+    ) -> List[FrameSample]:
+        """Return a list of sampled frames ordered by timestamp.
+
+        When *probe_cache* is given the video duration is read from the shard's
+        probe cache and ffprobe only runs on a miss.
+        """
 
         if not ensure_pillow(LOGGER):
             return []
 
         frame_budget = max(1, int(max_frames or self._max_frames))
-        timestamps = self._collect_timestamps(video_path, frame_budget)
+        timestamps = self._collect_timestamps(video_path, frame_budget, probe_cache)
         if not timestamps:
             LOGGER.debug("No timestamps determined for video: %s", video_path)
             return []
@@ -115,13 +126,18 @@ class FrameSampler:
     # ------------------------------------------------------------------
     # Timestamp collection helpers
     # ------------------------------------------------------------------
-    def _collect_timestamps(self, video_path: Path, frame_budget: int) -> List[float]:
+    def _collect_timestamps(
+        self,
+        video_path: Path,
+        frame_budget: int,
+        probe_cache: Optional[ProbeCache] = None,
+    ) -> List[float]:
         scenes = self._detect_scenes(video_path)
         if scenes:
             timestamps = self._timestamps_from_scenes(scenes, frame_budget)
             if timestamps:
                 return timestamps
-        duration = self._probe_duration(video_path)
+        duration = self._probe_duration(video_path, probe_cache)
         if duration:
             values = [
                 max(0.0, min(duration, duration * pct)) for pct in self._percentages
@@ -334,8 +350,10 @@ class FrameSampler:
     # ------------------------------------------------------------------
     # Utilities
     # ------------------------------------------------------------------
-    def _probe_duration(self, video_path: Path) -> Optional[float]:
+    def _probe_duration(self, video_path: Path, probe_cache: Optional[ProbeCache] = None) -> Optional[float]:
         probe = self._ffmpeg_path.with_name(self._ffmpeg_path.name.replace("ffmpeg", "ffprobe"))
+        if probe_cache is not None:
+            return probe_cache.duration(video_path, ffprobe=probe if probe.exists() else None)
         if not probe.exists():
             return None
         args = [
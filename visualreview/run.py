@@ -10,6 +10,7 @@ from typing import Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple
 
 from core.db import connect
 from core.paths import get_shard_db_path, get_shards_dir, resolve_working_dir
+from core.probe_cache import ProbeCache
 from structure import tv_review
 
 from .contact_sheet import ContactSheetBuilder, ContactSheetConfig
@@ -381,7 +382,9 @@ class ReviewRunner:
             )
             if not items:
                 continue
-            with VisualReviewStore(shard_path, config=self._store_config) as store:
+            with VisualReviewStore(shard_path, config=self._store_config) as store, ProbeCache.open(
+                shard_path, label
+            ) as probe_cache:
                 for item in items:
                     if cancel and cancel():
                         LOGGER.info("Review run cancelled during processing of %s", item.item_key)
@@ -389,7 +392,7 @@ class ReviewRunner:
                     progress_state.total_attempted += 1
                     progress_state.last_item = item
                     try:
-                        wrote_sheet, wrote_thumb = self._process_item(store, item)
+                        wrote_sheet, wrote_thumb = self._process_item(store, item, probe_cache)
                     except Exception as exc:  # pragma: no cover - defensive logging
                         LOGGER.exception("Failed to process %s/%s", item.drive_label, item.item_key)
                         summary.failed += 1
@@ -537,9 +540,12 @@ class ReviewRunner:
                 )
 
     def _process_item(
-        self, store: VisualReviewStore, item: ReviewItem
+        self,
+        store: VisualReviewStore,
+        item: ReviewItem,
+        probe_cache: Optional[ProbeCache] = None,
     ) -> tuple[bool, bool]:
-        samples = self._sampler.sample(item.video_path)
+        samples = self._sampler.sample(item.video_path, probe_cache=probe_cache)
         if not samples:
             return False, False
         sheet_result = self._sheet_builder.build(samples)
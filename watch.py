@@ -0,0 +1,312 @@
+"""Continuous watch mode that keeps a mounted drive's shard current.
+
+``scan_drive.py --watch`` runs one scan and then stays attached to the mount.
+On Linux it subscribes to inotify through ``ctypes`` (no daemon or extra
+package required) on every directory of the tree. Events are coalesced until
+the tree has been quiet for ``debounce_s`` seconds, or until ``max_batch_s``
+seconds have passed since the first event. The batch then becomes one fast
+delta pass (see :mod:`dirstate`) that is forced to list the directories the
+events touched. Inserts, updates, deletions and inventory rows therefore go
+through the regular scan path, and untouched directories cost one ``stat``.
+
+When inotify is unavailable, or the kernel refuses more watches
+(``fs.inotify.max_user_watches``), the watcher polls instead: every
+``poll_s`` seconds it runs a fast delta pass, which detects changed
+directories from their mtimes. A queue overflow drops events, so it triggers
+a thorough pass that lists every directory.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from robust import CancellationToken
+
+LOGGER = logging.getLogger("videocatalog.watch")
+
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (
+    IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+    | IN_DONT_FOLLOW
+)
+
+_EVENT = struct.Struct("iIII")
+_READ_BYTES = 64 * 1024
+
+WatchEvent = Tuple[str, int, str]
+RescanFn = Callable[[Set[str], bool], Dict[str, object]]
+
+
+@dataclass(frozen=True)
+class WatchSettings:
+    use_inotify: bool = True
+    debounce_s: float = 5.0
+    max_batch_s: float = 60.0
+    poll_s: float = 300.0
+    max_watches: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "use_inotify": bool(self.use_inotify),
+            "debounce_s": float(self.debounce_s),
+            "max_batch_s": float(self.max_batch_s),
+            "poll_s": float(self.poll_s),
+            "max_watches": int(self.max_watches),
+        }
+
+
+class InotifyWatcher:
+    """Recursive inotify subscription on a directory tree.
+
+    :meth:`read` returns ``(directory, mask, name)`` tuples. Directories
+    created after startup are watched as their events arrive. When the watch
+    limit is reached, :attr:`exhausted` is set and the remaining directories
+    are left to the polling fallback.
+    """
+
+    def __init__(self, root: str, *, max_watches: int = 0) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_init1.restype = ctypes.c_int
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_add_watch.restype = ctypes.c_int
+        self._libc = libc
+        self.root = root
+        self._max_watches = max(0, int(max_watches))
+        self._paths: Dict[int, str] = {}
+        self.exhausted = False
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._fd = fd
+        self._poller = select.poll()
+        self._poller.register(fd, select.POLLIN)
+        self.add_tree(root)
+
+    @property
+    def watch_count(self) -> int:
+        return len(self._paths)
+
+    def _add(self, path: str) -> bool:
+        if self._max_watches and len(self._paths) >= self._max_watches:
+            self.exhausted = True
+            return False
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                self.exhausted = True
+            elif err not in (errno.ENOENT, errno.EACCES, errno.ENOTDIR):
+                LOGGER.debug("inotify_add_watch failed for %s: %s", path, os.strerror(err))
+            return False
+        self._paths[wd] = path
+        return True
+
+    def add_tree(self, path: str) -> None:
+        if self.exhausted or not self._add(path):
+            return
+        for current, dirs, _files in os.walk(path):
+            for name in dirs:
+                if not self._add(os.path.join(current, name)):
+                    if self.exhausted:
+                        LOGGER.warning(
+                            "inotify watch limit reached after %s directories; polling the rest",
+                            len(self._paths),
+                        )
+                        return
+
+    def read(self, timeout_s: float) -> List[WatchEvent]:
+        if not self._poller.poll(max(0, int(timeout_s * 1000))):
+            return []
+        try:
+            buffer = os.read(self._fd, _READ_BYTES)
+        except BlockingIOError:
+            return []
+        events: List[WatchEvent] = []
+        offset = 0
+        while offset + _EVENT.size <= len(buffer):
+            wd, mask, _cookie, length = _EVENT.unpack_from(buffer, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(buffer[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                events.append((self.root, mask, ""))
+                continue
+            directory = self._paths.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                self._paths.pop(wd, None)
+                continue
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self.add_tree(os.path.join(directory, name))
+            events.append((directory, mask, name))
+        return events
+
+    def close(self) -> None:
+        fd, self._fd = self._fd, -1
+        if fd >= 0:
+            os.close(fd)
+
+
+def dirty_directories(events: List[WatchEvent]) -> Tuple[Set[str], bool]:
+    """Collapse events into the directories a pass must list, and an overflow flag."""
+
+    dirty: Set[str] = set()
+    overflow = False
+    for directory, mask, name in events:
+        if mask & IN_Q_OVERFLOW:
+            overflow = True
+            continue
+        if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+            dirty.add(os.path.dirname(directory))
+            continue
+        dirty.add(directory)
+        if mask & IN_ISDIR and name and mask & (IN_CREATE | IN_MOVED_TO):
+            dirty.add(os.path.join(directory, name))
+    return dirty, overflow
+
+
+def run_watch(
+    root: str,
+    rescan: RescanFn,
+    settings: WatchSettings,
+    *,
+    cancel_token: Optional[CancellationToken] = None,
+    watcher_factory: Optional[Callable[[str, int], InotifyWatcher]] = None,
+    clock: Callable[[], float] = time.monotonic,
+    on_pass: Optional[Callable[[str, Dict[str, object]], None]] = None,
+) -> Dict[str, object]:
+    """Apply coalesced filesystem changes under ``root`` until cancelled.
+
+    ``rescan(changed_dirs, thorough)`` runs one scan pass. ``thorough`` asks
+    for a pass that lists every directory instead of trusting stored records.
+    A pass that comes back with ``status == "cancelled"`` (for example after
+    Ctrl+C during enumeration) stops the loop; its directories are kept in
+    the summary's ``unapplied_dirs`` rather than dropped silently.
+    """
+
+    token = cancel_token or CancellationToken()
+    watcher: Optional[InotifyWatcher] = None
+    if settings.use_inotify:
+        try:
+            if watcher_factory is not None:
+                watcher = watcher_factory(root, settings.max_watches)
+            else:
+                watcher = InotifyWatcher(root, max_watches=settings.max_watches)
+        except OSError as exc:
+            LOGGER.warning("inotify unavailable (%s); polling every %.0fs", exc, settings.poll_s)
+    summary: Dict[str, object] = {
+        "mode": "inotify" if watcher is not None else "poll",
+        "watches": watcher.watch_count if watcher is not None else 0,
+        "batches": 0,
+        "polls": 0,
+        "overflows": 0,
+        "dirs_changed": 0,
+        "unapplied_dirs": [],
+    }
+    pending: Set[str] = set()
+    first_event: Optional[float] = None
+    last_event: Optional[float] = None
+    last_pass = clock()
+    overflow = False
+
+    def _run(kind: str, changed: Set[str], thorough: bool) -> bool:
+        nonlocal last_pass
+        result = rescan(set(changed), thorough)
+        last_pass = clock()
+        if on_pass is not None:
+            on_pass(kind, result)
+        if isinstance(result, dict) and result.get("status") == "cancelled":
+            token.set()
+        return not token.is_set()
+
+    try:
+        while not token.is_set():
+            polling = watcher is None or watcher.exhausted
+            if watcher is not None:
+                events = watcher.read(timeout_s=min(1.0, settings.debounce_s))
+            else:
+                token.wait(min(1.0, settings.poll_s))
+                events = []
+            now = clock()
+            if events:
+                dirty, overflowed = dirty_directories(events)
+                pending |= dirty
+                overflow = overflow or overflowed
+                first_event = now if first_event is None else first_event
+                last_event = now
+            if token.is_set():
+                break
+            if overflow:
+                summary["overflows"] = int(summary["overflows"]) + 1
+                LOGGER.warning("inotify queue overflowed; running a thorough pass")
+                if not _run("overflow", pending, True):
+                    break
+                pending.clear()
+                first_event = last_event = None
+                overflow = False
+            elif pending and first_event is not None and last_event is not None and (
+                now - last_event >= settings.debounce_s or now - first_event >= settings.max_batch_s
+            ):
+                summary["batches"] = int(summary["batches"]) + 1
+                summary["dirs_changed"] = int(summary["dirs_changed"]) + len(pending)
+                if not _run("batch", pending, False):
+                    break
+                pending.clear()
+                first_event = last_event = None
+            elif polling and now - last_pass >= settings.poll_s:
+                summary["polls"] = int(summary["polls"]) + 1
+                if not _run("poll", pending, False):
+                    break
+                pending.clear()
+                first_event = last_event = None
+    finally:
+        if watcher is not None:
+            watcher.close()
+    if pending:
+        summary["unapplied_dirs"] = sorted(pending)
+        LOGGER.warning("Watch stopped with %d changed directories not applied", len(pending))
+    return summary
+
+
+__all__ = [
+    "InotifyWatcher",
+    "WatchSettings",
+    "dirty_directories",
+    "run_watch",
+]